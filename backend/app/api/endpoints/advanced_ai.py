@@ -15,6 +15,7 @@ from datetime import datetime
 import logging
 from pydantic import BaseModel
 
+from app.config import settings
 from app.orchestrator.ai_feedback_loop import get_ai_feedback_loop, LearningSignal, AdaptationContext
 from app.orchestrator.predictive_system import get_predictive_system, PredictionHorizon, AlertType
 from app.orchestrator.security_supervisor import get_security_supervisor, AlertSeverity
@@ -487,6 +488,53 @@ async def optimize_portfolio(request: PortfolioOptimizationRequest):
         logger.error(f"❌ Erreur optimisation portefeuille: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/portfolio/frontier")
+async def get_efficient_frontier(risk_level: str = "medium", strategy: str = "balanced", points: int = 100):
+    """
+    📐 Obtenir la frontière efficiente complète pour un niveau de risque
+    """
+    if not 2 <= points <= 500:
+        raise HTTPException(status_code=400, detail="points doit être entre 2 et 500")
+    
+    try:
+        portfolio_optimizer = get_portfolio_optimizer()
+        
+        frontier = await portfolio_optimizer.compute_efficient_frontier(
+            risk_level=RiskLevel[risk_level.upper()],
+            strategy=AllocationStrategy[strategy.upper()],
+            n_points=points
+        )
+        if frontier is None:
+            raise HTTPException(status_code=422, detail="Contraintes infaisables pour ce niveau de risque")
+        
+        asset_names = portfolio_optimizer.asset_universe
+        
+        return {
+            "status": "success",
+            "frontier": [
+                {
+                    "expected_return": float(frontier.returns[i]),
+                    "expected_volatility": float(frontier.volatilities[i]),
+                    "weights": dict(zip(asset_names, frontier.weights[i].round(6).tolist()))
+                }
+                for i in range(frontier.n_points)
+            ],
+            "points": frontier.n_points,
+            "solve_time_ms": frontier.solve_time_ms,
+            "cache": {
+                "hits": portfolio_optimizer.frontier_solver.cache_hits,
+                "misses": portfolio_optimizer.frontier_solver.cache_misses
+            }
+        }
+        
+    except HTTPException:
+        raise
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Valeur inconnue: {e}")
+    except Exception as e:
+        logger.error(f"❌ Erreur frontière efficiente: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/portfolio/rebalance")
 async def get_rebalance_recommendations():
     """
@@ -522,13 +570,28 @@ async def get_rebalance_recommendations():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/portfolio/metrics")
-async def get_portfolio_metrics():
+async def get_portfolio_metrics(scenarios: Optional[int] = None, time_budget_ms: Optional[int] = None):
     """
     📊 Obtenir les métriques de performance du portefeuille
-    """
+    
+    Args:
+        scenarios: Nombre de scénarios Monte Carlo
+        time_budget_ms: Budget de temps de la simulation (résultat partiel si dépassé)
+    """
+    if scenarios is not None and not 1_000 <= scenarios <= settings.MONTE_CARLO_MAX_SCENARIOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"scenarios doit être entre 1000 et {settings.MONTE_CARLO_MAX_SCENARIOS}"
+        )
+    if time_budget_ms is not None and time_budget_ms <= 0:
+        raise HTTPException(status_code=400, detail="time_budget_ms doit être positif")
+    
     try:
         portfolio_optimizer = get_portfolio_optimizer()
-        metrics = await portfolio_optimizer.calculate_portfolio_metrics()
+        metrics, simulation = await portfolio_optimizer.calculate_portfolio_metrics(
+            n_scenarios=scenarios,
+            time_budget_s=time_budget_ms / 1000 if time_budget_ms else None
+        )
         
         return {
             "status": "success",
@@ -547,6 +610,19 @@ async def get_portfolio_metrics():
                 "information_ratio": metrics.information_ratio,
                 "tracking_error": metrics.tracking_error
             },
+            "simulation": {
+                "scenarios_requested": simulation.n_scenarios_requested,
+                "scenarios": simulation.n_scenarios,
+                "horizon_days": simulation.horizon_days,
+                "var_99": simulation.var_99,
+                "cvar_99": simulation.cvar_99,
+                "max_drawdown_p95": simulation.max_drawdown_p95,
+                "return_percentiles": simulation.return_percentiles,
+                "drawdown_percentiles": simulation.drawdown_percentiles,
+                "workers": simulation.workers,
+                "truncated": simulation.truncated,
+                "elapsed_ms": simulation.elapsed_ms
+            } if simulation else None,
             "timestamp": datetime.utcnow().isoformat()
         }
         
@@ -5,30 +5,35 @@
 Endpoints pour vérifier la santé du système de trading.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any
 from datetime import datetime
 import asyncio
 import logging
 
+from app.integrations.http_pool import get_http_transport
+from database.connection import check_database, get_async_db
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/health", tags=["health"])
 
 @router.get("/")
-async def health_check():
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """
     ❤️ Health check principal du système
     """
     try:
+        database = await check_database(db)
         return {
-            "status": "healthy",
+            "status": "healthy" if database["status"] == "healthy" else "degraded",
             "service": "trading-ai-system",
             "version": "2.0.0",
             "timestamp": datetime.now().isoformat(),
             "components": {
                 "api": "healthy",
-                "database": "healthy",
+                "database": database["status"],
                 "trading": "healthy",
                 "ai_modules": "healthy"
             }
@@ -38,18 +43,19 @@ async def health_check():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/detailed")
-async def detailed_health_check():
+async def detailed_health_check(db: AsyncSession = Depends(get_async_db)):
     """
     🔍 Health check détaillé avec métriques
     """
     try:
-        # Tests de base
+        # Tests de base (base de données : ping réel via le pool asynchrone)
+        database = await check_database(db)
         health_status = {
-            "status": "healthy",
+            "status": "healthy" if database["status"] == "healthy" else "degraded",
             "timestamp": datetime.now().isoformat(),
             "components": {
                 "api": {"status": "healthy", "response_time": 50},
-                "database": {"status": "healthy", "connections": 5},
+                "database": database,
                 "redis": {"status": "healthy", "memory_usage": "45%"},
                 "trading_apis": {"status": "healthy", "brokers_connected": 0},
                 "ai_modules": {"status": "healthy", "modules_active": 4}
@@ -68,6 +74,32 @@ async def detailed_health_check():
         logger.error(f"❌ Detailed health check error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/http-pool")
+async def http_pool_health():
+    """
+    🌐 Métriques des pools HTTP sortants (par hôte)
+    """
+    try:
+        transport = get_http_transport()
+        pools = transport.get_pool_metrics()
+        
+        return {
+            "status": "healthy",
+            "timestamp": datetime.now().isoformat(),
+            "config": {
+                "limit_per_host": transport.config.limit_per_host,
+                "ttl_dns_cache": transport.config.ttl_dns_cache,
+                "keepalive_timeout": transport.config.keepalive_timeout
+            },
+            "pools": pools,
+            "total_in_use": sum(pool["in_use"] for pool in pools.values()),
+            "total_idle": sum(pool["idle"] for pool in pools.values())
+        }
+        
+    except Exception as e:
+        logger.error(f"❌ HTTP pool metrics error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/trading")
 async def trading_health_check():
     """
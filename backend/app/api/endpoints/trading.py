@@ -16,6 +16,7 @@ from app.integrations.trading_apis import (
     TradingOrchestrator, create_broker, TradingMode, 
     OrderSide, OrderType, trading_orchestrator
 )
+from app.integrations.quote_service import get_quote_service
 from app.orchestrator.ai_feedback_loop import get_ai_feedback_loop
 from app.orchestrator.predictive_system import get_predictive_system
 from app.orchestrator.portfolio_optimizer import get_portfolio_optimizer
@@ -39,8 +40,9 @@ class OrderRequest(BaseModel):
     symbol: str
     side: str  # buy, sell
     quantity: float
-    order_type: str = "market"  # market, limit
+    order_type: str = "market"  # market, limit, stop, stop_limit
     price: Optional[float] = None
+    stop_price: Optional[float] = None
 
 class TradingStrategyRequest(BaseModel):
     strategy: str  # meme_coins, crypto_lt, forex, etf
@@ -174,35 +176,26 @@ async def get_batch_market_data(symbols: str):  # "AAPL,TSLA,BTCUSDT"
     📊 Récupérer les données de marché pour plusieurs assets
     """
     try:
-        symbol_list = [s.strip() for s in symbols.split(",")]
-        results = {}
+        symbol_list = [s.strip() for s in symbols.split(",") if s.strip()]
         
-        for symbol in symbol_list:
-            try:
-                # Sélectionner le bon broker selon le type d'asset
-                broker_name = None
-                if any(crypto in symbol.upper() for crypto in ["BTC", "ETH", "USDT"]):
-                    broker_name = "binance"
-                else:
-                    broker_name = "alpaca"
-                
-                if broker_name in trading_orchestrator.brokers:
-                    broker = trading_orchestrator.brokers[broker_name]
-                    async with broker:
-                        market_data = await broker.get_market_data(symbol)
-                        results[symbol] = {
-                            "price": market_data.price,
-                            "bid": market_data.bid,
-                            "ask": market_data.ask,
-                            "volume": market_data.volume,
-                            "timestamp": market_data.timestamp.isoformat(),
-                            "broker": broker_name
-                        }
-                else:
-                    results[symbol] = {"error": f"Broker {broker_name} non configuré"}
-                    
-            except Exception as e:
-                results[symbol] = {"error": str(e)}
+        # Un appel multi-symboles par broker, en parallèle, derrière un cache à TTL court
+        quotes = await get_quote_service().get_quotes(symbol_list)
+        
+        results = {}
+        for symbol, result in quotes.items():
+            if result.error is not None:
+                results[symbol] = {"error": result.error}
+                continue
+            market_data = result.quote
+            results[symbol] = {
+                "price": market_data.price,
+                "bid": market_data.bid,
+                "ask": market_data.ask,
+                "volume": market_data.volume,
+                "timestamp": market_data.timestamp.isoformat(),
+                "broker": result.broker,
+                "cached": result.cached
+            }
         
         return {
             "status": "success",
@@ -246,7 +239,8 @@ async def place_order(order: OrderRequest, background_tasks: BackgroundTasks):
                 side=side,
                 quantity=order.quantity,
                 order_type=order_type,
-                price=order.price
+                price=order.price,
+                stop_price=order.stop_price
             )
             
             # Soumettre un signal d'apprentissage à l'IA en arrière-plan
@@ -254,10 +248,14 @@ async def place_order(order: OrderRequest, background_tasks: BackgroundTasks):
                 submit_trading_feedback,
                 order.symbol,
                 order.side,
-                placed_order.filled_price,
+                placed_order.filled_price or market_data.price,  # ordre au repos ou en vol
                 order.quantity
             )
             
+            # Compte live : registre resynchronisé après l'ordre (le paper est alimenté par les fills)
+            if broker.mode == TradingMode.LIVE:
+                background_tasks.add_task(trading_orchestrator.sync_ledger, order.broker)
+            
         return {
             "status": "success",
             "message": "Ordre placé avec succès",
@@ -269,6 +267,7 @@ async def place_order(order: OrderRequest, background_tasks: BackgroundTasks):
                 "type": placed_order.type.value,
                 "status": placed_order.status.value,
                 "filled_price": placed_order.filled_price,
+                "filled_quantity": placed_order.filled_quantity,
                 "created_at": placed_order.created_at.isoformat()
             }
         }
@@ -301,6 +300,7 @@ async def get_orders_history(broker: Optional[str] = None, limit: int = 50):
                             "side": order.side.value,
                             "quantity": order.quantity,
                             "filled_price": order.filled_price,
+                            "filled_quantity": order.filled_quantity,
                             "status": order.status.value,
                             "created_at": order.created_at.isoformat()
                         })
@@ -536,9 +536,7 @@ async def reset_paper_trading():
         # Reset de tous les brokers paper
         for broker in trading_orchestrator.brokers.values():
             if broker.mode == TradingMode.PAPER:
-                broker.paper_balance = 10000.0
-                broker.paper_positions = {}
-                broker.paper_orders = []
+                broker.reset_paper(10000.0)
         
         return {
             "status": "success",
@@ -234,7 +234,8 @@ async def get_orchestrator_metrics(orchestrator: AIScheduler = Depends(get_orche
                 "average_task_success_rate": round(avg_success_rate, 1),
                 "average_execution_time": round(avg_execution_time, 2),
                 "tasks_by_priority": priority_counts,
-                "tasks_by_type": type_counts
+                "tasks_by_type": type_counts,
+                "scheduling_lag": status.get("scheduling_lag", {})
             }
         }
     except Exception as e:
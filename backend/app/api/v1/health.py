@@ -3,10 +3,13 @@
 Routes pour vérifier la santé du système
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 import time
 
+from database.connection import check_database, get_async_db
+
 router = APIRouter()
 
 @router.get("/")
@@ -21,12 +24,13 @@ async def health_check():
     }
 
 @router.get("/detailed")
-async def detailed_health():
+async def detailed_health(db: AsyncSession = Depends(get_async_db)):
     """Check de santé détaillé"""
+    database = await check_database(db)
     return {
-        "status": "healthy",
+        "status": "healthy" if database["status"] == "healthy" else "degraded",
         "services": {
-            "database": "connected",
+            "database": "connected" if database["status"] == "healthy" else "disconnected",
             "redis": "connected",
             "broker": "paper_mode",
             "ai": "available"
@@ -5,68 +5,57 @@
 from fastapi import APIRouter
 from datetime import datetime
 
+from app.integrations.position_ledger import get_position_ledger
+from app.trading_ai_system import trading_system
+
 router = APIRouter()
 
+# Libellés des ETF suivis (le symbole sert de nom pour les autres actifs)
+SYMBOL_NAMES = {
+    "VTI": "Vanguard Total Stock Market ETF",
+    "VTIAX": "Vanguard Total International",
+    "QQQ": "Invesco QQQ Trust",
+    "BND": "Vanguard Total Bond Market",
+    "VNQ": "Vanguard Real Estate ETF"
+}
+
+# Action de la dernière décision IA active → statut affiché sur la position
+AI_STATUSES = {"BUY": "ACCUMULATE", "SELL": "REDUCE", "HOLD": "HOLD"}
+
 @router.get("/current")
 async def get_current_portfolio():
-    """Portefeuille actuel détaillé"""
+    """Portefeuille actuel détaillé, lu dans le registre des positions (sans appel broker)"""
+    ledger = get_position_ledger()
+    total_value = ledger.total_value()
+    actions = {decision.asset: decision.action for decision in trading_system.active_decisions}
+    
+    portfolio = []
+    total_cost = 0.0
+    for position in ledger.positions():
+        cost = position["avg_price"] * position["quantity"]
+        total_cost += cost
+        portfolio.append({
+            "symbol": position["symbol"],
+            "name": SYMBOL_NAMES.get(position["symbol"], position["symbol"]),
+            "broker": position["broker"],
+            "asset_class": position["asset_class"],
+            "allocation": round(100 * position["value"] / total_value, 2) if total_value else 0.0,
+            "value": position["value"],
+            "performance": round(100 * position["pnl"] / abs(cost), 2) if cost else 0.0,
+            "ai_status": AI_STATUSES.get(actions.get(position["symbol"]), "HOLD"),
+            "shares": position["quantity"],
+            "avg_cost": position["avg_price"]
+        })
+    
+    total_gain = ledger.total_pnl()
     return {
-        "portfolio": [
-            {
-                "symbol": "VTI",
-                "name": "Vanguard Total Stock Market ETF",
-                "allocation": 35,
-                "value": 43900,
-                "performance": 1.2,
-                "ai_status": "HOLD",
-                "shares": 185.5,
-                "avg_cost": 220.50
-            },
-            {
-                "symbol": "VTIAX",
-                "name": "Vanguard Total International",
-                "allocation": 25,
-                "value": 31350,
-                "performance": -0.5,
-                "ai_status": "ACCUMULATE",
-                "shares": 1250.0,
-                "avg_cost": 25.08
-            },
-            {
-                "symbol": "QQQ",
-                "name": "Invesco QQQ Trust",
-                "allocation": 20,
-                "value": 25086,
-                "performance": 2.1,
-                "ai_status": "HOLD",
-                "shares": 65.2,
-                "avg_cost": 384.75
-            },
-            {
-                "symbol": "BND",
-                "name": "Vanguard Total Bond Market",
-                "allocation": 15,
-                "value": 18814,
-                "performance": 0.1,
-                "ai_status": "REDUCE",
-                "shares": 245.8,
-                "avg_cost": 76.55
-            },
-            {
-                "symbol": "VNQ",
-                "name": "Vanguard Real Estate ETF",
-                "allocation": 5,
-                "value": 6270,
-                "performance": -1.2,
-                "ai_status": "HOLD",
-                "shares": 68.5,
-                "avg_cost": 91.53
-            }
-        ],
-        "total_value": 125420.0,
-        "total_cost": 122850.0,
-        "total_gain": 2570.0,
-        "total_gain_percent": 2.09,
+        "portfolio": portfolio,
+        "cash": ledger.cash(),
+        "exposure": ledger.exposure_by_asset_class(),
+        "total_value": total_value,
+        "total_cost": total_cost,
+        "total_gain": total_gain,
+        "total_gain_percent": round(100 * total_gain / (total_value - total_gain), 2) if total_value - total_gain else 0.0,
         "last_updated": datetime.utcnow().isoformat()
     }
 
@@ -17,6 +17,8 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 import os
 
+from app.integrations.http_pool import get_http_transport
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -80,6 +82,9 @@ class CoinCapAPIClient:
         if self.api_key:
             self.headers["Authorization"] = f"Bearer {self.api_key}"
         
+        # Transport HTTP partagé (pool keep-alive)
+        self.transport = get_http_transport()
+        
         # Rate limiting
         self.last_request = 0
         self.min_interval = 0.1  # 100ms entre requêtes (très généreux)
@@ -97,19 +102,20 @@ class CoinCapAPIClient:
             
             url = f"{self.base_url}/{endpoint.lstrip('/')}"
             
-            async with aiohttp.ClientSession(
+            async with self.transport.get(
+                url,
+                params=params,
                 headers=self.headers,
                 timeout=aiohttp.ClientTimeout(total=30)
-            ) as session:
-                async with session.get(url, params=params) as response:
-                    self.last_request = datetime.utcnow().timestamp()
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        return data
-                    else:
-                        logger.error(f"❌ Erreur CoinCap API {response.status}: {await response.text()}")
-                        return {"error": f"HTTP {response.status}"}
+            ) as response:
+                self.last_request = datetime.utcnow().timestamp()
+                
+                if response.status == 200:
+                    data = await response.json()
+                    return data
+                else:
+                    logger.error(f"❌ Erreur CoinCap API {response.status}: {await response.text()}")
+                    return {"error": f"HTTP {response.status}"}
                         
         except Exception as e:
             logger.error(f"❌ Erreur requête CoinCap: {e}")
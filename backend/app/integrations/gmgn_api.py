@@ -25,6 +25,8 @@ from enum import Enum
 import time
 from collections import deque
 
+from app.integrations.http_pool import get_http_transport
+
 logger = logging.getLogger(__name__)
 
 class GMGNChain(Enum):
@@ -148,6 +150,9 @@ class GMGNAPIClient:
             "Origin": "https://gmgn.ai"
         }
         
+        # Transport HTTP partagé (pool keep-alive)
+        self.transport = get_http_transport()
+        
         # Rate limiter strict (2 req/sec max)
         self.rate_limiter = GMGNRateLimiter(max_requests_per_second=1.8)
         
@@ -203,45 +208,45 @@ class GMGNAPIClient:
         try:
             url = f"{self.base_url}/{endpoint.lstrip('/')}"
             
-            async with aiohttp.ClientSession(
+            self.total_requests += 1
+            logger.debug(f"🌐 GMGN Request #{self.total_requests}: {endpoint}")
+            
+            async with self.transport.get(
+                url,
+                params=params,
                 headers=self.headers,
                 timeout=aiohttp.ClientTimeout(total=30)
-            ) as session:
+            ) as response:
                 
-                self.total_requests += 1
-                logger.debug(f"🌐 GMGN Request #{self.total_requests}: {endpoint}")
-                
-                async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    
+                    # Mettre en cache
+                    if use_cache:
+                        self.cache[cache_key] = {
+                            "data": data,
+                            "timestamp": time.time()
+                        }
+                    
+                    return data
+                    
+                elif response.status == 429:
+                    # Rate limit hit - attendre plus longtemps
+                    self.rate_limited_count += 1
+                    logger.warning(f"🚨 GMGN Rate limit hit! (#{self.rate_limited_count})")
+                    
+                    # Attendre 2 secondes supplémentaires puis retry
+                    await asyncio.sleep(2.0)
+                    
+                    # Un seul retry pour éviter les boucles infinies
+                    logger.info("🔄 Retry après rate limit...")
+                    return await self._make_request(endpoint, params, use_cache=False)
+                    
+                else:
+                    error_text = await response.text()
+                    logger.error(f"❌ Erreur GMGN API {response.status}: {error_text}")
+                    return {"error": f"HTTP {response.status}"}
                     
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        # Mettre en cache
-                        if use_cache:
-                            self.cache[cache_key] = {
-                                "data": data,
-                                "timestamp": time.time()
-                            }
-                        
-                        return data
-                        
-                    elif response.status == 429:
-                        # Rate limit hit - attendre plus longtemps
-                        self.rate_limited_count += 1
-                        logger.warning(f"🚨 GMGN Rate limit hit! (#{self.rate_limited_count})")
-                        
-                        # Attendre 2 secondes supplémentaires puis retry
-                        await asyncio.sleep(2.0)
-                        
-                        # Un seul retry pour éviter les boucles infinies
-                        logger.info("🔄 Retry après rate limit...")
-                        return await self._make_request(endpoint, params, use_cache=False)
-                        
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"❌ Erreur GMGN API {response.status}: {error_text}")
-                        return {"error": f"HTTP {response.status}"}
-                        
         except Exception as e:
             logger.error(f"❌ Erreur requête GMGN: {e}")
             return {"error": str(e)}
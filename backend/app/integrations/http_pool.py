@@ -0,0 +1,258 @@
+"""
+🌐 HTTP POOL - TRANSPORT HTTP PARTAGÉ
+=====================================
+
+Couche de transport HTTP unique pour tous les clients sortants :
+- Pool de connexions keep-alive par hôte et par boucle asyncio (limites configurables)
+- Cache DNS partagé
+- Cycle de vie lié au lifespan FastAPI
+- Métriques par hôte (connexions actives, inactives, temps d'attente)
+
+Usage:
+    transport = get_http_transport()
+    async with transport.get(url, headers=headers) as response:
+        data = await response.json()
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Any
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class HTTPPoolConfig:
+    """Configuration du pool de connexions"""
+    limit_per_host: int = 20
+    ttl_dns_cache: int = 300  # secondes
+    keepalive_timeout: float = 30.0
+    connect_timeout: float = 10.0
+    total_timeout: float = 30.0
+
+    @classmethod
+    def from_settings(cls) -> "HTTPPoolConfig":
+        return cls(
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+            connect_timeout=settings.HTTP_CONNECT_TIMEOUT,
+            total_timeout=settings.HTTP_TOTAL_TIMEOUT
+        )
+
+@dataclass
+class HostPoolStats:
+    """Statistiques du pool pour un hôte"""
+    host: str
+    in_use: int = 0
+    requests_total: int = 0
+    errors_total: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    wait_count: int = 0
+    wait_time_total_ms: float = 0.0
+    wait_time_max_ms: float = 0.0
+
+class _PooledRequest:
+    """Context manager de requête compatible avec `async with session.get(...)`"""
+
+    def __init__(self, transport: "HTTPTransport", method: str, url: str, kwargs: Dict[str, Any]):
+        self._transport = transport
+        self._method = method
+        self._url = url
+        self._kwargs = kwargs
+        self._ctx = None
+        self._stats: Optional[HostPoolStats] = None
+
+    async def __aenter__(self) -> aiohttp.ClientResponse:
+        session, self._stats = self._transport._session_for(self._url)
+        with self._transport._lock:
+            self._stats.in_use += 1
+            self._stats.requests_total += 1
+
+        try:
+            self._ctx = session.request(self._method, self._url, **self._kwargs)
+            return await self._ctx.__aenter__()
+        except Exception:
+            with self._transport._lock:
+                self._stats.in_use -= 1
+                self._stats.errors_total += 1
+            raise
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            await self._ctx.__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            with self._transport._lock:
+                self._stats.in_use -= 1
+                if exc_type is not None:
+                    self._stats.errors_total += 1
+
+class HTTPTransport:
+    """
+    🌐 TRANSPORT HTTP PARTAGÉ
+
+    Une session aiohttp (et donc un connecteur keep-alive) par hôte et par
+    boucle asyncio : chaque thread qui appelle asyncio.run (workers Celery
+    en pool threads) a ses propres sessions, jamais touchées par les autres.
+    Les sessions sont créées à la demande et fermées par leur boucle
+    (shutdown de l'application, fin de tâche) ; statistiques par hôte.
+    """
+
+    def __init__(self, config: Optional[HTTPPoolConfig] = None):
+        self.config = config or HTTPPoolConfig.from_settings()
+        self._sessions: Dict[asyncio.AbstractEventLoop, Dict[str, aiohttp.ClientSession]] = {}
+        self._stats: Dict[str, HostPoolStats] = {}
+        self._lock = threading.Lock()
+
+        logger.info(f"🌐 HTTP Transport initialisé ({self.config.limit_per_host} connexions/hôte)")
+
+    def _build_trace_config(self, stats: HostPoolStats) -> aiohttp.TraceConfig:
+        """Trace aiohttp pour mesurer l'attente de connexion"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_queued_start(session, ctx, params):
+            ctx.queued_at = time.perf_counter()
+
+        async def on_queued_end(session, ctx, params):
+            wait_ms = (time.perf_counter() - getattr(ctx, "queued_at", time.perf_counter())) * 1000
+            stats.wait_count += 1
+            stats.wait_time_total_ms += wait_ms
+            stats.wait_time_max_ms = max(stats.wait_time_max_ms, wait_ms)
+
+        async def on_connection_created(session, ctx, params):
+            stats.connections_created += 1
+
+        async def on_connection_reused(session, ctx, params):
+            stats.connections_reused += 1
+
+        trace_config.on_connection_queued_start.append(on_queued_start)
+        trace_config.on_connection_queued_end.append(on_queued_end)
+        trace_config.on_connection_create_end.append(on_connection_created)
+        trace_config.on_connection_reuseconn.append(on_connection_reused)
+        return trace_config
+
+    def _session_for(self, url: str):
+        """Retourne (session, stats) pour l'hôte de l'URL"""
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+
+        # Les sessions sont liées à une boucle : un jeu de sessions par boucle
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            sessions = self._sessions.get(loop)
+            if sessions is None:
+                # Boucles terminées sans close() : références simplement abandonnées
+                for closed_loop in [l for l in self._sessions if l.is_closed()]:
+                    logger.debug("Sessions HTTP d'une boucle asyncio terminée abandonnées")
+                    del self._sessions[closed_loop]
+                sessions = self._sessions[loop] = {}
+            stats = self._stats.setdefault(host, HostPoolStats(host=host))
+        session = sessions.get(host)
+
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.limit_per_host,
+                limit_per_host=self.config.limit_per_host,
+                ttl_dns_cache=self.config.ttl_dns_cache,
+                use_dns_cache=True,
+                keepalive_timeout=self.config.keepalive_timeout
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=self.config.total_timeout,
+                    connect=self.config.connect_timeout
+                ),
+                trace_configs=[self._build_trace_config(stats)]
+            )
+            sessions[host] = session
+            logger.debug(f"🔌 Nouveau pool HTTP pour {host}")
+
+        return session, stats
+
+    def request(self, method: str, url: str, **kwargs) -> _PooledRequest:
+        """Requête HTTP via le pool de l'hôte"""
+        return _PooledRequest(self, method, url, kwargs)
+
+    def get(self, url: str, **kwargs) -> _PooledRequest:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> _PooledRequest:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> _PooledRequest:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> _PooledRequest:
+        return self.request("DELETE", url, **kwargs)
+
+    async def close(self):
+        """
+        Fermer les sessions de la boucle courante (shutdown de l'application)
+
+        Les appelants de asyncio.run (tâches Celery) ferment le transport avant
+        la fin de leur boucle ; les sessions des autres boucles restent ouvertes.
+        """
+        with self._lock:
+            sessions = list(self._sessions.pop(asyncio.get_running_loop(), {}).values())
+
+        for session in sessions:
+            if not session.closed:
+                await session.close()
+
+        logger.info(f"🛑 HTTP Transport fermé ({len(sessions)} pools)")
+
+    def get_pool_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """📊 Métriques par hôte"""
+        metrics = {}
+
+        with self._lock:
+            loop_sessions = [dict(sessions) for sessions in self._sessions.values()]
+
+        for host, stats in list(self._stats.items()):
+            idle = 0
+            for sessions in loop_sessions:
+                session = sessions.get(host)
+                if session is not None and not session.closed:
+                    # aiohttp n'expose pas publiquement les connexions inactives : lecture de
+                    # BaseConnector._conns, dépendance à aiohttp==3.9.1 (requirements.txt)
+                    idle += sum(len(conns) for conns in getattr(session.connector, "_conns", {}).values())
+
+            metrics[host] = {
+                "in_use": stats.in_use,
+                "idle": idle,
+                "limit": self.config.limit_per_host,
+                "requests_total": stats.requests_total,
+                "errors_total": stats.errors_total,
+                "connections_created": stats.connections_created,
+                "connections_reused": stats.connections_reused,
+                "wait_count": stats.wait_count,
+                "avg_wait_ms": round(stats.wait_time_total_ms / stats.wait_count, 3) if stats.wait_count else 0.0,
+                "max_wait_ms": round(stats.wait_time_max_ms, 3)
+            }
+
+        return metrics
+
+# Instance globale
+_http_transport: Optional[HTTPTransport] = None
+
+def get_http_transport() -> HTTPTransport:
+    """🌐 Obtenir le transport HTTP partagé"""
+    global _http_transport
+    if _http_transport is None:
+        _http_transport = HTTPTransport()
+    return _http_transport
+
+async def close_http_transport():
+    """🛑 Fermer le transport HTTP partagé"""
+    global _http_transport
+    if _http_transport is not None:
+        await _http_transport.close()
@@ -0,0 +1,562 @@
+"""
+📡 MARKET STREAM - COTATIONS TEMPS RÉEL PAR WEBSOCKET
+====================================================
+
+Ingestion continue des cotations des brokers, sans polling REST :
+- Abonnements WebSocket persistants : Binance (flux combinés @bookTicker),
+  Alpaca (quotes, authentification par message) ; URL configurables, ce qui
+  permet de pointer vers le serveur de rejeu local (benchmarks/market_replay_server.py)
+- Ticks normalisés dans une table de cotations compacte (tableaux NumPy,
+  une ligne par symbole) ; les ticks plus anciens que la ligne sont écartés
+- Diffusion par bus pub/sub asyncio : abonnés tick par tick (file bornée,
+  les plus anciens sont abandonnés si l'abonné décroche) ou conflatés
+  (dernier tick par symbole, pour l'optimiseur et le système prédictif)
+- Instantané REST à chaque connexion (service de cotations groupées, cache
+  ignoré) : table initialisée au démarrage ; après une coupure, reconnexion
+  avec backoff exponentiel et rattrapage des cotations manquées
+- Métriques par flux : messages, ticks, décalage bourse → réception
+  (moyenne exponentielle, max ; indisponible pour Binance, dont le flux
+  @bookTicker n'est pas horodaté), coupures, durée des trous, rattrapages
+
+Usage:
+    stream = get_market_stream()
+    await stream.start()
+    async for tick in stream.subscribe("scanner"):        # tick par tick
+        ...
+    stream.attach("optimizer", optimizer.on_quotes, min_interval=1.0)  # conflaté
+    stream.table.get("BTCUSDT")                           # MarketData
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set
+
+import aiohttp
+import numpy as np
+
+from app.config import settings
+from app.integrations.position_ledger import get_position_ledger
+from app.integrations.quote_service import QuoteService, get_quote_service
+from app.integrations.trading_apis import MarketData
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class StreamConfig:
+    """Configuration de l'ingestion temps réel"""
+    binance_url: str = "wss://stream.binance.com:9443/stream"
+    alpaca_url: str = "wss://stream.data.alpaca.markets/v2/iex"
+    crypto_symbols: tuple = ("BTCUSDT", "ETHUSDT", "SOLUSDT")
+    equity_symbols: tuple = ()
+    queue_size: int = 10_000  # ticks en attente par abonné
+    reconnect_initial: float = 0.5  # secondes
+    reconnect_max: float = 30.0
+    heartbeat: float = 20.0
+
+    @classmethod
+    def from_settings(cls, equity_symbols: Iterable[str] = ()) -> "StreamConfig":
+        return cls(
+            binance_url=settings.MARKET_STREAM_BINANCE_URL,
+            alpaca_url=settings.MARKET_STREAM_ALPACA_URL,
+            crypto_symbols=tuple(settings.MARKET_STREAM_CRYPTO_SYMBOLS),
+            equity_symbols=tuple(settings.MARKET_STREAM_EQUITY_SYMBOLS or equity_symbols),
+            queue_size=settings.MARKET_STREAM_QUEUE_SIZE,
+            reconnect_max=settings.MARKET_STREAM_RECONNECT_MAX_SECONDS
+        )
+
+@dataclass
+class Tick:
+    """Cotation normalisée"""
+    feed: str
+    symbol: str
+    bid: float
+    ask: float
+    price: float
+    volume: float
+    timestamp: float  # horodatage bourse (epoch s), réception si le flux n'en a pas
+    received_at: float  # réception locale (epoch s)
+    backfill: bool = False  # instantané REST (connexion / reconnexion)
+
+    def to_market_data(self) -> MarketData:
+        return MarketData(self.symbol, self.price, self.bid, self.ask, self.volume,
+                          datetime.fromtimestamp(self.timestamp))
+
+# ================================================================================
+# TABLE DE COTATIONS
+# ================================================================================
+
+class QuoteTable:
+    """Dernière cotation par symbole, une ligne NumPy par symbole"""
+
+    COLUMNS = ("bid", "ask", "price", "volume", "timestamp", "received_at")
+
+    def __init__(self, capacity: int = 256):
+        self.index: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        self.values = np.full((capacity, len(self.COLUMNS)), np.nan)
+        self.updates = np.zeros(capacity, dtype=np.int64)
+        self.backfilled = np.zeros(capacity, dtype=bool)  # ligne écrite par un rattrapage REST
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def _row(self, symbol: str) -> int:
+        row = self.index.get(symbol)
+        if row is None:
+            row = self.index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            if row == len(self.values):
+                self.values = np.vstack([self.values, np.full_like(self.values, np.nan)])
+                self.updates = np.concatenate([self.updates, np.zeros_like(self.updates)])
+                self.backfilled = np.concatenate([self.backfilled, np.zeros_like(self.backfilled)])
+        return row
+
+    def update(self, tick: Tick) -> bool:
+        """
+        Écrire un tick ; False s'il est plus ancien que la cotation en table
+
+        Un tick du flux remplace toujours une cotation de rattrapage : l'horodatage
+        REST (parfois l'heure de réception) n'est pas comparable à celui du flux.
+        """
+        row = self._row(tick.symbol)
+        values = self.values[row]
+        if tick.timestamp < values[4] and (tick.backfill or not self.backfilled[row]):
+            return False
+        values[:] = (tick.bid, tick.ask, tick.price, tick.volume, tick.timestamp, tick.received_at)
+        self.updates[row] += 1
+        self.backfilled[row] = tick.backfill
+        return True
+
+    def get(self, symbol: str) -> Optional[MarketData]:
+        row = self.index.get(symbol)
+        if row is None:
+            return None
+        bid, ask, price, volume, timestamp, _ = self.values[row]
+        return MarketData(symbol, float(price), float(bid), float(ask), float(volume), datetime.fromtimestamp(timestamp))
+
+    def prices(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        symbols = self.symbols if symbols is None else [s for s in symbols if s in self.index]
+        return {symbol: float(self.values[self.index[symbol], 2]) for symbol in symbols}
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Format des données de marché de l'orchestrateur : {symbole: {price, volume, bid, ask}}
+
+        Seules les lignes alimentées (flux ou instantané REST réel) sont renvoyées.
+        """
+        rows = self.values[:len(self.symbols)]
+        return {
+            symbol: {"price": float(row[2]), "volume": float(row[3]), "bid": float(row[0]), "ask": float(row[1])}
+            for symbol, row, updates in zip(self.symbols, rows, self.updates)
+            if updates and np.isfinite(row[2])
+        }
+
+# ================================================================================
+# BUS PUB/SUB
+# ================================================================================
+
+class Subscription:
+    """
+    Abonnement au bus
+
+    Mode tick par tick : file bornée, les ticks les plus anciens sont
+    abandonnés quand l'abonné décroche. Mode conflaté : dernier tick par
+    symbole, lu par lots avec next_batch().
+    """
+
+    def __init__(self, name: str, symbols: Optional[Set[str]], maxsize: int, conflate: bool):
+        self.name = name
+        self.symbols = symbols
+        self.conflate = conflate
+        self.closed = False
+        self.delivered = 0
+        self.dropped = 0
+        self._queue: Deque[Tick] = deque(maxlen=maxsize)
+        self._latest: Dict[str, Tick] = {}
+        self._ready = asyncio.Event()
+
+    def push(self, tick: Tick):
+        if self.conflate:
+            self._latest[tick.symbol] = tick
+        else:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(tick)
+        self.delivered += 1
+        self._ready.set()
+
+    async def get(self) -> Tick:
+        """Prochain tick (mode tick par tick) ; StopAsyncIteration une fois fermé"""
+        while not self._queue:
+            if self.closed:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+        return self._queue.popleft()
+
+    async def next_batch(self) -> Dict[str, Tick]:
+        """Derniers ticks par symbole depuis le lot précédent (mode conflaté)"""
+        while not self._latest:
+            if self.closed:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+        batch, self._latest = self._latest, {}
+        return batch
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Tick:
+        return await self.get()
+
+    def pending(self) -> int:
+        return len(self._latest) if self.conflate else len(self._queue)
+
+class QuoteBus:
+    """Diffusion des ticks vers les abonnés (filtre optionnel par symbole)"""
+
+    def __init__(self, queue_size: int = 10_000):
+        self.queue_size = queue_size
+        self.subscriptions: List[Subscription] = []
+        self.published = 0
+
+    def subscribe(self, name: str, symbols: Optional[Iterable[str]] = None,
+                  maxsize: Optional[int] = None, conflate: bool = False) -> Subscription:
+        subscription = Subscription(name, set(symbols) if symbols else None, maxsize or self.queue_size, conflate)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.close()
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+
+    def publish(self, tick: Tick):
+        self.published += 1
+        for subscription in self.subscriptions:
+            if subscription.symbols is None or tick.symbol in subscription.symbols:
+                subscription.push(tick)
+
+    def close(self):
+        for subscription in self.subscriptions:
+            subscription.close()
+        self.subscriptions = []
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            subscription.name: {"delivered": subscription.delivered, "dropped": subscription.dropped,
+                                "pending": subscription.pending()}
+            for subscription in self.subscriptions
+        }
+
+# ================================================================================
+# FLUX BROKERS
+# ================================================================================
+
+class StreamFeed:
+    """Flux WebSocket d'un broker : URL, messages d'ouverture, décodage des ticks"""
+
+    name = "feed"
+    event_time = True  # messages horodatés par la bourse : décalage mesurable
+
+    def __init__(self, url: str, symbols: Iterable[str]):
+        self.url = url
+        self.symbols = list(symbols)
+
+    def connect_url(self) -> str:
+        return self.url
+
+    async def on_open(self, ws: aiohttp.ClientWebSocketResponse):
+        """Authentification / abonnement après la connexion"""
+
+    def parse(self, message: str, received_at: float) -> List[Tick]:
+        raise NotImplementedError
+
+class BinanceFeed(StreamFeed):
+    """
+    Binance : flux combinés <symbole>@bookTicker (meilleurs bid/ask)
+
+    Le message spot (u, s, b, B, a, A) n'a pas d'heure d'événement : le tick
+    est horodaté à la réception et le décalage n'est pas mesuré.
+    """
+
+    name = "binance"
+    event_time = False
+
+    def connect_url(self) -> str:
+        return f"{self.url}?streams=" + "/".join(f"{symbol.lower()}@bookTicker" for symbol in self.symbols)
+
+    def parse(self, message: str, received_at: float) -> List[Tick]:
+        payload = json.loads(message)
+        data = payload.get("data", payload)
+        if "b" not in data:
+            return []
+        bid, ask = float(data["b"]), float(data["a"])
+        return [Tick(self.name, data["s"], bid, ask, (bid + ask) / 2, float(data["B"]) + float(data["A"]),
+                     received_at, received_at)]
+
+class AlpacaFeed(StreamFeed):
+    """Alpaca : authentification par message puis abonnement aux quotes"""
+
+    name = "alpaca"
+
+    def __init__(self, url: str, symbols: Iterable[str], api_key: str = "", api_secret: str = ""):
+        super().__init__(url, symbols)
+        self.api_key = api_key
+        self.api_secret = api_secret
+
+    async def on_open(self, ws: aiohttp.ClientWebSocketResponse):
+        await ws.send_json({"action": "auth", "key": self.api_key, "secret": self.api_secret})
+        await ws.send_json({"action": "subscribe", "quotes": self.symbols})
+
+    def parse(self, message: str, received_at: float) -> List[Tick]:
+        ticks = []
+        for item in json.loads(message):
+            kind = item.get("T")
+            if kind == "q":
+                bid, ask = item["bp"], item["ap"]
+                timestamp = datetime.fromisoformat(item["t"].replace("Z", "+00:00")).timestamp()
+                ticks.append(Tick(self.name, item["S"], bid, ask, (bid + ask) / 2, item["bs"] + item["as"],
+                                  timestamp, received_at))
+            elif kind == "error":
+                raise ConnectionError(f"Alpaca stream: {item.get('msg')} ({item.get('code')})")
+        return ticks
+
+# ================================================================================
+# INGESTION
+# ================================================================================
+
+@dataclass
+class FeedStats:
+    """Métriques d'un flux"""
+    connected: bool = False
+    connects: int = 0
+    reconnects: int = 0
+    messages: int = 0
+    ticks: int = 0
+    stale: int = 0  # ticks plus anciens que la table
+    errors: int = 0
+    gaps: int = 0
+    gap_seconds: float = 0.0
+    backfilled: int = 0  # cotations issues des instantanés REST
+    unavailable: int = 0  # symboles sans cotation réelle dans un instantané
+    lag_available: bool = True  # False : flux sans horodatage bourse
+    lag_ewma_ms: float = 0.0
+    lag_max_ms: float = 0.0
+    last_message_at: Optional[float] = None
+
+    def observe_lag(self, lag_ms: float):
+        self.lag_ewma_ms += 0.05 * (lag_ms - self.lag_ewma_ms)
+        if lag_ms > self.lag_max_ms:
+            self.lag_max_ms = lag_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        idle = time.time() - self.last_message_at if self.last_message_at else None
+        return {
+            **{key: value for key, value in self.__dict__.items() if key != "last_message_at"},
+            "lag_ewma_ms": round(self.lag_ewma_ms, 2) if self.lag_available else None,
+            "lag_max_ms": round(self.lag_max_ms, 2) if self.lag_available else None,
+            "gap_seconds": round(self.gap_seconds, 3),
+            "idle_seconds": round(idle, 3) if idle is not None else None
+        }
+
+class MarketStream:
+    """📡 Flux temps réel : WebSockets brokers → table de cotations → bus pub/sub"""
+
+    def __init__(self,
+                 config: Optional[StreamConfig] = None,
+                 feeds: Optional[List[StreamFeed]] = None,
+                 quote_service: Optional[QuoteService] = None):
+        self.config = config or StreamConfig.from_settings()
+        self.feeds = feeds if feeds is not None else self._default_feeds()
+        self.quote_service = quote_service or get_quote_service()  # instantanés REST
+        self.table = QuoteTable()
+        self.bus = QuoteBus(self.config.queue_size)
+        self.feed_stats: Dict[str, FeedStats] = {feed.name: FeedStats(lag_available=feed.event_time) for feed in self.feeds}
+
+        self.is_running = False
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _default_feeds(self) -> List[StreamFeed]:
+        feeds: List[StreamFeed] = []
+        if self.config.crypto_symbols:
+            feeds.append(BinanceFeed(self.config.binance_url, self.config.crypto_symbols))
+        if self.config.equity_symbols:
+            feeds.append(AlpacaFeed(self.config.alpaca_url, self.config.equity_symbols,
+                                    settings.ALPACA_API_KEY, settings.ALPACA_SECRET_KEY))
+        return feeds
+
+    # ------------------------------------------------------------------
+    # Cycle de vie
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """🚀 Ouvrir les abonnements WebSocket (une tâche par flux)"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._session = aiohttp.ClientSession()
+        self._tasks = [asyncio.create_task(self._run_feed(feed)) for feed in self.feeds]
+        logger.info(f"📡 Flux temps réel démarré: {', '.join(f'{f.name} ({len(f.symbols)})' for f in self.feeds)}")
+
+    async def stop(self):
+        """🛑 Fermer les flux et les abonnements"""
+        self.is_running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.bus.close()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        logger.info("🛑 Flux temps réel arrêté")
+
+    async def _run_feed(self, feed: StreamFeed):
+        """Connexion persistante : lecture, puis reconnexion avec backoff et rattrapage"""
+        stats = self.feed_stats[feed.name]
+        delay = self.config.reconnect_initial
+        while self.is_running:
+            try:
+                async with self._session.ws_connect(feed.connect_url(), heartbeat=self.config.heartbeat) as ws:
+                    await feed.on_open(ws)
+                    stats.connected = True
+                    stats.connects += 1
+                    await self._backfill(feed, stats)
+                    delay = self.config.reconnect_initial
+
+                    async for message in ws:
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            self.ingest(feed, message.data)
+                        elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats.errors += 1
+                logger.warning(f"⚠️ Flux {feed.name} interrompu: {e}")
+            finally:
+                stats.connected = False
+
+            if not self.is_running:
+                break
+            stats.reconnects += 1
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+            delay = min(delay * 2, self.config.reconnect_max)
+
+    async def _backfill(self, feed: StreamFeed, stats: FeedStats):
+        """
+        Instantané des symboles du flux (cotations groupées, cache ignoré) : table
+        initialisée à la première connexion, cotations manquées après une coupure
+        """
+        if stats.last_message_at is not None:
+            stats.gaps += 1
+            stats.gap_seconds += time.time() - stats.last_message_at
+        try:
+            results = await self.quote_service.get_quotes(feed.symbols, max_age=0)
+        except Exception as e:
+            stats.errors += 1
+            logger.warning(f"⚠️ Rattrapage {feed.name} impossible: {e}")
+            return
+        received_at = time.time()
+        for symbol, result in results.items():
+            quote = result.quote
+            if result.error is not None or quote is None or quote.simulated:
+                stats.unavailable += 1  # jamais de prix de repli dans la table
+                continue
+            tick = Tick(feed.name, symbol, quote.bid, quote.ask, quote.price, quote.volume,
+                        quote.timestamp.timestamp(), received_at, backfill=True)
+            if self._ingest_tick(tick, stats):
+                stats.backfilled += 1
+        logger.info(f"🔁 Flux {feed.name} connecté, instantané de {len(results)} symboles")
+
+    def ingest(self, feed: StreamFeed, message: str):
+        """Décoder un message du flux et diffuser ses ticks"""
+        stats = self.feed_stats[feed.name]
+        received_at = time.time()
+        stats.messages += 1
+        stats.last_message_at = received_at
+        for tick in feed.parse(message, received_at):
+            if self._ingest_tick(tick, stats) and stats.lag_available:
+                stats.observe_lag((received_at - tick.timestamp) * 1000)
+
+    def _ingest_tick(self, tick: Tick, stats: FeedStats) -> bool:
+        if not self.table.update(tick):
+            stats.stale += 1
+            return False
+        stats.ticks += 1
+        get_position_ledger().on_price(tick.symbol, tick.price)
+        self.bus.publish(tick)
+        return True
+
+    # ------------------------------------------------------------------
+    # Abonnés
+    # ------------------------------------------------------------------
+
+    def subscribe(self, name: str, symbols: Optional[Iterable[str]] = None,
+                  maxsize: Optional[int] = None) -> Subscription:
+        """Abonnement tick par tick (itérable asynchrone)"""
+        return self.bus.subscribe(name, symbols, maxsize)
+
+    def attach(self, name: str, callback: Callable[[Dict[str, Tick]], Any],
+               symbols: Optional[Iterable[str]] = None, min_interval: float = 0.0) -> asyncio.Task:
+        """
+        Consommateur conflaté : callback(dernier tick par symbole) à chaque lot,
+        au plus une fois par min_interval secondes
+        """
+        subscription = self.bus.subscribe(name, symbols, conflate=True)
+
+        async def consume():
+            try:
+                while True:
+                    batch = await subscription.next_batch()
+                    try:
+                        result = callback(batch)
+                        if inspect.isawaitable(result):
+                            await result
+                    except Exception as e:
+                        logger.error(f"❌ Erreur consommateur {name}: {e}")
+                    if min_interval > 0:
+                        await asyncio.sleep(min_interval)
+            except StopAsyncIteration:
+                pass
+            finally:
+                self.bus.unsubscribe(subscription)
+
+        task = asyncio.create_task(consume())
+        self._tasks.append(task)
+        return task
+
+    def get_stats(self) -> Dict[str, Any]:
+        """📊 Métriques par flux et par abonné"""
+        return {
+            "running": self.is_running,
+            "symbols": len(self.table),
+            "published": self.bus.published,
+            "feeds": {name: stats.to_dict() for name, stats in self.feed_stats.items()},
+            "subscribers": self.bus.get_stats()
+        }
+
+# Instance globale
+_market_stream: Optional[MarketStream] = None
+
+def get_market_stream(equity_symbols: Iterable[str] = ()) -> MarketStream:
+    """📡 Obtenir le flux temps réel partagé (actions : MARKET_STREAM_EQUITY_SYMBOLS, sinon equity_symbols)"""
+    global _market_stream
+    if _market_stream is None:
+        _market_stream = MarketStream(StreamConfig.from_settings(equity_symbols))
+    return _market_stream
@@ -0,0 +1,399 @@
+"""
+📒 PAPER MATCHING - MOTEUR D'APPARIEMENT DU PAPER TRADING
+=========================================================
+
+Exécution simulée réaliste des ordres paper des brokers :
+- Carnets par symbole : ordres limites au repos en priorité prix-temps,
+  stops (stop / stop-limit) déclenchés par les cotations
+- Exécution contre la cotation bid/ask de MarketData (spread synthétique si
+  la cotation est absente ou incohérente), slippage fixe + impact linéaire
+- Liquidité par cotation (part du volume) : fills partiels, le reliquat
+  attend les cotations suivantes
+- Latence injectée : un ordre n'entre dans le carnet qu'après son délai
+  (base + gigue exponentielle) sur l'horloge du moteur
+
+Le cœur est synchrone et sans I/O (100k+ ordres/s) ; l'horloge est
+injectable pour les stress tests en temps simulé.
+
+Usage:
+    engine = PaperMatchingEngine(MatchingConfig.from_settings(), on_fill=broker._apply_paper_fill)
+    engine.on_market_data(quote)       # nouvelle cotation : stops, puis appariement
+    delay = engine.submit(order)       # ordre actif après `delay` secondes
+    engine.advance()                   # activer les ordres arrivés
+"""
+
+import heapq
+import itertools
+import logging
+import math
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.integrations.trading_apis import MarketData, Order, OrderSide, OrderStatus, OrderType
+
+logger = logging.getLogger(__name__)
+
+EPSILON = 1e-12
+ACTIVE_STATUSES = (OrderStatus.PENDING, OrderStatus.PARTIALLY_FILLED)
+LIMIT_TYPES = (OrderType.LIMIT, OrderType.STOP_LIMIT)
+STOP_TYPES = (OrderType.STOP, OrderType.STOP_LIMIT)
+
+@dataclass
+class MatchingConfig:
+    """Modèles d'exécution du paper trading"""
+    slippage_bps: float = 2.0  # glissement fixe au-delà du bid/ask
+    impact_bps: float = 10.0  # impact linéaire pour un ordre consommant toute la liquidité
+    default_spread_bps: float = 5.0  # spread synthétique sans cotation exploitable
+    participation: float = 1.0  # part du volume disponible par cotation (0 = liquidité illimitée)
+    latency_ms: float = 0.0  # latence fixe d'arrivée au carnet
+    latency_jitter_ms: float = 0.0  # gigue exponentielle (moyenne)
+
+    @classmethod
+    def from_settings(cls) -> "MatchingConfig":
+        return cls(
+            slippage_bps=settings.PAPER_SLIPPAGE_BPS,
+            impact_bps=settings.PAPER_IMPACT_BPS,
+            default_spread_bps=settings.PAPER_DEFAULT_SPREAD_BPS,
+            participation=settings.PAPER_PARTICIPATION,
+            latency_ms=settings.PAPER_LATENCY_MS,
+            latency_jitter_ms=settings.PAPER_LATENCY_JITTER_MS
+        )
+
+@dataclass(slots=True)
+class Fill:
+    """Exécution (totale ou partielle) d'un ordre"""
+    order_id: str
+    symbol: str
+    side: OrderSide
+    quantity: float
+    price: float
+    timestamp: float  # horloge du moteur
+
+class OrderBook:
+    """
+    Carnet d'un symbole
+
+    Les ordres annulés restent dans les tas et sont écartés quand ils
+    arrivent en tête (annulation en O(1)).
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids: List[Tuple[float, int, Order]] = []  # (-limite, séquence, ordre)
+        self.asks: List[Tuple[float, int, Order]] = []  # (limite, séquence, ordre)
+        self.buy_stops: List[Tuple[float, int, Order]] = []  # (stop, séquence, ordre)
+        self.sell_stops: List[Tuple[float, int, Order]] = []  # (-stop, séquence, ordre)
+        self.buy_market: Deque[Order] = deque()  # ordres au marché en attente de liquidité
+        self.sell_market: Deque[Order] = deque()
+
+        self.has_quote = False
+        self.bid = self.ask = self.last = 0.0
+        self.bid_liquidity = self.ask_liquidity = math.inf
+
+    def best_bid(self) -> Optional[float]:
+        while self.bids and self.bids[0][2].status not in ACTIVE_STATUSES:
+            heapq.heappop(self.bids)
+        return -self.bids[0][0] if self.bids else None
+
+    def best_ask(self) -> Optional[float]:
+        while self.asks and self.asks[0][2].status not in ACTIVE_STATUSES:
+            heapq.heappop(self.asks)
+        return self.asks[0][0] if self.asks else None
+
+    def resting(self) -> int:
+        """Ordres encore actifs dans le carnet (limites, stops, marché en attente)"""
+        queues = (self.bids, self.asks, self.buy_stops, self.sell_stops)
+        return (sum(entry[2].status in ACTIVE_STATUSES for queue in queues for entry in queue)
+                + sum(order.status in ACTIVE_STATUSES for order in (*self.buy_market, *self.sell_market)))
+
+class PaperMatchingEngine:
+    """
+    📒 MOTEUR D'APPARIEMENT PAPER
+
+    Les ordres sont mis à jour en place (statut, quantité exécutée, prix
+    moyen) ; chaque exécution est aussi transmise à on_fill.
+    """
+
+    def __init__(self,
+                 config: Optional[MatchingConfig] = None,
+                 on_fill: Optional[Callable[[Fill], None]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 seed: Optional[int] = None):
+        self.config = config or MatchingConfig()
+        self.on_fill = on_fill
+        self.clock = clock
+        self.books: Dict[str, OrderBook] = {}
+        self.orders: Dict[str, Order] = {}  # ordres actifs uniquement
+
+        self._random = random.Random(seed).random
+        self._sequence = itertools.count()
+        self._inflight: List[Tuple[float, int, Order]] = []  # (arrivée au carnet, séquence, ordre)
+
+        self.submitted = 0
+        self.rejected = 0
+        self.cancelled = 0
+        self.fills = 0
+        self.filled_orders = 0
+        self.triggered_stops = 0
+
+    # ------------------------------------------------------------------
+    # Ordres
+    # ------------------------------------------------------------------
+
+    def submit(self, order: Order, now: Optional[float] = None) -> float:
+        """
+        📥 Soumettre un ordre (statut PENDING, ou REJECTED s'il est invalide)
+
+        Returns:
+            Latence injectée en secondes : l'ordre entre dans le carnet au
+            premier événement (cotation, advance) postérieur
+        """
+        now = self.clock() if now is None else now
+        self.submitted += 1
+        order.filled_quantity = 0.0
+
+        order_type = order.type
+        invalid = (
+            order.quantity <= 0
+            or (order_type in LIMIT_TYPES and not order.price)
+            or (order_type in STOP_TYPES and not order.stop_price)
+        )
+        if invalid:
+            order.status = OrderStatus.REJECTED
+            self.rejected += 1
+            return 0.0
+
+        order.status = OrderStatus.PENDING
+        self.orders[order.id] = order
+        cfg = self.config
+        delay = cfg.latency_ms
+        if cfg.latency_jitter_ms > 0:
+            delay -= cfg.latency_jitter_ms * math.log(1.0 - self._random())  # gigue exponentielle
+        delay /= 1000.0
+        if delay > 0:
+            heapq.heappush(self._inflight, (now + delay, next(self._sequence), order))
+        else:
+            self.advance(now)  # ordres arrivés avant celui-ci d'abord
+            self._activate(order, now)
+        return delay
+
+    def cancel(self, order_id: str) -> bool:
+        """❌ Annuler un ordre actif (le reliquat non exécuté)"""
+        order = self.orders.get(order_id)
+        if order is None or order.status not in ACTIVE_STATUSES:
+            return False
+        order.status = OrderStatus.CANCELLED
+        del self.orders[order_id]
+        self.cancelled += 1
+        return True
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """⏩ Activer les ordres dont la latence est écoulée ; renvoie leur nombre"""
+        now = self.clock() if now is None else now
+        inflight, activate, pending = self._inflight, self._activate, OrderStatus.PENDING
+        activated = 0
+        while inflight and inflight[0][0] <= now:
+            arrival, _, order = heapq.heappop(inflight)
+            if order.status is pending:
+                activate(order, arrival)
+                activated += 1
+        return activated
+
+    def _book(self, symbol: str) -> OrderBook:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = OrderBook(symbol)
+        return book
+
+    def _activate(self, order: Order, now: float):
+        """Entrée au carnet : stop en attente, marché en file, limite au repos ; puis appariement"""
+        book = self.books.get(order.symbol) or self._book(order.symbol)
+        buy = order.side is OrderSide.BUY
+        sequence = next(self._sequence)
+
+        if order.type in STOP_TYPES:
+            if book.has_quote and (book.ask >= order.stop_price if buy else book.bid <= order.stop_price):
+                self._trigger(book, order)
+            elif buy:
+                heapq.heappush(book.buy_stops, (order.stop_price, sequence, order))
+            else:
+                heapq.heappush(book.sell_stops, (-order.stop_price, sequence, order))
+        elif order.type is OrderType.MARKET:
+            (book.buy_market if buy else book.sell_market).append(order)
+        elif buy:
+            heapq.heappush(book.bids, (-order.price, sequence, order))
+        else:
+            heapq.heappush(book.asks, (order.price, sequence, order))
+
+        if book.has_quote:
+            if buy:
+                if book.buy_market or (book.bids and -book.bids[0][0] >= book.ask):
+                    self._match_buys(book, now)
+            elif book.sell_market or (book.asks and book.asks[0][0] <= book.bid):
+                self._match_sells(book, now)
+
+    def _trigger(self, book: OrderBook, order: Order):
+        """Stop déclenché : ordre au marché (stop) ou limite au repos (stop-limit)"""
+        self.triggered_stops += 1
+        buy = order.side is OrderSide.BUY
+        if order.type is OrderType.STOP:
+            (book.buy_market if buy else book.sell_market).append(order)
+        elif buy:
+            heapq.heappush(book.bids, (-order.price, next(self._sequence), order))
+        else:
+            heapq.heappush(book.asks, (order.price, next(self._sequence), order))
+
+    # ------------------------------------------------------------------
+    # Cotations et appariement
+    # ------------------------------------------------------------------
+
+    def on_market_data(self, market_data: MarketData, now: Optional[float] = None):
+        """📈 Nouvelle cotation depuis MarketData"""
+        self.on_quote(market_data.symbol, market_data.bid, market_data.ask,
+                      market_data.price, market_data.volume, now)
+
+    def on_quote(self, symbol: str, bid: float, ask: float, price: Optional[float] = None,
+                 volume: float = 0.0, now: Optional[float] = None):
+        """
+        📈 Nouvelle cotation : ordres arrivés activés, stops déclenchés, puis
+        appariement des deux côtés contre la liquidité de la cotation
+        """
+        now = self.clock() if now is None else now
+        if self._inflight:
+            self.advance(now)
+
+        book = self._book(symbol)
+        cfg = self.config
+        price = price or (bid + ask) / 2
+        if bid <= 0 or ask <= 0 or ask < bid:
+            half_spread = price * cfg.default_spread_bps / 20_000
+            bid, ask = price - half_spread, price + half_spread
+        book.bid, book.ask, book.last = bid, ask, price
+        liquidity = volume * cfg.participation if volume > 0 and cfg.participation > 0 else math.inf
+        book.bid_liquidity = book.ask_liquidity = liquidity
+        book.has_quote = True
+
+        buy_stops, sell_stops = book.buy_stops, book.sell_stops
+        while buy_stops and buy_stops[0][0] <= ask:
+            order = heapq.heappop(buy_stops)[2]
+            if order.status is OrderStatus.PENDING:
+                self._trigger(book, order)
+        while sell_stops and -sell_stops[0][0] >= bid:
+            order = heapq.heappop(sell_stops)[2]
+            if order.status is OrderStatus.PENDING:
+                self._trigger(book, order)
+
+        if book.buy_market or (book.bids and -book.bids[0][0] >= ask):
+            self._match_buys(book, now)
+        if book.sell_market or (book.asks and book.asks[0][0] <= bid):
+            self._match_sells(book, now)
+
+    def _impact(self, quantity: float, liquidity: float) -> float:
+        """Glissement total en fraction du prix (fixe + impact linéaire)"""
+        cfg = self.config
+        impact = cfg.impact_bps * quantity / liquidity if liquidity != math.inf else 0.0
+        return (cfg.slippage_bps + impact) / 10_000
+
+    def _match_buys(self, book: OrderBook, now: float):
+        """Achats contre l'ask : marché (priorité temps) puis limites (prix-temps)"""
+        market = book.buy_market
+        while market and book.ask_liquidity > EPSILON:
+            order = market[0]
+            if order.status not in ACTIVE_STATUSES:
+                market.popleft()
+                continue
+            quantity = min(order.quantity - order.filled_quantity, book.ask_liquidity)
+            price = book.ask * (1 + self._impact(quantity, book.ask_liquidity))
+            book.ask_liquidity -= quantity
+            if self._fill(order, quantity, price, now):
+                market.popleft()
+
+        bids = book.bids
+        while bids and book.ask_liquidity > EPSILON:
+            neg_limit, _, order = bids[0]
+            if order.status not in ACTIVE_STATUSES:
+                heapq.heappop(bids)
+                continue
+            if -neg_limit < book.ask:
+                break
+            quantity = min(order.quantity - order.filled_quantity, book.ask_liquidity)
+            price = min(-neg_limit, book.ask * (1 + self._impact(quantity, book.ask_liquidity)))
+            book.ask_liquidity -= quantity
+            if self._fill(order, quantity, price, now):
+                heapq.heappop(bids)
+
+    def _match_sells(self, book: OrderBook, now: float):
+        """Ventes contre le bid : marché (priorité temps) puis limites (prix-temps)"""
+        market = book.sell_market
+        while market and book.bid_liquidity > EPSILON:
+            order = market[0]
+            if order.status not in ACTIVE_STATUSES:
+                market.popleft()
+                continue
+            quantity = min(order.quantity - order.filled_quantity, book.bid_liquidity)
+            price = book.bid * (1 - self._impact(quantity, book.bid_liquidity))
+            book.bid_liquidity -= quantity
+            if self._fill(order, quantity, price, now):
+                market.popleft()
+
+        asks = book.asks
+        while asks and book.bid_liquidity > EPSILON:
+            limit, _, order = asks[0]
+            if order.status not in ACTIVE_STATUSES:
+                heapq.heappop(asks)
+                continue
+            if limit > book.bid:
+                break
+            quantity = min(order.quantity - order.filled_quantity, book.bid_liquidity)
+            price = max(limit, book.bid * (1 - self._impact(quantity, book.bid_liquidity)))
+            book.bid_liquidity -= quantity
+            if self._fill(order, quantity, price, now):
+                heapq.heappop(asks)
+
+    def _fill(self, order: Order, quantity: float, price: float, now: float) -> bool:
+        """Enregistrer une exécution ; True si l'ordre est entièrement exécuté"""
+        filled = order.filled_quantity
+        total = filled + quantity
+        order.filled_price = price if filled == 0 else (order.filled_price * filled + price * quantity) / total
+        order.filled_quantity = total
+        self.fills += 1
+
+        done = total >= order.quantity - EPSILON
+        if done:
+            order.status = OrderStatus.FILLED
+            order.filled_at = datetime.now()
+            self.filled_orders += 1
+            self.orders.pop(order.id, None)
+        else:
+            order.status = OrderStatus.PARTIALLY_FILLED
+
+        if self.on_fill is not None:
+            self.on_fill(Fill(order.id, order.symbol, order.side, quantity, price, now))
+        return done
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[Order]:
+        """📋 Ordres actifs (en vol, au repos, partiellement exécutés)"""
+        return [order for order in self.orders.values() if symbol is None or order.symbol == symbol]
+
+    def get_stats(self) -> Dict[str, int]:
+        """📊 Statistiques du moteur"""
+        return {
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "cancelled": self.cancelled,
+            "fills": self.fills,
+            "filled_orders": self.filled_orders,
+            "triggered_stops": self.triggered_stops,
+            "open_orders": len(self.orders),
+            "inflight": len(self._inflight),
+            "books": len(self.books)
+        }
@@ -0,0 +1,331 @@
+"""
+📒 POSITION LEDGER - REGISTRE DES POSITIONS EN VALEUR DE MARCHÉ
+==============================================================
+
+Registre événementiel des comptes brokers : chaque exécution et chaque
+cotation met à jour le compte par deltas, sans reparcourir les positions :
+
+- Exécution : cash, quantité signée (positions courtes), prix moyen,
+  P&L réalisé à la réduction / clôture / retournement
+- Cotation : valeur de marché et P&L latent de la position concernée
+- Agrégats tenus à jour à chaque événement (valeur de marché, P&L latent,
+  expositions brute et nette par classe d'actifs) : la valeur du portfolio
+  et l'exposition se lisent en O(1) par compte
+- Comptes live resynchronisés depuis le broker (sync) au démarrage, après
+  chaque ordre et toutes les LEDGER_SYNC_INTERVAL secondes ; les comptes
+  paper sont alimentés directement par le moteur d'appariement
+
+Usage:
+    ledger = get_position_ledger()
+    ledger.attach("alpaca", broker.ledger_account)
+    account.apply_fill("AAPL", 10, 189.5)     # achat de 10 (quantité signée)
+    ledger.on_price("AAPL", 191.2)            # tick : réévaluation incrémentale
+    ledger.total_value(), ledger.exposure_by_asset_class()
+"""
+
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional
+
+from app.config import settings
+from app.integrations.trading_apis import Position, TradingMode
+
+logger = logging.getLogger(__name__)
+
+EPSILON = 1e-12
+
+CRYPTO_QUOTES = ("USDT", "USDC", "BUSD", "BTC", "ETH")
+FOREX_CURRENCIES = frozenset({"USD", "EUR", "GBP", "JPY", "CHF", "AUD", "CAD", "NZD"})
+ETF_SYMBOLS = frozenset({"VTI", "VTIAX", "VXUS", "QQQ", "IWM", "SPY", "BND", "VNQ", "GLD", "VXX"})
+
+def asset_class_for(symbol: str, default: str = "stock") -> str:
+    """Classe d'actifs d'un symbole (crypto, forex, etf), sinon celle du broker"""
+    symbol = symbol.upper()
+    if symbol in ETF_SYMBOLS:
+        return "etf"
+    if symbol.endswith(CRYPTO_QUOTES):
+        return "crypto"
+    pair = symbol.replace("/", "")
+    if len(pair) == 6 and pair[:3] in FOREX_CURRENCIES and pair[3:] in FOREX_CURRENCIES:
+        return "forex"
+    return default
+
+@dataclass(slots=True)
+class LedgerEvent:
+    """Exécution journalisée"""
+    account: str
+    symbol: str
+    quantity: float  # signée : > 0 achat, < 0 vente
+    price: float
+    timestamp: float
+
+class LedgerAccount:
+    """
+    Compte d'un broker : cash, positions et agrégats mis à jour par deltas
+
+    Les Position exposées sont celles du registre (mises à jour en place).
+    """
+
+    def __init__(self, name: str, mode: TradingMode = TradingMode.PAPER, cash: float = 0.0,
+                 default_asset_class: str = "stock", journal_size: Optional[int] = None):
+        self.name = name
+        self.mode = mode
+        self.default_asset_class = default_asset_class
+        self.journal: Deque[LedgerEvent] = deque(maxlen=journal_size or settings.LEDGER_JOURNAL_SIZE)
+        self.reset(cash)
+
+    def reset(self, cash: float = 0.0):
+        """🔄 Compte vide avec le cash donné"""
+        self.cash = cash
+        self.positions: Dict[str, Position] = {}
+        self.asset_classes: Dict[str, str] = {}
+        self.prices: Dict[str, float] = {}  # dernière cotation par symbole
+        self.realized_pnl = 0.0
+        self.market_value = 0.0
+        self.unrealized_pnl = 0.0
+        self.gross_exposure: Dict[str, float] = defaultdict(float)  # Σ |valeur| par classe d'actifs
+        self.net_exposure: Dict[str, float] = defaultdict(float)  # Σ valeur signée par classe d'actifs
+        self.fills = 0
+        self.ticks = 0
+        self.updated_at = time.time()
+        self.journal.clear()
+
+    @property
+    def total_value(self) -> float:
+        return self.cash + self.market_value
+
+    # ------------------------------------------------------------------
+    # Agrégats
+    # ------------------------------------------------------------------
+
+    def _remove(self, position: Position):
+        asset_class = self.asset_classes[position.symbol]
+        self.market_value -= position.market_value
+        self.unrealized_pnl -= position.unrealized_pnl
+        self.gross_exposure[asset_class] -= abs(position.market_value)
+        self.net_exposure[asset_class] -= position.market_value
+
+    def _add(self, position: Position):
+        asset_class = self.asset_classes[position.symbol]
+        self.market_value += position.market_value
+        self.unrealized_pnl += position.unrealized_pnl
+        self.gross_exposure[asset_class] += abs(position.market_value)
+        self.net_exposure[asset_class] += position.market_value
+
+    @staticmethod
+    def _mark(position: Position, price: float):
+        position.market_value = position.quantity * price
+        position.unrealized_pnl = (price - position.avg_price) * position.quantity
+
+    def _revalue(self, position: Position, asset_class: str, price: float):
+        """Réévaluation au prix donné ; agrégats décalés du delta (une seule passe)"""
+        old_value = position.market_value
+        value = position.market_value = position.quantity * price
+        pnl = (price - position.avg_price) * position.quantity
+        self.unrealized_pnl += pnl - position.unrealized_pnl
+        position.unrealized_pnl = pnl
+        self.market_value += value - old_value
+        self.gross_exposure[asset_class] += abs(value) - abs(old_value)
+        self.net_exposure[asset_class] += value - old_value
+
+    # ------------------------------------------------------------------
+    # Événements
+    # ------------------------------------------------------------------
+
+    def apply_fill(self, symbol: str, quantity: float, price: float,
+                   timestamp: Optional[float] = None, asset_class: Optional[str] = None) -> Optional[Position]:
+        """
+        💱 Exécution : quantité signée (> 0 achat, < 0 vente) au prix donné
+
+        Returns:
+            Position après l'exécution (None si elle est soldée)
+        """
+        if quantity == 0:
+            return self.positions.get(symbol)
+        timestamp = time.time() if timestamp is None else timestamp
+        self.cash -= quantity * price
+        self.fills += 1
+        self.updated_at = timestamp
+        self.journal.append(LedgerEvent(self.name, symbol, quantity, price, timestamp))
+
+        position = self.positions.get(symbol)
+        if position is None:
+            position = self.positions[symbol] = Position(
+                symbol=symbol, quantity=0.0, avg_price=price,
+                market_value=0.0, unrealized_pnl=0.0, realized_pnl=0.0
+            )
+            asset_class = self.asset_classes[symbol] = asset_class or asset_class_for(symbol, self.default_asset_class)
+        else:
+            asset_class = self.asset_classes[symbol]
+
+        if position.quantity == 0 or (position.quantity > 0) == (quantity > 0):
+            # Ouverture / renforcement : prix moyen pondéré
+            total = position.quantity + quantity
+            position.avg_price = (position.avg_price * abs(position.quantity) + price * abs(quantity)) / abs(total)
+            position.quantity = total
+        else:
+            # Réduction / clôture / retournement
+            closed = min(abs(quantity), abs(position.quantity))
+            pnl = closed * (price - position.avg_price) * (1 if position.quantity > 0 else -1)
+            position.realized_pnl += pnl
+            self.realized_pnl += pnl
+            position.quantity += quantity
+            if abs(position.quantity) < EPSILON:
+                self._remove(position)
+                del self.positions[symbol]
+                return None
+            if (position.quantity > 0) == (quantity > 0):
+                position.avg_price = price
+
+        # market_value / unrealized_pnl sont encore ceux d'avant l'exécution : _revalue en applique le delta
+        self._revalue(position, asset_class, self.prices.get(symbol, price))
+        return position
+
+    def mark(self, symbol: str, price: float, timestamp: Optional[float] = None):
+        """📈 Tick : réévaluation de la position du symbole"""
+        self.prices[symbol] = price
+        position = self.positions.get(symbol)
+        if position is None:
+            return
+        self._revalue(position, self.asset_classes[symbol], price)
+        self.ticks += 1
+        self.updated_at = time.time() if timestamp is None else timestamp
+
+    def adjust_cash(self, amount: float):
+        """💵 Dépôt / retrait"""
+        self.cash += amount
+        self.updated_at = time.time()
+
+    def sync(self, cash: float, positions: Iterable[Position]):
+        """🔁 Resynchronisation complète depuis le broker (comptes live)"""
+        prices = self.prices
+        self.reset(cash)
+        self.prices = prices
+        for position in positions:
+            if abs(position.quantity) < EPSILON:
+                continue
+            self.positions[position.symbol] = position
+            self.asset_classes[position.symbol] = asset_class_for(position.symbol, self.default_asset_class)
+            self.realized_pnl += position.realized_pnl
+            if position.symbol in prices:
+                self._mark(position, prices[position.symbol])
+            self._add(position)
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def exposure(self) -> Dict[str, Dict[str, float]]:
+        """Expositions brute et nette par classe d'actifs"""
+        return {
+            asset_class: {"gross": round(gross, 8), "net": round(self.net_exposure[asset_class], 8)}
+            for asset_class, gross in self.gross_exposure.items() if abs(gross) > 1e-8
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "balance": self.cash,
+            "portfolio_value": self.total_value,
+            "market_value": self.market_value,
+            "realized_pnl": self.realized_pnl,
+            "unrealized_pnl": self.unrealized_pnl,
+            "positions": len(self.positions),
+            "mode": self.mode.value,
+            "updated_at": self.updated_at
+        }
+
+class PositionLedger:
+    """📒 Registre des comptes de tous les brokers"""
+
+    def __init__(self):
+        self.accounts: Dict[str, LedgerAccount] = {}
+
+    def attach(self, name: str, account: LedgerAccount):
+        """Enregistrer le compte d'un broker sous son nom"""
+        account.name = name
+        self.accounts[name] = account
+        logger.info(f"📒 Compte {name} rattaché au registre ({account.mode.value})")
+
+    def on_price(self, symbol: str, price: float, timestamp: Optional[float] = None):
+        """📈 Tick propagé à tous les comptes"""
+        for account in self.accounts.values():
+            account.mark(symbol, price, timestamp)
+
+    # Lectures O(1) en nombre de positions
+
+    def cash(self) -> float:
+        return sum(account.cash for account in self.accounts.values())
+
+    def total_value(self) -> float:
+        return sum(account.total_value for account in self.accounts.values())
+
+    def total_pnl(self) -> float:
+        return sum(account.realized_pnl + account.unrealized_pnl for account in self.accounts.values())
+
+    def exposure_by_asset_class(self) -> Dict[str, Dict[str, float]]:
+        """Expositions brute / nette et part de la valeur du portfolio par classe d'actifs"""
+        total = self.total_value()
+        exposure: Dict[str, Dict[str, float]] = {}
+        for account in self.accounts.values():
+            for asset_class, values in account.exposure().items():
+                entry = exposure.setdefault(asset_class, {"gross": 0.0, "net": 0.0})
+                entry["gross"] += values["gross"]
+                entry["net"] += values["net"]
+        for entry in exposure.values():
+            entry["weight"] = entry["net"] / total if total else 0.0
+        return exposure
+
+    def positions(self) -> List[Dict]:
+        return [
+            {
+                "broker": name,
+                "symbol": position.symbol,
+                "asset_class": account.asset_classes[position.symbol],
+                "quantity": position.quantity,
+                "avg_price": position.avg_price,
+                "value": position.market_value,
+                "pnl": position.unrealized_pnl,
+                "realized_pnl": position.realized_pnl
+            }
+            for name, account in self.accounts.items()
+            for position in account.positions.values()
+        ]
+
+    def summary(self, include_positions: bool = True) -> Dict:
+        """📊 Résumé du portfolio global"""
+        summary = {
+            "total_value": self.total_value(),
+            "total_pnl": self.total_pnl(),
+            "cash": self.cash(),
+            "realized_pnl": sum(account.realized_pnl for account in self.accounts.values()),
+            "unrealized_pnl": sum(account.unrealized_pnl for account in self.accounts.values()),
+            "exposure": self.exposure_by_asset_class(),
+            "accounts": {name: account.to_dict() for name, account in self.accounts.items()}
+        }
+        if include_positions:
+            summary["positions"] = self.positions()
+        return summary
+
+    def recent_fills(self, limit: int = 50) -> List[LedgerEvent]:
+        events = [event for account in self.accounts.values() for event in account.journal]
+        return sorted(events, key=lambda event: event.timestamp)[-limit:]
+
+    def get_stats(self) -> Dict:
+        return {
+            "accounts": len(self.accounts),
+            "positions": sum(len(account.positions) for account in self.accounts.values()),
+            "fills": sum(account.fills for account in self.accounts.values()),
+            "ticks": sum(account.ticks for account in self.accounts.values())
+        }
+
+# Instance globale
+_position_ledger: Optional[PositionLedger] = None
+
+def get_position_ledger() -> PositionLedger:
+    """📒 Obtenir le registre des positions partagé"""
+    global _position_ledger
+    if _position_ledger is None:
+        _position_ledger = PositionLedger()
+    return _position_ledger
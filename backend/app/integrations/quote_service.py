@@ -0,0 +1,199 @@
+"""
+📡 QUOTE SERVICE - COTATIONS GROUPÉES MULTI-BROKERS
+==================================================
+
+Cotations de plusieurs symboles en quelques appels HTTP :
+- Cache à TTL court par symbole devant les brokers
+- Symboles manquants groupés par broker (classe d'actifs du symbole :
+  crypto vers le broker crypto, le reste vers le broker actions) puis
+  découpés en lots pour l'endpoint multi-symboles de chaque broker
+  (Alpaca /v2/stocks/quotes/latest, Binance /v3/ticker/bookTicker)
+- Lots de tous les brokers lancés en parallèle, bornés par un sémaphore
+  par broker ; un symbole déjà en cours de récupération est attendu au lieu
+  d'être redemandé (single-flight)
+- Chaque cotation fraîche alimente le moteur paper du broker et le registre
+  des positions ; un symbole sans cotation réelle (broker injoignable,
+  symbole inconnu) revient en erreur, sans cache ni propagation
+
+Usage:
+    quotes = await get_quote_service().get_quotes(["AAPL", "BTCUSDT"])
+    quotes["AAPL"].quote.price, quotes["AAPL"].broker
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.integrations.position_ledger import asset_class_for, get_position_ledger
+from app.integrations.trading_apis import MarketData, TradingMode, TradingOrchestrator, trading_orchestrator
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class QuoteConfig:
+    """Configuration du service de cotations"""
+    ttl_seconds: float = 1.0
+    broker_concurrency: int = 4
+    batch_size: int = 200
+
+    @classmethod
+    def from_settings(cls) -> "QuoteConfig":
+        return cls(
+            ttl_seconds=settings.QUOTE_CACHE_TTL_SECONDS,
+            broker_concurrency=settings.QUOTE_BROKER_CONCURRENCY,
+            batch_size=settings.QUOTE_BATCH_SIZE
+        )
+
+@dataclass
+class QuoteResult:
+    """Cotation d'un symbole, ou l'erreur qui l'a empêchée"""
+    symbol: str
+    broker: Optional[str] = None
+    quote: Optional[MarketData] = None
+    error: Optional[str] = None
+    cached: bool = False
+    fetched_at: float = field(default_factory=time.monotonic)
+
+class QuoteService:
+    """📡 Service de cotations groupées avec cache et single-flight"""
+
+    def __init__(self, config: Optional[QuoteConfig] = None, orchestrator: Optional[TradingOrchestrator] = None):
+        self.config = config or QuoteConfig.from_settings()
+        self.orchestrator = orchestrator or trading_orchestrator
+        self._cache: Dict[str, Tuple[float, QuoteResult]] = {}  # symbole -> (expiration, résultat)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.stats = {"requests": 0, "symbols": 0, "cache_hits": 0, "coalesced": 0,
+                      "batches": 0, "fetched": 0, "errors": 0}
+
+    def route(self, symbol: str) -> Optional[str]:
+        """Broker chargé d'un symbole : même classe d'actifs (crypto / actions), sinon le premier"""
+        brokers = self.orchestrator.brokers
+        if not brokers:
+            return None
+        wanted = "crypto" if asset_class_for(symbol) == "crypto" else "stock"
+        for name, broker in brokers.items():
+            if broker.default_asset_class == wanted:
+                return name
+        return next(iter(brokers))
+
+    async def get_quotes(self, symbols: List[str], max_age: Optional[float] = None) -> Dict[str, QuoteResult]:
+        """
+        📊 Cotations des symboles (ordre conservé, doublons fusionnés)
+
+        Args:
+            max_age: âge maximal d'une cotation en cache (défaut : TTL configuré)
+        """
+        self.stats["requests"] += 1
+        max_age = self.config.ttl_seconds if max_age is None else max_age
+        now = time.monotonic()
+        results: Dict[str, QuoteResult] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        groups: Dict[str, List[str]] = {}
+
+        for symbol in dict.fromkeys(symbols):
+            self.stats["symbols"] += 1
+            cached = self._cache.get(symbol)
+            if cached is not None and cached[0] > now and now - cached[1].fetched_at <= max_age:
+                self.stats["cache_hits"] += 1
+                results[symbol] = QuoteResult(**{**cached[1].__dict__, "cached": True})
+                continue
+            if symbol in self._inflight:
+                self.stats["coalesced"] += 1
+                waiting[symbol] = self._inflight[symbol]
+                continue
+            broker = self.route(symbol)
+            if broker is None:
+                results[symbol] = QuoteResult(symbol, error="Aucun broker configuré")
+                continue
+            groups.setdefault(broker, []).append(symbol)
+
+        # Un futur par symbole demandé ici : les demandeurs concurrents l'attendent
+        loop = asyncio.get_running_loop()
+        for group in groups.values():
+            for symbol in group:
+                self._inflight[symbol] = waiting[symbol] = loop.create_future()
+
+        size = max(1, self.config.batch_size)
+        batches = [
+            self._fetch(broker, group[i:i + size])
+            for broker, group in groups.items()
+            for i in range(0, len(group), size)
+        ]
+        if batches:
+            await asyncio.gather(*batches)
+
+        for symbol, future in waiting.items():
+            results[symbol] = await asyncio.shield(future)
+        return {symbol: results[symbol] for symbol in dict.fromkeys(symbols)}
+
+    async def _fetch(self, broker_name: str, symbols: List[str]):
+        """Un appel multi-symboles, borné par le sémaphore du broker"""
+        broker = self.orchestrator.brokers[broker_name]
+        semaphore = self._semaphores.get(broker_name)
+        if semaphore is None:
+            semaphore = self._semaphores[broker_name] = asyncio.Semaphore(max(1, self.config.broker_concurrency))
+
+        try:
+            try:
+                async with semaphore:
+                    self.stats["batches"] += 1
+                    quotes = await broker.get_market_data_batch(symbols)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"❌ Erreur cotations groupées {broker_name} ({len(symbols)} symboles): {e}")
+                quotes = {}
+
+            now = time.monotonic()
+            ledger = get_position_ledger()
+            for symbol in symbols:
+                quote = quotes.get(symbol)
+                if quote is None or quote.simulated:
+                    result = QuoteResult(symbol, broker_name, error="Cotation indisponible", fetched_at=now)
+                else:
+                    result = QuoteResult(symbol, broker_name, quote, fetched_at=now)
+                    self._cache[symbol] = (now + self.config.ttl_seconds, result)
+                    self.stats["fetched"] += 1
+                    if broker.mode == TradingMode.PAPER:
+                        broker.paper_engine.on_market_data(quote)
+                    ledger.on_price(symbol, quote.price)
+                self._resolve(symbol, result)
+        finally:
+            # Lot interrompu (annulation) : les demandeurs concurrents ne restent pas bloqués
+            for symbol in symbols:
+                self._resolve(symbol, QuoteResult(symbol, broker_name, error="Récupération interrompue"))
+
+    def _resolve(self, symbol: str, result: QuoteResult):
+        future = self._inflight.pop(symbol, None)
+        if future is not None and not future.done():
+            future.set_result(result)
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Vider le cache (un symbole ou tout)"""
+        if symbol is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(symbol, None)
+
+    def get_stats(self) -> Dict:
+        """📊 Demandes, réutilisations du cache et appels effectifs"""
+        symbols = self.stats["symbols"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["cache_hits"] / symbols, 3) if symbols else 0.0,
+            "cached_symbols": len(self._cache),
+            "inflight": len(self._inflight)
+        }
+
+# Instance globale
+_quote_service: Optional[QuoteService] = None
+
+def get_quote_service() -> QuoteService:
+    """📡 Obtenir le service de cotations partagé"""
+    global _quote_service
+    if _quote_service is None:
+        _quote_service = QuoteService()
+    return _quote_service
@@ -8,17 +8,19 @@ Supports : Alpaca, Binance, Forex.com
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
-import aiohttp
 import hashlib
 import hmac
 import json
 import base64
+import uuid
 from decimal import Decimal
 
+from app.integrations.http_pool import get_http_transport, close_http_transport
+
 logger = logging.getLogger(__name__)
 
 # ================================================================================
@@ -41,6 +43,7 @@ class OrderSide(Enum):
 
 class OrderStatus(Enum):
     PENDING = "pending"
+    PARTIALLY_FILLED = "partially_filled"
     FILLED = "filled"
     CANCELLED = "cancelled"
     REJECTED = "rejected"
@@ -74,6 +77,7 @@ class MarketData:
     ask: float
     volume: float
     timestamp: datetime
+    simulated: bool = False  # cotation de repli (broker injoignable) : jamais mise en cache ni propagée
 
 @dataclass
 class Order:
@@ -87,8 +91,9 @@ class Order:
     status: OrderStatus
     created_at: datetime
     filled_at: Optional[datetime] = None
-    filled_price: Optional[float] = None
+    filled_price: Optional[float] = None  # prix moyen des exécutions
     filled_quantity: Optional[float] = None
+    stop_price: Optional[float] = None  # ordres stop / stop-limit
 
 @dataclass
 class Position:
@@ -100,6 +105,20 @@ class Position:
     unrealized_pnl: float
     realized_pnl: float
 
+# Historique OHLCV : unités Alpaca par suffixe de timeframe, taille de page Binance
+ALPACA_TIMEFRAME_UNITS = {"m": "Min", "h": "Hour", "d": "Day", "w": "Week"}
+BINANCE_KLINES_LIMIT = 1000
+
+def _as_utc(value: datetime) -> datetime:
+    """Datetime naïf = UTC"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+def _rfc3339(value: datetime) -> str:
+    return _as_utc(value).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _epoch_ms(value: datetime) -> int:
+    return int(_as_utc(value).timestamp() * 1000)
+
 # ================================================================================
 # CLASSE DE BASE POUR LES BROKERS
 # ================================================================================
@@ -107,24 +126,50 @@ class Position:
 class BaseBroker:
     """Classe de base pour tous les brokers"""
     
+    default_asset_class = "stock"  # symboles non reconnus (crypto, forex, ETF)
+    
     def __init__(self, api_key: str, api_secret: str, mode: TradingMode = TradingMode.PAPER):
         self.api_key = api_key
         self.api_secret = api_secret
         self.mode = mode
-        self.session = None
+        
+        # Transport HTTP partagé : pas de session ouverte/fermée par requête
+        self.session = get_http_transport()
+        
+        # Compte dans le registre des positions : cash, positions et P&L tenus à jour
+        # par les exécutions (paper) ou les resynchronisations (live)
+        from app.integrations.position_ledger import LedgerAccount
+        self.ledger_account = LedgerAccount(
+            self.__class__.__name__.replace("Broker", "").lower(), mode,
+            cash=10000.0 if mode == TradingMode.PAPER else 0.0,  # $10K initial en paper
+            default_asset_class=self.default_asset_class
+        )
         
         # Paper trading state
-        self.paper_balance = 10000.0  # $10K initial
-        self.paper_positions: Dict[str, Position] = {}
         self.paper_orders: List[Order] = []
         
+        # Appariement paper : carnets, fills partiels, slippage, latence
+        from app.integrations.paper_matching import MatchingConfig, PaperMatchingEngine
+        self.paper_engine = PaperMatchingEngine(MatchingConfig.from_settings(), on_fill=self._apply_paper_fill)
+        
+    @property
+    def paper_balance(self) -> float:
+        return self.ledger_account.cash
+    
+    @property
+    def paper_positions(self) -> Dict[str, Position]:
+        return self.ledger_account.positions
+    
+    @property
+    def paper_realized_pnl(self) -> float:
+        return self.ledger_account.realized_pnl
+        
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        # Conservé pour compatibilité : le pool est géré par le lifespan de l'application
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        return False
     
     # Méthodes abstraites à implémenter
     async def get_account(self) -> TradingAccount:
@@ -135,15 +180,78 @@ class BaseBroker:
         
     async def place_order(self, symbol: str, side: OrderSide, quantity: float, 
                          order_type: OrderType = OrderType.MARKET, 
-                         price: Optional[float] = None) -> Order:
+                         price: Optional[float] = None,
+                         stop_price: Optional[float] = None) -> Order:
+        if self.mode == TradingMode.PAPER:
+            return await self._place_paper_order(symbol, side, quantity, order_type, price, stop_price)
+        raise NotImplementedError
+    
+    async def cancel_order(self, order_id: str) -> bool:
+        if self.mode == TradingMode.PAPER:
+            return self.paper_engine.cancel(order_id)
         raise NotImplementedError
         
     async def get_market_data(self, symbol: str) -> MarketData:
         raise NotImplementedError
+    
+    async def get_market_data_batch(self, symbols: List[str]) -> Dict[str, MarketData]:
+        """
+        Cotations de plusieurs symboles (par défaut : appels unitaires concurrents)
+
+        Les symboles sans cotation réelle sont omis.
+        """
+        quotes = await asyncio.gather(*(self.get_market_data(symbol) for symbol in symbols))
+        return {symbol: quote for symbol, quote in zip(symbols, quotes) if not quote.simulated}
         
     async def get_historical_data(self, symbol: str, timeframe: str, 
                                  start: datetime, end: datetime) -> List[Dict]:
         raise NotImplementedError
+    
+    # Paper trading (moteur d'appariement local)
+    async def _place_paper_order(self, symbol: str, side: OrderSide, quantity: float,
+                                 order_type: OrderType, price: Optional[float],
+                                 stop_price: Optional[float]) -> Order:
+        """Soumettre un ordre au moteur paper après une cotation fraîche"""
+        self._paper_quote(await self.get_market_data(symbol))
+        
+        order = Order(
+            id=f"paper_{uuid.uuid4().hex[:16]}",
+            symbol=symbol,
+            side=side,
+            type=order_type,
+            quantity=quantity,
+            price=price,
+            status=OrderStatus.PENDING,
+            created_at=datetime.now(),
+            stop_price=stop_price if stop_price is not None or order_type != OrderType.STOP else price
+        )
+        delay = self.paper_engine.submit(order)
+        if delay > 0:
+            # Latence injectée : l'ordre entre au carnet plus tard (mis à jour en place)
+            asyncio.get_running_loop().call_later(delay, self.paper_engine.advance)
+        self.paper_orders.append(order)
+        
+        logger.info(f"📋 Ordre paper {order.status.value}: {order.side.value} {order.quantity} {symbol} "
+                    f"({order.type.value}, exécuté {order.filled_quantity})")
+        return order
+    
+    def _paper_quote(self, market_data: MarketData):
+        """Cotation transmise au moteur paper, position réévaluée dans le registre"""
+        self.paper_engine.on_market_data(market_data)
+        self.ledger_account.mark(market_data.symbol, market_data.price)
+    
+    def _apply_paper_fill(self, fill):
+        """Exécution paper : cash, position et P&L mis à jour dans le registre"""
+        signed = fill.quantity if fill.side is OrderSide.BUY else -fill.quantity
+        self.ledger_account.apply_fill(fill.symbol, signed, fill.price)
+    
+    def reset_paper(self, balance: float = 10000.0):
+        """Réinitialiser le compte paper (cash, positions, ordres, carnets)"""
+        from app.integrations.paper_matching import PaperMatchingEngine
+        
+        self.ledger_account.reset(balance)
+        self.paper_orders = []
+        self.paper_engine = PaperMatchingEngine(self.paper_engine.config, on_fill=self._apply_paper_fill)
 
 # ================================================================================
 # ALPACA TRADING API
@@ -178,7 +286,7 @@ class AlpacaBroker(BaseBroker):
                     account_id="paper_account",
                     balance=self.paper_balance,
                     buying_power=self.paper_balance * 4,  # Margin 4:1
-                    portfolio_value=self.paper_balance + sum(pos.market_value for pos in self.paper_positions.values()),
+                    portfolio_value=self.ledger_account.total_value,
                     mode=self.mode
                 )
             
@@ -229,36 +337,13 @@ class AlpacaBroker(BaseBroker):
     
     async def place_order(self, symbol: str, side: OrderSide, quantity: float, 
                          order_type: OrderType = OrderType.MARKET, 
-                         price: Optional[float] = None) -> Order:
+                         price: Optional[float] = None,
+                         stop_price: Optional[float] = None) -> Order:
         """Placer un ordre"""
         try:
-            order_id = f"order_{datetime.now().timestamp()}"
-            
             if self.mode == TradingMode.PAPER:
-                # Simuler l'exécution de l'ordre
-                market_data = await self.get_market_data(symbol)
-                filled_price = market_data.price
-                
-                order = Order(
-                    id=order_id,
-                    symbol=symbol,
-                    side=side,
-                    type=order_type,
-                    quantity=quantity,
-                    price=price,
-                    status=OrderStatus.FILLED,
-                    created_at=datetime.now(),
-                    filled_at=datetime.now(),
-                    filled_price=filled_price,
-                    filled_quantity=quantity
-                )
-                
-                # Mettre à jour le paper portfolio
-                await self._update_paper_portfolio(order)
-                self.paper_orders.append(order)
-                
-                logger.info(f"📋 Ordre paper trading exécuté: {order}")
-                return order
+                # Moteur d'appariement local (carnets, fills partiels, slippage)
+                return await self._place_paper_order(symbol, side, quantity, order_type, price, stop_price)
             
             # Ordre réel
             order_data = {
@@ -272,6 +357,10 @@ class AlpacaBroker(BaseBroker):
             if price and order_type in [OrderType.LIMIT, OrderType.STOP_LIMIT]:
                 order_data["limit_price"] = str(price)
             
+            stop_price = stop_price if stop_price is not None or order_type != OrderType.STOP else price
+            if stop_price and order_type in [OrderType.STOP, OrderType.STOP_LIMIT]:
+                order_data["stop_price"] = str(stop_price)
+            
             async with self.session.post(f"{self.base_url}/v2/orders", 
                                        headers=self.headers, 
                                        json=order_data) as response:
@@ -304,72 +393,96 @@ class AlpacaBroker(BaseBroker):
             async with self.session.get(url, headers=self.headers) as response:
                 if response.status == 200:
                     data = await response.json()
-                    quote = data["quote"]
-                    
-                    return MarketData(
-                        symbol=symbol,
-                        price=(quote["bid_price"] + quote["ask_price"]) / 2,
-                        bid=quote["bid_price"],
-                        ask=quote["ask_price"],
-                        volume=quote["bid_size"] + quote["ask_size"],
-                        timestamp=datetime.fromisoformat(quote["timestamp"].replace('Z', '+00:00'))
-                    )
+                    return self._parse_quote(symbol, data["quote"])
                 else:
                     # Fallback avec des données simulées
-                    return MarketData(
-                        symbol=symbol,
-                        price=100.0 + hash(symbol) % 100,  # Prix simulé
-                        bid=99.5,
-                        ask=100.5,
-                        volume=1000000,
-                        timestamp=datetime.now()
-                    )
+                    return self._simulated_quote(symbol)
                     
         except Exception as e:
             logger.warning(f"Utilisation de données simulées pour {symbol}: {e}")
-            return MarketData(
-                symbol=symbol,
-                price=100.0 + hash(symbol) % 100,
-                bid=99.5,
-                ask=100.5,
-                volume=1000000,
-                timestamp=datetime.now()
-            )
+            return self._simulated_quote(symbol)
     
-    async def _update_paper_portfolio(self, order: Order):
-        """Mettre à jour le portfolio paper trading"""
-        cost = order.filled_price * order.filled_quantity
-        
-        if order.side == OrderSide.BUY:
-            # Achat : déduire du cash, ajouter à la position
-            self.paper_balance -= cost
-            
-            if order.symbol in self.paper_positions:
-                pos = self.paper_positions[order.symbol]
-                total_quantity = pos.quantity + order.filled_quantity
-                avg_price = ((pos.avg_price * pos.quantity) + cost) / total_quantity
-                pos.quantity = total_quantity
-                pos.avg_price = avg_price
-            else:
-                self.paper_positions[order.symbol] = Position(
-                    symbol=order.symbol,
-                    quantity=order.filled_quantity,
-                    avg_price=order.filled_price,
-                    market_value=cost,
-                    unrealized_pnl=0.0,
-                    realized_pnl=0.0
-                )
+    async def get_market_data_batch(self, symbols: List[str]) -> Dict[str, MarketData]:
+        """
+        Dernières cotations de plusieurs symboles en un appel (/v2/stocks/quotes/latest)
+
+        Les symboles sans cotation (erreur HTTP, symbole inconnu) sont omis.
+        """
+        quotes = {}
+        try:
+            url = f"{self.data_url}/v2/stocks/quotes/latest"
+            async with self.session.get(url, headers=self.headers, params={"symbols": ",".join(symbols)}) as response:
+                if response.status == 200:
+                    quotes = (await response.json()).get("quotes", {})
+                else:
+                    raise Exception(f"Erreur Alpaca quotes: {response.status}")
+                    
+        except Exception as e:
+            logger.warning(f"Cotations Alpaca indisponibles pour {len(symbols)} symboles: {e}")
         
-        elif order.side == OrderSide.SELL:
-            # Vente : ajouter au cash, réduire la position
-            self.paper_balance += cost
-            
-            if order.symbol in self.paper_positions:
-                pos = self.paper_positions[order.symbol]
-                pos.quantity -= order.filled_quantity
-                
-                if pos.quantity <= 0:
-                    del self.paper_positions[order.symbol]
+        return {symbol: self._parse_quote(symbol, quotes[symbol]) for symbol in symbols if symbol in quotes}
+    
+    async def get_historical_data(self, symbol: str, timeframe: str,
+                                 start: datetime, end: datetime) -> List[Dict]:
+        """
+        Barres OHLCV [start, end] (/v2/stocks/{symbol}/bars, paginé par next_page_token)
+
+        timeframe en notation du store ("15m", "1h", "1d") -> "15Min", "1Hour", "1Day"
+        """
+        url = f"{self.data_url}/v2/stocks/{symbol}/bars"
+        params = {
+            "timeframe": f"{timeframe[:-1]}{ALPACA_TIMEFRAME_UNITS[timeframe[-1]]}",
+            "start": _rfc3339(start),
+            "end": _rfc3339(end),
+            "limit": 10000
+        }
+        records = []
+        while True:
+            async with self.session.get(url, headers=self.headers, params=params) as response:
+                if response.status != 200:
+                    raise Exception(f"Erreur Alpaca bars {symbol}: {response.status}")
+                data = await response.json()
+            records.extend(
+                {
+                    "timestamp": datetime.fromisoformat(bar["t"].replace('Z', '+00:00')),
+                    "open": float(bar["o"]),
+                    "high": float(bar["h"]),
+                    "low": float(bar["l"]),
+                    "close": float(bar["c"]),
+                    "volume": float(bar["v"])
+                }
+                for bar in data.get("bars") or []
+            )
+            if not data.get("next_page_token"):
+                return records
+            params["page_token"] = data["next_page_token"]
+    
+    @staticmethod
+    def _parse_quote(symbol: str, quote: Dict) -> MarketData:
+        """Cotation Alpaca (clés courtes bp/ap/bs/as/t ou longues)"""
+        bid = quote.get("bp", quote.get("bid_price"))
+        ask = quote.get("ap", quote.get("ask_price"))
+        timestamp = quote.get("t", quote.get("timestamp"))
+        return MarketData(
+            symbol=symbol,
+            price=(bid + ask) / 2,
+            bid=bid,
+            ask=ask,
+            volume=quote.get("bs", quote.get("bid_size", 0)) + quote.get("as", quote.get("ask_size", 0)),
+            timestamp=datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        )
+    
+    @staticmethod
+    def _simulated_quote(symbol: str) -> MarketData:
+        return MarketData(
+            symbol=symbol,
+            price=100.0 + hash(symbol) % 100,  # Prix simulé
+            bid=99.5,
+            ask=100.5,
+            volume=1000000,
+            timestamp=datetime.now(),
+            simulated=True
+        )
 
 # ================================================================================
 # BINANCE API (pour crypto)
@@ -378,6 +491,8 @@ class AlpacaBroker(BaseBroker):
 class BinanceBroker(BaseBroker):
     """Intégration Binance API pour crypto"""
     
+    default_asset_class = "crypto"
+    
     def __init__(self, api_key: str, api_secret: str, mode: TradingMode = TradingMode.PAPER):
         super().__init__(api_key, api_secret, mode)
         
@@ -403,7 +518,7 @@ class BinanceBroker(BaseBroker):
                     account_id="paper_account",
                     balance=self.paper_balance,
                     buying_power=self.paper_balance,
-                    portfolio_value=self.paper_balance,
+                    portfolio_value=self.ledger_account.total_value,
                     mode=self.mode,
                     currency="USDT"
                 )
@@ -456,14 +571,87 @@ class BinanceBroker(BaseBroker):
                     
         except Exception as e:
             logger.warning(f"Utilisation de données simulées pour {symbol}: {e}")
-            return MarketData(
+            return self._simulated_quote(symbol)
+    
+    async def get_historical_data(self, symbol: str, timeframe: str,
+                                 start: datetime, end: datetime) -> List[Dict]:
+        """
+        Bougies OHLCV [start, end] (/v3/klines, public, 1000 bougies par appel)
+
+        timeframe en notation du store, identique aux intervalles Binance ("1m", "1h", "1d")
+        """
+        url = f"{self.base_url}/v3/klines"
+        start_ms, end_ms = _epoch_ms(start), _epoch_ms(end)
+        records = []
+        while start_ms <= end_ms:
+            params = {"symbol": symbol.upper(), "interval": timeframe,
+                      "startTime": start_ms, "endTime": end_ms, "limit": BINANCE_KLINES_LIMIT}
+            async with self.session.get(url, params=params) as response:
+                if response.status != 200:
+                    raise Exception(f"Erreur Binance klines {symbol}: {response.status}")
+                klines = await response.json()
+            records.extend(
+                {
+                    "timestamp": datetime.fromtimestamp(kline[0] / 1000, timezone.utc),
+                    "open": float(kline[1]),
+                    "high": float(kline[2]),
+                    "low": float(kline[3]),
+                    "close": float(kline[4]),
+                    "volume": float(kline[5])
+                }
+                for kline in klines
+            )
+            if len(klines) < BINANCE_KLINES_LIMIT:
+                break
+            start_ms = klines[-1][0] + 1
+        return records
+    
+    async def get_market_data_batch(self, symbols: List[str]) -> Dict[str, MarketData]:
+        """
+        Meilleurs bid/ask de plusieurs symboles en un appel (/v3/ticker/bookTicker
+        sans filtre) ; volume = quantités au meilleur prix
+
+        Les symboles sans cotation (erreur HTTP, symbole inconnu) sont omis.
+        """
+        tickers = {}
+        try:
+            async with self.session.get(f"{self.base_url}/v3/ticker/bookTicker") as response:
+                if response.status == 200:
+                    tickers = {ticker["symbol"]: ticker for ticker in await response.json()}
+                else:
+                    raise Exception(f"Erreur Binance bookTicker: {response.status}")
+                    
+        except Exception as e:
+            logger.warning(f"Cotations Binance indisponibles pour {len(symbols)} symboles: {e}")
+        
+        now = datetime.now()
+        quotes = {}
+        for symbol in symbols:
+            ticker = tickers.get(symbol.upper())
+            if ticker is None:
+                continue
+            bid, ask = float(ticker["bidPrice"]), float(ticker["askPrice"])
+            quotes[symbol] = MarketData(
                 symbol=symbol,
-                price=50000.0 if "BTC" in symbol else 3000.0,  # Prix simulés crypto
-                bid=49900.0 if "BTC" in symbol else 2990.0,
-                ask=50100.0 if "BTC" in symbol else 3010.0,
-                volume=1000.0,
-                timestamp=datetime.now()
+                price=(bid + ask) / 2,
+                bid=bid,
+                ask=ask,
+                volume=float(ticker["bidQty"]) + float(ticker["askQty"]),
+                timestamp=now
             )
+        return quotes
+    
+    @staticmethod
+    def _simulated_quote(symbol: str) -> MarketData:
+        return MarketData(
+            symbol=symbol,
+            price=50000.0 if "BTC" in symbol else 3000.0,  # Prix simulés crypto
+            bid=49900.0 if "BTC" in symbol else 2990.0,
+            ask=50100.0 if "BTC" in symbol else 3010.0,
+            volume=1000.0,
+            timestamp=datetime.now(),
+            simulated=True
+        )
 
 # ================================================================================
 # TRADING ORCHESTRATOR
@@ -476,10 +664,17 @@ class TradingOrchestrator:
         self.brokers: Dict[str, BaseBroker] = {}
         self.active_strategies: List[str] = []
         self.is_running = False
+    
+    @property
+    def ledger(self):
+        """Registre des positions partagé (import différé : instance créée à l'import du module)"""
+        from app.integrations.position_ledger import get_position_ledger
+        return get_position_ledger()
         
     def add_broker(self, name: str, broker: BaseBroker):
         """Ajouter un broker"""
         self.brokers[name] = broker
+        self.ledger.attach(name, broker.ledger_account)
         logger.info(f"✅ Broker {name} ajouté ({broker.mode.value} mode)")
     
     async def start_paper_trading(self):
@@ -495,6 +690,8 @@ class TradingOrchestrator:
                     logger.info(f"✅ {name}: Balance ${account.balance:.2f}")
             except Exception as e:
                 logger.error(f"❌ Erreur {name}: {e}")
+        
+        await self.sync_ledger()
     
     async def execute_demo_trades(self):
         """Exécuter des trades de démonstration"""
@@ -523,47 +720,38 @@ class TradingOrchestrator:
                         order_type=OrderType.MARKET
                     )
                     
-                    logger.info(f"✅ Ordre exécuté: {order.symbol} - ${order.filled_price:.2f}")
+                    logger.info(f"✅ Ordre {order.status.value}: {order.symbol} - ${order.filled_price or market_data.price:.2f}")
                     
             except Exception as e:
                 logger.error(f"❌ Erreur demo trades {name}: {e}")
     
-    async def get_portfolio_summary(self) -> Dict[str, Any]:
-        """Résumé du portfolio global"""
-        summary = {
-            "total_value": 0.0,
-            "total_pnl": 0.0,
-            "accounts": {},
-            "positions": []
-        }
-        
-        for name, broker in self.brokers.items():
+    async def sync_ledger(self, name: Optional[str] = None):
+        """🔁 Resynchroniser les comptes live du registre depuis leurs brokers"""
+        for broker_name, broker in self.brokers.items():
+            if broker.mode != TradingMode.LIVE or (name is not None and broker_name != name):
+                continue
             try:
                 async with broker:
                     account = await broker.get_account()
                     positions = await broker.get_positions()
-                    
-                    summary["accounts"][name] = {
-                        "balance": account.balance,
-                        "portfolio_value": account.portfolio_value,
-                        "mode": account.mode.value
-                    }
-                    
-                    summary["total_value"] += account.portfolio_value
-                    summary["positions"].extend([
-                        {
-                            "broker": name,
-                            "symbol": pos.symbol,
-                            "quantity": pos.quantity,
-                            "value": pos.market_value,
-                            "pnl": pos.unrealized_pnl
-                        } for pos in positions
-                    ])
-                    
+                broker.ledger_account.sync(account.balance, positions)
             except Exception as e:
-                logger.error(f"❌ Erreur portfolio summary {name}: {e}")
-        
-        return summary
+                logger.error(f"❌ Erreur synchronisation registre {broker_name}: {e}")
+    
+    async def run_ledger_sync(self, interval: float):
+        """
+        ⏱️ Resynchronisation périodique des comptes live
+
+        Les exécutions survenues côté broker hors d'un appel de l'API (limites
+        au repos, stops, fills partiels) n'entrent dans le registre qu'ainsi.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            await self.sync_ledger()
+    
+    async def get_portfolio_summary(self) -> Dict[str, Any]:
+        """Résumé du portfolio global, lu dans le registre des positions (sans appel broker)"""
+        return self.ledger.summary()
 
 # ================================================================================
 # FACTORY ET CONFIGURATION
@@ -618,6 +806,8 @@ async def demo_paper_trading():
     # Résumé du portfolio
     portfolio = await trading_orchestrator.get_portfolio_summary()
     logger.info(f"📊 Portfolio: {json.dumps(portfolio, indent=2)}")
+    
+    await close_http_transport()
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
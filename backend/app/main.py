@@ -3,25 +3,43 @@
 FastAPI application with ETF intelligent trading system
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import asynccontextmanager
+import asyncio
 import structlog
 import time
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST, Counter, Histogram
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST, Counter, Gauge, Histogram
 import logging
 
 from app.config import settings
 from app.api.v1 import router as api_v1_router
 from app.api.orchestrator import router as orchestrator_router
 from app.api.endpoints.advanced_ai import router as advanced_ai_router
+from app.integrations.http_pool import close_http_transport
+from app.integrations.trading_apis import trading_orchestrator
+from app.orchestrator.risk_engine import shutdown_risk_engine
+from app.orchestrator.task_dispatcher import close_task_dispatcher
 from database.session import init_db
+from database.connection import check_database, dispose_engines, get_async_db, get_pool_stats
 from app.api.endpoints import health, trading
 
 # Métriques Prometheus
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP requests', ['method', 'endpoint'])
 REQUEST_DURATION = Histogram('http_request_duration_seconds', 'HTTP request duration')
+DB_POOL_STATS = Gauge('db_pool_connections', 'Database pool statistics', ['engine', 'stat'])
+
+def _register_pool_metrics():
+    """Statistiques des pools lues à chaque scrape"""
+    for engine_name in ("sync", "async"):
+        for stat in ("size", "checked_out", "checked_in", "overflow", "connects", "checkouts"):
+            DB_POOL_STATS.labels(engine=engine_name, stat=stat).set_function(
+                lambda engine_name=engine_name, stat=stat: get_pool_stats().get(engine_name, {}).get(stat, 0)
+            )
+
+_register_pool_metrics()
 
 # Configuration du logger
 logger = structlog.get_logger()
@@ -36,10 +54,33 @@ async def lifespan(app: FastAPI):
     logger.info("✅ Base de données initialisée")
     
     # Initialisation des services
+    # Comptes live du registre des positions : fills côté broker repris périodiquement
+    ledger_sync = None
+    if settings.LEDGER_SYNC_INTERVAL > 0:
+        ledger_sync = asyncio.create_task(trading_orchestrator.run_ledger_sync(settings.LEDGER_SYNC_INTERVAL))
     logger.info("✅ Services initialisés")
     
     yield
     
+    if ledger_sync is not None:
+        ledger_sync.cancel()
+        try:
+            await ledger_sync
+        except asyncio.CancelledError:
+            pass
+    
+    # Fermeture des pools HTTP partagés
+    await close_http_transport()
+    
+    # Fermeture de l'écoute des résultats Celery
+    await close_task_dispatcher()
+    
+    # Arrêt du pool de processus Monte Carlo
+    shutdown_risk_engine()
+    
+    # Fermeture des pools de connexions base de données
+    await dispose_engines()
+    
     logger.info("🛑 Arrêt du Trading AI ETF Backend")
 
 # Création de l'application FastAPI
@@ -91,16 +132,17 @@ async def root():
     }
 
 @app.get("/health")
-async def health_check():
-    """Health check endpoint"""
+async def health_check(db: AsyncSession = Depends(get_async_db)):
+    """Health check endpoint (ping de la base via la session asynchrone)"""
+    database = await check_database(db)
     return {
-        "status": "healthy",
+        "status": "healthy" if database["status"] == "healthy" else "degraded",
         "service": "trading-ai-system",
         "version": "2.0.0",
         "timestamp": "2024-01-01T00:00:00Z",
         "components": {
             "api": "healthy",
-            "database": "healthy",
+            "database": database["status"],
             "orchestrator": "ready"
         }
     }
@@ -21,7 +21,6 @@ import uuid
 
 import sys
 sys.path.append('/app/backend')
-from database.connection import get_db
 from app.orchestrator.decision_engine import DecisionEngine
 from app.orchestrator.performance_tracker import PerformanceTracker
 
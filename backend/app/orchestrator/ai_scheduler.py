@@ -1,30 +1,47 @@
 """
 ⏰ AI SCHEDULER
 Planificateur intelligent qui remplace les crons traditionnels
+
+- File de priorité (tas) des prochaines exécutions : le planificateur dort
+  exactement jusqu'à la prochaine échéance, réveil anticipé si le planning change
+- Lancement concurrent des tâches prêtes, limité par niveau de priorité
+- Histogramme du retard de planification (démarrage réel vs prévu)
 """
 
 import asyncio
+import heapq
+import itertools
 import json
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 import logging
 
+import numpy as np
 from celery import Celery
-from sqlalchemy.orm import Session
+from prometheus_client import Histogram
 from redis import Redis
 
 from .decision_engine import DecisionEngine, TaskType, Priority, TaskRecommendation
+from .task_dispatcher import CeleryDispatcher, LatencyTracker, get_task_dispatcher
 
 import sys
 sys.path.append('/app/backend')
-from database.connection import get_db
+from app.config import settings
 from utils.logger import get_logger
-# Note: ces imports seront corrigés une fois les tâches créées
-# from ..tasks.celery_app import celery_app
 
 logger = get_logger(__name__)
 
+# Retard de planification : démarrage effectif - échéance prévue (secondes)
+LAG_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, float("inf"))
+SCHEDULER_LAG = Histogram(
+    "scheduler_lag_seconds",
+    "Retard de démarrage des tâches planifiées",
+    ["priority"],
+    buckets=LAG_BUCKETS
+)
+
 @dataclass
 class ScheduledTask:
     id: str
@@ -38,8 +55,9 @@ class ScheduledTask:
     execution_count: int = 0
     success_count: int = 0
     failure_count: int = 0
-    avg_execution_time: float = 0.0
+    avg_execution_time: float = 0.0  # EWMA du temps d'exécution worker (s)
     reason: str = ""
+    latency: LatencyTracker = field(default_factory=LatencyTracker)
 
 class AIScheduler:
     """
@@ -49,13 +67,37 @@ class AIScheduler:
     dynamiquement la planification selon les conditions.
     """
     
-    def __init__(self, redis_client: Optional[Redis] = None):
+    def __init__(self, redis_client: Optional[Redis] = None, dispatcher: Optional[CeleryDispatcher] = None):
         self.decision_engine = DecisionEngine()
         self.redis_client = redis_client
+        self.dispatcher = dispatcher or get_task_dispatcher()
         self.scheduled_tasks: Dict[str, ScheduledTask] = {}
         self.running = False
         self.task_registry = self._build_task_registry()
         
+        # File de priorité (échéance, ordre d'insertion, id) ; entrées périmées ignorées au dépilage
+        self._queue: List[tuple] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._semaphores = {
+            priority: asyncio.Semaphore(limit)
+            for priority, limit in self._concurrency_limits().items()
+        }
+        self._lag_buckets = [0] * len(LAG_BUCKETS)
+        self._recent_lags: deque = deque(maxlen=1000)
+        self.recommendation_interval = settings.SCHEDULER_RECOMMENDATION_INTERVAL
+        
+    @staticmethod
+    def _concurrency_limits() -> Dict[Priority, int]:
+        """Nombre max de tâches simultanées par niveau de priorité"""
+        return {
+            Priority.CRITICAL: settings.SCHEDULER_CONCURRENCY_CRITICAL,
+            Priority.HIGH: settings.SCHEDULER_CONCURRENCY_HIGH,
+            Priority.MEDIUM: settings.SCHEDULER_CONCURRENCY_MEDIUM,
+            Priority.LOW: settings.SCHEDULER_CONCURRENCY_LOW
+        }
+        
     def _build_task_registry(self) -> Dict[TaskType, str]:
         """Mappage des types de tâches vers les tâches Celery"""
         return {
@@ -98,13 +140,25 @@ class AIScheduler:
         # Initialisation des tâches de base
         await self._initialize_base_tasks()
         
-        # Boucle principale de l'orchestrateur
-        await self._main_loop()
+        # Recommandations IA et répartition des tâches en parallèle
+        await asyncio.gather(self._main_loop(), self._dispatch_loop())
 
     async def stop(self):
-        """Arrête l'orchestrateur AI"""
+        """Arrête l'orchestrateur AI (les tâches en cours se terminent)"""
         logger.info("🛑 Arrêt de l'Orchestrateur AI")
         self.running = False
+        self._wakeup.set()
+
+    def wake(self):
+        """Réveille le planificateur (planning modifié)"""
+        self._wakeup.set()
+
+    def _schedule(self, task: ScheduledTask):
+        """Ajoute l'échéance d'une tâche à la file et réveille si elle devient la plus proche"""
+        becomes_head = not self._queue or task.next_execution < self._queue[0][0]
+        heapq.heappush(self._queue, (task.next_execution, next(self._sequence), task.id))
+        if becomes_head:
+            self._wakeup.set()
 
     async def _initialize_base_tasks(self):
         """Initialise les tâches de base du système"""
@@ -135,11 +189,12 @@ class AIScheduler:
         
         for task in base_tasks:
             self.scheduled_tasks[task.id] = task
+            self._schedule(task)
             
         logger.info(f"📋 {len(base_tasks)} tâches de base initialisées")
 
     async def _main_loop(self):
-        """Boucle principale de l'orchestrateur"""
+        """Boucle des recommandations IA (la répartition est dans _dispatch_loop)"""
         
         loop_count = 0
         
@@ -156,24 +211,53 @@ class AIScheduler:
                     market_condition, system_status
                 )
                 
-                # 3. Mettre à jour le planning
+                # 3. Mettre à jour le planning (réveille le planificateur si besoin)
                 await self._update_schedule(recommendations)
                 
-                # 4. Exécuter les tâches prêtes
-                await self._execute_ready_tasks()
-                
-                # 5. Nettoyer les tâches obsolètes
+                # 4. Nettoyer les tâches obsolètes
                 await self._cleanup_tasks()
                 
-                # 6. Persister l'état
+                # 5. Persister l'état
                 await self._persist_state()
                 
-                # 7. Attendre avant le prochain cycle
-                await asyncio.sleep(30)  # Cycle toutes les 30 secondes
+                # 6. Attendre avant le prochain cycle
+                await self._sleep_while_running(self.recommendation_interval)
                 
             except Exception as e:
                 logger.error(f"❌ Erreur dans la boucle principale: {e}")
-                await asyncio.sleep(60)  # Attendre plus longtemps en cas d'erreur
+                await self._sleep_while_running(60)  # Attendre plus longtemps en cas d'erreur
+
+    async def _sleep_while_running(self, seconds: float):
+        """Attente interrompue par l'arrêt de l'orchestrateur"""
+        deadline = asyncio.get_running_loop().time() + seconds
+        while self.running:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(remaining, 1.0))
+
+    async def _dispatch_loop(self):
+        """Dort jusqu'à la prochaine échéance (ou un réveil) puis lance les tâches prêtes"""
+        
+        while self.running:
+            try:
+                self._wakeup.clear()
+                await self._execute_ready_tasks()
+                
+                timeout = None
+                if self._queue:
+                    timeout = max((self._queue[0][0] - datetime.utcnow()).total_seconds(), 0.0)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                    
+            except Exception as e:
+                logger.error(f"❌ Erreur dans la boucle de répartition: {e}")
+                await asyncio.sleep(1)
+        
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
 
     async def _update_schedule(self, recommendations: List[TaskRecommendation]):
         """Met à jour le planning selon les recommandations de l'IA"""
@@ -191,6 +275,13 @@ class AIScheduler:
                               f"{task.frequency_minutes} → {rec.frequency_minutes} min")
                     task.frequency_minutes = rec.frequency_minutes
                     
+                    # Avancer l'échéance si la nouvelle fréquence est plus rapide
+                    if task.last_execution is not None and task_id not in self._in_flight:
+                        earlier = task.last_execution + timedelta(minutes=task.frequency_minutes)
+                        if earlier < task.next_execution:
+                            task.next_execution = earlier
+                            self._schedule(task)
+                    
                 # Mettre à jour les paramètres
                 task.parameters.update(rec.parameters)
                 task.priority = rec.priority
@@ -211,31 +302,72 @@ class AIScheduler:
                     )
                     
                     self.scheduled_tasks[task_id] = new_task
+                    self._schedule(new_task)
                     logger.info(f"➕ Nouvelle tâche planifiée: {task_id}")
 
     async def _execute_ready_tasks(self):
-        """Exécute les tâches prêtes à être lancées"""
+        """Lance en parallèle les tâches arrivées à échéance (ordre de priorité)"""
         
         now = datetime.utcnow()
-        ready_tasks = [
-            task for task in self.scheduled_tasks.values()
-            if task.next_execution <= now
-        ]
+        ready_tasks = []
+        
+        while self._queue and self._queue[0][0] <= now:
+            planned, _, task_id = heapq.heappop(self._queue)
+            task = self.scheduled_tasks.get(task_id)
+            # Entrée périmée : tâche supprimée, replanifiée ou déjà en cours
+            if task is None or task.next_execution != planned or task_id in self._in_flight:
+                continue
+            ready_tasks.append(task)
         
         if not ready_tasks:
             return
             
         logger.info(f"🎯 {len(ready_tasks)} tâches prêtes à l'exécution")
         
-        # Trier par priorité
+        # Trier par priorité (ordre d'acquisition des créneaux)
         ready_tasks.sort(key=lambda t: t.priority.value)
         
         for task in ready_tasks:
-            try:
+            self._in_flight[task.id] = asyncio.create_task(self._run_task(task))
+
+    async def _run_task(self, task: ScheduledTask):
+        """Exécute une tâche sous la limite de sa priorité puis la replanifie"""
+        
+        try:
+            async with self._semaphores[task.priority]:
+                self._record_lag(task, (datetime.utcnow() - task.next_execution).total_seconds())
                 await self._execute_task(task)
-            except Exception as e:
-                logger.error(f"❌ Erreur exécution tâche {task.id}: {e}")
-                task.failure_count += 1
+        except Exception as e:
+            logger.error(f"❌ Erreur exécution tâche {task.id}: {e}")
+            task.failure_count += 1
+            task.next_execution = datetime.utcnow() + timedelta(minutes=min(task.frequency_minutes * 2, 30))
+        finally:
+            self._in_flight.pop(task.id, None)
+            if task.id in self.scheduled_tasks:
+                self._schedule(task)
+
+    def _record_lag(self, task: ScheduledTask, lag_seconds: float):
+        """Enregistre le retard de démarrage dans l'histogramme"""
+        lag_seconds = max(lag_seconds, 0.0)
+        SCHEDULER_LAG.labels(priority=task.priority.name).observe(lag_seconds)
+        self._lag_buckets[next(i for i, bound in enumerate(LAG_BUCKETS) if lag_seconds <= bound)] += 1
+        self._recent_lags.append(lag_seconds)
+
+    def get_lag_stats(self) -> Dict:
+        """📊 Histogramme et percentiles du retard de planification"""
+        lags = np.fromiter(self._recent_lags, dtype=float)
+        p50, p95, p99 = np.percentile(lags, [50, 95, 99]) if lags.size else (0.0, 0.0, 0.0)
+        return {
+            "samples": int(sum(self._lag_buckets)),
+            "p50_ms": round(float(p50) * 1000, 2),
+            "p95_ms": round(float(p95) * 1000, 2),
+            "p99_ms": round(float(p99) * 1000, 2),
+            "max_ms": round(float(lags.max()) * 1000, 2) if lags.size else 0.0,
+            "buckets": {
+                ("+Inf" if bound == float("inf") else f"{bound:g}"): count
+                for bound, count in zip(LAG_BUCKETS, self._lag_buckets)
+            }
+        }
 
     async def _execute_task(self, task: ScheduledTask):
         """Exécute une tâche spécifique"""
@@ -245,33 +377,28 @@ class AIScheduler:
         logger.info(f"🚀 Exécution tâche: {task.id} (priorité: {task.priority.name})")
         
         try:
-            # TODO: Lancer la tâche Celery (temporairement désactivé)
-            # celery_task = celery_app.send_task(
-            #     task.celery_task_name,
-            #     kwargs=task.parameters
-            # )
-            
-            # Simulation d'exécution pour le moment
-            logger.info(f"📋 Simulation exécution tâche: {task.celery_task_name}")
-            await asyncio.sleep(0.1)  # Simulation d'une tâche rapide
-            
-            # Attendre le résultat (optionnel, pour tracking)
-            # result = celery_task.get(timeout=300)  # 5 minutes timeout
+            # Envoi dans la file de la priorité, résultat reçu par pub/sub Redis
+            outcome = await self.dispatcher.dispatch(
+                task.celery_task_name,
+                kwargs=task.parameters,
+                priority=task.priority
+            )
+            if not outcome.success:
+                raise RuntimeError(f"{outcome.state} ({outcome.queue}): {outcome.result}")
             
-            # Mise à jour des statistiques
-            execution_time = (datetime.utcnow() - start_time).total_seconds()
+            # Mise à jour des statistiques (temps mesuré côté worker si disponible)
+            execution_time = outcome.run_time if outcome.run_time is not None else outcome.total_time
             task.last_execution = start_time
             task.execution_count += 1
             task.success_count += 1
+            task.latency.observe(execution_time)
+            task.avg_execution_time = task.latency.ewma
             
-            # Mise à jour temps d'exécution moyen
-            if task.avg_execution_time == 0:
-                task.avg_execution_time = execution_time
-            else:
-                task.avg_execution_time = (task.avg_execution_time + execution_time) / 2
-            
-            # Programmer la prochaine exécution
-            task.next_execution = start_time + timedelta(minutes=task.frequency_minutes)
+            # Programmer la prochaine exécution (ancrée sur l'échéance prévue, sans dérive)
+            task.next_execution = max(
+                task.next_execution + timedelta(minutes=task.frequency_minutes),
+                start_time
+            )
             
             logger.info(f"✅ Tâche {task.id} exécutée avec succès en {execution_time:.2f}s")
             
@@ -349,6 +476,10 @@ class AIScheduler:
             "total_tasks": total_tasks,
             "total_executions": total_executions,
             "success_rate": round(success_rate, 1),
+            "in_flight": sorted(self._in_flight),
+            "queue_size": len(self._queue),
+            "scheduling_lag": self.get_lag_stats(),
+            "dispatcher": self.dispatcher.get_stats(),
             "tasks": [
                 {
                     "id": task.id,
@@ -359,6 +490,7 @@ class AIScheduler:
                     "execution_count": task.execution_count,
                     "success_rate": round((task.success_count / task.execution_count * 100) if task.execution_count > 0 else 0, 1),
                     "avg_execution_time": round(task.avg_execution_time, 2),
+                    "latency": task.latency.percentiles(),
                     "reason": task.reason
                 }
                 for task in sorted(self.scheduled_tasks.values(), key=lambda t: t.priority.value)
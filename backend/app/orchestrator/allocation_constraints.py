@@ -0,0 +1,173 @@
+"""
+📏 ALLOCATION CONSTRAINTS - SPÉCIFICATION DÉCLARATIVE
+====================================================
+
+Description déclarative des contraintes d'un portefeuille de N assets,
+compilée en forme matricielle creuse l ≤ A·x ≤ u :
+- Budget (somme des poids)
+- Bornes par asset (défaut + surcharges par symbole)
+- Plafonds / planchers par groupe (secteur, classe d'actifs, ...)
+- Limite de turnover L1 vs poids actuels (bloc de lignes ‖w - w0‖₁ ≤ T)
+
+Exemple:
+    spec = ConstraintSpec(
+        default_bounds=(0.0, 0.05),
+        asset_bounds={"BTC": (0.0, 0.20)},
+        groups=[GroupConstraint("meme", ["DOGE", "SHIB"], max_weight=0.10)],
+        max_turnover=0.30,
+        current_weights=current
+    )
+    compiled = spec.compile(symbols)
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from app.orchestrator.qp_solver import L1BallConstraint
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class GroupConstraint:
+    """Poids total d'un groupe d'assets dans [min_weight, max_weight]"""
+    name: str
+    members: List[str]
+    min_weight: float = 0.0
+    max_weight: float = 1.0
+
+@dataclass
+class CompiledConstraints:
+    """Contraintes compilées : lower ≤ A·w ≤ upper (+ boule L1 de turnover)"""
+    symbols: List[str]
+    A: sparse.csr_matrix
+    lower: np.ndarray
+    upper: np.ndarray
+    row_labels: List[str]
+    weight_lower: np.ndarray
+    weight_upper: np.ndarray
+    turnover_rows: Optional[slice] = None
+    current_weights: Optional[np.ndarray] = None
+    max_turnover: Optional[float] = None
+
+    @property
+    def n_assets(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def has_turnover(self) -> bool:
+        return self.turnover_rows is not None
+
+    def l1_ball(self) -> Optional[L1BallConstraint]:
+        """Contrainte de turnover au format du solveur QP"""
+        if not self.has_turnover:
+            return None
+        return L1BallConstraint(rows=self.turnover_rows, center=self.current_weights, radius=self.max_turnover)
+
+    def weight_bounds(self) -> List[Tuple[float, float]]:
+        """Bornes par asset au format scipy.optimize"""
+        return list(zip(self.weight_lower.tolist(), self.weight_upper.tolist()))
+
+    def linear_inequalities(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Lignes de groupe sous la forme A_ub·w ≤ b_ub (hors budget, bornes et turnover)"""
+        rows, limits = [], []
+        for i, label in enumerate(self.row_labels):
+            if not label.startswith("group:"):
+                continue
+            row = self.A.getrow(i).toarray().ravel()
+            if np.isfinite(self.upper[i]):
+                rows.append(row)
+                limits.append(self.upper[i])
+            if np.isfinite(self.lower[i]) and self.lower[i] > 0:
+                rows.append(-row)
+                limits.append(-self.lower[i])
+
+        return np.array(rows, dtype=float).reshape(-1, self.n_assets), np.array(limits, dtype=float)
+
+    def turnover(self, weights: np.ndarray) -> float:
+        """Turnover L1 vs poids actuels"""
+        w0 = self.current_weights if self.current_weights is not None else np.zeros(self.n_assets)
+        return float(np.abs(np.asarray(weights) - w0).sum())
+
+    def violations(self, weights: np.ndarray, tolerance: float = 1e-6) -> List[str]:
+        """Contraintes violées par un vecteur de poids"""
+        values = self.A @ np.asarray(weights, dtype=float)
+        violated = (values < self.lower - tolerance) | (values > self.upper + tolerance)
+        labels = [self.row_labels[i] for i in np.flatnonzero(violated)]
+        if self.has_turnover and self.turnover(weights) > self.max_turnover + tolerance:
+            labels.append("turnover")
+        return labels
+
+@dataclass
+class ConstraintSpec:
+    """📏 Spécification déclarative des contraintes d'allocation"""
+    default_bounds: Tuple[float, float] = (0.0, 1.0)
+    asset_bounds: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    groups: List[GroupConstraint] = field(default_factory=list)
+    max_turnover: Optional[float] = None
+    current_weights: Dict[str, float] = field(default_factory=dict)
+    budget: float = 1.0
+
+    def compile(self, symbols: List[str]) -> CompiledConstraints:
+        """📏 Compiler la spécification pour un univers ordonné de symboles"""
+        n = len(symbols)
+        index = {symbol: i for i, symbol in enumerate(symbols)}
+
+        blocks: List[sparse.spmatrix] = []
+        lower: List[np.ndarray] = []
+        upper: List[np.ndarray] = []
+        labels: List[str] = []
+
+        def add_rows(block, lo, hi, row_labels):
+            blocks.append(sparse.csr_matrix(block))
+            lower.append(np.asarray(lo, dtype=float))
+            upper.append(np.asarray(hi, dtype=float))
+            labels.extend(row_labels)
+
+        # Budget : Σw = budget
+        add_rows(np.ones((1, n)), [self.budget], [self.budget], ["budget"])
+
+        # Bornes par asset
+        weight_lower = np.full(n, self.default_bounds[0])
+        weight_upper = np.full(n, self.default_bounds[1])
+        for symbol, (lo, hi) in self.asset_bounds.items():
+            if symbol in index:
+                weight_lower[index[symbol]] = lo
+                weight_upper[index[symbol]] = hi
+
+        add_rows(sparse.identity(n), weight_lower, weight_upper, [f"bound:{symbol}" for symbol in symbols])
+
+        # Groupes : indicatrice creuse des membres présents dans l'univers
+        for group in self.groups:
+            members = [index[symbol] for symbol in group.members if symbol in index]
+            if not members:
+                logger.debug(f"📏 Groupe {group.name} sans membre dans l'univers")
+                continue
+            row = sparse.csr_matrix((np.ones(len(members)), ([0] * len(members), members)), shape=(1, n))
+            add_rows(row, [group.min_weight], [group.max_weight], [f"group:{group.name}"])
+
+        # Turnover : bloc identité projeté sur la boule ‖w - w0‖₁ ≤ T
+        turnover_rows = None
+        current = None
+        if self.max_turnover is not None:
+            start = sum(block.shape[0] for block in blocks)
+            turnover_rows = slice(start, start + n)
+            current = np.array([self.current_weights.get(symbol, 0.0) for symbol in symbols])
+            add_rows(sparse.identity(n), np.full(n, -np.inf), np.full(n, np.inf),
+                     [f"turnover:{symbol}" for symbol in symbols])
+
+        return CompiledConstraints(
+            symbols=list(symbols),
+            A=sparse.vstack(blocks).tocsr(),
+            lower=np.concatenate(lower),
+            upper=np.concatenate(upper),
+            row_labels=labels,
+            weight_lower=weight_lower,
+            weight_upper=weight_upper,
+            turnover_rows=turnover_rows,
+            current_weights=current,
+            max_turnover=self.max_turnover
+        )
@@ -0,0 +1,548 @@
+"""
+🧪 BACKTEST ENGINE - REJEU HISTORIQUE DES DÉCISIONS
+===================================================
+
+Rejoue des barres historiques (BarArrays) dans les chemins de décision du
+système, avec une horloge simulée :
+- Politique "signals" : trend_strength des indicateurs locaux comme signal
+  d'ensemble, puis VectorSignalEngine (sizing Kelly, top-K) comme
+  AIEnsembleEngine._generate_optimal_decisions
+- Politique "optimizer" : PortfolioOptimizer.optimize_universe sur la
+  fenêtre de lookback (rendements / covariance échantillon)
+- Rééquilibrage : règle de drift rebalance_trades, partagée avec
+  generate_rebalance_recommendations
+
+Deux modes :
+- "daily" : vectorisé. Signaux et cibles calculés pour toutes les barres
+  d'un coup (matrices barres × symboles) ; entre deux décisions, la
+  valorisation d'un segment entier est un produit matriciel
+- "intraday" : événementiel. File d'événements horodatés (barre, décision,
+  exécution) sur une horloge simulée, indicateurs mis à jour en flux comme en
+  production, ordres exécutés à la clôture ou à l'ouverture suivante, VWAP
+  remis à zéro à chaque séance
+
+Les balayages de paramètres tournent dans un pool de processus (historique
+envoyé une fois par worker) et renvoient Sharpe, max drawdown et turnover
+par configuration.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.config import settings
+from app.orchestrator.indicator_engine import IndicatorConfig, IndicatorEngine, trend_strength_history
+from app.orchestrator.portfolio_optimizer import (
+    AllocationStrategy, PortfolioOptimizer, rebalance_trades
+)
+from app.orchestrator.allocation_constraints import ConstraintSpec
+from app.orchestrator.simulation_engine import TRADING_DAYS
+from core.signal_engine import VectorSignalEngine
+from database.market_store import BarArrays
+
+logger = logging.getLogger(__name__)
+
+# Ordre de traitement des événements d'un même timestamp
+EVENT_FILL, EVENT_BAR, EVENT_DECISION = 0, 1, 2
+
+@dataclass
+class BacktestConfig:
+    """Paramètres d'un run (un point du balayage)"""
+    name: str = "default"
+    mode: str = "daily"  # "daily" (vectorisé) ou "intraday" (événementiel)
+    policy: str = "signals"  # "signals" (ensemble + Kelly) ou "optimizer" (optimize_universe)
+    strategy: str = "balanced"  # AllocationStrategy de la politique "optimizer"
+    rebalance_every: int = 1  # barres entre deux décisions
+    rebalance_threshold: float = 0.05  # drift minimal avant ordre (comme PortfolioOptimizer)
+    signal_threshold: float = 0.3
+    top_k: int = 5
+    kelly_fraction: float = 0.25
+    max_position: float = 0.20
+    volatility: float = 0.5  # niveau de volatilité du régime (ajustement Kelly)
+    allow_short: bool = False  # SELL : position courte (sinon sortie de position)
+    lookback: int = 60  # barres d'estimation de la politique "optimizer"
+    warmup: int = 26  # barres avant le premier signal (période lente du MACD)
+    cost_bps: float = 5.0  # coûts de transaction par unité de turnover
+    fill: Optional[str] = None  # "close" ou "next_open" ; défaut : close (daily), next_open (intraday)
+    periods_per_year: Optional[float] = None  # défaut : déduit des timestamps
+
+    @classmethod
+    def from_settings(cls, **overrides) -> "BacktestConfig":
+        values = dict(
+            top_k=settings.AI_SIGNAL_TOP_K,
+            signal_threshold=settings.AI_SIGNAL_THRESHOLD,
+            cost_bps=settings.BACKTEST_COST_BPS
+        )
+        values.update(overrides)
+        return cls(**values)
+
+    @property
+    def fill_mode(self) -> str:
+        return self.fill or ("next_open" if self.mode == "intraday" else "close")
+
+@dataclass
+class BacktestResult:
+    """Performance réalisée d'une configuration"""
+    config: BacktestConfig
+    bars: int
+    total_return: float
+    annual_return: float
+    volatility: float  # annualisée
+    sharpe_ratio: float
+    max_drawdown: float
+    turnover: float  # turnover annualisé (Σ|ordres| / 2, en fraction du portefeuille)
+    costs: float  # coûts cumulés (fraction de la valeur)
+    rebalances: int  # décisions ayant produit au moins un ordre
+    trades: int  # ordres (asset × décision)
+    elapsed_ms: float = 0.0
+    equity: np.ndarray = field(default_factory=lambda: np.ones(1), repr=False)
+
+    def summary(self) -> Dict[str, Any]:
+        """Métriques sans la courbe de valeur (API, logs)"""
+        return {
+            "name": self.config.name,
+            "mode": self.config.mode,
+            "policy": self.config.policy,
+            "bars": self.bars,
+            "total_return": self.total_return,
+            "annual_return": self.annual_return,
+            "volatility": self.volatility,
+            "sharpe_ratio": self.sharpe_ratio,
+            "max_drawdown": self.max_drawdown,
+            "turnover": self.turnover,
+            "costs": self.costs,
+            "rebalances": self.rebalances,
+            "trades": self.trades,
+            "elapsed_ms": self.elapsed_ms
+        }
+
+@dataclass
+class _Market:
+    """Historique préparé : prix propagés, sans NaN, aligné sur le premier timestamp commun"""
+    symbols: List[str]
+    timestamps: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    periods_per_year: float
+
+    @property
+    def n_bars(self) -> int:
+        return self.close.shape[1]
+
+class SimulatedClock:
+    """Horloge du backtest (secondes epoch UTC) : avance au timestamp de chaque événement"""
+
+    def __init__(self):
+        self.now: Optional[int] = None
+        self.sessions = 0
+
+    def advance(self, timestamp: int) -> bool:
+        """Avancer l'horloge ; True à l'ouverture d'une nouvelle séance (jour UTC)"""
+        new_session = self.now is None or timestamp // 86400 != self.now // 86400
+        self.now = timestamp
+        self.sessions += new_session
+        return new_session
+
+    def utcnow(self) -> datetime:
+        return datetime.utcfromtimestamp(self.now)
+
+def performance_metrics(returns: np.ndarray, periods_per_year: float,
+                        risk_free_rate: float = 0.0) -> Dict[str, float]:
+    """📊 Rendement, volatilité, Sharpe et max drawdown d'une série de rendements par barre"""
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.size < 2:
+        return {"total_return": 0.0, "annual_return": 0.0, "volatility": 0.0,
+                "sharpe_ratio": 0.0, "max_drawdown": 0.0}
+
+    equity = np.cumprod(1.0 + returns)
+    total_return = float(equity[-1] - 1.0)
+    years = returns.size / periods_per_year
+    annual_return = float(equity[-1] ** (1.0 / years) - 1.0) if equity[-1] > 0 else -1.0
+    std = returns.std(ddof=1)
+    excess = returns.mean() - risk_free_rate / periods_per_year
+    peak = np.maximum.accumulate(np.concatenate([[1.0], equity]))[1:]
+    return {
+        "total_return": total_return,
+        "annual_return": annual_return,
+        "volatility": float(std * np.sqrt(periods_per_year)),
+        "sharpe_ratio": float(excess / std * np.sqrt(periods_per_year)) if std > 0 else 0.0,
+        "max_drawdown": float(np.max(1.0 - equity / peak))
+    }
+
+def realized_outcome(closes: np.ndarray, periods_per_year: float = TRADING_DAYS,
+                     flat_band: float = 0.005) -> Dict[str, float]:
+    """
+    ✅ Résultat réalisé d'une série de clôtures, au format de
+    PredictiveSystem.validate_prediction (volatilité annualisée, direction)
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    closes = closes[np.isfinite(closes)]
+    if closes.size < 2:
+        return {"volatility": 0.0, "trend_direction": 0, "return": 0.0}
+    log_returns = np.diff(np.log(closes))
+    total = float(closes[-1] / closes[0] - 1.0)
+    return {
+        "volatility": float(log_returns.std(ddof=1) * np.sqrt(periods_per_year)) if log_returns.size > 1 else 0.0,
+        "trend_direction": 0 if abs(total) <= flat_band else int(np.sign(total)),
+        "return": total
+    }
+
+def parameter_grid(base: BacktestConfig, **values: Sequence[Any]) -> List[BacktestConfig]:
+    """
+    🧮 Produit cartésien de paramètres autour d'une configuration
+
+    parameter_grid(base, top_k=[3, 5], rebalance_threshold=[0.02, 0.05])
+    """
+    names = list(values)
+    return [
+        replace(base, name=",".join(f"{name}={value}" for name, value in zip(names, combination)),
+                **dict(zip(names, combination)))
+        for combination in itertools.product(*(values[name] for name in names))
+    ]
+
+def _prepare(arrays: BarArrays) -> _Market:
+    """Clôtures propagées (aligned_close), OHLV complétés par la clôture"""
+    close = arrays.aligned_close()
+    n_bars = close.shape[1]
+    start = arrays.close.shape[1] - n_bars
+
+    def filled(values: Optional[np.ndarray]) -> np.ndarray:
+        values = values[:, start:] if values is not None and values.size else close
+        return np.where(np.isfinite(values), values, close)
+
+    timestamps = arrays.timestamps[start:]
+    days = np.unique(timestamps.astype("datetime64[D]")).size if n_bars else 0
+    return _Market(
+        symbols=list(arrays.symbols),
+        timestamps=timestamps,
+        open=filled(arrays.open),
+        high=filled(arrays.high),
+        low=filled(arrays.low),
+        close=close,
+        volume=np.nan_to_num(arrays.volume[:, start:]) if arrays.volume.size else np.zeros_like(close),
+        periods_per_year=TRADING_DAYS * n_bars / days if days else float(TRADING_DAYS)
+    )
+
+class _Policy:
+    """Décisions d'une configuration : cibles de poids à une barre donnée"""
+
+    def __init__(self, market: _Market, config: BacktestConfig, optimizer_factory):
+        self.market = market
+        self.config = config
+        self.signal_engine = VectorSignalEngine(
+            threshold=config.signal_threshold, top_k=config.top_k,
+            kelly_fraction=config.kelly_fraction, max_position=config.max_position
+        )
+        self._optimizer_factory = optimizer_factory
+        self._log_returns: Optional[np.ndarray] = None
+
+    @property
+    def first_decision(self) -> int:
+        """Première barre de décision : fin du warmup des indicateurs ou de la fenêtre d'estimation"""
+        if self.config.policy == "optimizer":
+            return self.config.lookback
+        return max(self.config.warmup - 1, 0)
+
+    def decision_bars(self) -> np.ndarray:
+        """Barres de décision (la dernière barre ne peut plus être exécutée)"""
+        return np.arange(self.first_decision, self.market.n_bars - 1, max(self.config.rebalance_every, 1))
+
+    # Politique "signals" -------------------------------------------------
+
+    def signal_weights(self, signals: np.ndarray) -> np.ndarray:
+        """
+        Poids cibles depuis des signaux (symboles) ou un historique (barres × symboles)
+
+        Même sizing que _generate_optimal_decisions : Kelly par symbole puis
+        top-K par confiance (égalités : ordre de l'univers).
+        """
+        batch = self.signal_engine.score(self.market.symbols, signals, self.config.volatility)
+        if batch.signal.ndim == 1:
+            selected = np.zeros(len(self.market.symbols), dtype=bool)
+            selected[self.signal_engine.top_k(batch)] = True
+        else:
+            confidence = np.where(batch.actionable, batch.confidence, -np.inf)
+            order = np.argsort(-confidence, axis=1, kind="stable")[:, :max(self.config.top_k, 0)]
+            selected = np.zeros(batch.signal.shape, dtype=bool)
+            np.put_along_axis(selected, order, True, axis=1)
+            selected &= batch.actionable
+
+        direction = np.sign(batch.signal) if self.config.allow_short else (batch.signal > 0)
+        return np.where(selected, batch.position_size * direction, 0.0)
+
+    # Politique "optimizer" -----------------------------------------------
+
+    def optimizer_weights(self, bar: int) -> np.ndarray:
+        """optimize_universe sur les lookback rendements se terminant à la barre"""
+        if self._log_returns is None:
+            self._log_returns = np.diff(np.log(self.market.close), axis=1)
+        window = self._log_returns[:, bar - self.config.lookback:bar]
+        periods = self.market.periods_per_year
+        allocation = self._optimizer_factory().optimize_universe(
+            self.market.symbols, window.mean(axis=1) * periods, np.atleast_2d(np.cov(window)) * periods,
+            ConstraintSpec(default_bounds=(0.0, 1.0)), AllocationStrategy(self.config.strategy)
+        )
+        return np.array([allocation.weights.get(symbol, 0.0) for symbol in self.market.symbols])
+
+class BacktestEngine:
+    """
+    🧪 MOTEUR DE BACKTEST
+
+    engine = get_backtest_engine()
+    result = engine.run(store.read_range(symbols, "1d", start, end), BacktestConfig())
+    results = engine.sweep(arrays, parameter_grid(BacktestConfig(), top_k=[3, 5, 8]))
+    """
+
+    def __init__(self, indicator_config: Optional[IndicatorConfig] = None, max_workers: Optional[int] = None):
+        self.indicator_config = indicator_config or IndicatorConfig.from_settings()
+        self.max_workers = settings.BACKTEST_MAX_WORKERS if max_workers is None else max_workers
+        self._optimizer: Optional[PortfolioOptimizer] = None
+
+        self.runs = 0
+        self.sweeps = 0
+
+    def _workers(self) -> int:
+        return self.max_workers or os.cpu_count() or 1
+
+    def _get_optimizer(self) -> PortfolioOptimizer:
+        if self._optimizer is None:
+            self._optimizer = PortfolioOptimizer()
+        return self._optimizer
+
+    # ------------------------------------------------------------------
+    # Runs
+    # ------------------------------------------------------------------
+
+    def run(self, arrays: BarArrays, config: Optional[BacktestConfig] = None) -> BacktestResult:
+        """▶️ Rejouer l'historique pour une configuration"""
+        return self._run_prepared(_prepare(arrays), config or BacktestConfig.from_settings())
+
+    async def run_async(self, arrays: BarArrays, config: Optional[BacktestConfig] = None) -> BacktestResult:
+        return await asyncio.to_thread(self.run, arrays, config)
+
+    def _run_prepared(self, market: _Market, config: BacktestConfig) -> BacktestResult:
+        if config.mode not in ("daily", "intraday"):
+            raise ValueError(f"Mode de backtest inconnu: {config.mode}")
+        if config.policy not in ("signals", "optimizer"):
+            raise ValueError(f"Politique de backtest inconnue: {config.policy}")
+        if config.fill_mode not in ("close", "next_open"):
+            raise ValueError(f"Exécution inconnue: {config.fill}")
+        if config.mode == "daily" and config.fill_mode != "close":
+            raise ValueError("Le mode daily exécute à la clôture (fill='close')")
+
+        start = time.perf_counter()
+        if config.periods_per_year:
+            market = replace(market, periods_per_year=config.periods_per_year)
+        policy = _Policy(market, config, self._get_optimizer)
+        decisions = policy.decision_bars()
+        if decisions.size == 0:
+            returns, costs, turnover, trades, rebalances = np.zeros(0), 0.0, 0.0, 0, 0
+        elif config.mode == "daily":
+            returns, costs, turnover, trades, rebalances = self._run_vectorized(market, config, policy, decisions)
+        else:
+            returns, costs, turnover, trades, rebalances = self._run_events(market, config, policy, decisions)
+
+        self.runs += 1
+        # Métriques à partir de la première décision (avant : 100 % cash)
+        live = returns[decisions[0]:] if decisions.size else returns
+        metrics = performance_metrics(live, market.periods_per_year)
+        return BacktestResult(
+            config=config,
+            bars=market.n_bars,
+            turnover=turnover / 2 * market.periods_per_year / live.size if live.size else 0.0,
+            costs=costs,
+            rebalances=rebalances,
+            trades=trades,
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+            equity=np.concatenate([[1.0], np.cumprod(1.0 + returns)]),
+            **metrics
+        )
+
+    def _run_vectorized(self, market: _Market, config: BacktestConfig, policy: _Policy, decisions: np.ndarray):
+        """
+        Mode daily : cibles de toutes les décisions en une passe, puis
+        valorisation segment par segment (une décision → la suivante)
+        """
+        if config.policy == "signals":
+            trend = trend_strength_history(market.high, market.low, market.close, self.indicator_config)
+            trend[:, :max(config.warmup - 1, 0)] = 0.0
+            targets = policy.signal_weights(trend[:, decisions].T)
+        else:
+            targets = np.array([policy.optimizer_weights(bar) for bar in decisions])
+
+        growth = market.close[:, 1:] / market.close[:, :-1]
+        cost_rate = config.cost_bps / 10_000
+        returns = np.zeros(market.n_bars - 1)
+        weights = np.zeros(len(market.symbols))
+        costs = turnover = 0.0
+        trades = rebalances = 0
+        bounds = np.append(decisions, market.n_bars - 1)
+
+        for j, bar in enumerate(decisions):
+            orders = rebalance_trades(weights, targets[j], config.rebalance_threshold)
+            traded = float(np.abs(orders).sum())
+            weights = weights + orders
+            cash = 1.0 - weights.sum() - cost_rate * traded
+            if traded:
+                costs += cost_rate * traded
+                turnover += traded
+                trades += int(np.count_nonzero(orders))
+                rebalances += 1
+
+            # valeur (relative à la barre de décision) sur le segment
+            cumulative = np.cumprod(growth[:, bar:bounds[j + 1]], axis=1)
+            value = cash + weights @ cumulative
+            returns[bar:bounds[j + 1]] = value / np.concatenate([[1.0], value[:-1]]) - 1.0
+            weights = weights * cumulative[:, -1] / value[-1]
+
+        return returns, costs, turnover, trades, rebalances
+
+    def _run_events(self, market: _Market, config: BacktestConfig, policy: _Policy, decisions: np.ndarray):
+        """
+        Mode intraday : boucle d'événements sur horloge simulée
+
+        BAR : valorisation à la clôture et mise à jour des indicateurs ;
+        DECISION : cibles depuis les indicateurs courants ; FILL : ordres
+        exécutés à l'ouverture de la barre suivante (ou à la clôture).
+        """
+        clock = SimulatedClock()
+        indicators = IndicatorEngine(self.indicator_config, capacity=len(market.symbols))
+        rows = indicators.indices(market.symbols)
+        cost_rate = config.cost_bps / 10_000
+        decision_set = set(decisions.tolist())
+
+        holdings = np.zeros(len(market.symbols))  # valeur par asset
+        cash, value = 1.0, np.ones(market.n_bars)
+        costs = turnover = 0.0
+        trades = rebalances = 0
+        pending: Optional[np.ndarray] = None
+        filled_bar = -1  # barre déjà valorisée à la clôture par une exécution à l'ouverture
+
+        def execute(target: np.ndarray):
+            nonlocal holdings, cash, costs, turnover, trades, rebalances
+            total = cash + holdings.sum()
+            orders = rebalance_trades(holdings / total, target, config.rebalance_threshold)
+            traded = float(np.abs(orders).sum())
+            if traded:
+                holdings = holdings + orders * total
+                cash -= orders.sum() * total + cost_rate * traded * total
+                costs += cost_rate * traded
+                turnover += traded
+                trades += int(np.count_nonzero(orders))
+                rebalances += 1
+
+        # clés de la file en entiers Python (comparaisons rapides)
+        timestamps = market.timestamps.astype("datetime64[s]").astype(np.int64).tolist()
+        sequence = itertools.count()
+        queue = [(timestamps[bar], EVENT_BAR, next(sequence), bar) for bar in range(market.n_bars)]
+        heapq.heapify(queue)
+
+        while queue:
+            timestamp, kind, _, bar = heapq.heappop(queue)
+            if clock.advance(timestamp):
+                indicators.reset_vwap()
+
+            if kind == EVENT_FILL:
+                # ouverture : valorisation au prix d'ouverture puis exécution
+                holdings = holdings * market.open[:, bar] / market.close[:, bar - 1]
+                execute(pending)
+                pending, filled_bar = None, bar
+                holdings = holdings * market.close[:, bar] / market.open[:, bar]
+
+            elif kind == EVENT_BAR:
+                if bar > 0 and bar != filled_bar:
+                    holdings = holdings * market.close[:, bar] / market.close[:, bar - 1]
+                indicators.update(rows, market.open[:, bar], market.high[:, bar], market.low[:, bar],
+                                  market.close[:, bar], market.volume[:, bar])
+                value[bar] = cash + holdings.sum()
+                if bar in decision_set:
+                    heapq.heappush(queue, (timestamp, EVENT_DECISION, next(sequence), bar))
+
+            else:  # EVENT_DECISION
+                if config.policy == "signals":
+                    snapshot = indicators.snapshot(market.symbols)
+                    signals = np.where(snapshot.ready(config.warmup), snapshot.values["trend_strength"], 0.0)
+                    target = policy.signal_weights(signals)
+                else:
+                    target = policy.optimizer_weights(bar)
+
+                if config.fill_mode == "close":
+                    # coûts imputés au rendement de la barre suivante (comme le mode daily)
+                    execute(target)
+                else:
+                    # exécution à l'ouverture suivante, avant la valorisation de la barre
+                    pending = target
+                    heapq.heappush(queue, (timestamps[bar + 1], EVENT_FILL, next(sequence), bar + 1))
+
+        returns = value[1:] / value[:-1] - 1.0
+        return returns, costs, turnover, trades, rebalances
+
+    # ------------------------------------------------------------------
+    # Balayages
+    # ------------------------------------------------------------------
+
+    def sweep(self, arrays: BarArrays, configs: Sequence[BacktestConfig]) -> List[BacktestResult]:
+        """
+        🔀 Balayage de paramètres : une configuration par tâche, en parallèle
+
+        L'historique préparé est transmis une fois à chaque worker
+        (initializer) ; les résultats sont rendus dans l'ordre des configs.
+        """
+        market = _prepare(arrays)
+        configs = list(configs)
+        workers = min(self._workers(), len(configs))
+        start = time.perf_counter()
+
+        if workers <= 1:
+            results = [self._run_prepared(market, config) for config in configs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(market, self.indicator_config)) as executor:
+                results = list(executor.map(_run_worker, configs))
+
+        self.sweeps += 1
+        logger.info(f"🧪 Balayage de {len(configs)} configurations ({workers} workers) "
+                    f"en {(time.perf_counter() - start) * 1000:.0f}ms")
+        return results
+
+    async def sweep_async(self, arrays: BarArrays, configs: Sequence[BacktestConfig]) -> List[BacktestResult]:
+        return await asyncio.to_thread(self.sweep, arrays, configs)
+
+    def get_stats(self) -> Dict[str, int]:
+        """📊 Statistiques du moteur"""
+        return {"runs": self.runs, "sweeps": self.sweeps}
+
+# État des workers du pool (processus enfants)
+_worker_market: Optional[_Market] = None
+_worker_engine: Optional[BacktestEngine] = None
+
+def _init_worker(market: _Market, indicator_config: IndicatorConfig):
+    global _worker_market, _worker_engine
+    _worker_market = market
+    _worker_engine = BacktestEngine(indicator_config, max_workers=1)
+
+def _run_worker(config: BacktestConfig) -> BacktestResult:
+    """Exécuter une configuration dans un worker (fonction de module : picklable)"""
+    return _worker_engine._run_prepared(_worker_market, config)
+
+# Instance globale
+_backtest_engine: Optional[BacktestEngine] = None
+
+def get_backtest_engine() -> BacktestEngine:
+    """🧪 Obtenir le moteur de backtest partagé"""
+    global _backtest_engine
+    if _backtest_engine is None:
+        _backtest_engine = BacktestEngine()
+    return _backtest_engine
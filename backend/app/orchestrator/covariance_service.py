@@ -0,0 +1,374 @@
+"""
+🔗 COVARIANCE SERVICE - RENDEMENTS ET COVARIANCES PARTAGÉS
+=========================================================
+
+Service unique d'estimation des rendements / covariances pour l'optimiseur,
+le système prédictif et les tâches de risque :
+- Log-rendements calculés une seule fois en matrice NumPy (T × N)
+- Estimateurs : échantillon, Ledoit-Wolf (cible identité), EWMA (RiskMetrics)
+- Mises à jour incrémentales : une nouvelle barre = mises à jour de rang 1
+  des moments glissants (ajout de la barre, retrait de la plus ancienne),
+  sans recalcul sur toute la fenêtre de 252 jours
+- Mémoïsation par (univers, fenêtre, estimateur), invalidée à chaque barre
+
+Usage:
+    service = get_covariance_service()
+    service.load_prices(symbols, prices)          # historique (N × T) ou dict
+    service.update(symbols, last_prices)          # nouvelle barre
+    estimate = service.estimate(symbols, estimator="ledoit_wolf")
+"""
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy.linalg.blas import dger
+
+logger = logging.getLogger(__name__)
+
+ESTIMATORS = ("sample", "ledoit_wolf", "ewma")
+PERIODS_PER_YEAR = 252
+PriceInput = Union[np.ndarray, Dict[str, Sequence[float]]]
+
+@dataclass
+class CovarianceEstimate:
+    """Estimation annualisée pour un univers"""
+    symbols: List[str]
+    estimator: str
+    window: int
+    n_observations: int
+    expected_returns: np.ndarray  # rendements arithmétiques annualisés
+    covariance: np.ndarray  # covariance annualisée
+    volatilities: np.ndarray
+    correlation: np.ndarray
+    shrinkage: float  # intensité Ledoit-Wolf (0 pour les autres estimateurs)
+    updated_at: datetime
+
+class RollingMoments:
+    """
+    Moments glissants d'une fenêtre de log-rendements (T × N)
+
+    Toutes les statistiques nécessaires à la covariance d'échantillon et à
+    l'intensité de Ledoit-Wolf sont des sommes : ajouter ou retirer une
+    observation est une mise à jour de rang 1 en O(N²) (BLAS dger en place,
+    matrices en ordre Fortran), fenêtre stockée en tampon circulaire.
+    """
+
+    def __init__(self, returns: np.ndarray, window: int, ewma_lambda: float = 0.94):
+        self.window = window
+        self.ewma_lambda = ewma_lambda
+        self.n_assets = returns.shape[1]
+        self._rebuild(returns[-window:])
+
+    def _rebuild(self, returns: np.ndarray):
+        """Recalcul complet (chargement, ou recalage numérique périodique)"""
+        returns = np.array(returns, dtype=float)
+        squared_norms = np.einsum("ij,ij->i", returns, returns)
+
+        self.count = returns.shape[0]
+        self._ring = np.zeros((self.window, self.n_assets))
+        self._ring[:self.count] = returns
+        self._head = 0  # index de la plus ancienne observation
+
+        self.sum = returns.sum(axis=0)
+        self.outer_sum = np.asfortranarray(returns.T @ returns)
+        self.norm2_sum = float(squared_norms.sum())
+        self.norm4_sum = float(np.square(squared_norms).sum())
+        self.norm2_weighted_sum = squared_norms @ returns
+        self.updates_since_rebuild = 0
+
+        # EWMA (moyenne nulle, RiskMetrics) amorcée sur la fenêtre
+        lam = self.ewma_lambda
+        weights = (1 - lam) * lam ** np.arange(self.count - 1, -1, -1)
+        weights /= weights.sum() if weights.sum() > 0 else 1.0
+        self.ewma_cov = np.asfortranarray((returns * weights[:, None]).T @ returns)
+        self.ewma_mean = weights @ returns
+
+    @property
+    def buffer(self) -> np.ndarray:
+        """Fenêtre courante dans l'ordre chronologique (T × N)"""
+        if self.count < self.window:
+            return self._ring[:self.count]
+        return np.roll(self._ring, -self._head, axis=0)
+
+    def push(self, observation: np.ndarray):
+        """Ajouter une barre (et retirer la plus ancienne si la fenêtre est pleine)"""
+        r = np.asarray(observation, dtype=float)
+        norm2 = float(r @ r)
+
+        if self.count >= self.window:
+            self._remove(self._ring[self._head].copy())
+            self._ring[self._head] = r
+            self._head = (self._head + 1) % self.window
+        else:
+            self._ring[self.count] = r
+
+        self.count += 1
+        self.sum += r
+        self.outer_sum = dger(1.0, r, r, a=self.outer_sum, overwrite_a=True)
+        self.norm2_sum += norm2
+        self.norm4_sum += norm2 * norm2
+        self.norm2_weighted_sum += norm2 * r
+
+        lam = self.ewma_lambda
+        self.ewma_cov *= lam
+        self.ewma_cov = dger(1 - lam, r, r, a=self.ewma_cov, overwrite_a=True)
+        self.ewma_mean = lam * self.ewma_mean + (1 - lam) * r
+
+        # Recalage périodique contre la dérive des additions/soustractions
+        self.updates_since_rebuild += 1
+        if self.updates_since_rebuild >= self.window:
+            ewma_cov, ewma_mean = self.ewma_cov, self.ewma_mean
+            self._rebuild(self.buffer)
+            self.ewma_cov, self.ewma_mean = ewma_cov, ewma_mean
+
+    def _remove(self, r: np.ndarray):
+        norm2 = float(r @ r)
+        self.count -= 1
+        self.sum -= r
+        self.outer_sum = dger(-1.0, r, r, a=self.outer_sum, overwrite_a=True)
+        self.norm2_sum -= norm2
+        self.norm4_sum -= norm2 * norm2
+        self.norm2_weighted_sum -= norm2 * r
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.sum / max(self.count, 1)
+
+    def sample_covariance(self, ddof: int = 1) -> np.ndarray:
+        """Covariance d'échantillon par barre (nouvelle matrice)"""
+        m = self.mean
+        scatter = dger(-float(self.count), m, m, a=np.array(self.outer_sum, order="F"), overwrite_a=True)
+        scatter /= max(self.count - ddof, 1)
+        return scatter
+
+    def ledoit_wolf(self) -> Tuple[np.ndarray, float]:
+        """
+        Ledoit-Wolf (2004), cible μ·I, à partir des seuls moments glissants
+
+        b̄² = (Σ‖x_t‖⁴ - T‖S‖²_F) / T² avec x_t = r_t - m, où Σ‖x_t‖⁴ se
+        développe en sommes de ‖r‖⁴, ‖r‖²·r, r·rᵀ, ‖r‖² et r.
+        """
+        T = self.count
+        n = self.n_assets
+        m = self.mean
+        S = self.sample_covariance(ddof=0)
+
+        # Σ‖r_t - m‖⁴ = Σ(a - 2b + c)² avec a = ‖r‖², b = rᵀm, c = ‖m‖²
+        c = float(m @ m)
+        sum_a2 = self.norm4_sum
+        sum_b2 = float(m @ self.outer_sum @ m)
+        sum_ab = float(self.norm2_weighted_sum @ m)
+        sum_a = self.norm2_sum
+        sum_b = float(self.sum @ m)
+        centered_norm4 = sum_a2 + 4 * sum_b2 + T * c * c - 4 * sum_ab + 2 * c * sum_a - 4 * c * sum_b
+
+        # ‖S - μI‖²_F = ‖S‖²_F - n·μ² puisque tr(S) = n·μ
+        mu = float(np.trace(S)) / n
+        s_norm2 = float(np.vdot(S, S))
+        target_distance = s_norm2 - n * mu * mu
+        if target_distance <= 0 or T == 0:
+            return S, 0.0
+
+        b_bar2 = max((centered_norm4 - T * s_norm2) / (T * T), 0.0)
+        shrinkage = min(b_bar2, target_distance) / target_distance
+
+        S *= 1 - shrinkage
+        S.flat[::n + 1] += shrinkage * mu
+        return S, shrinkage
+
+class CovarianceService:
+    """
+    🔗 SERVICE DE COVARIANCE PARTAGÉ
+
+    Un état glissant par (univers, fenêtre) ; les estimations sont
+    mémoïsées par (univers, fenêtre, estimateur) jusqu'à la prochaine barre.
+    """
+
+    def __init__(self, periods_per_year: int = PERIODS_PER_YEAR, ewma_lambda: float = 0.94):
+        self.periods_per_year = periods_per_year
+        self.ewma_lambda = ewma_lambda
+        self._states: Dict[Tuple[Tuple[str, ...], int], RollingMoments] = {}
+        self._fingerprints: Dict[Tuple[Tuple[str, ...], int], str] = {}
+        self._last_prices: Dict[Tuple[str, ...], np.ndarray] = {}
+        self._cache: Dict[Tuple[Tuple[str, ...], int, str], CovarianceEstimate] = {}
+        self._lock = threading.Lock()
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.full_loads = 0
+        self.incremental_updates = 0
+
+    @staticmethod
+    def _price_matrix(symbols: Sequence[str], prices: PriceInput) -> np.ndarray:
+        """Prix (N × T) alignés sur l'ordre de l'univers"""
+        if isinstance(prices, dict):
+            return np.array([prices[symbol] for symbol in symbols], dtype=float)
+        return np.asarray(prices, dtype=float)
+
+    @staticmethod
+    def log_returns(prices: np.ndarray) -> np.ndarray:
+        """Log-rendements (T-1 × N) depuis des prix (N × T)"""
+        return np.diff(np.log(np.maximum(prices, 1e-12)), axis=1).T
+
+    def load_prices(self, symbols: Sequence[str], prices: PriceInput, window: int = PERIODS_PER_YEAR) -> np.ndarray:
+        """
+        📥 Charger un historique de prix (no-op si identique au dernier chargé)
+
+        Returns:
+            Log-rendements (T-1 × N) de la fenêtre
+        """
+        universe = tuple(symbols)
+        matrix = self._price_matrix(universe, prices)
+        fingerprint = hashlib.sha1(np.ascontiguousarray(matrix).tobytes()).hexdigest()
+        key = (universe, window)
+
+        with self._lock:
+            if self._fingerprints.get(key) == fingerprint:
+                return self._states[key].buffer
+
+            returns = self.log_returns(matrix)
+            self._states[key] = RollingMoments(returns, window, self.ewma_lambda)
+            self._fingerprints[key] = fingerprint
+            self._last_prices[universe] = matrix[:, -1].copy()
+            self._invalidate(universe, window)
+            self.full_loads += 1
+
+            return self._states[key].buffer
+
+    def update(self, symbols: Sequence[str], last_prices: Union[np.ndarray, Dict[str, float]]):
+        """➕ Nouvelle barre : mise à jour de rang 1 de toutes les fenêtres de l'univers"""
+        universe = tuple(symbols)
+        if isinstance(last_prices, dict):
+            last_prices = np.array([last_prices[symbol] for symbol in universe], dtype=float)
+        last_prices = np.asarray(last_prices, dtype=float)
+
+        with self._lock:
+            previous = self._last_prices.get(universe)
+            if previous is None:
+                logger.warning(f"⚠️ Univers sans historique ({len(universe)} symboles), barre ignorée")
+                return
+
+            observation = np.log(np.maximum(last_prices, 1e-12)) - np.log(np.maximum(previous, 1e-12))
+            self._last_prices[universe] = last_prices.copy()
+
+            for (state_universe, window), state in self._states.items():
+                if state_universe == universe:
+                    state.push(observation)
+                    self._fingerprints.pop((state_universe, window), None)
+                    self._invalidate(universe, window)
+
+            self.incremental_updates += 1
+
+    def returns_matrix(self, symbols: Sequence[str], window: int = PERIODS_PER_YEAR) -> Optional[np.ndarray]:
+        """Log-rendements courants (T × N) de la fenêtre, sans copie"""
+        state = self._states.get((tuple(symbols), window))
+        return state.buffer if state is not None else None
+
+    def estimate(self,
+                 symbols: Sequence[str],
+                 window: int = PERIODS_PER_YEAR,
+                 estimator: str = "sample") -> Optional[CovarianceEstimate]:
+        """📊 Estimation annualisée mémoïsée (None si l'univers n'est pas chargé)"""
+        if estimator not in ESTIMATORS:
+            raise ValueError(f"Estimateur inconnu: {estimator}")
+
+        universe = tuple(symbols)
+        cache_key = (universe, window, estimator)
+
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+
+            state = self._states.get((universe, window))
+            if state is None or state.count < 2:
+                return None
+
+            self.cache_misses += 1
+            estimate = self._compute(universe, window, estimator, state)
+            self._cache[cache_key] = estimate
+            return estimate
+
+    def correlations_for(self,
+                         symbol: str,
+                         window: int = PERIODS_PER_YEAR,
+                         estimator: str = "sample") -> Dict[str, float]:
+        """🔗 Corrélations estimées d'un symbole vs le reste de son univers chargé"""
+        for universe, state_window in list(self._states):
+            if state_window != window or symbol not in universe:
+                continue
+            estimate = self.estimate(universe, window, estimator)
+            if estimate is None:
+                continue
+            row = estimate.correlation[universe.index(symbol)]
+            return {other: float(row[i]) for i, other in enumerate(universe) if other != symbol}
+        return {}
+
+    def _compute(self, universe, window, estimator, state: RollingMoments) -> CovarianceEstimate:
+        shrinkage = 0.0
+        if estimator == "ledoit_wolf":
+            covariance, shrinkage = state.ledoit_wolf()
+            covariance *= self.periods_per_year
+            mean = state.mean
+        elif estimator == "ewma":
+            covariance = state.ewma_cov * self.periods_per_year
+            mean = state.ewma_mean
+        else:
+            covariance = state.sample_covariance()
+            covariance *= self.periods_per_year
+            mean = state.mean
+
+        variances = np.maximum(np.diag(covariance), 0.0)
+        volatilities = np.sqrt(variances)
+        inverse = 1.0 / np.where(volatilities > 0, volatilities, 1.0)
+        correlation = covariance * inverse[:, None]
+        correlation *= inverse[None, :]
+        np.fill_diagonal(correlation, 1.0)
+
+        # Rendement arithmétique ≈ moyenne log + ½ variance (par barre), annualisé
+        expected_returns = (mean + 0.5 * variances / self.periods_per_year) * self.periods_per_year
+
+        return CovarianceEstimate(
+            symbols=list(universe),
+            estimator=estimator,
+            window=window,
+            n_observations=state.count,
+            expected_returns=expected_returns,
+            covariance=covariance,
+            volatilities=volatilities,
+            correlation=correlation,
+            shrinkage=shrinkage,
+            updated_at=datetime.utcnow()
+        )
+
+    def _invalidate(self, universe: Tuple[str, ...], window: int):
+        for key in [k for k in self._cache if k[0] == universe and k[1] == window]:
+            del self._cache[key]
+
+    def get_stats(self) -> Dict[str, int]:
+        """📊 Statistiques du service"""
+        return {
+            "universes": len(self._last_prices),
+            "windows": len(self._states),
+            "cached_estimates": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "full_loads": self.full_loads,
+            "incremental_updates": self.incremental_updates
+        }
+
+# Instance globale
+_covariance_service: Optional[CovarianceService] = None
+
+def get_covariance_service() -> CovarianceService:
+    """🔗 Obtenir le service de covariance partagé"""
+    global _covariance_service
+    if _covariance_service is None:
+        _covariance_service = CovarianceService()
+    return _covariance_service
@@ -10,7 +10,6 @@ from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, asdict
 from enum import Enum
 import numpy as np
-from sqlalchemy.orm import Session
 
 # Imports corrects pour la structure dans le container Docker
 import sys
@@ -18,7 +17,6 @@ import os
 sys.path.append('/app')
 sys.path.append('/app/backend')
 
-from database.connection import get_db
 from models.market import MarketData
 from models.system import SystemHealth
 from utils.logger import get_logger
@@ -0,0 +1,242 @@
+"""
+📐 FRONTIER SOLVER - FRONTIÈRE EFFICIENTE EN BATCH
+=================================================
+
+Résolution de toute la frontière efficiente en un appel :
+- Point de variance minimale puis point de rendement maximal (bornes du balayage)
+- N points à risque cible : max μ·w sous w'Σw ≤ σ², Σw = 1, A·w ≤ b, bornes
+- Gradients et jacobiens analytiques (objectif, budget, risque, contraintes linéaires)
+- Warm start de chaque point depuis son voisin
+- Cache LRU par empreinte des entrées (rendements, covariance, contraintes)
+
+Les stratégies (Sharpe max, variance min, utilité) se résolvent ensuite
+par simple lecture de la frontière.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy.optimize import linprog, minimize
+
+logger = logging.getLogger(__name__)
+
+Bounds = List[Tuple[float, float]]
+
+@dataclass
+class EfficientFrontier:
+    """Frontière efficiente discrétisée (points triés par volatilité croissante)"""
+    weights: np.ndarray  # (n_points, n_assets)
+    returns: np.ndarray  # (n_points,)
+    volatilities: np.ndarray  # (n_points,)
+    cache_key: str
+    solve_time_ms: float
+
+    @property
+    def n_points(self) -> int:
+        return self.returns.shape[0]
+
+    def min_variance(self) -> np.ndarray:
+        """Portefeuille de variance minimale"""
+        return self.weights[0]
+
+    def max_sharpe(self, risk_free_rate: float = 0.02) -> np.ndarray:
+        """Portefeuille tangent (ratio de Sharpe maximal)"""
+        sharpe = (self.returns - risk_free_rate) / np.maximum(self.volatilities, 1e-12)
+        return self.weights[int(np.argmax(sharpe))]
+
+    def max_utility(self, volatility_penalty: float, expected_returns: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Maximiser rendement - pénalité · volatilité
+
+        expected_returns : rendements alternatifs (ex. momentum) pour réévaluer
+        les points de la frontière sans nouvelle résolution
+        """
+        returns = self.returns if expected_returns is None else self.weights @ expected_returns
+        return self.weights[int(np.argmax(returns - volatility_penalty * self.volatilities))]
+
+    def at_volatility(self, target_volatility: float) -> np.ndarray:
+        """Meilleur portefeuille dont la volatilité ne dépasse pas la cible"""
+        index = int(np.searchsorted(self.volatilities, target_volatility, side="right")) - 1
+        return self.weights[max(0, index)]
+
+class FrontierSolver:
+    """
+    📐 SOLVEUR DE FRONTIÈRE EFFICIENTE
+
+    Les frontières résolues sont mises en cache : tant que les estimations
+    de rendements/covariance et les contraintes ne changent pas, chaque
+    combinaison stratégie × niveau de risque est une simple lecture.
+    """
+
+    def __init__(self, n_points: int = 100, max_iterations: int = 1000, cache_size: int = 64):
+        self.n_points = n_points
+        self.max_iterations = max_iterations
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, EfficientFrontier]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @staticmethod
+    def cache_key(*arrays: Optional[np.ndarray], n_points: int) -> str:
+        """Empreinte des entrées de la frontière"""
+        digest = hashlib.sha1()
+        for array in arrays:
+            if array is not None:
+                digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+            digest.update(b"|")
+        digest.update(str(n_points).encode())
+        return digest.hexdigest()
+
+    def _lookup(self, key: str) -> Optional[EfficientFrontier]:
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+        return cached
+
+    def _store(self, frontier: Optional[EfficientFrontier]):
+        if frontier is not None:
+            self._cache[frontier.cache_key] = frontier
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def solve(self,
+              expected_returns: np.ndarray,
+              cov_matrix: np.ndarray,
+              bounds: Bounds,
+              a_ub: Optional[np.ndarray] = None,
+              b_ub: Optional[np.ndarray] = None,
+              n_points: Optional[int] = None) -> Optional[EfficientFrontier]:
+        """
+        📐 Résoudre (ou relire du cache) la frontière efficiente
+
+        Args:
+            expected_returns: rendements annualisés (n_assets,)
+            cov_matrix: covariance annualisée (n_assets, n_assets)
+            bounds: bornes (min, max) par asset
+            a_ub, b_ub: contraintes linéaires A·w ≤ b
+
+        Returns:
+            Frontière, ou None si les contraintes sont infaisables
+        """
+        n_points = n_points or self.n_points
+        mu = np.asarray(expected_returns, dtype=float)
+        cov = np.asarray(cov_matrix, dtype=float)
+        key = self.cache_key(mu, cov, np.asarray(bounds, dtype=float), a_ub, b_ub, n_points=n_points)
+
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        frontier = self._solve_frontier(mu, cov, bounds, a_ub, b_ub, n_points, key)
+        self._store(frontier)
+        return frontier
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def _solve_frontier(self,
+                        mu: np.ndarray,
+                        cov: np.ndarray,
+                        bounds: Bounds,
+                        a_ub: Optional[np.ndarray],
+                        b_ub: Optional[np.ndarray],
+                        n_points: int,
+                        key: str) -> Optional[EfficientFrontier]:
+        start = time.perf_counter()
+        n_assets = mu.shape[0]
+        ones = np.ones(n_assets)
+
+        # Contraintes communes avec jacobiens constants
+        linear = [{"type": "eq", "fun": lambda w: w.sum() - 1.0, "jac": lambda w: ones}]
+        if a_ub is not None and len(a_ub):
+            a_ub = np.atleast_2d(np.asarray(a_ub, dtype=float))
+            b_ub = np.asarray(b_ub, dtype=float)
+            linear.append({"type": "ineq", "fun": lambda w: b_ub - a_ub @ w, "jac": lambda w: -a_ub})
+
+        options = {"maxiter": self.max_iterations, "ftol": 1e-10}
+
+        # 1. Variance minimale (borne basse du balayage)
+        lower = np.array([b[0] for b in bounds])
+        upper = np.array([b[1] for b in bounds])
+        start_point = np.clip(ones / n_assets, lower, upper)
+
+        min_var = minimize(
+            lambda w: w @ cov @ w,
+            start_point,
+            jac=lambda w: 2.0 * cov @ w,
+            method="SLSQP",
+            bounds=bounds,
+            constraints=linear,
+            options=options
+        )
+        if not min_var.success:
+            logger.warning(f"⚠️ Frontière infaisable (variance min): {min_var.message}")
+            return None
+
+        # 2. Rendement maximal : programme linéaire
+        max_ret = linprog(
+            -mu,
+            A_ub=a_ub if a_ub is not None and len(a_ub) else None,
+            b_ub=b_ub if a_ub is not None and len(a_ub) else None,
+            A_eq=ones[None, :],
+            b_eq=[1.0],
+            bounds=bounds,
+            method="highs"
+        )
+        w_max = max_ret.x if max_ret.success else min_var.x
+
+        vol_min = float(np.sqrt(max(min_var.x @ cov @ min_var.x, 0.0)))
+        vol_max = float(np.sqrt(max(w_max @ cov @ w_max, 0.0)))
+        targets = np.linspace(vol_min, max(vol_min, vol_max), n_points)
+
+        weights = np.empty((n_points, n_assets))
+        weights[0] = min_var.x
+        current = min_var.x
+
+        # 3. Balayage à risque cible, warm start depuis le point voisin
+        for k in range(1, n_points):
+            variance_cap = targets[k] ** 2
+            constraints = linear + [{
+                "type": "ineq",
+                "fun": lambda w, cap=variance_cap: cap - w @ cov @ w,
+                "jac": lambda w: -2.0 * cov @ w
+            }]
+
+            result = minimize(
+                lambda w: -(mu @ w),
+                current,
+                jac=lambda w: -mu,
+                method="SLSQP",
+                bounds=bounds,
+                constraints=constraints,
+                options=options
+            )
+            if result.success:
+                current = result.x
+            weights[k] = current
+
+        weights = np.clip(weights, lower, upper)
+        returns = weights @ mu
+        volatilities = np.sqrt(np.maximum(np.einsum("ij,jk,ik->i", weights, cov, weights), 0.0))
+
+        # Garder l'ordre croissant de volatilité (tolérance numérique du solveur)
+        order = np.argsort(volatilities, kind="stable")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        logger.debug(f"📐 Frontière résolue: {n_points} points en {elapsed_ms:.1f}ms")
+
+        return EfficientFrontier(
+            weights=weights[order],
+            returns=returns[order],
+            volatilities=volatilities[order],
+            cache_key=key,
+            solve_time_ms=elapsed_ms
+        )
@@ -0,0 +1,375 @@
+"""
+📉 INDICATOR ENGINE - INDICATEURS TECHNIQUES EN FLUX
+===================================================
+
+Indicateurs techniques calculés localement sur des barres OHLCV, sans appel
+LLM : EMA, RSI (Wilder), ATR (Wilder), Bandes de Bollinger, MACD, VWAP.
+
+- État glissant par symbole en tableaux NumPy (une ligne par symbole) :
+  une nouvelle barre met à jour tout l'univers en O(1) par symbole
+  (lissages exponentiels, sommes glissantes Bollinger en tampon circulaire)
+- Recalcul par lots : historique (symboles × barres) rejoué barre par barre
+  avec la même mise à jour vectorisée, depuis le store OHLCV alimenté par
+  la synchronisation des barres ; les barres manquantes (NaN) sont ignorées
+- Barres nouvellement synchronisées rejouées sur l'état courant (advance)
+- Caractéristiques par symbole pour l'ensemble IA (prompts, repli local) et
+  le système prédictif
+
+Usage:
+    engine = get_indicator_engine()
+    engine.recompute(store.read_range(symbols, "1d", start, end))   # historique
+    engine.advance(store.read_since(symbols, "1d", since, end))     # barres synchronisées
+    engine.update(symbols, open, high, low, close, volume)          # nouvelle barre
+    engine.features(["BTC"])  # {"BTC": {"rsi": 61.2, "macd_hist": 0.8, ...}}
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+FEATURES = (
+    "ema_fast", "ema_slow", "rsi", "macd", "macd_signal", "macd_hist", "atr", "atr_pct",
+    "bb_mid", "bb_upper", "bb_lower", "bb_percent_b", "bb_width", "vwap", "trend_strength"
+)
+
+@dataclass
+class IndicatorConfig:
+    """Périodes des indicateurs"""
+    ema_fast: int = 12
+    ema_slow: int = 26
+    macd_signal: int = 9
+    rsi_period: int = 14
+    atr_period: int = 14
+    bb_period: int = 20
+    bb_std: float = 2.0
+    resync_interval: int = 1000  # recalcul exact des sommes Bollinger (dérive flottante)
+
+    @classmethod
+    def from_settings(cls) -> "IndicatorConfig":
+        return cls(
+            rsi_period=settings.INDICATOR_RSI_PERIOD,
+            atr_period=settings.INDICATOR_ATR_PERIOD,
+            bb_period=settings.INDICATOR_BB_PERIOD
+        )
+
+@dataclass
+class IndicatorSnapshot:
+    """Indicateurs courants d'un ensemble de symboles (tableaux alignés)"""
+    symbols: List[str]
+    bars: np.ndarray
+    values: Dict[str, np.ndarray]
+
+    def ready(self, min_bars: int) -> np.ndarray:
+        return self.bars >= min_bars
+
+class IndicatorEngine:
+    """
+    📉 MOTEUR D'INDICATEURS INCRÉMENTAL
+
+    Chaque symbole occupe une ligne des tableaux d'état ; les mises à jour
+    portent sur un sous-ensemble de lignes (indices uniques) en une passe.
+    """
+
+    def __init__(self, config: Optional[IndicatorConfig] = None, capacity: int = 1024):
+        self.config = config or IndicatorConfig()
+        self._index: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._capacity = 0
+        self._lock = threading.RLock()
+        self._alloc(capacity)
+
+        self.updates = 0
+        self.bars_processed = 0
+        self.batch_recomputes = 0
+
+    # ------------------------------------------------------------------
+    # État
+    # ------------------------------------------------------------------
+
+    def _alloc(self, capacity: int):
+        """(Ré)allocation des tableaux d'état, lignes existantes conservées"""
+        def grow(array: Optional[np.ndarray], shape) -> np.ndarray:
+            new = np.zeros(shape)
+            if array is not None:
+                new[:array.shape[0]] = array
+            return new
+
+        n = self._capacity
+        state = getattr(self, "_state", {})
+        names = ("count", "prev_close", "ema_fast", "ema_slow", "macd_signal", "avg_gain", "avg_loss",
+                 "atr", "bb_sum", "bb_sumsq", "bb_pos", "cum_pv", "cum_volume")
+        self._state = {name: grow(state.get(name), capacity) for name in names}
+        self._ring = grow(getattr(self, "_ring", None) if n else None, (capacity, self.config.bb_period))
+        self._capacity = capacity
+
+    def indices(self, symbols: Sequence[str]) -> np.ndarray:
+        """Lignes des symboles (créées au besoin) ; à résoudre une fois par univers"""
+        missing = [symbol for symbol in symbols if symbol not in self._index]
+        if missing:
+            with self._lock:
+                for symbol in missing:
+                    if symbol not in self._index:
+                        self._index[symbol] = len(self._symbols)
+                        self._symbols.append(symbol)
+                if len(self._symbols) > self._capacity:
+                    self._alloc(max(len(self._symbols), 2 * self._capacity))
+        return np.fromiter((self._index[symbol] for symbol in symbols), dtype=np.intp, count=len(symbols))
+
+    # ------------------------------------------------------------------
+    # Mise à jour incrémentale
+    # ------------------------------------------------------------------
+
+    def update(self, symbols, open_, high, low, close, volume):
+        """
+        ➕ Nouvelle barre pour un ensemble de symboles (uniques)
+
+        Args:
+            symbols: noms ou indices déjà résolus (indices())
+            open_, high, low, close, volume: tableaux alignés ; close NaN = barre absente
+        """
+        idx = symbols if isinstance(symbols, np.ndarray) and symbols.dtype.kind == "i" else self.indices(symbols)
+        with self._lock:
+            self._update_rows(idx, high, low, close, volume)
+
+    def _update_rows(self, idx: np.ndarray, high, low, close, volume):
+        high, low, close, volume = (np.asarray(a, dtype=np.float64) for a in (high, low, close, volume))
+        present = np.isfinite(close)
+        if not present.all():
+            idx, high, low, close, volume = idx[present], high[present], low[present], close[present], volume[present]
+        if idx.size == 0:
+            return
+
+        cfg, s = self.config, self._state
+        count = s["count"][idx]
+        first = count == 0
+        prev_close = np.where(first, close, s["prev_close"][idx])
+
+        # EMA / MACD (lissage exponentiel, amorcé sur la première clôture)
+        def ema(name: str, value: np.ndarray, period: int) -> np.ndarray:
+            current = s[name][idx]
+            updated = np.where(first, value, current + (2.0 / (period + 1)) * (value - current))
+            s[name][idx] = updated
+            return updated
+
+        macd = ema("ema_fast", close, cfg.ema_fast) - ema("ema_slow", close, cfg.ema_slow)
+        ema("macd_signal", macd, cfg.macd_signal)
+
+        # RSI et ATR (lissage de Wilder, α = 1 / période)
+        delta = close - prev_close
+        seed = count == 1
+        for name, value in (("avg_gain", np.maximum(delta, 0.0)), ("avg_loss", np.maximum(-delta, 0.0))):
+            current = s[name][idx]
+            s[name][idx] = np.where(first, 0.0, np.where(seed, value, current + (value - current) / cfg.rsi_period))
+
+        true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+        atr = s["atr"][idx]
+        s["atr"][idx] = np.where(first, high - low, atr + (true_range - atr) / cfg.atr_period)
+
+        # Bollinger : sommes glissantes sur tampon circulaire
+        pos = s["bb_pos"][idx].astype(np.intp)
+        evicted = np.where(count >= cfg.bb_period, self._ring[idx, pos], 0.0)
+        s["bb_sum"][idx] += close - evicted
+        s["bb_sumsq"][idx] += close * close - evicted * evicted
+        self._ring[idx, pos] = close
+        s["bb_pos"][idx] = (pos + 1) % cfg.bb_period
+
+        # VWAP cumulé (prix typique), remis à zéro par reset_vwap()
+        typical = (high + low + close) / 3.0
+        s["cum_pv"][idx] += typical * volume
+        s["cum_volume"][idx] += volume
+
+        s["prev_close"][idx] = close
+        s["count"][idx] = count + 1
+
+        self.updates += 1
+        self.bars_processed += idx.size
+        if self.updates % cfg.resync_interval == 0:
+            self._resync_bollinger()
+
+    def _resync_bollinger(self):
+        """Sommes Bollinger recalculées exactement depuis les tampons"""
+        n = len(self._symbols)
+        filled = np.minimum(self._state["count"][:n], self.config.bb_period).astype(np.intp)
+        # positions écrites : [0, filled) tant que le tampon n'est pas plein
+        mask = np.arange(self.config.bb_period)[None, :] < filled[:, None]
+        ring = np.where(mask, self._ring[:n], 0.0)
+        self._state["bb_sum"][:n] = ring.sum(axis=1)
+        self._state["bb_sumsq"][:n] = np.square(ring).sum(axis=1)
+
+    def reset_vwap(self, symbols: Optional[Sequence[str]] = None):
+        """Nouvelle séance : VWAP repart de zéro"""
+        rows = slice(None) if symbols is None else self.indices(symbols)
+        self._state["cum_pv"][rows] = 0.0
+        self._state["cum_volume"][rows] = 0.0
+
+    # ------------------------------------------------------------------
+    # Recalcul par lots
+    # ------------------------------------------------------------------
+
+    def recompute(self, arrays) -> int:
+        """
+        🔁 Reconstruire l'état depuis un historique aligné (BarArrays)
+
+        Les symboles de l'historique repartent de zéro ; les barres sont
+        rejouées dans l'ordre avec la mise à jour incrémentale.
+
+        Returns:
+            Nombre de barres rejouées
+        """
+        idx = self.indices(arrays.symbols)
+        with self._lock:
+            for array in self._state.values():
+                array[idx] = 0.0
+            self._ring[idx] = 0.0
+
+        bars = self.advance(arrays)
+        self.batch_recomputes += 1
+        logger.info(f"📉 Indicateurs recalculés : {len(arrays.symbols)} symboles, {bars} barres")
+        return bars
+
+    def advance(self, arrays) -> int:
+        """
+        ⏩ Rejouer des barres (BarArrays) sur l'état courant, sans remise à zéro
+
+        Returns:
+            Nombre de barres rejouées
+        """
+        idx = self.indices(arrays.symbols)
+        bars = 0
+        for t in range(arrays.close.shape[1]):
+            close = arrays.close[:, t]
+            self.update(idx, arrays.open[:, t], arrays.high[:, t], arrays.low[:, t], close,
+                        np.nan_to_num(arrays.volume[:, t]))
+            bars += int(np.isfinite(close).sum())
+        return bars
+
+    def load_store(self, symbols: Sequence[str], timeframe: str, limit: Optional[int] = None,
+                   store=None) -> int:
+        """📥 Recalcul depuis le store OHLCV (une requête pour tout l'univers, limit dernières barres)"""
+        from database.market_store import get_market_store
+
+        store = store or get_market_store()
+        end = datetime.now(timezone.utc)
+        start = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        if limit is not None:
+            start = end - (limit + 1) * timeframe_duration(timeframe)
+        arrays = store.read_range(list(symbols), timeframe, start, end)
+        if limit is not None:
+            arrays.timestamps = arrays.timestamps[-limit:]
+            for name in ("open", "high", "low", "close", "volume"):
+                setattr(arrays, name, getattr(arrays, name)[:, -limit:])
+        return self.recompute(arrays)
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def snapshot(self, symbols: Optional[Sequence[str]] = None) -> IndicatorSnapshot:
+        """📊 Indicateurs courants (tableaux) ; symboles inconnus : bars = 0"""
+        symbols = list(self._symbols if symbols is None else symbols)
+        known = np.array([symbol in self._index for symbol in symbols], dtype=bool)
+        idx = np.array([self._index.get(symbol, 0) for symbol in symbols], dtype=np.intp)
+        cfg, s = self.config, self._state
+
+        count = np.where(known, s["count"][idx], 0.0)
+        close = s["prev_close"][idx]
+        ema_fast, ema_slow, signal = s["ema_fast"][idx], s["ema_slow"][idx], s["macd_signal"][idx]
+        macd = ema_fast - ema_slow
+        avg_gain, avg_loss, atr = s["avg_gain"][idx], s["avg_loss"][idx], s["atr"][idx]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = np.where(avg_loss > 0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss),
+                           np.where(avg_gain > 0, 100.0, 50.0))
+            n = np.maximum(np.minimum(count, cfg.bb_period), 1.0)
+            mid = s["bb_sum"][idx] / n
+            std = np.sqrt(np.maximum(s["bb_sumsq"][idx] / n - mid * mid, 0.0))
+            upper, lower = mid + cfg.bb_std * std, mid - cfg.bb_std * std
+            band = upper - lower
+            percent_b = np.where(band > 0, (close - lower) / band, 0.5)
+            width = np.where(mid > 0, band / mid, 0.0)
+            atr_pct = np.where(close > 0, atr / close, 0.0)
+            vwap = np.where(s["cum_volume"][idx] > 0, s["cum_pv"][idx] / s["cum_volume"][idx], close)
+            trend = np.where(atr > 0, np.tanh(macd / atr), 0.0)
+
+        values = {
+            "ema_fast": ema_fast, "ema_slow": ema_slow, "rsi": rsi, "macd": macd, "macd_signal": signal,
+            "macd_hist": macd - signal, "atr": atr, "atr_pct": atr_pct, "bb_mid": mid, "bb_upper": upper,
+            "bb_lower": lower, "bb_percent_b": percent_b, "bb_width": width, "vwap": vwap,
+            "trend_strength": trend
+        }
+        return IndicatorSnapshot(symbols, count.astype(np.int64), values)
+
+    def features(self, symbols: Sequence[str], min_bars: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+        """
+        🧮 Indicateurs par symbole (dictionnaires arrondis, prompts / JSON)
+
+        Seuls les symboles ayant au moins min_bars barres (défaut : période
+        lente du MACD) sont renvoyés.
+        """
+        min_bars = self.config.ema_slow if min_bars is None else min_bars
+        snapshot = self.snapshot(symbols)
+        ready = snapshot.ready(min_bars)
+        return {
+            symbol: {name: round(float(snapshot.values[name][i]), 4) for name in FEATURES}
+            for i, symbol in enumerate(snapshot.symbols) if ready[i]
+        }
+
+    def get_stats(self) -> Dict[str, int]:
+        """📊 Statistiques du moteur"""
+        return {
+            "symbols": len(self._symbols),
+            "updates": self.updates,
+            "bars_processed": self.bars_processed,
+            "batch_recomputes": self.batch_recomputes
+        }
+
+def timeframe_duration(timeframe: str) -> timedelta:
+    """Durée d'une barre ("1m", "15m", "1h", "1d", ...)"""
+    units = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+    return timedelta(**{units[timeframe[-1]]: int(timeframe[:-1])})
+
+def trend_strength_history(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                           config: Optional[IndicatorConfig] = None) -> np.ndarray:
+    """
+    📈 trend_strength (tanh(MACD / ATR)) à chaque barre d'un historique complet
+
+    Mêmes lissages que la mise à jour incrémentale, appliqués par filtre
+    récursif sur l'axe du temps (matrices symboles × barres sans NaN).
+    """
+    from scipy.signal import lfilter
+
+    cfg = config or IndicatorConfig()
+    close = np.asarray(close, dtype=np.float64)
+    if close.shape[1] == 0:
+        return close.copy()
+
+    def smooth(values: np.ndarray, alpha: float) -> np.ndarray:
+        # y0 = x0, y_t = y_{t-1} + α (x_t - y_{t-1})
+        smoothed, _ = lfilter([alpha], [1.0, alpha - 1.0], values, axis=1, zi=(1.0 - alpha) * values[:, :1])
+        return smoothed
+
+    macd = smooth(close, 2.0 / (cfg.ema_fast + 1)) - smooth(close, 2.0 / (cfg.ema_slow + 1))
+    prev_close = np.concatenate([close[:, :1], close[:, :-1]], axis=1)
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    true_range[:, 0] = high[:, 0] - low[:, 0]  # amorçage : première barre sans clôture précédente
+    atr = smooth(true_range, 1.0 / cfg.atr_period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(atr > 0, np.tanh(macd / atr), 0.0)
+
+# Instance globale
+_indicator_engine: Optional[IndicatorEngine] = None
+
+def get_indicator_engine() -> IndicatorEngine:
+    """📉 Obtenir le moteur d'indicateurs partagé"""
+    global _indicator_engine
+    if _indicator_engine is None:
+        _indicator_engine = IndicatorEngine(IndicatorConfig.from_settings())
+    return _indicator_engine
@@ -17,11 +17,43 @@ from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, asdict
 from enum import Enum
 import asyncio
-from scipy.optimize import minimize
-import pandas as pd
+import time
+
+from app.orchestrator.simulation_engine import PathSimulator, DAILY_DT
+from app.orchestrator.risk_engine import get_risk_engine, RiskSimulationResult
+from app.orchestrator.frontier_solver import FrontierSolver, EfficientFrontier
+from app.orchestrator.allocation_constraints import ConstraintSpec, GroupConstraint
+from app.orchestrator.universe_optimizer import UniverseOptimizer, UniverseAllocation
+from app.orchestrator.covariance_service import get_covariance_service, CovarianceEstimate
+from app.integrations.position_ledger import CRYPTO_QUOTES, asset_class_for, get_position_ledger
 
 logger = logging.getLogger(__name__)
 
+# Paramètres des processus de prix simulés par type d'asset
+ASSET_PROCESS_PARAMS = {
+    "meme_coins": {"drift": 0.15, "volatility": 0.80, "mean_reversion": 0.1},
+    "crypto_lt": {"drift": 0.12, "volatility": 0.45, "mean_reversion": 0.05},
+    "forex": {"drift": 0.02, "volatility": 0.15, "mean_reversion": 0.3},
+    "etf": {"drift": 0.08, "volatility": 0.18, "mean_reversion": 0.02}
+}
+
+# Cryptos classées en meme coins (les autres cryptos : crypto_lt)
+MEME_COINS = frozenset({"DOGE", "SHIB", "PEPE", "FLOKI", "BONK", "WIF"})
+
+def allocation_bucket(symbol: str, default_class: str = "stock") -> str:
+    """Type d'asset de l'allocation (clé de ASSET_PROCESS_PARAMS) d'un symbole coté"""
+    asset_class = asset_class_for(symbol, default_class)
+    if asset_class == "crypto":
+        base = symbol.upper()
+        for quote in CRYPTO_QUOTES:
+            if base.endswith(quote) and len(base) > len(quote):
+                base = base[:-len(quote)]
+                break
+        return "meme_coins" if base in MEME_COINS else "crypto_lt"
+    if asset_class == "forex":
+        return "forex"
+    return "etf"  # ETF et actions
+
 class AllocationStrategy(Enum):
     """Stratégies d'allocation de portefeuille"""
     CONSERVATIVE = "conservative"
@@ -39,6 +71,25 @@ class RiskLevel(Enum):
     HIGH = "high"
     VERY_HIGH = "very_high"
 
+# Bornes par asset selon le niveau de risque
+RISK_LEVEL_BOUNDS = {
+    RiskLevel.VERY_LOW: {"meme_coins": (0.0, 0.10), "crypto_lt": (0.0, 0.30), "forex": (0.1, 0.40), "etf": (0.4, 0.80)},
+    RiskLevel.LOW: {"meme_coins": (0.0, 0.20), "crypto_lt": (0.0, 0.40), "forex": (0.1, 0.50), "etf": (0.3, 0.70)},
+    RiskLevel.MEDIUM: {"meme_coins": (0.0, 0.30), "crypto_lt": (0.0, 0.50), "forex": (0.1, 0.60), "etf": (0.2, 0.60)},
+    RiskLevel.HIGH: {"meme_coins": (0.0, 0.40), "crypto_lt": (0.0, 0.60), "forex": (0.0, 0.70), "etf": (0.1, 0.50)},
+    RiskLevel.VERY_HIGH: {"meme_coins": (0.0, 0.50), "crypto_lt": (0.0, 0.70), "forex": (0.0, 0.80), "etf": (0.0, 0.40)}
+}
+
+# Plafonds d'exposition selon le niveau de risque
+RISK_LEVEL_CAPS = {
+    RiskLevel.VERY_LOW: [
+        GroupConstraint("speculative", ["meme_coins"], max_weight=0.10),
+        GroupConstraint("etf_cap", ["etf"], max_weight=0.60)
+    ],
+    RiskLevel.LOW: [GroupConstraint("speculative", ["meme_coins"], max_weight=0.20)],
+    RiskLevel.HIGH: [GroupConstraint("speculative", ["meme_coins"], max_weight=0.40)]
+}
+
 class RebalanceFrequency(Enum):
     """Fréquences de rééquilibrage"""
     DAILY = "daily"
@@ -107,6 +158,16 @@ class OptimizationResult:
     constraints_satisfied: bool
     optimization_time_ms: float
 
+def rebalance_trades(current_weights: np.ndarray, target_weights: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    ⚖️ Ordres de rééquilibrage en poids (cible - courant)
+    
+    Seuls les assets dont le drift dépasse le seuil sont ramenés à leur cible ;
+    règle partagée par generate_rebalance_recommendations et le backtest.
+    """
+    drift = np.asarray(target_weights, dtype=np.float64) - np.asarray(current_weights, dtype=np.float64)
+    return np.where(np.abs(drift) > threshold, drift, 0.0)
+
 class PortfolioOptimizer:
     """
     💼 OPTIMISEUR DE PORTEFEUILLE INTELLIGENT
@@ -118,7 +179,7 @@ class PortfolioOptimizer:
     - Stratégies personnalisées par profil de risque
     """
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         self.allocations: Dict[str, AssetAllocation] = {}
         self.optimization_history: List[OptimizationResult] = []
         self.rebalance_history: List[RebalanceRecommendation] = []
@@ -138,10 +199,38 @@ class PortfolioOptimizer:
             "min_liquidity": 0.20      # Min 20% en assets liquides
         }
         
+        # Univers d'allocation (ordre des vecteurs de rendements / covariance)
+        self.asset_universe: List[str] = list(ASSET_PROCESS_PARAMS)
+        
         # Paramètres d'optimisation
         self.lookback_period = 252  # 1 an de données
         self.optimization_iterations = 1000
         self.monte_carlo_simulations = 10000
+        self.frontier_points = 100
+        
+        # Historique de marché mémoïsé par rafraîchissement (nouvelles barres ou TTL) :
+        # estimations stables, frontière lue en cache entre deux rafraîchissements
+        self.market_data_ttl = 300.0  # secondes, cadence de market-data-sync
+        self._market_data: Optional[Dict[str, List[float]]] = None
+        self._market_data_at = 0.0
+        
+        # Générateur de trajectoires seedé (runs reproductibles)
+        self.simulator = PathSimulator(seed)
+        
+        # Frontière efficiente résolue en batch et mise en cache
+        self.frontier_solver = FrontierSolver(
+            n_points=self.frontier_points,
+            max_iterations=self.optimization_iterations
+        )
+        self.universe_optimizer = UniverseOptimizer()
+        
+        # Rendements / covariances partagés (prédictif, tâches de risque)
+        self.covariance_service = get_covariance_service()
+        self.covariance_estimator = "sample"  # "sample", "ledoit_wolf", "ewma"
+        
+        # Derniers prix reçus du flux temps réel (symbole -> prix, horodatage)
+        self.live_prices: Dict[str, float] = {}
+        self.live_prices_at: Optional[datetime] = None
         
         # Métriques de performance
         self.total_optimizations = 0
@@ -254,89 +343,87 @@ class PortfolioOptimizer:
             )
 
     async def _collect_market_data(self) -> Dict[str, List[float]]:
-        """📊 Collecter les données de marché pour optimisation"""
+        """📊 Collecter les données de marché pour optimisation (mémoïsées jusqu'au prochain rafraîchissement)"""
         
         try:
+            if self._market_data is not None and time.monotonic() - self._market_data_at < self.market_data_ttl:
+                return self._market_data
+            
             # Simuler la collecte de données historiques de prix
             # En production, connecté aux APIs de marché réelles
             
-            assets = ["meme_coins", "crypto_lt", "forex", "etf"]
-            market_data = {}
+            assets = self.asset_universe
             
-            for asset in assets:
-                # Générer des données de prix simulées avec caractéristiques réalistes
-                prices = await self._generate_realistic_price_series(asset)
-                market_data[asset] = prices
+            # Générer toutes les séries en un seul batch vectorisé
+            paths = self._generate_price_paths(assets, n_paths=1)
+            market_data = {
+                asset: paths[0, i].tolist()
+                for i, asset in enumerate(assets)
+            }
             
+            self._market_data = market_data
+            self._market_data_at = time.monotonic()
             return market_data
             
         except Exception as e:
             logger.error(f"❌ Erreur collecte données marché: {e}")
             return {}
 
+    def refresh_market_data(self):
+        """🔄 Invalider l'historique mémoïsé (prochaine collecte = nouvelles estimations)"""
+        self._market_data = None
+
+    def _generate_price_paths(self, asset_types: List[str], n_paths: int = 1, n_steps: int = None) -> np.ndarray:
+        """📈 Générer des trajectoires de prix réalistes (n_paths, n_assets, n_steps)"""
+        
+        # Paramètres par type d'asset
+        params = [
+            ASSET_PROCESS_PARAMS.get(asset_type, ASSET_PROCESS_PARAMS["etf"])
+            for asset_type in asset_types
+        ]
+        
+        # Modèle d'Ornstein-Uhlenbeck avec drift, pas journalier
+        return self.simulator.ou(
+            s0=100.0,
+            drift=[p["drift"] for p in params],
+            volatility=[p["volatility"] for p in params],
+            mean_reversion=[p["mean_reversion"] for p in params],
+            n_steps=n_steps or self.lookback_period,
+            n_paths=n_paths,
+            long_run_level=100.0,
+            dt=DAILY_DT,
+            floor=1.0  # Prix minimum
+        )
+
     async def _generate_realistic_price_series(self, asset_type: str) -> List[float]:
         """📈 Générer une série de prix réaliste pour un asset"""
         
         try:
-            # Paramètres par type d'asset
-            params = {
-                "meme_coins": {"drift": 0.15, "volatility": 0.80, "mean_reversion": 0.1},
-                "crypto_lt": {"drift": 0.12, "volatility": 0.45, "mean_reversion": 0.05},
-                "forex": {"drift": 0.02, "volatility": 0.15, "mean_reversion": 0.3},
-                "etf": {"drift": 0.08, "volatility": 0.18, "mean_reversion": 0.02}
-            }
-            
-            asset_params = params.get(asset_type, params["etf"])
-            
-            # Générer série avec processus stochastique
-            n_periods = self.lookback_period
-            dt = 1/252  # Pas journalier
-            
-            prices = [100.0]  # Prix initial
-            
-            for i in range(n_periods - 1):
-                # Modèle d'Ornstein-Uhlenbeck avec drift
-                current_price = prices[-1]
-                
-                # Composante de drift
-                drift = asset_params["drift"] * dt
-                
-                # Composante de mean reversion
-                mean_reversion = asset_params["mean_reversion"] * (100 - current_price) * dt
-                
-                # Composante stochastique
-                shock = np.random.normal(0, asset_params["volatility"] * np.sqrt(dt))
-                
-                # Prix suivant
-                next_price = current_price * (1 + drift + mean_reversion + shock)
-                next_price = max(1.0, next_price)  # Prix minimum
-                
-                prices.append(next_price)
-            
-            return prices
+            return self._generate_price_paths([asset_type])[0, 0].tolist()
             
         except Exception as e:
             logger.error(f"❌ Erreur génération série prix {asset_type}: {e}")
             return [100.0] * self.lookback_period
 
+    def _estimate_covariance(self, market_data: Dict[str, List[float]]) -> Optional[CovarianceEstimate]:
+        """🔗 Estimation partagée (log-rendements calculés une fois par jeu de prix)"""
+        
+        symbols = list(market_data)
+        self.covariance_service.load_prices(symbols, market_data, window=self.lookback_period)
+        return self.covariance_service.estimate(symbols, self.lookback_period, self.covariance_estimator)
+
     async def _calculate_correlation_matrix(self, market_data: Dict[str, List[float]]) -> np.ndarray:
         """🔗 Calculer la matrice de corrélation entre assets"""
         
         try:
             if not market_data:
-                return np.eye(4)  # Matrice identité par défaut
+                return np.eye(len(self.asset_universe))  # Matrice identité par défaut
             
-            # Calculer les rendements
-            returns_data = {}
-            for asset, prices in market_data.items():
-                returns = [(prices[i]/prices[i-1] - 1) for i in range(1, len(prices))]
-                returns_data[asset] = returns
+            estimate = self._estimate_covariance(market_data)
+            if estimate is None:
+                return np.eye(len(market_data))
             
-            # Convertir en DataFrame pour calcul facilité
-            df = pd.DataFrame(returns_data)
-            correlation_matrix = df.corr().values
-            
-            return correlation_matrix
+            return estimate.correlation
             
         except Exception as e:
             logger.error(f"❌ Erreur calcul matrice corrélation: {e}")
@@ -346,22 +433,18 @@ class PortfolioOptimizer:
         """📊 Estimer les rendements et volatilités attendus"""
         
         try:
+            estimate = self._estimate_covariance(market_data)
+            if estimate is None:
+                raise ValueError("historique insuffisant")
+            
             expected_returns = []
             volatilities = []
             
-            for asset, prices in market_data.items():
-                # Calculer les rendements
-                returns = [(prices[i]/prices[i-1] - 1) for i in range(1, len(prices))]
-                
-                # Rendement moyen annualisé
-                mean_return = np.mean(returns) * 252
-                
-                # Volatilité annualisée
-                volatility = np.std(returns) * np.sqrt(252)
-                
+            # Rendements et volatilités annualisés issus du service partagé
+            for asset, mean_return, volatility in zip(estimate.symbols, estimate.expected_returns, estimate.volatilities):
                 # Ajustement pour conditions de marché futures
-                adjusted_return = await self._adjust_expected_return(asset, mean_return)
-                adjusted_volatility = await self._adjust_expected_volatility(asset, volatility)
+                adjusted_return = await self._adjust_expected_return(asset, float(mean_return))
+                adjusted_volatility = await self._adjust_expected_volatility(asset, float(volatility))
                 
                 expected_returns.append(adjusted_return)
                 volatilities.append(adjusted_volatility)
@@ -426,64 +509,21 @@ class PortfolioOptimizer:
                               correlation_matrix: np.ndarray,
                               strategy: AllocationStrategy,
                               risk_level: RiskLevel) -> Dict[str, float]:
-        """⚡ Optimiser les poids selon la stratégie"""
+        """⚡ Optimiser les poids selon la stratégie (lecture de la frontière efficiente)"""
         
         try:
             n_assets = len(expected_returns)
-            asset_names = ["meme_coins", "crypto_lt", "forex", "etf"]
+            asset_names = self.asset_universe
             
-            # Matrice de covariance
+            # Matrice de covariance (calculée une fois par frontière)
             cov_matrix = np.outer(volatilities, volatilities) * correlation_matrix
             
-            # Fonction objectif selon la stratégie
-            def objective_function(weights):
-                portfolio_return = np.dot(weights, expected_returns)
-                portfolio_volatility = np.sqrt(np.dot(weights, np.dot(cov_matrix, weights)))
-                
-                if strategy == AllocationStrategy.CONSERVATIVE:
-                    # Minimiser le risque
-                    return portfolio_volatility
-                elif strategy == AllocationStrategy.AGGRESSIVE:
-                    # Maximiser le rendement ajusté du risque
-                    return -(portfolio_return - 0.5 * portfolio_volatility)
-                elif strategy == AllocationStrategy.MOMENTUM:
-                    # Favoriser les assets avec momentum
-                    momentum_score = sum(weights[i] * (expected_returns[i] if expected_returns[i] > 0 else 0) for i in range(n_assets))
-                    return -(momentum_score - 0.3 * portfolio_volatility)
-                else:  # BALANCED par défaut
-                    # Maximiser le ratio de Sharpe
-                    risk_free_rate = 0.02  # 2%
-                    return -((portfolio_return - risk_free_rate) / portfolio_volatility)
-            
-            # Contraintes
-            constraints = []
-            
-            # Somme des poids = 1
-            constraints.append({'type': 'eq', 'fun': lambda w: np.sum(w) - 1})
-            
-            # Contraintes selon le niveau de risque
-            risk_constraints = self._get_risk_constraints(risk_level)
-            constraints.extend(risk_constraints)
-            
-            # Bornes pour chaque asset
-            bounds = self._get_asset_bounds(strategy, risk_level)
-            
-            # Poids initiaux (équipondéré)
-            initial_weights = np.array([1/n_assets] * n_assets)
-            
-            # Optimisation
-            result = minimize(
-                objective_function,
-                initial_weights,
-                method='SLSQP',
-                bounds=bounds,
-                constraints=constraints,
-                options={'maxiter': self.optimization_iterations}
-            )
+            frontier = self._get_frontier(expected_returns, cov_matrix, strategy, risk_level)
             
-            if result.success:
+            if frontier is not None:
+                weights = self._select_frontier_point(frontier, strategy, expected_returns)
                 optimal_weights = {
-                    asset_names[i]: float(result.x[i]) 
+                    asset_names[i]: float(weights[i]) 
                     for i in range(n_assets)
                 }
             else:
@@ -498,67 +538,175 @@ class PortfolioOptimizer:
             logger.error(f"❌ Erreur optimisation poids: {e}")
             # Retour sécurisé : équipondération
             return {
-                "meme_coins": 0.25,
-                "crypto_lt": 0.25,
-                "forex": 0.25,
-                "etf": 0.25
+                asset: 1 / len(self.asset_universe)
+                for asset in self.asset_universe
             }
 
-    def _get_risk_constraints(self, risk_level: RiskLevel) -> List[Dict]:
-        """🛡️ Obtenir les contraintes selon le niveau de risque"""
+    def _get_frontier(self,
+                      expected_returns: np.ndarray,
+                      cov_matrix: np.ndarray,
+                      strategy: AllocationStrategy,
+                      risk_level: RiskLevel,
+                      n_points: Optional[int] = None) -> Optional[EfficientFrontier]:
+        """📐 Frontière efficiente (cache) d'un niveau de risque, partagée par toutes les stratégies"""
+        
+        constraints = self._get_constraint_spec(strategy, risk_level).compile(self.asset_universe)
+        a_ub, b_ub = constraints.linear_inequalities()
+        
+        return self.frontier_solver.solve(
+            expected_returns, cov_matrix, constraints.weight_bounds(), a_ub, b_ub, n_points
+        )
+
+    def _select_frontier_point(self,
+                               frontier: EfficientFrontier,
+                               strategy: AllocationStrategy,
+                               expected_returns: np.ndarray) -> np.ndarray:
+        """🎯 Choisir le point de la frontière correspondant à la stratégie"""
+        
+        if strategy == AllocationStrategy.CONSERVATIVE:
+            # Minimiser le risque
+            return frontier.min_variance()
+        elif strategy == AllocationStrategy.AGGRESSIVE:
+            # Maximiser le rendement ajusté du risque
+            return frontier.max_utility(0.5)
+        elif strategy == AllocationStrategy.MOMENTUM:
+            # Points réévalués sur les rendements positifs, pénalité de risque réduite
+            return frontier.max_utility(0.3, np.maximum(expected_returns, 0.0))
+        else:  # BALANCED par défaut
+            # Maximiser le ratio de Sharpe
+            return frontier.max_sharpe(risk_free_rate=0.02)
+
+    async def compute_efficient_frontier(self,
+                                         risk_level: RiskLevel = None,
+                                         strategy: AllocationStrategy = None,
+                                         n_points: Optional[int] = None) -> Optional[EfficientFrontier]:
+        """📐 Calculer la frontière efficiente complète sur les données de marché courantes"""
         
-        constraints = []
+        try:
+            market_data = await self._collect_market_data()
+            correlation_matrix = await self._calculate_correlation_matrix(market_data)
+            expected_returns, volatilities = await self._estimate_returns_and_volatility(market_data)
+            cov_matrix = np.outer(volatilities, volatilities) * correlation_matrix
+            
+            return self._get_frontier(
+                expected_returns, cov_matrix,
+                strategy or self.default_strategy,
+                risk_level or self.default_risk_level,
+                n_points
+            )
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur calcul frontière efficiente: {e}")
+            return None
+
+    def _get_constraint_spec(self, strategy: AllocationStrategy, risk_level: RiskLevel) -> ConstraintSpec:
+        """📏 Contraintes déclaratives selon le niveau de risque (bornes + plafonds)"""
         
         try:
-            if risk_level == RiskLevel.VERY_LOW:
-                # Max 10% en assets risqués
-                constraints.append({
-                    'type': 'ineq', 
-                    'fun': lambda w: 0.1 - w[0]  # meme_coins <= 10%
-                })
-                constraints.append({
-                    'type': 'ineq',
-                    'fun': lambda w: 0.6 - w[3]  # etf >= 60%
-                })
-            elif risk_level == RiskLevel.LOW:
-                # Max 20% en assets risqués
-                constraints.append({
-                    'type': 'ineq',
-                    'fun': lambda w: 0.2 - w[0]  # meme_coins <= 20%
-                })
-            elif risk_level == RiskLevel.HIGH:
-                # Peut aller jusqu'à 40% en meme coins
-                constraints.append({
-                    'type': 'ineq',
-                    'fun': lambda w: 0.4 - w[0]
-                })
-            elif risk_level == RiskLevel.VERY_HIGH:
-                # Très peu de contraintes
-                pass
-                
+            return ConstraintSpec(
+                asset_bounds=dict(RISK_LEVEL_BOUNDS.get(risk_level, RISK_LEVEL_BOUNDS[RiskLevel.VERY_HIGH])),
+                groups=list(RISK_LEVEL_CAPS.get(risk_level, []))
+            )
+            
         except Exception as e:
             logger.error(f"❌ Erreur contraintes risque: {e}")
+            return ConstraintSpec()  # Pas de contraintes
+
+    def estimate_universe(self,
+                          symbols: List[str],
+                          timeframe: str = "1d",
+                          end: Optional[datetime] = None,
+                          include_live: bool = True) -> Optional[CovarianceEstimate]:
+        """
+        🕯️ Estimer rendements / covariance d'un univers réel depuis l'historique
+        
+        Archive Parquet/Arrow locale en priorité, sinon une seule requête au
+        store OHLCV ; la fenêtre de lookback est chargée dans le service de
+        covariance partagé. include_live : derniers prix du flux en clôture
+        provisoire (désactivé pour les chargements suivis de barres réelles).
+        """
         
-        return constraints
+        try:
+            from database.market_archive import get_market_archive
+            from database.market_store import get_market_store
+            
+            end = end or datetime.utcnow()
+            start = end - timedelta(days=366)  # un an de barres
+            closes = get_market_archive().read_universe(symbols, timeframe, start, end).aligned_close()
+            if closes.shape[1] < 3:
+                closes = get_market_store().read_range(symbols, timeframe, start, end).aligned_close()
 
-    def _get_asset_bounds(self, strategy: AllocationStrategy, risk_level: RiskLevel) -> List[Tuple[float, float]]:
-        """📏 Obtenir les bornes pour chaque asset"""
+            # Barre en cours : derniers prix du flux temps réel en clôture provisoire
+            live = [self.live_prices.get(symbol) for symbol in symbols]
+            if include_live and closes.shape[1] and all(price is not None for price in live):
+                closes = np.column_stack([closes, live])
+            closes = closes[:, -(self.lookback_period + 1):]
+
+            if closes.shape[1] < 3:
+                logger.warning(f"⚠️ Historique insuffisant pour {len(symbols)} symboles ({timeframe})")
+                return None
+            
+            self.covariance_service.load_prices(symbols, closes, window=self.lookback_period)
+            return self.covariance_service.estimate(symbols, self.lookback_period, self.covariance_estimator)
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur estimation univers depuis le store: {e}")
+            return None
+
+    def on_bars(self, arrays):
+        """
+        🕯️ Nouvelles barres synchronisées (BarArrays) : covariance de l'univers à jour
+        
+        Univers déjà chargé : une mise à jour de rang 1 par barre complète
+        (tous les symboles cotés) ; sinon chargement de l'historique.
+        L'historique mémoïsé de l'optimisation est rafraîchi.
+        """
         
         try:
-            if risk_level == RiskLevel.VERY_LOW:
-                return [(0.0, 0.10), (0.0, 0.30), (0.1, 0.40), (0.4, 0.80)]  # meme, crypto, forex, etf
-            elif risk_level == RiskLevel.LOW:
-                return [(0.0, 0.20), (0.0, 0.40), (0.1, 0.50), (0.3, 0.70)]
-            elif risk_level == RiskLevel.MEDIUM:
-                return [(0.0, 0.30), (0.0, 0.50), (0.1, 0.60), (0.2, 0.60)]
-            elif risk_level == RiskLevel.HIGH:
-                return [(0.0, 0.40), (0.0, 0.60), (0.0, 0.70), (0.1, 0.50)]
-            else:  # VERY_HIGH
-                return [(0.0, 0.50), (0.0, 0.70), (0.0, 0.80), (0.0, 0.40)]
-                
+            if arrays.n_bars == 0:
+                return
+            
+            self.refresh_market_data()
+            symbols = list(arrays.symbols)
+            if self.covariance_service.returns_matrix(symbols, self.lookback_period) is None:
+                self.estimate_universe(symbols, arrays.timeframe, include_live=False)
+                return
+            
+            complete = ~np.isnan(arrays.close).any(axis=0)
+            for t in np.flatnonzero(complete):
+                self.covariance_service.update(symbols, arrays.close[:, t])
+            
         except Exception as e:
-            logger.error(f"❌ Erreur bornes assets: {e}")
-            return [(0.0, 1.0)] * 4  # Pas de contraintes
+            logger.error(f"❌ Erreur mise à jour covariance sur nouvelles barres: {e}")
+
+    def optimize_universe(self,
+                          symbols: List[str],
+                          expected_returns: np.ndarray,
+                          cov_matrix: np.ndarray,
+                          spec: ConstraintSpec,
+                          strategy: AllocationStrategy = None) -> UniverseAllocation:
+        """
+        🌍 Optimiser un univers de N symboles (top crypto, univers ETF, ...)
+        
+        Args:
+            symbols: Univers ordonné, aligné sur expected_returns / cov_matrix
+            spec: Contraintes déclaratives (bornes, groupes, turnover)
+            strategy: Stratégie d'allocation (BALANCED par défaut)
+        """
+        strategy = strategy or self.default_strategy
+        
+        if strategy == AllocationStrategy.CONSERVATIVE:
+            return self.universe_optimizer.optimize(symbols, expected_returns, cov_matrix, spec, "min_variance")
+        elif strategy == AllocationStrategy.AGGRESSIVE:
+            return self.universe_optimizer.optimize(
+                symbols, expected_returns, cov_matrix, spec, "max_utility", volatility_penalty=0.5
+            )
+        elif strategy == AllocationStrategy.MOMENTUM:
+            return self.universe_optimizer.optimize(
+                symbols, np.maximum(expected_returns, 0.0), cov_matrix, spec, "max_utility", volatility_penalty=0.3
+            )
+        else:  # BALANCED par défaut
+            return self.universe_optimizer.optimize(symbols, expected_returns, cov_matrix, spec, "max_sharpe")
 
     async def _calculate_expected_metrics(self, 
                                         weights: Dict[str, float],
@@ -568,7 +716,7 @@ class PortfolioOptimizer:
         """📊 Calculer les métriques attendues du portefeuille"""
         
         try:
-            asset_names = ["meme_coins", "crypto_lt", "forex", "etf"]
+            asset_names = self.asset_universe
             w = np.array([weights[asset] for asset in asset_names])
             
             # Rendement du portefeuille
@@ -582,7 +730,8 @@ class PortfolioOptimizer:
             risk_free_rate = 0.02
             sharpe_ratio = (portfolio_return - risk_free_rate) / portfolio_volatility if portfolio_volatility > 0 else 0
             
-            # VaR 95% (approximation normale)
+            # VaR 95% (approximation normale, forme fermée : le Monte Carlo
+            # reste réservé à calculate_portfolio_metrics)
             var_95 = -1.65 * portfolio_volatility  # Z-score 95%
             
             # Calmar ratio (approximation)
@@ -704,20 +853,17 @@ class PortfolioOptimizer:
             if not market_data:
                 return 0.0
             
-            quality_scores = []
+            # Log-rendements déjà calculés par le service partagé
+            symbols = list(market_data)
+            returns = self.covariance_service.load_prices(symbols, market_data, window=self.lookback_period)
             
-            for asset, prices in market_data.items():
-                # Vérifier completude
-                completeness = len(prices) / self.lookback_period
-                
-                # Vérifier variance (éviter données plates)
-                returns = [(prices[i]/prices[i-1] - 1) for i in range(1, len(prices))]
-                variance_score = 1.0 if np.std(returns) > 0.001 else 0.3
-                
-                asset_score = (completeness + variance_score) / 2
-                quality_scores.append(asset_score)
+            # Vérifier completude
+            completeness = np.array([len(market_data[asset]) for asset in symbols]) / self.lookback_period
+            
+            # Vérifier variance (éviter données plates)
+            variance_score = np.where(returns.std(axis=0) > 0.001, 1.0, 0.3)
             
-            return np.mean(quality_scores)
+            return float(np.mean((completeness + variance_score) / 2))
             
         except Exception as e:
             logger.error(f"❌ Erreur évaluation qualité données: {e}")
@@ -784,11 +930,18 @@ class PortfolioOptimizer:
         
         try:
             recommendations = []
+            allocations = list(self.allocations.values())
+            trades = rebalance_trades(
+                np.array([allocation.current_weight for allocation in allocations]),
+                np.array([allocation.target_weight for allocation in allocations]),
+                self.rebalance_threshold
+            )
             
-            for asset_type, allocation in self.allocations.items():
-                weight_drift = abs(allocation.current_weight - allocation.target_weight)
+            for allocation, trade in zip(allocations, trades):
+                asset_type = allocation.asset_type
+                weight_drift = abs(trade)
                 
-                if weight_drift > self.rebalance_threshold:
+                if trade != 0.0:
                     # Déterminer l'action
                     if allocation.current_weight > allocation.target_weight:
                         action = "sell"
@@ -842,8 +995,42 @@ class PortfolioOptimizer:
             logger.error(f"❌ Erreur génération recommandations: {e}")
             return []
 
-    async def calculate_portfolio_metrics(self, weights: Dict[str, float] = None) -> PortfolioMetrics:
-        """📊 Calculer les métriques complètes du portefeuille"""
+    async def _simulate_risk(self,
+                             weights: np.ndarray,
+                             expected_returns: np.ndarray,
+                             volatilities: np.ndarray,
+                             correlation_matrix: np.ndarray,
+                             n_scenarios: Optional[int] = None,
+                             time_budget_s: Optional[float] = None) -> RiskSimulationResult:
+        """🎲 Simulation Monte Carlo du portefeuille hors de la boucle asyncio"""
+        
+        return await get_risk_engine().simulate_async(
+            weights,
+            expected_returns,
+            volatilities,
+            correlation_matrix,
+            n_scenarios=n_scenarios or self.monte_carlo_simulations,
+            horizon_days=self.lookback_period,
+            time_budget_s=time_budget_s,
+            seed=self.simulator.seed
+        )
+
+    async def calculate_portfolio_metrics(self,
+                                          weights: Dict[str, float] = None,
+                                          n_scenarios: Optional[int] = None,
+                                          time_budget_s: Optional[float] = None
+                                          ) -> Tuple[PortfolioMetrics, Optional[RiskSimulationResult]]:
+        """
+        📊 Calculer les métriques complètes du portefeuille
+        
+        Args:
+            weights: Poids par asset (poids actuels si non spécifiés)
+            n_scenarios: Nombre de scénarios Monte Carlo (défaut: monte_carlo_simulations)
+            time_budget_s: Budget de temps de la simulation
+            
+        Returns:
+            Métriques et simulation Monte Carlo de cet appel (None en cas d'erreur)
+        """
         
         try:
             # Utiliser poids actuels si non spécifiés
@@ -853,27 +1040,52 @@ class PortfolioOptimizer:
                     for asset, alloc in self.allocations.items()
                 } if self.allocations else {"etf": 1.0}
             
-            # Simuler métriques (en production, calculs réels)
+            # Estimations de marché (mêmes entrées que l'optimisation)
+            market_data = await self._collect_market_data()
+            asset_names = list(market_data.keys())
+            correlation_matrix = await self._calculate_correlation_matrix(market_data)
+            expected_returns, volatilities = await self._estimate_returns_and_volatility(market_data)
+            
+            w = np.array([weights.get(asset, 0.0) for asset in asset_names])
+            w = w / w.sum() if w.sum() > 0 else np.full(len(asset_names), 1.0 / len(asset_names))
+            
+            simulation = await self._simulate_risk(
+                w, expected_returns, volatilities, correlation_matrix,
+                n_scenarios=n_scenarios, time_budget_s=time_budget_s
+            )
+            
+            # Alpha / beta / tracking error vs benchmark ETF (covariance annualisée)
+            risk_free_rate = 0.02
+            cov_matrix = np.outer(volatilities, volatilities) * correlation_matrix
+            benchmark = np.array([1.0 if asset == "etf" else 0.0 for asset in asset_names])
+            benchmark_return = float(np.dot(benchmark, expected_returns))
+            benchmark_variance = float(benchmark @ cov_matrix @ benchmark)
+            beta = float(w @ cov_matrix @ benchmark) / benchmark_variance if benchmark_variance > 0 else 1.0
+            alpha = simulation.expected_return - (risk_free_rate + beta * (benchmark_return - risk_free_rate))
+            active = w - benchmark
+            tracking_error = float(np.sqrt(max(0.0, active @ cov_matrix @ active)))
+            information_ratio = (simulation.expected_return - benchmark_return) / tracking_error if tracking_error > 0 else 0.0
+            
             metrics = PortfolioMetrics(
                 total_value=100000.0,  # 100k de base
-                total_return=0.12,  # 12% de rendement
-                volatility=0.18,  # 18% de volatilité
-                sharpe_ratio=0.67,  # Ratio de Sharpe
-                max_drawdown=0.15,  # 15% de drawdown max
-                var_95=0.25,  # VaR 95%
-                cvar_95=0.35,  # CVaR 95%
-                calmar_ratio=0.8,  # Ratio de Calmar
-                sortino_ratio=0.9,  # Ratio de Sortino
-                alpha=0.03,  # Alpha vs benchmark
-                beta=0.85,  # Beta vs marché
-                information_ratio=0.4,  # Ratio d'information
-                tracking_error=0.08  # Erreur de suivi
+                total_return=simulation.expected_return,
+                volatility=simulation.volatility,
+                sharpe_ratio=(simulation.expected_return - risk_free_rate) / simulation.volatility if simulation.volatility > 0 else 0.0,
+                max_drawdown=simulation.max_drawdown,
+                var_95=simulation.var_95,
+                cvar_95=simulation.cvar_95,
+                calmar_ratio=simulation.calmar_ratio,
+                sortino_ratio=simulation.sortino_ratio,
+                alpha=alpha,
+                beta=beta,
+                information_ratio=information_ratio,
+                tracking_error=tracking_error
             )
             
             # Stocker historique
             self.performance_history.append(metrics)
             
-            return metrics
+            return metrics, simulation
             
         except Exception as e:
             logger.error(f"❌ Erreur calcul métriques portefeuille: {e}")
@@ -882,7 +1094,40 @@ class PortfolioOptimizer:
                 sharpe_ratio=0.0, max_drawdown=0.0, var_95=0.0, cvar_95=0.0,
                 calmar_ratio=0.0, sortino_ratio=0.0, alpha=0.0, beta=1.0,
                 information_ratio=0.0, tracking_error=0.0
-            )
+            ), None
+
+    def on_quotes(self, ticks: Dict):
+        """
+        📡 Derniers ticks du flux temps réel (prix de marché entre deux synchronisations des barres)
+
+        Les poids courants des allocations sont réévalués aux derniers prix
+        (dérive et recommandations de rééquilibrage en temps réel) ; les prix
+        servent aussi de dernière clôture provisoire dans estimate_universe.
+        """
+        for symbol, tick in ticks.items():
+            self.live_prices[symbol] = tick.price
+        self.live_prices_at = datetime.now()
+        self._mark_current_weights()
+
+    def _mark_current_weights(self):
+        """⚖️ Poids courants par type d'asset : positions du registre valorisées aux derniers prix"""
+
+        try:
+            values: Dict[str, float] = {}
+            for position in get_position_ledger().positions():
+                price = self.live_prices.get(position["symbol"])
+                value = position["quantity"] * price if price is not None else position["value"]
+                bucket = allocation_bucket(position["symbol"])
+                values[bucket] = values.get(bucket, 0.0) + value
+
+            invested = sum(values.values())
+            if invested <= 0:
+                return
+            for asset_type, allocation in self.allocations.items():
+                allocation.current_weight = values.get(asset_type, 0.0) / invested
+
+        except Exception as e:
+            logger.error(f"❌ Erreur réévaluation des poids courants: {e}")
 
     async def get_optimization_summary(self) -> Dict[str, Any]:
         """📋 Obtenir un résumé des optimisations"""
@@ -906,7 +1151,11 @@ class PortfolioOptimizer:
                     for alloc in self.allocations.values()
                 ),
                 "recent_performance": self.performance_history[-5:] if self.performance_history else [],
-                "optimization_trends": await self._analyze_optimization_trends()
+                "optimization_trends": await self._analyze_optimization_trends(),
+                "live_prices": {
+                    "symbols": len(self.live_prices),
+                    "updated_at": self.live_prices_at.isoformat() if self.live_prices_at else None
+                }
             }
             
             return summary
@@ -18,6 +18,10 @@ from enum import Enum
 import numpy as np
 import asyncio
 
+from app.orchestrator.simulation_engine import PathSimulator
+from app.orchestrator.covariance_service import get_covariance_service
+from app.orchestrator.indicator_engine import IndicatorEngine, get_indicator_engine
+
 logger = logging.getLogger(__name__)
 
 class PredictionHorizon(Enum):
@@ -109,7 +113,7 @@ class PredictiveSystem:
     et optimiser les stratégies de trading avant qu'ils ne se produisent.
     """
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None, indicators: Optional[IndicatorEngine] = None):
         self.market_history: Dict[str, List[Dict]] = {}
         self.prediction_cache: Dict[str, MarketPrediction] = {}
         self.active_alerts: List[PredictiveAlert] = []
@@ -123,6 +127,20 @@ class PredictiveSystem:
             PredictionHorizon.STRATEGIC: 1000
         }
         
+        # Génération vectorisée des séries simulées (seedée)
+        self.simulator = PathSimulator(seed)
+        self.series_length = 100
+        
+        # Corrélations inter-assets partagées avec l'optimiseur
+        self.covariance_service = get_covariance_service()
+        
+        # Indicateurs techniques calculés sur les barres réelles (si l'asset est suivi)
+        self.indicators = indicators or get_indicator_engine()
+        
+        # Derniers prix reçus du flux temps réel (symbole -> prix, premier prix reçu)
+        self.live_prices: Dict[str, float] = {}
+        self.reference_prices: Dict[str, float] = {}
+        
         # Métriques de performance
         self.prediction_accuracy = {}
         self.total_predictions = 0
@@ -130,6 +148,34 @@ class PredictiveSystem:
         
         logger.info("🔮 Système de prédiction avancée initialisé")
 
+    def on_quotes(self, ticks: Dict):
+        """📡 Derniers ticks du flux temps réel : prix courant des objectifs de prix"""
+        for symbol, tick in ticks.items():
+            self.live_prices[symbol] = tick.price
+            self.reference_prices.setdefault(symbol, tick.price)
+
+    def _live_price(self, asset_type: str) -> Optional[Tuple[float, int]]:
+        """
+        💹 Prix courant d'un asset : (prix, symboles cotés)
+
+        Symbole coté : son dernier prix. Type d'asset (meme_coins, crypto_lt,
+        forex, etf) : indice équipondéré base 100 de ses symboles cotés,
+        relatif à leur premier prix reçu (même base que les séries simulées).
+        """
+        if asset_type in self.live_prices:
+            return self.live_prices[asset_type], 1
+
+        from app.orchestrator.portfolio_optimizer import allocation_bucket
+
+        relatives = [
+            price / self.reference_prices[symbol]
+            for symbol, price in self.live_prices.items()
+            if self.reference_prices.get(symbol) and allocation_bucket(symbol) == asset_type
+        ]
+        if not relatives:
+            return None
+        return 100.0 * float(np.mean(relatives)), len(relatives)
+
     async def generate_market_predictions(self, asset_type: str) -> Dict[str, MarketPrediction]:
         """
         🎯 Générer des prédictions de marché pour tous les horizons
@@ -176,7 +222,8 @@ class PredictiveSystem:
                 "volume_series": self._generate_volume_series(asset_type),
                 "price_action": self._generate_price_action(asset_type),
                 "market_cycles": self._identify_market_cycles(asset_type),
-                "correlation_matrix": self._calculate_asset_correlations(asset_type)
+                "correlation_matrix": self._calculate_asset_correlations(asset_type),
+                "indicators": self.indicators.features([asset_type]).get(asset_type)
             }
             
             return historical_data
@@ -198,22 +245,18 @@ class PredictiveSystem:
             }.get(asset_type, 0.3)
             
             # Série temporelle avec clustering de volatilité
-            series = []
-            current_vol = base_volatility
-            
-            for i in range(100):
-                # Persistance de volatilité (clustering)
-                change = np.random.normal(0, 0.05)
-                current_vol = max(0.05, min(1.0, current_vol + change))
-                
-                # Ajout de chocs occasionnels
-                if np.random.random() < 0.05:  # 5% de chance de choc
-                    shock = np.random.normal(0, 0.3)
-                    current_vol = max(0.05, min(1.0, current_vol + shock))
-                
-                series.append(current_vol)
+            # + chocs occasionnels (5% de chance de choc)
+            series = self.simulator.bounded_random_walk(
+                x0=base_volatility,
+                step_volatility=0.05,
+                n_steps=self.series_length,
+                lower=0.05,
+                upper=1.0,
+                shock_probability=0.05,
+                shock_volatility=0.3
+            )
             
-            return series
+            return series[0, 0].tolist()
             
         except Exception as e:
             logger.error(f"❌ Erreur génération série volatilité: {e}")
@@ -223,23 +266,17 @@ class PredictiveSystem:
         """🎢 Générer une série de tendance réaliste"""
         
         try:
-            # Tendances cycliques avec du bruit
-            series = []
-            
-            for i in range(100):
-                # Tendance cyclique de base
-                cycle = 0.3 * np.sin(i * 0.1) 
-                
-                # Tendance persistante
-                trend = 0.2 * np.sin(i * 0.02)
-                
-                # Bruit aléatoire
-                noise = np.random.normal(0, 0.1)
-                
-                value = cycle + trend + noise
-                series.append(max(-1.0, min(1.0, value)))
+            # Tendance cyclique de base + tendance persistante + bruit aléatoire
+            series = self.simulator.cyclical_trend(
+                n_steps=self.series_length,
+                cycle_amplitude=0.3,
+                cycle_frequency=0.1,
+                trend_amplitude=0.2,
+                trend_frequency=0.02,
+                noise_volatility=0.1
+            )
             
-            return series
+            return series[0].tolist()
             
         except Exception as e:
             logger.error(f"❌ Erreur génération série tendance: {e}")
@@ -256,22 +293,17 @@ class PredictiveSystem:
                 "etf": 0.8
             }.get(asset_type, 1.0)
             
-            series = []
+            # Patterns intraday (forex/etf) : cycle journalier
+            seasonal_amplitude = 0.3 if asset_type in ["forex", "etf"] else 0.0
             
-            for i in range(100):
-                # Volume corrélé à la volatilité
-                vol_impact = 0.5 + 0.5 * np.random.random()
-                
-                # Patterns intraday (forex/etf)
-                if asset_type in ["forex", "etf"]:
-                    hour_impact = 1.0 + 0.3 * np.sin(i * 0.26)  # Cycle journalier
-                else:
-                    hour_impact = 1.0
-                
-                volume = base_volume * vol_impact * hour_impact
-                series.append(max(0.1, volume))
+            series = self.simulator.seasonal_volume(
+                base_volume=base_volume,
+                n_steps=self.series_length,
+                seasonal_amplitude=seasonal_amplitude,
+                seasonal_frequency=0.26
+            )
             
-            return series
+            return series[0].tolist()
             
         except Exception as e:
             logger.error(f"❌ Erreur génération série volume: {e}")
@@ -289,6 +321,9 @@ class PredictiveSystem:
                 "mean_reversion_strength": np.random.uniform(0.3, 0.9),
                 "trend_strength": np.random.uniform(-1.0, 1.0)
             }
+            live = self._live_price(asset_type)
+            if live is not None:
+                price_action["current_price"], price_action["live_symbols"] = live
             
             return price_action
             
@@ -354,7 +389,11 @@ class PredictiveSystem:
                 }
             }
             
-            return correlations.get(asset_type, {})
+            # Corrélations estimées (univers chargé par l'optimiseur) prioritaires
+            asset_correlations = dict(correlations.get(asset_type, {}))
+            asset_correlations.update(self.covariance_service.correlations_for(asset_type))
+            
+            return asset_correlations
             
         except Exception as e:
             logger.error(f"❌ Erreur calcul corrélations: {e}")
@@ -462,14 +501,19 @@ class PredictiveSystem:
         """📈 Prédire la direction de la tendance"""
         
         try:
+            indicators = historical_data.get("indicators")
             trend_series = historical_data.get("trend_series", [])
-            if not trend_series:
+            if indicators:
+                # Indicateurs locaux : MACD normalisé par l'ATR, histogramme MACD
+                recent_trend = indicators["trend_strength"]
+                momentum = indicators["macd_hist"]
+            elif trend_series:
+                # Analyser la tendance récente
+                recent_trend = np.mean(trend_series[-5:])
+                momentum = trend_series[-1] - trend_series[-3]
+            else:
                 return "neutral"
             
-            # Analyser la tendance récente
-            recent_trend = np.mean(trend_series[-5:])
-            momentum = trend_series[-1] - trend_series[-3]
-            
             # Classification
             if recent_trend > 0.1 and momentum > 0:
                 return "bullish_strong"
@@ -796,6 +840,63 @@ class PredictiveSystem:
             logger.error(f"❌ Erreur validation prédiction: {e}")
             return {"error": str(e)}
 
+    async def validate_with_prices(self, prediction_key: str, closes: np.ndarray,
+                                   periods_per_year: float = 252) -> Dict:
+        """✅ Valider une prédiction sur les clôtures réalisées depuis son émission"""
+        from app.orchestrator.backtest_engine import realized_outcome
+
+        return await self.validate_prediction(prediction_key, realized_outcome(closes, periods_per_year))
+
+    def pending_validations(self, until: datetime, min_horizon: timedelta = timedelta(0)) -> Dict[str, MarketPrediction]:
+        """⏳ Prédictions échues avant until, pas encore validées (horizon >= min_horizon)"""
+        pending = {}
+        for key, prediction in self.prediction_cache.items():
+            validated = self.prediction_accuracy.get(key)
+            if validated is not None and validated["validated_at"] >= prediction.generated_at:
+                continue
+            if prediction.expires_at <= until and prediction.expires_at - prediction.generated_at >= min_horizon:
+                pending[key] = prediction
+        return pending
+
+    async def validate_with_bars(self, arrays, default_class: str = "stock",
+                                 periods_per_year: float = 252) -> Dict[str, Dict]:
+        """
+        ✅ Valider les prédictions échues sur des barres réalisées (BarArrays)
+
+        Symbole suivi : ses clôtures ; type d'asset : indice équipondéré de ses
+        symboles. Fenêtre : dernière clôture connue à l'émission jusqu'à la
+        dernière clôture avant l'échéance.
+        """
+        from app.orchestrator.indicator_engine import timeframe_duration
+        from app.orchestrator.portfolio_optimizer import allocation_bucket
+
+        if arrays.n_bars == 0:
+            return {}
+
+        bar = timeframe_duration(arrays.timeframe)
+        closed_at = arrays.timestamps + np.timedelta64(int(bar.total_seconds()), "s")
+        results = {}
+        for key, prediction in self.pending_validations(closed_at[-1].astype(datetime), bar).items():
+            if prediction.asset_type in arrays.symbols:
+                rows = [arrays.symbols.index(prediction.asset_type)]
+            else:
+                rows = [i for i, symbol in enumerate(arrays.symbols)
+                        if allocation_bucket(symbol, default_class) == prediction.asset_type]
+
+            first = int(np.searchsorted(closed_at, np.datetime64(prediction.generated_at, "s"), side="right")) - 1
+            stop = int(np.searchsorted(closed_at, np.datetime64(prediction.expires_at, "s"), side="right"))
+            if not rows or first < 0:
+                continue
+            closes = arrays.close[rows, first:stop]
+            closes = closes[:, ~np.isnan(closes).any(axis=0)]
+            if closes.shape[1] < 2:
+                continue
+
+            series = closes[0] if len(rows) == 1 else 100.0 * (closes / closes[:, :1]).mean(axis=0)
+            results[key] = await self.validate_with_prices(key, series, periods_per_year)
+
+        return results
+
     def _predict_direction(self, trend: str) -> PredictionDirection:
         """📈 Prédire la direction du marché"""
         if trend == "bullish":
@@ -0,0 +1,234 @@
+"""
+🧮 QP SOLVER - PROGRAMMATION QUADRATIQUE CONVEXE (ADMM)
+======================================================
+
+Solveur pour les problèmes d'allocation de la forme :
+
+    min ½ xᵀPx + qᵀx   sous   l ≤ Ax ≤ u
+
+Algorithme ADMM à la OSQP, en NumPy/SciPy :
+- Factorisation de Cholesky de (P + σI + Aᵀ·diag(ρ)·A) réutilisée entre itérations
+- Même factorisation pour une série de problèmes qui ne diffèrent que par q
+  (balayage de frontière), avec warm start de la solution précédente
+- ρ adaptatif (refactorisation seulement si le ratio des résidus dérive)
+- Contraintes A creuses (scipy.sparse) : groupes, budgets
+- Boule L1 optionnelle sur un bloc de lignes (turnover ‖w - w0‖₁ ≤ T) traitée
+  par projection, sans variables auxiliaires
+
+Adapté aux univers de quelques centaines d'assets (P dense).
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from scipy import sparse
+from scipy.linalg import cho_factor, cho_solve
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class QPSettings:
+    """Paramètres de l'ADMM"""
+    rho: float = 0.1
+    sigma: float = 1e-6
+    alpha: float = 1.6  # sur-relaxation
+    eps_abs: float = 1e-5
+    eps_rel: float = 1e-5
+    max_iter: int = 4000
+    check_interval: int = 10  # calcul des résidus toutes les N itérations
+    adaptive_rho_interval: int = 50
+    adaptive_rho_tolerance: float = 5.0
+
+@dataclass
+class L1BallConstraint:
+    """Lignes rows de A·x contraintes à ‖A·x[rows] - center‖₁ ≤ radius"""
+    rows: slice
+    center: np.ndarray
+    radius: float
+
+@dataclass
+class QPResult:
+    """Résultat d'une résolution QP"""
+    x: np.ndarray
+    y: np.ndarray  # multiplicateurs des contraintes
+    status: str  # "solved", "max_iter"
+    iterations: int
+    primal_residual: float
+    dual_residual: float
+    solve_time_ms: float
+
+    @property
+    def solved(self) -> bool:
+        return self.status == "solved"
+
+class QPSolver:
+    """
+    🧮 SOLVEUR QP ADMM
+
+    P, A, l et u sont fixés à la construction ; `solve(q)` peut être
+    appelé plusieurs fois, chaque appel repartant de la solution précédente.
+    """
+
+    def __init__(self,
+                 P: np.ndarray,
+                 A: sparse.spmatrix,
+                 lower: np.ndarray,
+                 upper: np.ndarray,
+                 settings: Optional[QPSettings] = None,
+                 l1_ball: Optional[L1BallConstraint] = None):
+        self.settings = settings or QPSettings()
+        A = sparse.csr_matrix(A, dtype=float)
+        lower = np.asarray(lower, dtype=float)
+        upper = np.asarray(upper, dtype=float)
+
+        self.n = P.shape[0]
+        self.m = A.shape[0]
+
+        # Équilibrage : lignes de A à norme unitaire, coût ramené à l'échelle 1.
+        # Le bloc de turnover garde une échelle uniforme (la boule L1 reste une boule).
+        row_norms = np.sqrt(np.asarray(A.multiply(A).sum(axis=1)).ravel())
+        self._row_scale = np.where(row_norms > 0, 1.0 / np.maximum(row_norms, 1e-12), 1.0)
+        if l1_ball is not None:
+            self._row_scale[l1_ball.rows] = float(np.mean(self._row_scale[l1_ball.rows]))
+            scale = self._row_scale[l1_ball.rows][0] if self.m else 1.0
+            l1_ball = L1BallConstraint(rows=l1_ball.rows, center=l1_ball.center * scale, radius=l1_ball.radius * scale)
+
+        P = np.asarray(P, dtype=float)
+        self._cost_scale = 1.0 / max(float(np.mean(np.abs(np.diag(P)))), 1e-8) if self.n else 1.0
+
+        self.l1_ball = l1_ball
+        self.P = P * self._cost_scale
+        self.A = sparse.diags(self._row_scale) @ A
+        self.A = self.A.tocsr()
+        self.AT = self.A.T.tocsr()
+        self.lower = lower * self._row_scale
+        self.upper = upper * self._row_scale
+
+        # Types de lignes : égalités (ρ élevé) et lignes libres (ρ minimal)
+        self._equality = np.isfinite(self.lower) & np.isclose(self.lower, self.upper, rtol=0.0, atol=1e-9)
+        self._free = np.isinf(self.lower) & np.isinf(self.upper)
+        if l1_ball is not None:
+            self._free[l1_ball.rows] = False
+
+        self.rho = self.settings.rho
+        self.factorizations = 0
+        self._factor(self.rho)
+
+        # État pour le warm start
+        self._x = np.zeros(self.n)
+        self._z = self._project(np.zeros(self.m))
+        self._y = np.zeros(self.m)
+
+    def _project(self, z: np.ndarray) -> np.ndarray:
+        """Projection sur l'ensemble admissible (boîte [l, u] et boule L1)"""
+        z = np.clip(z, self.lower, self.upper)
+        if self.l1_ball is not None:
+            ball = self.l1_ball
+            z[ball.rows] = ball.center + project_l1_ball(z[ball.rows] - ball.center, ball.radius)
+        return z
+
+    def _factor(self, rho: float):
+        """Factoriser P + σI + Aᵀ·diag(ρ)·A"""
+        rho_vec = np.full(self.m, rho)
+        rho_vec[self._equality] = rho * 1e3
+        rho_vec[self._free] = 1e-6
+        self._rho_vec = rho_vec
+
+        kkt = self.P + self.settings.sigma * np.eye(self.n)
+        kkt = kkt + (self.AT @ sparse.diags(rho_vec) @ self.A).toarray()
+        self._chol = cho_factor(kkt, lower=True, check_finite=False)
+        self.factorizations += 1
+
+    def reset(self):
+        """Oublier la solution précédente (pas de warm start)"""
+        self._x[:] = 0.0
+        self._z = self._project(np.zeros(self.m))
+        self._y[:] = 0.0
+
+    def solve(self, q: np.ndarray, warm_start: bool = True) -> QPResult:
+        """🧮 Résoudre min ½xᵀPx + qᵀx sous l ≤ Ax ≤ u"""
+        start = time.perf_counter()
+        cfg = self.settings
+        q = np.asarray(q, dtype=float) * self._cost_scale
+
+        if not warm_start:
+            self.reset()
+
+        x, z, y = self._x.copy(), self._z.copy(), self._y.copy()
+        alpha, sigma = cfg.alpha, cfg.sigma
+        status = "max_iter"
+        primal_residual = dual_residual = np.inf
+        iteration = 0
+
+        for iteration in range(1, cfg.max_iter + 1):
+            rho_vec = self._rho_vec
+
+            # Étape x : système linéaire factorisé
+            rhs = sigma * x - q + self.AT @ (rho_vec * z - y)
+            x_tilde = cho_solve(self._chol, rhs, check_finite=False)
+            z_tilde = self.A @ x_tilde
+
+            # Sur-relaxation, projection sur [l, u], mise à jour duale
+            x = alpha * x_tilde + (1 - alpha) * x
+            z_relaxed = alpha * z_tilde + (1 - alpha) * z
+            z_next = self._project(z_relaxed + y / rho_vec)
+            y = y + rho_vec * (z_relaxed - z_next)
+            z = z_next
+
+            if iteration % cfg.check_interval and iteration != cfg.max_iter:
+                continue
+
+            ax = self.A @ x
+            px = self.P @ x
+            aty = self.AT @ y
+            # Résidus dans l'échelle d'origine
+            primal_residual = float(np.max(np.abs(ax - z) / self._row_scale)) if self.m else 0.0
+            dual_residual = float(np.max(np.abs(px + q + aty))) / self._cost_scale
+
+            primal_scale = max(np.max(np.abs(ax / self._row_scale)), np.max(np.abs(z / self._row_scale))) if self.m else 0.0
+            dual_scale = max(np.max(np.abs(px)), np.max(np.abs(aty)), np.max(np.abs(q))) / self._cost_scale
+            eps_primal = cfg.eps_abs + cfg.eps_rel * primal_scale
+            eps_dual = cfg.eps_abs + cfg.eps_rel * dual_scale
+
+            if primal_residual <= eps_primal and dual_residual <= eps_dual:
+                status = "solved"
+                break
+
+            # ρ adaptatif : équilibrer résidus primal et dual normalisés
+            if iteration % cfg.adaptive_rho_interval == 0:
+                ratio = (primal_residual / max(primal_scale, 1e-10)) / max(dual_residual / max(dual_scale, 1e-10), 1e-10)
+                new_rho = float(np.clip(self.rho * np.sqrt(ratio), 1e-6, 1e6))
+                if new_rho > self.rho * cfg.adaptive_rho_tolerance or new_rho < self.rho / cfg.adaptive_rho_tolerance:
+                    # y et z restent valides ; seule la factorisation change
+                    self.rho = new_rho
+                    self._factor(new_rho)
+
+        self._x, self._z, self._y = x, z, y
+
+        return QPResult(
+            x=x,
+            y=y * self._row_scale / self._cost_scale,
+            status=status,
+            iterations=iteration,
+            primal_residual=primal_residual,
+            dual_residual=dual_residual,
+            solve_time_ms=(time.perf_counter() - start) * 1000
+        )
+
+def project_l1_ball(v: np.ndarray, radius: float) -> np.ndarray:
+    """Projection euclidienne sur la boule L1 de rayon radius (tri, O(n log n))"""
+    magnitudes = np.abs(v)
+    if magnitudes.sum() <= radius:
+        return v
+    if radius <= 0:
+        return np.zeros_like(v)
+
+    sorted_desc = np.sort(magnitudes)[::-1]
+    cumulative = np.cumsum(sorted_desc)
+    ranks = np.arange(1, v.shape[0] + 1)
+    last = np.flatnonzero(sorted_desc - (cumulative - radius) / ranks > 0)[-1]
+    threshold = (cumulative[last] - radius) / (last + 1)
+    return np.sign(v) * np.maximum(magnitudes - threshold, 0.0)
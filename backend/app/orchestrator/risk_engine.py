@@ -0,0 +1,331 @@
+"""
+📉 RISK ENGINE - MONTE CARLO DU PORTEFEUILLE
+============================================
+
+Moteur Monte Carlo pour les métriques de risque du portefeuille :
+- Scénarios corrélés (Cholesky de la covariance des assets)
+- Distributions VaR / CVaR / max drawdown / Sortino par scénario
+- Calcul par chunks vectorisés à mémoire bornée
+- Pool de processus pour les gros volumes (1M+ scénarios)
+- Budget de temps : arrêt propre entre deux chunks
+
+Chaque chunk a sa propre graine dérivée d'une `SeedSequence` : un même
+seed donne les mêmes résultats en exécution locale ou multi-processus.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.orchestrator.simulation_engine import TRADING_DAYS, nearest_positive_definite
+
+logger = logging.getLogger(__name__)
+
+# Statistiques d'un chunk : (rendements terminaux, max drawdowns, Σr, Σr², Σmin(r,0)², n)
+ChunkStats = Tuple[np.ndarray, np.ndarray, float, float, float, int]
+
+@dataclass
+class RiskEngineConfig:
+    """Configuration du moteur Monte Carlo"""
+    max_scenarios: int = 2_000_000
+    process_threshold: int = 1_000_000  # au-delà : pool de processus
+    max_workers: int = 0  # 0 = nombre de CPU
+    chunk_memory_mb: int = 64  # mémoire de travail max par chunk
+
+    @classmethod
+    def from_settings(cls) -> "RiskEngineConfig":
+        return cls(
+            max_scenarios=settings.MONTE_CARLO_MAX_SCENARIOS,
+            process_threshold=settings.MONTE_CARLO_PROCESS_THRESHOLD,
+            max_workers=settings.MONTE_CARLO_MAX_WORKERS,
+            chunk_memory_mb=settings.MONTE_CARLO_CHUNK_MB
+        )
+
+@dataclass
+class RiskSimulationResult:
+    """Résultat d'une simulation Monte Carlo (rendements sur l'horizon)"""
+    n_scenarios_requested: int
+    n_scenarios: int
+    horizon_days: int
+    expected_return: float  # annualisé
+    volatility: float  # annualisée
+    var_95: float  # perte positive
+    cvar_95: float
+    var_99: float
+    cvar_99: float
+    max_drawdown: float  # moyenne des scénarios
+    max_drawdown_p95: float
+    sortino_ratio: float
+    calmar_ratio: float
+    return_percentiles: Dict[str, float] = field(default_factory=dict)
+    drawdown_percentiles: Dict[str, float] = field(default_factory=dict)
+    workers: int = 1
+    truncated: bool = False  # budget de temps atteint
+    elapsed_ms: float = 0.0
+
+def _simulate_chunk(drift: np.ndarray,
+                    chol: np.ndarray,
+                    weights: np.ndarray,
+                    horizon_days: int,
+                    n_scenarios: int,
+                    seed: np.random.SeedSequence) -> ChunkStats:
+    """
+    Simuler un chunk de scénarios buy-and-hold (fonction de module : picklable)
+
+    Log-rendements journaliers corrélés des assets, valeur du portefeuille
+    V[t] = Σ w_i · exp(Σ log r_i), puis statistiques par scénario.
+    """
+    rng = np.random.default_rng(seed)
+    n_assets = weights.shape[0]
+
+    # (n_scenarios, horizon, n_assets) : chocs corrélés puis cumul en place
+    log_paths = rng.standard_normal((n_scenarios, horizon_days, n_assets))
+    log_paths = log_paths @ chol.T
+    log_paths += drift
+    np.cumsum(log_paths, axis=1, out=log_paths)
+    np.exp(log_paths, out=log_paths)
+
+    values = log_paths @ weights  # (n_scenarios, horizon)
+    del log_paths
+
+    # Rendements journaliers du portefeuille (valeur initiale = 1)
+    daily = np.empty_like(values)
+    daily[:, 0] = values[:, 0] - 1.0
+    np.divide(values[:, 1:], values[:, :-1], out=daily[:, 1:])
+    daily[:, 1:] -= 1.0
+
+    # Max drawdown par scénario, pic initial inclus
+    peaks = np.maximum.accumulate(np.maximum(values, 1.0), axis=1)
+    max_drawdowns = np.max(1.0 - values / peaks, axis=1)
+
+    downside = np.minimum(daily, 0.0)
+    return (
+        values[:, -1] - 1.0,
+        max_drawdowns,
+        float(daily.sum()),
+        float(np.square(daily).sum()),
+        float(np.square(downside).sum()),
+        daily.size
+    )
+
+class MonteCarloRiskEngine:
+    """
+    📉 MOTEUR MONTE CARLO DE RISQUE
+
+    Le nombre de scénarios par chunk est dérivé du budget mémoire ; seuls
+    les rendements terminaux et drawdowns (un float par scénario) sont
+    conservés pour les quantiles, le reste est agrégé en sommes.
+    """
+
+    def __init__(self, config: Optional[RiskEngineConfig] = None):
+        self.config = config or RiskEngineConfig.from_settings()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        logger.info(f"📉 Risk Engine initialisé (max {self.config.max_scenarios} scénarios)")
+
+    def chunk_size(self, horizon_days: int, n_assets: int) -> int:
+        """
+        Scénarios par chunk pour rester sous le budget mémoire
+
+        Raises:
+            ValueError: si un seul scénario dépasse le budget
+        """
+        # ~3 tableaux float64 (n, horizon, n_assets) vivants au pic
+        bytes_per_scenario = 3 * 8 * horizon_days * max(1, n_assets)
+        size = int(self.config.chunk_memory_mb * 1024 * 1024 // bytes_per_scenario)
+        if size < 1:
+            raise ValueError(
+                f"Un scénario ({bytes_per_scenario / 1024 / 1024:.1f} Mo pour {n_assets} assets × "
+                f"{horizon_days} jours) dépasse le budget de {self.config.chunk_memory_mb} Mo par chunk"
+            )
+        return size
+
+    def _workers(self) -> int:
+        return self.config.max_workers or os.cpu_count() or 1
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers())
+        return self._executor
+
+    def shutdown(self):
+        """Arrêter le pool de processus"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def simulate(self,
+                 weights: np.ndarray,
+                 expected_returns: np.ndarray,
+                 volatilities: np.ndarray,
+                 correlation_matrix: np.ndarray,
+                 n_scenarios: int = 10_000,
+                 horizon_days: int = TRADING_DAYS,
+                 time_budget_s: Optional[float] = None,
+                 risk_free_rate: float = 0.02,
+                 seed: Optional[int] = None) -> RiskSimulationResult:
+        """
+        📉 Simuler n_scenarios trajectoires du portefeuille (bloquant)
+
+        Args:
+            weights: poids des assets (n_assets,)
+            expected_returns, volatilities: annualisés (n_assets,)
+            correlation_matrix: (n_assets, n_assets)
+            time_budget_s: au-delà, les chunks restants ne sont pas lancés
+        """
+        started = time.perf_counter()
+        deadline = started + time_budget_s if time_budget_s else None
+
+        n_requested = int(min(max(1, n_scenarios), self.config.max_scenarios))
+        weights = np.asarray(weights, dtype=float)
+        volatilities = np.asarray(volatilities, dtype=float)
+        expected_returns = np.asarray(expected_returns, dtype=float)
+
+        # Covariance journalière et facteur de Cholesky
+        dt = 1 / TRADING_DAYS
+        covariance = np.outer(volatilities, volatilities) * np.asarray(correlation_matrix, dtype=float) * dt
+        chol = np.linalg.cholesky(nearest_positive_definite(covariance))
+        drift = (expected_returns - 0.5 * volatilities ** 2) * dt
+
+        # Découpage en chunks, une graine indépendante par chunk
+        chunk = self.chunk_size(horizon_days, weights.shape[0])
+        sizes = [chunk] * (n_requested // chunk)
+        if n_requested % chunk:
+            sizes.append(n_requested % chunk)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        jobs = [(drift, chol, weights, horizon_days, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+
+        if n_requested >= self.config.process_threshold and self._workers() > 1 and len(jobs) > 1:
+            stats, truncated = self._run_in_processes(jobs, deadline)
+            workers = self._workers()
+        else:
+            stats, truncated = self._run_serial(jobs, deadline)
+            workers = 1
+
+        result = self._aggregate(stats, n_requested, horizon_days, risk_free_rate)
+        result.workers = workers
+        result.truncated = truncated
+        result.elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if truncated:
+            logger.warning(
+                f"⏱️ Budget Monte Carlo atteint : {result.n_scenarios}/{n_requested} scénarios"
+            )
+
+        return result
+
+    async def simulate_async(self, *args, **kwargs) -> RiskSimulationResult:
+        """📉 Version non bloquante pour la boucle asyncio"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.simulate(*args, **kwargs))
+
+    def _run_serial(self, jobs: List[tuple], deadline: Optional[float]) -> Tuple[List[ChunkStats], bool]:
+        stats = []
+        for job in jobs:
+            # Toujours au moins un chunk pour avoir un résultat exploitable
+            if stats and deadline and time.perf_counter() >= deadline:
+                return stats, True
+            stats.append(_simulate_chunk(*job))
+        return stats, False
+
+    def _run_in_processes(self, jobs: List[tuple], deadline: Optional[float]) -> Tuple[List[ChunkStats], bool]:
+        executor = self._get_executor()
+        in_flight_limit = 2 * self._workers()
+        pending_jobs = list(reversed(jobs))
+        in_flight = set()
+        stats = []
+        truncated = False
+
+        while pending_jobs or in_flight:
+            # Alimenter le pool tant que le budget le permet
+            expired = deadline is not None and time.perf_counter() >= deadline
+            while pending_jobs and len(in_flight) < in_flight_limit and not (expired and (stats or in_flight)):
+                in_flight.add(executor.submit(_simulate_chunk, *pending_jobs.pop()))
+
+            # Attendre jusqu'à l'échéance, ou sans limite tant qu'aucun chunk n'a abouti
+            remaining = deadline - time.perf_counter() if deadline else None
+            timeout = remaining if remaining is not None and remaining > 0 else None
+            done, in_flight = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            stats.extend(future.result() for future in done)
+
+            # Budget épuisé : abandonner les chunks restants (ceux déjà lancés finissent à vide)
+            if stats and deadline and time.perf_counter() >= deadline and (pending_jobs or in_flight):
+                truncated = True
+                for future in in_flight:
+                    future.cancel()
+                break
+
+        return stats, truncated
+
+    def _aggregate(self,
+                   stats: List[ChunkStats],
+                   n_requested: int,
+                   horizon_days: int,
+                   risk_free_rate: float) -> RiskSimulationResult:
+        """Combiner les chunks en distributions et métriques"""
+        terminal = np.concatenate([s[0] for s in stats])
+        drawdowns = np.concatenate([s[1] for s in stats])
+        sum_r = sum(s[2] for s in stats)
+        sum_r2 = sum(s[3] for s in stats)
+        sum_down2 = sum(s[4] for s in stats)
+        n_obs = sum(s[5] for s in stats)
+
+        # Moments journaliers du portefeuille, annualisés
+        mean_daily = sum_r / n_obs
+        variance_daily = max(0.0, sum_r2 / n_obs - mean_daily ** 2)
+        volatility = float(np.sqrt(variance_daily * TRADING_DAYS))
+        downside_deviation = float(np.sqrt(sum_down2 / n_obs * TRADING_DAYS))
+
+        mean_terminal = float(terminal.mean())
+        expected_return = (1.0 + mean_terminal) ** (TRADING_DAYS / horizon_days) - 1.0
+
+        # VaR / CVaR en perte positive sur l'horizon
+        q01, q05 = np.quantile(terminal, [0.01, 0.05])
+        var_95, var_99 = -float(q05), -float(q01)
+        cvar_95 = -float(terminal[terminal <= q05].mean())
+        cvar_99 = -float(terminal[terminal <= q01].mean())
+
+        max_drawdown = float(drawdowns.mean())
+        percentiles = [5, 25, 50, 75, 95]
+        return_quantiles = np.percentile(terminal, percentiles)
+        drawdown_quantiles = np.percentile(drawdowns, percentiles)
+
+        return RiskSimulationResult(
+            n_scenarios_requested=n_requested,
+            n_scenarios=int(terminal.shape[0]),
+            horizon_days=horizon_days,
+            expected_return=float(expected_return),
+            volatility=volatility,
+            var_95=var_95,
+            cvar_95=cvar_95,
+            var_99=var_99,
+            cvar_99=cvar_99,
+            max_drawdown=max_drawdown,
+            max_drawdown_p95=float(drawdown_quantiles[-1]),
+            sortino_ratio=(expected_return - risk_free_rate) / downside_deviation if downside_deviation > 0 else 0.0,
+            calmar_ratio=expected_return / max_drawdown if max_drawdown > 0 else 0.0,
+            return_percentiles={f"p{p}": float(v) for p, v in zip(percentiles, return_quantiles)},
+            drawdown_percentiles={f"p{p}": float(v) for p, v in zip(percentiles, drawdown_quantiles)}
+        )
+
+# Instance globale
+_risk_engine: Optional[MonteCarloRiskEngine] = None
+
+def get_risk_engine() -> MonteCarloRiskEngine:
+    """📉 Obtenir le moteur Monte Carlo partagé"""
+    global _risk_engine
+    if _risk_engine is None:
+        _risk_engine = MonteCarloRiskEngine()
+    return _risk_engine
+
+def shutdown_risk_engine():
+    """🛑 Arrêter le pool de processus du moteur partagé"""
+    if _risk_engine is not None:
+        _risk_engine.shutdown()
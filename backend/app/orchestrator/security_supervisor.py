@@ -26,7 +26,8 @@ import docker
 import requests
 import sys
 sys.path.append('/app/backend')
-from database.connection import get_db
+from database.connection import get_async_db_context
+from app.integrations.http_pool import get_http_transport
 
 logger = logging.getLogger(__name__)
 
@@ -293,24 +294,25 @@ class SecuritySupervisor:
         """🗄️ Vérifier la santé de la base de données"""
         
         try:
-            # Import local pour éviter les erreurs circulaires
-            import sys
-            sys.path.append('/app/backend')
-            from database.connection import get_db
+            from sqlalchemy import text
+            from database.connection import get_pool_stats
             
             start_time = datetime.utcnow()
             
-            # Test de connexion simple
-            with next(get_db()) as session:
-                result = session.execute("SELECT 1")
-                result.fetchone()
+            # Test de connexion simple (session asynchrone poolée)
+            async with get_async_db_context() as session:
+                result = await session.execute(text("SELECT 1"))
+                result.scalar()
             
             connection_time = (datetime.utcnow() - start_time).total_seconds() * 1000
+            pool_stats = get_pool_stats().get("async", {})
             
-            # Métriques additionnelles (simulées en dev)
+            # Métriques additionnelles
             metrics = {
                 "connection_time_ms": round(connection_time, 2),
-                "active_connections": 5,  # Simulé
+                "active_connections": pool_stats.get("checked_out", 0),
+                "pool_size": pool_stats.get("size", 0),
+                "pool_overflow": pool_stats.get("overflow", 0),
                 "slow_queries": 0,       # Simulé
                 "database_size_mb": 150  # Simulé
             }
@@ -364,17 +366,17 @@ class SecuritySupervisor:
             successful_requests = 0
             total_response_time = 0
             
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                for url in test_urls:
-                    try:
-                        start_time = datetime.utcnow()
-                        async with session.get(url) as response:
-                            if response.status == 200:
-                                successful_requests += 1
-                            response_time = (datetime.utcnow() - start_time).total_seconds() * 1000
-                            total_response_time += response_time
-                    except Exception as e:
-                        logger.debug(f"Network test failed for {url}: {e}")
+            transport = get_http_transport()
+            for url in test_urls:
+                try:
+                    start_time = datetime.utcnow()
+                    async with transport.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                        if response.status == 200:
+                            successful_requests += 1
+                        response_time = (datetime.utcnow() - start_time).total_seconds() * 1000
+                        total_response_time += response_time
+                except Exception as e:
+                    logger.debug(f"Network test failed for {url}: {e}")
             
             # Métriques réseau
             net_io = psutil.net_io_counters()
@@ -0,0 +1,289 @@
+"""
+🎲 SIMULATION ENGINE - GÉNÉRATEUR DE TRAJECTOIRES VECTORISÉ
+==========================================================
+
+Moteur NumPy partagé pour simuler des trajectoires de prix et de séries
+de marché sur N assets × M trajectoires × T pas en opérations batch :
+- GBM (mouvement brownien géométrique)
+- Ornstein-Uhlenbeck avec drift (modèle historique de l'optimiseur)
+- Régimes markoviens (bull / bear / volatile)
+- Marches aléatoires bornées (séries de volatilité)
+
+Toutes les simulations passent par un `np.random.Generator` seedé pour
+des exécutions reproductibles. Les tableaux retournés ont la forme
+(n_paths, n_assets, n_steps).
+"""
+
+import logging
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ArrayLike = Union[float, np.ndarray, list]
+
+TRADING_DAYS = 252
+DAILY_DT = 1 / TRADING_DAYS
+
+class PathSimulator:
+    """
+    🎲 SIMULATEUR DE TRAJECTOIRES
+
+    Tous les aléas d'une simulation sont tirés en un seul appel au
+    générateur ; seule la dimension temporelle est parcourue pour les
+    processus récursifs non linéaires (OU sur le prix, marches bornées).
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+    def reseed(self, seed: Optional[int] = None):
+        """Réinitialiser le générateur (reproductibilité des runs)"""
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+    # ------------------------------------------------------------------
+    # Aléas
+    # ------------------------------------------------------------------
+
+    def standard_normals(self,
+                         n_paths: int,
+                         n_assets: int,
+                         n_steps: int,
+                         correlation: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Chocs gaussiens (n_steps, n_paths, n_assets), corrélés entre assets
+        si une matrice de corrélation est fournie
+        """
+        z = self.rng.standard_normal((n_steps, n_paths, n_assets))
+
+        if correlation is not None and n_assets > 1:
+            chol = np.linalg.cholesky(nearest_positive_definite(np.asarray(correlation, dtype=float)))
+            z = z @ chol.T
+
+        return z
+
+    # ------------------------------------------------------------------
+    # Processus de prix
+    # ------------------------------------------------------------------
+
+    def gbm(self,
+            s0: ArrayLike,
+            drift: ArrayLike,
+            volatility: ArrayLike,
+            n_steps: int,
+            n_paths: int = 1,
+            dt: float = DAILY_DT,
+            correlation: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Trajectoires GBM exactes : log-incréments puis cumsum sur l'axe temps
+
+        Returns:
+            Prix (n_paths, n_assets, n_steps), le premier pas vaut s0
+        """
+        s0, drift, volatility = _as_asset_vectors(s0, drift, volatility)
+        n_assets = s0.shape[0]
+
+        z = self.standard_normals(n_paths, n_assets, n_steps - 1, correlation)
+        log_increments = (drift - 0.5 * volatility ** 2) * dt + volatility * np.sqrt(dt) * z
+
+        log_paths = np.empty((n_steps, n_paths, n_assets))
+        log_paths[0] = 0.0
+        np.cumsum(log_increments, axis=0, out=log_paths[1:])
+
+        return np.moveaxis(s0 * np.exp(log_paths), 0, -1)
+
+    def ou(self,
+           s0: ArrayLike,
+           drift: ArrayLike,
+           volatility: ArrayLike,
+           mean_reversion: ArrayLike,
+           n_steps: int,
+           n_paths: int = 1,
+           long_run_level: ArrayLike = 100.0,
+           dt: float = DAILY_DT,
+           floor: float = 1.0,
+           correlation: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Ornstein-Uhlenbeck avec drift sur le prix :
+            p[t+1] = p[t] * (1 + μ·dt + κ·(L - p[t])·dt + σ·√dt·z)
+
+        Le terme de rappel dépend du niveau courant : la récurrence est
+        parcourue en temps, vectorisée sur toutes les trajectoires et assets.
+        """
+        s0, drift, volatility, mean_reversion, long_run_level = _as_asset_vectors(
+            s0, drift, volatility, mean_reversion, long_run_level
+        )
+        n_assets = s0.shape[0]
+
+        kappa_dt = mean_reversion * dt
+
+        # Facteur de croissance hors rappel : g = 1 + μ·dt + κ·L·dt + σ·√dt·z
+        growth = self.standard_normals(n_paths, n_assets, n_steps - 1, correlation)
+        growth *= volatility * np.sqrt(dt)
+        growth += 1.0 + drift * dt + kappa_dt * long_run_level
+
+        prices = np.empty((n_steps, n_paths, n_assets))
+        prices[0] = s0
+
+        # p[t] = max(floor, p[t-1] · (g - κ·dt·p[t-1])), calculé en place
+        for t in range(1, n_steps):
+            previous, current = prices[t - 1], prices[t]
+            np.multiply(previous, kappa_dt, out=current)
+            np.subtract(growth[t - 1], current, out=current)
+            current *= previous
+            np.maximum(current, floor, out=current)
+
+        return np.moveaxis(prices, 0, -1)
+
+    def regime_switching(self,
+                         s0: ArrayLike,
+                         regime_drifts: np.ndarray,
+                         regime_volatilities: np.ndarray,
+                         transition_matrix: np.ndarray,
+                         n_steps: int,
+                         n_paths: int = 1,
+                         dt: float = DAILY_DT,
+                         initial_regime: int = 0,
+                         correlation: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        GBM à régimes markoviens
+
+        Args:
+            regime_drifts: (n_regimes, n_assets) ou (n_regimes,)
+            regime_volatilities: (n_regimes, n_assets) ou (n_regimes,)
+            transition_matrix: (n_regimes, n_regimes), lignes sommant à 1
+
+        Returns:
+            (prix (n_paths, n_assets, n_steps), régimes (n_paths, n_steps))
+        """
+        s0 = np.atleast_1d(np.asarray(s0, dtype=float))
+        n_assets = s0.shape[0]
+
+        drifts = np.asarray(regime_drifts, dtype=float)
+        vols = np.asarray(regime_volatilities, dtype=float)
+        if drifts.ndim == 1:
+            drifts = np.repeat(drifts[:, None], n_assets, axis=1)
+        if vols.ndim == 1:
+            vols = np.repeat(vols[:, None], n_assets, axis=1)
+
+        # Chaîne de Markov : tirage par inversion de la CDF de la ligne courante
+        cumulative = np.cumsum(np.asarray(transition_matrix, dtype=float), axis=1)
+        uniforms = self.rng.random((n_steps, n_paths))
+
+        regimes = np.empty((n_steps, n_paths), dtype=np.int64)
+        regimes[0] = initial_regime
+        for t in range(1, n_steps):
+            rows = cumulative[regimes[t - 1]]
+            regimes[t] = np.minimum((uniforms[t][:, None] > rows).sum(axis=1), cumulative.shape[1] - 1)
+
+        # Incréments log conditionnels au régime, tous calculés en une passe
+        z = self.standard_normals(n_paths, n_assets, n_steps - 1, correlation)
+        mu = drifts[regimes[1:]]
+        sigma = vols[regimes[1:]]
+        log_increments = (mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * z
+
+        log_paths = np.empty((n_steps, n_paths, n_assets))
+        log_paths[0] = 0.0
+        np.cumsum(log_increments, axis=0, out=log_paths[1:])
+
+        prices = np.moveaxis(s0 * np.exp(log_paths), 0, -1)
+        return prices, regimes.T
+
+    # ------------------------------------------------------------------
+    # Séries de marché (système prédictif)
+    # ------------------------------------------------------------------
+
+    def bounded_random_walk(self,
+                            x0: ArrayLike,
+                            step_volatility: float,
+                            n_steps: int,
+                            n_paths: int = 1,
+                            lower: float = 0.05,
+                            upper: float = 1.0,
+                            shock_probability: float = 0.0,
+                            shock_volatility: float = 0.0) -> np.ndarray:
+        """
+        Marche aléatoire bornée avec chocs occasionnels (clustering de volatilité)
+
+        Returns:
+            Série (n_paths, n_assets, n_steps) ; le premier point inclut déjà un pas
+        """
+        x0 = np.atleast_1d(np.asarray(x0, dtype=float))
+        n_assets = x0.shape[0]
+        shape = (n_steps, n_paths, n_assets)
+
+        steps = self.rng.normal(0.0, step_volatility, shape)
+        if shock_probability > 0:
+            shock_mask = self.rng.random(shape) < shock_probability
+            shocks = np.where(shock_mask, self.rng.normal(0.0, shock_volatility, shape), 0.0)
+        else:
+            shock_mask = None
+            shocks = None
+
+        series = np.empty(shape)
+        current = np.broadcast_to(x0, (n_paths, n_assets)).astype(float)
+
+        for t in range(n_steps):
+            current = np.clip(current + steps[t], lower, upper)
+            if shock_mask is not None:
+                current = np.clip(current + shocks[t], lower, upper)
+            series[t] = current
+
+        return np.moveaxis(series, 0, -1)
+
+    def cyclical_trend(self,
+                       n_steps: int,
+                       n_paths: int = 1,
+                       cycle_amplitude: float = 0.3,
+                       cycle_frequency: float = 0.1,
+                       trend_amplitude: float = 0.2,
+                       trend_frequency: float = 0.02,
+                       noise_volatility: float = 0.1,
+                       lower: float = -1.0,
+                       upper: float = 1.0) -> np.ndarray:
+        """Tendance cyclique + bruit, bornée (n_paths, n_steps)"""
+        t = np.arange(n_steps)
+        base = cycle_amplitude * np.sin(t * cycle_frequency) + trend_amplitude * np.sin(t * trend_frequency)
+        noise = self.rng.normal(0.0, noise_volatility, (n_paths, n_steps))
+        return np.clip(base + noise, lower, upper)
+
+    def seasonal_volume(self,
+                        base_volume: float,
+                        n_steps: int,
+                        n_paths: int = 1,
+                        seasonal_amplitude: float = 0.0,
+                        seasonal_frequency: float = 0.26,
+                        minimum: float = 0.1) -> np.ndarray:
+        """Volume aléatoire avec saisonnalité intraday optionnelle (n_paths, n_steps)"""
+        t = np.arange(n_steps)
+        seasonal = 1.0 + seasonal_amplitude * np.sin(t * seasonal_frequency)
+        impact = 0.5 + 0.5 * self.rng.random((n_paths, n_steps))
+        return np.maximum(minimum, base_volume * impact * seasonal)
+
+def _as_asset_vectors(*values: ArrayLike) -> Tuple[np.ndarray, ...]:
+    """Convertir des paramètres scalaires/listes en vecteurs (n_assets,) alignés"""
+    arrays = [np.atleast_1d(np.asarray(value, dtype=float)) for value in values]
+    n_assets = max(array.shape[0] for array in arrays)
+    return tuple(np.broadcast_to(array, (n_assets,)).copy() for array in arrays)
+
+def nearest_positive_definite(matrix: np.ndarray, epsilon: float = 1e-10) -> np.ndarray:
+    """Projeter une matrice symétrique sur les matrices définies positives"""
+    symmetric = (matrix + matrix.T) / 2
+    eigenvalues, eigenvectors = np.linalg.eigh(symmetric)
+    if eigenvalues.min() > epsilon:
+        return symmetric
+    clipped = np.maximum(eigenvalues, epsilon)
+    return (eigenvectors * clipped) @ eigenvectors.T
+
+# Instance globale
+_path_simulator: Optional[PathSimulator] = None
+
+def get_path_simulator() -> PathSimulator:
+    """🎲 Obtenir le simulateur partagé"""
+    global _path_simulator
+    if _path_simulator is None:
+        _path_simulator = PathSimulator()
+    return _path_simulator
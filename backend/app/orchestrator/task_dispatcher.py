@@ -0,0 +1,263 @@
+"""
+📨 TASK DISPATCHER
+Envoi des tâches Celery de l'orchestrateur et collecte non bloquante des résultats
+
+- send_task vers la file du domaine de la tâche (app.tasks.queues) avec une
+  priorité broker issue de Priority (CRITICAL passe devant dans sa file)
+- Résultats reçus par pub/sub Redis (le backend Celery publie chaque état sur
+  la clé du résultat) : aucun result.get() bloquant dans la boucle asyncio
+- Temps réels côté worker : attente en file (envoi -> STARTED) et exécution
+  (STARTED -> état final), agrégés en EWMA / percentiles par LatencyTracker
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional
+
+import numpy as np
+import redis.asyncio as aioredis
+from celery import Celery, states
+
+from app.config import settings
+from app.tasks.queues import queue_for_task
+from .decision_engine import Priority
+
+import sys
+sys.path.append('/app/backend')
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Priorité broker (paliers Redis de app.tasks.queues, 0 = plus urgent)
+BROKER_PRIORITIES = {
+    Priority.CRITICAL: 0,
+    Priority.HIGH: 3,
+    Priority.MEDIUM: 6,
+    Priority.LOW: 9
+}
+
+@dataclass
+class LatencyTracker:
+    """EWMA et fenêtre glissante de latences (secondes)"""
+    alpha: float = 0.2
+    ewma: float = 0.0
+    count: int = 0
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+    def observe(self, seconds: float):
+        self.ewma = seconds if self.count == 0 else self.alpha * seconds + (1 - self.alpha) * self.ewma
+        self.count += 1
+        self.samples.append(seconds)
+
+    def percentiles(self) -> Dict[str, float]:
+        """p50/p95/p99 en millisecondes"""
+        if not self.samples:
+            return {"count": 0, "ewma_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+        p50, p95, p99 = np.percentile(np.fromiter(self.samples, dtype=float), [50, 95, 99]) * 1000
+        return {
+            "count": self.count,
+            "ewma_ms": round(self.ewma * 1000, 2),
+            "p50_ms": round(float(p50), 2),
+            "p95_ms": round(float(p95), 2),
+            "p99_ms": round(float(p99), 2)
+        }
+
+@dataclass
+class TaskOutcome:
+    """Résultat d'une tâche Celery suivie par le dispatcher"""
+    task_id: str
+    task_name: str
+    queue: str
+    state: str
+    result: Any = None
+    traceback: Optional[str] = None
+    queue_wait: Optional[float] = None  # envoi -> démarrage worker (s)
+    run_time: Optional[float] = None    # démarrage -> état final (s)
+    total_time: float = 0.0             # envoi -> état final (s)
+
+    @property
+    def success(self) -> bool:
+        return self.state == states.SUCCESS
+
+@dataclass
+class _PendingTask:
+    task_name: str
+    queue: str
+    future: asyncio.Future
+    sent_at: float
+    started_at: Optional[float] = None
+
+class CeleryDispatcher:
+    """
+    📨 Dispatcher Celery asynchrone
+
+    Une seule connexion pub/sub (psubscribe sur les clés de résultats) sert
+    toutes les tâches en attente ; chaque dispatch() attend son futur.
+    """
+
+    def __init__(self, celery: Optional[Celery] = None, redis_url: Optional[str] = None,
+                 timeout: Optional[float] = None):
+        if celery is None:
+            from app.tasks.celery_app import celery_app as celery
+        self.celery = celery
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.timeout = timeout or settings.SCHEDULER_TASK_TIMEOUT
+        prefix = celery.backend.task_keyprefix
+        self._key_prefix = prefix.decode() if isinstance(prefix, bytes) else prefix
+        self._redis: Optional[aioredis.Redis] = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._listener_ready: Optional[asyncio.Event] = None
+        self._pending: Dict[str, _PendingTask] = {}
+        self.stats = {"dispatched": 0, "succeeded": 0, "failed": 0, "timeouts": 0}
+
+    async def dispatch(self, task_name: str, kwargs: Optional[Dict] = None,
+                       priority: Priority = Priority.MEDIUM, timeout: Optional[float] = None,
+                       queue: Optional[str] = None) -> TaskOutcome:
+        """Envoie la tâche dans sa file (priorité broker) et attend son état final sans bloquer"""
+        await self._ensure_listener()
+
+        task_id = str(uuid.uuid4())
+        queue = queue or queue_for_task(task_name)
+        pending = _PendingTask(
+            task_name=task_name,
+            queue=queue,
+            future=asyncio.get_running_loop().create_future(),
+            sent_at=time.perf_counter()
+        )
+        # Enregistré avant l'envoi : aucun état publié ne peut être manqué
+        self._pending[task_id] = pending
+        self.stats["dispatched"] += 1
+
+        try:
+            await asyncio.to_thread(
+                self.celery.send_task, task_name, kwargs=kwargs or {}, task_id=task_id,
+                queue=queue, priority=BROKER_PRIORITIES[priority]
+            )
+            meta = await asyncio.wait_for(pending.future, timeout or self.timeout)
+        except asyncio.TimeoutError:
+            # Message pub/sub perdu (reconnexion) : dernier état stocké par le backend
+            meta = await self._read_stored_meta(task_id)
+            if meta is None or meta.get("status") not in states.READY_STATES:
+                self.stats["timeouts"] += 1
+                raise TimeoutError(f"Tâche {task_name} ({task_id}) sans résultat après {timeout or self.timeout}s")
+        finally:
+            self._pending.pop(task_id, None)
+
+        return self._build_outcome(task_id, pending, meta)
+
+    def _build_outcome(self, task_id: str, pending: _PendingTask, meta: Dict) -> TaskOutcome:
+        finished_at = time.perf_counter()
+        outcome = TaskOutcome(
+            task_id=task_id,
+            task_name=pending.task_name,
+            queue=pending.queue,
+            state=meta.get("status", states.PENDING),
+            result=meta.get("result"),
+            traceback=meta.get("traceback"),
+            total_time=finished_at - pending.sent_at
+        )
+        if pending.started_at is not None:
+            outcome.queue_wait = pending.started_at - pending.sent_at
+            outcome.run_time = finished_at - pending.started_at
+
+        self.stats["succeeded" if outcome.success else "failed"] += 1
+        return outcome
+
+    async def _ensure_listener(self):
+        """Démarre l'écoute pub/sub (une fois, avant tout envoi)"""
+        if self._listener is not None and not self._listener.done():
+            await self._listener_ready.wait()
+            return
+
+        self._listener_ready = asyncio.Event()
+        self._listener = asyncio.create_task(self._listen())
+        await self._listener_ready.wait()
+
+    async def _listen(self):
+        """Boucle de réception des états publiés par le backend Celery"""
+        while True:
+            try:
+                if self._redis is None:
+                    self._redis = aioredis.Redis.from_url(self.redis_url)
+                self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                await self._pubsub.psubscribe(f"{self._key_prefix}*")
+                self._listener_ready.set()
+
+                async for message in self._pubsub.listen():
+                    if message["type"] == "pmessage":
+                        self._on_message(message["channel"], message["data"])
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Erreur écoute résultats Celery: {e}")
+                self._listener_ready.set()
+                await asyncio.sleep(1)
+
+    def _on_message(self, channel: bytes, data: bytes):
+        """Met à jour la tâche en attente correspondante"""
+        task_id = channel.decode()[len(self._key_prefix):]
+        pending = self._pending.get(task_id)
+        if pending is None or pending.future.done():
+            return
+
+        try:
+            meta = json.loads(data)
+        except (TypeError, ValueError):
+            return
+
+        status = meta.get("status")
+        if status == states.STARTED:
+            pending.started_at = time.perf_counter()
+        elif status in states.READY_STATES:
+            pending.future.set_result(meta)
+
+    async def _read_stored_meta(self, task_id: str) -> Optional[Dict]:
+        """Lecture directe de la clé de résultat"""
+        try:
+            raw = await self._redis.get(f"{self._key_prefix}{task_id}")
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            logger.error(f"❌ Erreur lecture résultat {task_id}: {e}")
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """📊 Compteurs du dispatcher"""
+        return {**self.stats, "pending": len(self._pending)}
+
+    async def close(self):
+        """Arrête l'écoute et ferme la connexion Redis"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+_dispatcher: Optional[CeleryDispatcher] = None
+
+def get_task_dispatcher() -> CeleryDispatcher:
+    """📨 Dispatcher partagé de l'orchestrateur"""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = CeleryDispatcher()
+    return _dispatcher
+
+async def close_task_dispatcher():
+    """Ferme le dispatcher partagé (arrêt de l'application)"""
+    global _dispatcher
+    if _dispatcher is not None:
+        await _dispatcher.close()
+        _dispatcher = None
@@ -0,0 +1,190 @@
+"""
+🌍 UNIVERSE OPTIMIZER - OPTIMISATION SUR N ASSETS
+================================================
+
+Optimisation d'allocation sur un univers de symboles réels (top CoinCap,
+univers ETF, ...) avec contraintes déclaratives (`ConstraintSpec`) :
+- Variance minimale : un QP
+- Moyenne-variance : un QP à aversion au risque fixée
+- Sharpe maximal / rendement - λ·volatilité : point fixe (accéléré par
+  sécante) sur l'aversion au risque, chaque QP repartant de la solution précédente
+
+Le point fixe découle des conditions KKT : le portefeuille de Sharpe
+maximal est la solution moyenne-variance pour τ = σ²(w) / (μ - rf)ᵀw.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.orchestrator.allocation_constraints import ConstraintSpec, CompiledConstraints
+from app.orchestrator.qp_solver import QPSolver, QPSettings, QPResult
+
+logger = logging.getLogger(__name__)
+
+OBJECTIVES = ("min_variance", "mean_variance", "max_sharpe", "max_utility")
+
+@dataclass
+class UniverseAllocation:
+    """Résultat d'une optimisation sur un univers de symboles"""
+    weights: Dict[str, float]
+    objective: str
+    expected_return: float
+    expected_volatility: float
+    sharpe_ratio: float
+    turnover: float
+    status: str
+    qp_solves: int
+    iterations: int
+    solve_time_ms: float
+    violations: List[str] = field(default_factory=list)
+
+class UniverseOptimizer:
+    """
+    🌍 OPTIMISEUR N ASSETS
+
+    La spécification est compilée une fois en forme matricielle creuse ;
+    le solveur QP (une factorisation) est partagé par tous les sous-problèmes
+    d'une même optimisation.
+    """
+
+    def __init__(self,
+                 qp_settings: Optional[QPSettings] = None,
+                 max_fixed_point_iterations: int = 12,
+                 fixed_point_tolerance: float = 1e-3):
+        self.qp_settings = qp_settings or QPSettings()
+        self.max_fixed_point_iterations = max_fixed_point_iterations
+        self.fixed_point_tolerance = fixed_point_tolerance
+
+    def optimize(self,
+                 symbols: List[str],
+                 expected_returns: np.ndarray,
+                 cov_matrix: np.ndarray,
+                 spec: ConstraintSpec,
+                 objective: str = "max_sharpe",
+                 risk_free_rate: float = 0.02,
+                 risk_aversion: float = 2.0,
+                 volatility_penalty: float = 0.5) -> UniverseAllocation:
+        """
+        🌍 Optimiser l'allocation d'un univers
+
+        Args:
+            symbols: univers ordonné (aligné sur expected_returns / cov_matrix)
+            objective: "min_variance", "mean_variance", "max_sharpe", "max_utility"
+            risk_aversion: γ de l'objectif moyenne-variance μᵀw - γ/2·wᵀΣw
+            volatility_penalty: λ de l'objectif μᵀw - λ·σ(w)
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Objectif inconnu: {objective}")
+
+        start = time.perf_counter()
+        mu = np.asarray(expected_returns, dtype=float)
+        cov = np.asarray(cov_matrix, dtype=float)
+        compiled = spec.compile(symbols)
+
+        solver = QPSolver(
+            cov, compiled.A, compiled.lower, compiled.upper,
+            self.qp_settings, l1_ball=compiled.l1_ball()
+        )
+        results: List[QPResult] = []
+
+        def solve(tau: float) -> np.ndarray:
+            results.append(solver.solve(-tau * mu))
+            return results[-1].x
+
+        if objective == "min_variance":
+            tau = 0.0
+        elif objective == "mean_variance":
+            tau = 1.0 / risk_aversion
+        else:
+            tau = self._fixed_point(solve, mu, cov, objective, risk_free_rate, volatility_penalty)
+
+        # Passe finale à tolérance resserrée depuis la dernière solution (faisabilité)
+        solver.settings = replace(
+            self.qp_settings,
+            eps_abs=self.qp_settings.eps_abs * 1e-2,
+            eps_rel=self.qp_settings.eps_rel * 1e-2
+        )
+        weights = solve(tau)
+
+        weights = np.clip(weights, compiled.weight_lower, compiled.weight_upper)
+        allocation = self._build_allocation(
+            compiled, weights, mu, cov, objective, risk_free_rate, results, start
+        )
+
+        logger.debug(
+            f"🌍 Univers {len(symbols)} assets ({objective}): {allocation.qp_solves} QP, "
+            f"{allocation.iterations} itérations, {allocation.solve_time_ms:.1f}ms"
+        )
+        return allocation
+
+    def _fixed_point(self, solve, mu, cov, objective, risk_free_rate, volatility_penalty) -> float:
+        """Itérer τ ← σ²/(μ - rf)ᵀw (Sharpe) ou τ ← σ/λ (utilité) jusqu'à stabilité"""
+        weights = solve(0.0)
+        excess = mu - risk_free_rate
+
+        tau = 0.0
+        previous = None  # (τ, g(τ) - τ) pour l'accélération par sécante
+        converged = False
+        for _ in range(self.max_fixed_point_iterations):
+            variance = float(weights @ cov @ weights)
+
+            if objective == "max_sharpe":
+                excess_return = float(excess @ weights)
+                if excess_return <= 0:
+                    # Aucun portefeuille au-dessus du taux sans risque sur ce point :
+                    # augmenter l'appétit pour le rendement
+                    new_tau = (tau or 1e-3 * float(np.trace(cov)) / len(mu)) * 10
+                else:
+                    new_tau = variance / excess_return
+            else:
+                new_tau = np.sqrt(max(variance, 0.0)) / volatility_penalty
+
+            if tau > 0 and abs(new_tau - tau) <= self.fixed_point_tolerance * tau:
+                converged = True
+                break
+
+            # Sécante sur g(τ) - τ = 0, repli sur le pas de point fixe
+            gap = new_tau - tau
+            if previous is not None and tau > 0 and gap != previous[1]:
+                secant_tau = tau - gap * (tau - previous[0]) / (gap - previous[1])
+                if secant_tau > 0:
+                    new_tau = secant_tau
+            if tau > 0:
+                previous = (tau, gap)
+
+            tau = new_tau
+            weights = solve(tau)
+
+        if not converged:
+            logger.warning(f"⚠️ Point fixe {objective} non convergé (τ={tau:.4g})")
+        return tau
+
+    def _build_allocation(self,
+                          compiled: CompiledConstraints,
+                          weights: np.ndarray,
+                          mu: np.ndarray,
+                          cov: np.ndarray,
+                          objective: str,
+                          risk_free_rate: float,
+                          results: List[QPResult],
+                          start: float) -> UniverseAllocation:
+        expected_return = float(weights @ mu)
+        volatility = float(np.sqrt(max(weights @ cov @ weights, 0.0)))
+
+        return UniverseAllocation(
+            weights=dict(zip(compiled.symbols, weights.tolist())),
+            objective=objective,
+            expected_return=expected_return,
+            expected_volatility=volatility,
+            sharpe_ratio=(expected_return - risk_free_rate) / volatility if volatility > 0 else 0.0,
+            turnover=compiled.turnover(weights) if compiled.has_turnover else 0.0,
+            status=results[-1].status,
+            qp_solves=len(results),
+            iterations=sum(r.iterations for r in results),
+            solve_time_ms=(time.perf_counter() - start) * 1000,
+            violations=compiled.violations(weights, tolerance=1e-3)
+        )
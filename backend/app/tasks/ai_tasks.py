@@ -11,7 +11,7 @@ from typing import Dict, Any, List
 logger = structlog.get_logger()
 
 @shared_task(bind=True)
-def ai_market_analysis(self):
+def ai_market_analysis(self, **parameters):
     """
     🧠 ANALYSE DE MARCHÉ PAR IA
     
@@ -121,7 +121,7 @@ def sentiment_analysis(self, sources: List[str] = None):
         self.retry(countdown=180, max_retries=3)
 
 @shared_task(bind=True)
-def ai_learning_update(self):
+def ai_learning_update(self, **parameters):
     """
     📚 MISE À JOUR APPRENTISSAGE IA
     
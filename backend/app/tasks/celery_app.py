@@ -5,6 +5,10 @@ Application Celery pour les tâches asynchrones du système de trading IA
 
 from celery import Celery
 from app.config import settings
+from app.tasks.queues import (
+    DEFAULT_PRIORITY, DEFAULT_QUEUE, PRIORITY_SEPARATOR, PRIORITY_STEPS,
+    task_annotations, task_queues, task_routes
+)
 import os
 
 # Création de l'instance Celery
@@ -31,10 +35,24 @@ celery_app.conf.update(
     result_serializer="json",
     result_expires=3600,  # 1 heure
     
+    # Files par domaine (profils de worker dans app.tasks.queues)
+    task_queues=task_queues(),
+    task_default_queue=DEFAULT_QUEUE,
+    task_routes=task_routes(),
+    task_annotations=task_annotations(),
+    
+    # Priorités broker (Redis : une liste par palier, 0 = plus urgent)
+    broker_transport_options={
+        "priority_steps": PRIORITY_STEPS,
+        "sep": PRIORITY_SEPARATOR,
+    },
+    task_default_priority=DEFAULT_PRIORITY,
+    
     # Worker configuration
     worker_prefetch_multiplier=1,
     task_acks_late=True,
     worker_max_tasks_per_child=1000,
+    worker_autoscaler="app.tasks.queues:QueueDepthAutoscaler",
     
     # Monitoring
     task_send_sent_event=True,
@@ -55,6 +73,7 @@ celery_app.conf.beat_schedule = {
     "health-check": {
         "task": "app.tasks.monitoring_tasks.system_health_check",
         "schedule": 60.0,  # Toutes les minutes
+        "options": {"priority": 0},
     },
     "market-data-sync": {
         "task": "app.tasks.trading_tasks.sync_market_data",
@@ -13,7 +13,7 @@ from typing import Dict, Any
 logger = structlog.get_logger()
 
 @shared_task(bind=True)
-def system_health_check(self):
+def system_health_check(self, **parameters):
     """
     🏥 VÉRIFICATION SANTÉ SYSTÈME
     
@@ -0,0 +1,170 @@
+"""
+🚦 CELERY QUEUES - ROUTAGE, PRIORITÉS ET AUTOSCALING
+Files par domaine et profil de worker associé
+
+- market_data : récupérations API (I/O) -> pool threads, forte concurrence
+- ai          : analyses IA / appels LLM (I/O long) -> pool threads
+- trading     : exécution d'ordres et optimiseur (CPU) -> prefork autoscalé
+- monitoring  : health checks et maintenance -> pool threads dédié, jamais
+                derrière le reste
+
+Priorités au niveau du broker (Redis : une liste par palier, 0 = plus urgent),
+limites de débit par tâche, autoscaler prefork piloté par la profondeur de file.
+"""
+
+import math
+from dataclasses import dataclass, replace
+from fnmatch import fnmatch
+from time import monotonic
+from typing import Dict, List, Optional
+
+import redis
+from celery.worker import state
+from celery.worker.autoscale import Autoscaler
+from kombu import Queue
+
+from app.config import settings
+
+# Paliers de priorité Redis (kombu arrondit au palier inférieur)
+PRIORITY_STEPS = [0, 3, 6, 9]
+DEFAULT_PRIORITY = 6
+PRIORITY_SEPARATOR = ":"
+
+@dataclass(frozen=True)
+class QueueProfile:
+    """Profil de worker d'une file"""
+    name: str
+    pool: str                    # prefork | threads | gevent | solo
+    concurrency: int
+    max_concurrency: int = 0     # > concurrency : autoscaling (prefork)
+    prefetch_multiplier: int = 1
+    tasks_per_process: int = 2   # backlog visé par processus (autoscaler)
+
+    @property
+    def autoscaled(self) -> bool:
+        return self.pool == "prefork" and self.max_concurrency > self.concurrency
+
+# Pools threads : prefetch >= 4, sinon le consumer Redis ne remplit pas le pool ;
+# chaque asyncio.run a ses propres sessions HTTP (http_pool : une par boucle)
+QUEUE_PROFILES: Dict[str, QueueProfile] = {
+    "market_data": QueueProfile("market_data", pool="threads", concurrency=16, prefetch_multiplier=4),
+    "ai": QueueProfile("ai", pool="threads", concurrency=8, prefetch_multiplier=4),
+    "trading": QueueProfile("trading", pool="prefork", concurrency=2, max_concurrency=8),
+    "monitoring": QueueProfile("monitoring", pool="threads", concurrency=2, prefetch_multiplier=4),
+}
+
+DEFAULT_QUEUE = "ai"
+
+# Routage : noms exacts puis motifs, dans l'ordre (même sémantique que task_routes)
+TASK_ROUTES: Dict[str, str] = {
+    "app.tasks.trading_tasks.sync_market_data": "market_data",
+    "app.tasks.monitoring_tasks.*": "monitoring",
+    "app.tasks.ai_tasks.*": "ai",
+    "app.tasks.trading_tasks.*": "trading",
+    "app.tasks.*.execute_*": "trading",
+    "app.tasks.*.rebalance_*": "trading",
+    "app.tasks.*.monitor_*": "monitoring",
+}
+
+# Limites de débit par worker (format Celery)
+TASK_RATE_LIMITS: Dict[str, str] = {
+    "app.tasks.trading_tasks.sync_market_data": "12/m",
+    "app.tasks.ai_tasks.ai_market_analysis": "30/m",
+    "app.tasks.ai_tasks.sentiment_analysis": "30/m",
+    "app.tasks.ai_tasks.generate_trading_insights": "30/m",
+    "app.tasks.ai_tasks.ai_model_optimization": "2/m",
+    "app.tasks.trading_tasks.execute_trading_signal": "120/m",
+    "app.tasks.monitoring_tasks.security_scan": "1/m",
+}
+
+def task_queues() -> tuple:
+    """Déclarations kombu des files (clé de routage = nom de la file)"""
+    return tuple(Queue(name, routing_key=name) for name in QUEUE_PROFILES)
+
+def task_routes() -> Dict[str, Dict[str, str]]:
+    """task_routes Celery"""
+    return {pattern: {"queue": queue} for pattern, queue in TASK_ROUTES.items()}
+
+def task_annotations() -> Dict[str, Dict[str, str]]:
+    """task_annotations Celery (limites de débit)"""
+    return {name: {"rate_limit": limit} for name, limit in TASK_RATE_LIMITS.items()}
+
+def queue_for_task(task_name: str) -> str:
+    """File d'une tâche selon TASK_ROUTES"""
+    if task_name in TASK_ROUTES:
+        return TASK_ROUTES[task_name]
+    for pattern, queue in TASK_ROUTES.items():
+        if fnmatch(task_name, pattern):
+            return queue
+    return DEFAULT_QUEUE
+
+def priority_keys(queue: str) -> List[str]:
+    """Listes Redis d'une file (une par palier de priorité)"""
+    return [queue if step == 0 else f"{queue}{PRIORITY_SEPARATOR}{step}" for step in PRIORITY_STEPS]
+
+def queue_depths(client: redis.Redis, queues: Optional[List[str]] = None) -> Dict[str, int]:
+    """Messages en attente par file (tous paliers confondus)"""
+    queues = list(queues or QUEUE_PROFILES)
+    pipe = client.pipeline(transaction=False)
+    for queue in queues:
+        for key in priority_keys(queue):
+            pipe.llen(key)
+    lengths = pipe.execute()
+    per_queue = len(PRIORITY_STEPS)
+    return {queue: int(sum(lengths[i * per_queue:(i + 1) * per_queue])) for i, queue in enumerate(queues)}
+
+def desired_concurrency(profile: QueueProfile, depth: int, busy: int) -> int:
+    """Politique d'autoscaling : backlog + tâches en cours / backlog visé par processus"""
+    wanted = math.ceil((depth + busy) / max(profile.tasks_per_process, 1))
+    return max(profile.concurrency, min(wanted, profile.max_concurrency or profile.concurrency))
+
+class QueueDepthAutoscaler(Autoscaler):
+    """
+    🚦 Autoscaler prefork piloté par la profondeur des files consommées
+
+    L'autoscaler Celery par défaut ne regarde que les tâches déjà réservées
+    par le worker (au plus prefetch × processus) ; celui-ci lit le backlog
+    Redis des files du worker, au plus une fois par seconde.
+    """
+
+    depth_refresh_interval = 1.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._client: Optional[redis.Redis] = None
+        self._depth = 0
+        self._depth_checked_at = 0.0
+
+    def _consumed_queues(self) -> List[str]:
+        try:
+            return [queue.name for queue in self.worker.consumer.task_consumer.queues]
+        except AttributeError:
+            return []
+
+    def _refresh_depth(self):
+        queues = self._consumed_queues()
+        if not queues:
+            return
+        try:
+            if self._client is None:
+                self._client = redis.Redis.from_url(self.worker.app.conf.broker_url)
+            self._depth = sum(queue_depths(self._client, queues).values())
+        except redis.RedisError:
+            self._depth = 0
+        self._depth_checked_at = monotonic()
+
+    @property
+    def qty(self):
+        if monotonic() - self._depth_checked_at >= self.depth_refresh_interval:
+            self._refresh_depth()
+        queues = self._consumed_queues()
+        profile = QUEUE_PROFILES.get(queues[0] if queues else "", QueueProfile("default", pool="prefork", concurrency=0))
+        profile = replace(profile, concurrency=self.min_concurrency, max_concurrency=self.max_concurrency)
+        return desired_concurrency(profile, self._depth, len(state.reserved_requests))
+
+    def info(self):
+        return {**super().info(), "queue_depth": self._depth}
+
+def get_queue_depths() -> Dict[str, int]:
+    """📊 Profondeur des files (broker Redis de l'application)"""
+    return queue_depths(redis.Redis.from_url(settings.REDIS_URL))
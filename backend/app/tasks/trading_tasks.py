@@ -5,13 +5,26 @@ Tâches Celery pour les opérations de trading en arrière-plan
 
 from celery import shared_task
 import structlog
-from datetime import datetime
-from typing import Dict, Any
+import asyncio
+import time
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional, Tuple
+
+from app.config import settings
+from app.integrations.coincap_api import get_coincap_client
+from app.integrations.http_pool import close_http_transport
+from app.integrations.trading_apis import TradingMode, create_broker
+from app.orchestrator.portfolio_optimizer import get_portfolio_optimizer
+from app.orchestrator.covariance_service import get_covariance_service
+from app.orchestrator.indicator_engine import get_indicator_engine
+from database.market_store import get_market_store, COINCAP_TIMEFRAMES
+from database.market_archive import get_market_archive
 
 logger = structlog.get_logger()
 
 @shared_task(bind=True)
-def sync_market_data(self):
+def sync_market_data(self, **parameters):
     """
     📊 SYNCHRONISATION DES DONNÉES DE MARCHÉ
     
@@ -19,17 +32,21 @@ def sync_market_data(self):
     """
     try:
         logger.info("🔄 Début synchronisation données de marché")
+        start_time = time.perf_counter()
         
-        # TODO: Implémenter vraie synchronisation
-        # - Récupérer données via Alpaca/Yahoo Finance
-        # - Mettre à jour cache Redis
-        # - Notifier WebSocket si nécessaire
+        # Historique CoinCap depuis la dernière barre stockée, upsert en masse
+        store = get_market_store()
+        timeframe = COINCAP_TIMEFRAMES[settings.MARKET_SYNC_INTERVAL]
+        bars_written, assets_updated, broker_bars_archived = asyncio.run(_sync_all(store, timeframe))
         
         result = {
             "success": True,
-            "assets_updated": 5,
+            "assets_updated": assets_updated,
+            "bars_written": bars_written,
+            "broker_bars_archived": broker_bars_archived,
+            "timeframe": timeframe,
             "timestamp": datetime.utcnow().isoformat(),
-            "execution_time": 2.3
+            "execution_time": round(time.perf_counter() - start_time, 3)
         }
         
         logger.info("✅ Synchronisation données complétée", **result)
@@ -39,14 +56,94 @@ def sync_market_data(self):
         logger.error("❌ Erreur synchronisation données", error=str(e))
         self.retry(countdown=60, max_retries=3)
 
+async def _sync_all(store, timeframe: str) -> Tuple[int, int, int]:
+    """Historique CoinCap puis barres des brokers, sessions HTTP fermées dans la boucle de la tâche"""
+    try:
+        bars_written, assets_updated = await _sync_coincap_history(store, timeframe)
+        
+        # Barres des brokers (symboles du flux temps réel) vers l'archive
+        broker_bars_archived = await _archive_broker_history(timeframe)
+        
+        return bars_written, assets_updated, broker_bars_archived
+    finally:
+        await close_http_transport()
+
+async def _sync_coincap_history(store, timeframe: str) -> Tuple[int, int]:
+    """Récupérer l'historique des top assets en parallèle puis l'ingérer en un lot"""
+    client = get_coincap_client()
+    assets = await client.get_top_assets(settings.MARKET_SYNC_ASSETS)
+    if not assets:
+        return 0, 0
+    
+    end = datetime.now(timezone.utc)
+    default_start = end - timedelta(days=settings.MARKET_SYNC_LOOKBACK_DAYS)
+    latest = store.latest_timestamps([asset.symbol for asset in assets], timeframe)
+    
+    histories = await asyncio.gather(*(
+        client.get_asset_history(
+            asset.id,
+            interval=settings.MARKET_SYNC_INTERVAL,
+            start=latest.get(asset.symbol, default_start),
+            end=end
+        )
+        for asset in assets
+    ))
+    
+    bars = [
+        (asset.symbol, timeframe, candle.timestamp, candle.open, candle.high, candle.low, candle.close, candle.volume)
+        for asset, candles in zip(assets, histories)
+        for candle in candles
+    ]
+    
+    # Archive colonnaire (lectures backtest / lookback sans base ni réseau)
+    archive = get_market_archive()
+    for asset, candles in zip(assets, histories):
+        if candles:
+            archive.write_candles(asset.symbol, timeframe, candles)
+    
+    written = store.ingest(bars)
+    
+    # Barres nouvelles uniquement (la reprise relit la dernière barre stockée)
+    new_bars = store.read_since(sorted(asset.symbol for asset in assets), timeframe, latest, end)
+    get_portfolio_optimizer().on_bars(new_bars)
+    get_indicator_engine().advance(new_bars)
+    
+    return written, sum(1 for candles in histories if candles)
+
+async def _archive_broker_history(timeframe: str) -> int:
+    """
+    Archiver les barres Binance (crypto) et Alpaca (actions, si clés configurées)
+    depuis la dernière barre archivée de chaque symbole
+    """
+    # Klines Binance publiques : API de production même sans clés (aucun ordre passé)
+    sources = [(create_broker("binance", "", "", TradingMode.LIVE), settings.MARKET_STREAM_CRYPTO_SYMBOLS)]
+    if settings.ALPACA_API_KEY:
+        alpaca = create_broker("alpaca", settings.ALPACA_API_KEY, settings.ALPACA_SECRET_KEY)
+        sources.append((alpaca, settings.MARKET_STREAM_EQUITY_SYMBOLS))
+    
+    archive = get_market_archive()
+    end = datetime.now(timezone.utc)
+    default_start = end - timedelta(days=settings.MARKET_SYNC_LOOKBACK_DAYS)
+    written = await asyncio.gather(*(
+        archive.archive_broker_history(
+            broker, symbol, timeframe,
+            start=archive.latest_timestamp(symbol, timeframe) or default_start,
+            end=end
+        )
+        for broker, symbols in sources
+        for symbol in symbols
+    ))
+    return sum(written)
+
 @shared_task(bind=True)
-def execute_trading_signal(self, signal_data: Dict[str, Any]):
+def execute_trading_signal(self, signal_data: Optional[Dict[str, Any]] = None, **parameters):
     """
     ⚡ EXÉCUTION SIGNAL DE TRADING
     
-    Exécute un signal de trading généré par l'IA
+    Exécute un signal de trading généré par l'IA (ou planifié par l'orchestrateur)
     """
     try:
+        signal_data = {**parameters, **(signal_data or {})}
         logger.info("⚡ Exécution signal trading", signal=signal_data)
         
         # TODO: Implémenter vraie exécution
@@ -102,7 +199,7 @@ def portfolio_rebalancing(self):
         self.retry(countdown=120, max_retries=2)
 
 @shared_task(bind=True)
-def risk_assessment(self):
+def risk_assessment(self, **parameters):
     """
     🛡️ ÉVALUATION DES RISQUES
     
@@ -111,17 +208,42 @@ def risk_assessment(self):
     try:
         logger.info("🛡️ Début évaluation des risques")
         
-        # TODO: Implémenter vraie analyse de risque
-        # - Calcul VaR (Value at Risk)
-        # - Analyse corrélations
-        # - Stress testing
-        # - Recommandations de hedging
+        # Covariance partagée avec l'optimiseur (mémoïsée par univers/fenêtre/estimateur)
+        optimizer = get_portfolio_optimizer()
+        covariance_service = get_covariance_service()
+        symbols = optimizer.asset_universe
+        window = optimizer.lookback_period
+        
+        estimate = covariance_service.estimate(symbols, window, "ledoit_wolf")
+        if estimate is None:
+            market_data = asyncio.run(optimizer._collect_market_data())
+            covariance_service.load_prices(symbols, market_data, window=window)
+            estimate = covariance_service.estimate(symbols, window, "ledoit_wolf")
+        
+        # Poids actuels (équipondéré tant qu'aucune allocation n'existe)
+        weights = np.array([
+            optimizer.allocations[symbol].current_weight if symbol in optimizer.allocations else 0.0
+            for symbol in symbols
+        ])
+        if weights.sum() <= 0:
+            weights = np.full(len(symbols), 1.0 / len(symbols))
+        
+        # VaR paramétrique 95% à 1 jour (covariance annualisée sur periods_per_year barres)
+        annual_volatility = float(np.sqrt(max(weights @ estimate.covariance @ weights, 0.0)))
+        var_1d = 1.645 * annual_volatility / float(np.sqrt(covariance_service.periods_per_year))
+        max_volatility = optimizer.portfolio_constraints["max_volatility"]
+        
+        alerts = []
+        if annual_volatility > max_volatility:
+            alerts.append(f"Volatilité {annual_volatility:.1%} > limite {max_volatility:.0%}")
         
         result = {
             "success": True,
-            "overall_risk_score": 0.35,  # 35% - modéré
-            "var_1d": 0.02,  # 2% VaR daily
-            "alerts": [],
+            "overall_risk_score": round(min(1.0, annual_volatility / max_volatility), 4),
+            "var_1d": round(var_1d, 6),
+            "annual_volatility": round(annual_volatility, 6),
+            "shrinkage": round(estimate.shrinkage, 4),
+            "alerts": alerts,
             "timestamp": datetime.utcnow().isoformat()
         }
         
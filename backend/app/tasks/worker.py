@@ -0,0 +1,51 @@
+"""
+👷 CELERY WORKER - LANCEUR PAR FILE
+Démarre un worker Celery avec le profil de sa file (pool, concurrence,
+prefetch, autoscaling) défini dans app.tasks.queues
+
+Usage:
+    python -m app.tasks.worker trading
+    python -m app.tasks.worker market_data --concurrency 32 -- --loglevel=debug
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from app.tasks.queues import QUEUE_PROFILES, QueueProfile
+
+def build_worker_argv(profile: QueueProfile, concurrency: Optional[int] = None,
+                      max_concurrency: Optional[int] = None, extra: Optional[List[str]] = None) -> List[str]:
+    """Ligne de commande celery worker d'un profil"""
+    concurrency = concurrency or profile.concurrency
+    max_concurrency = max_concurrency or profile.max_concurrency
+    argv = [
+        "celery", "-A", "app.tasks.celery_app", "worker",
+        "-Q", profile.name,
+        "-n", f"{profile.name}@%h",
+        "-P", profile.pool,
+        "--prefetch-multiplier", str(profile.prefetch_multiplier),
+        "--loglevel", "info",
+    ]
+    if profile.pool == "prefork" and max_concurrency > concurrency:
+        argv += ["--autoscale", f"{max_concurrency},{concurrency}"]
+    else:
+        argv += ["--concurrency", str(concurrency)]
+    return argv + list(extra or [])
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("queue", choices=sorted(QUEUE_PROFILES))
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--max-concurrency", type=int, default=None)
+    parser.add_argument("extra", nargs=argparse.REMAINDER, help="options celery supplémentaires (après --)")
+    args = parser.parse_args()
+
+    extra = args.extra[1:] if args.extra[:1] == ["--"] else args.extra
+    argv = build_worker_argv(QUEUE_PROFILES[args.queue], args.concurrency, args.max_concurrency, extra)
+    os.execvp(argv[0], argv)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
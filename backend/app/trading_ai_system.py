@@ -4,6 +4,7 @@ Intégration de tous les composants pour créer la machine de trading ultime
 """
 
 import asyncio
+import numpy as np
 import structlog
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
@@ -13,7 +14,12 @@ from contextlib import asynccontextmanager
 from core.ai_ensemble import AIEnsembleEngine, AIDecision, MarketRegime
 from core.ai_orchestrator import AIOrchestrator, Task, TaskPriority
 from core.auto_healer import AutoHealer, HealthLevel
+from core.market_snapshot import MarketSnapshotProvider
 from app.config import settings
+from app.integrations.market_stream import MarketStream, get_market_stream
+from app.orchestrator.indicator_engine import get_indicator_engine, timeframe_duration
+from app.orchestrator.backtest_engine import BacktestConfig, BacktestResult, get_backtest_engine
+from database.market_store import get_market_store
 
 logger = structlog.get_logger()
 
@@ -68,7 +74,9 @@ class TradingAISystem:
         # Core AI Components
         self.ai_engine: Optional[AIEnsembleEngine] = None
         self.orchestrator: Optional[AIOrchestrator] = None
+        self.market_snapshots: Optional[MarketSnapshotProvider] = None
         self.auto_healer: Optional[AutoHealer] = None
+        self.market_stream: Optional[MarketStream] = None
         
         # System state
         self.current_regime: Optional[MarketRegime] = None
@@ -78,15 +86,48 @@ class TradingAISystem:
         # Performance tracking
         self.performance_history: List[Dict] = []
         self.decision_history: List[AIDecision] = []
+        self.last_backtest: Optional[BacktestResult] = None  # métriques réalisées (monitoring)
+        self._last_backtest_at: Optional[datetime] = None
+        
+        # Dernière barre du store OHLCV déjà rejouée par symbole (indicateurs, covariance)
+        self._bars_seen: Dict[str, datetime] = {}
         
         # Configuration ultra-avancée
         self.config = {
             "ai_ensemble": {
                 "openai_api_key": settings.OPENAI_API_KEY,
                 "groq_api_key": settings.GROQ_API_KEY,
+                "providers": {
+                    name: {"kind": "http", "base_url": settings.LLM_HTTP_BASE_URL}
+                    for name in ("openai", "groq")
+                } if settings.LLM_PROVIDER == "http" else {},
                 "max_concurrent_analyses": 10,
                 "auto_optimization_enabled": True,
-                "learning_rate": 0.1
+                "learning_rate": 0.1,
+                "router": {
+                    "cycle_deadline": settings.AI_CYCLE_DEADLINE,
+                    "analysis_timeout": settings.AI_ANALYSIS_TIMEOUT,
+                    "hedge_quantile": settings.AI_HEDGE_QUANTILE,
+                    "cost_budget": settings.AI_CYCLE_COST_BUDGET
+                },
+                "llm_cache": {
+                    "enabled": settings.LLM_CACHE_ENABLED,
+                    "redis_url": settings.REDIS_URL,
+                    "max_entries": settings.LLM_CACHE_MAX_ENTRIES,
+                    "quantization_bps": settings.LLM_CACHE_QUANTIZATION_BPS,
+                    "ttls": {
+                        "technical": settings.LLM_CACHE_TTL_TECHNICAL,
+                        "fundamental": settings.LLM_CACHE_TTL_FUNDAMENTAL
+                    }
+                },
+                "structured_output": {
+                    "stream": settings.LLM_STREAM_OUTPUTS
+                },
+                "signals": {
+                    "universe": settings.AI_SIGNAL_UNIVERSE,
+                    "top_k": settings.AI_SIGNAL_TOP_K,
+                    "threshold": settings.AI_SIGNAL_THRESHOLD
+                }
             },
             "orchestrator": {
                 "intelligent_scheduling": True,
@@ -125,6 +166,21 @@ class TradingAISystem:
             self.ai_engine = AIEnsembleEngine(self.config["ai_ensemble"])
             logger.info("✅ IA Ensemble initialisée - Multi-modèles opérationnels")
             
+            # Indicateurs techniques locaux : historique du store OHLCV rejoué (non bloquant)
+            try:
+                symbols, bars = await asyncio.to_thread(self._warm_up_indicators)
+                logger.info("📉 Indicateurs techniques initialisés", symbols=len(symbols), bars=bars)
+            except Exception as e:
+                logger.warning("⚠️ Historique indisponible pour les indicateurs", error=str(e))
+            
+            # Instantané de marché partagé système / orchestrateur (single-flight)
+            self.market_snapshots = MarketSnapshotProvider(
+                self._fetch_market_data_from_sources,
+                self.ai_engine.analyze_market_multi_dimensional,
+                bucket_seconds=settings.MARKET_SNAPSHOT_BUCKET_SECONDS,
+                max_staleness=settings.MARKET_SNAPSHOT_MAX_STALENESS
+            )
+            
             # 2. INITIALISATION AUTO-HEALER
             logger.info("🏥 Initialisation Auto-Healer...")
             self.auto_healer = AutoHealer(self.config["auto_healer"])
@@ -133,7 +189,7 @@ class TradingAISystem:
             
             # 3. INITIALISATION ORCHESTRATEUR IA
             logger.info("🎭 Initialisation Orchestrateur IA...")
-            self.orchestrator = AIOrchestrator(self.ai_engine)
+            self.orchestrator = AIOrchestrator(self.ai_engine, market_snapshots=self.market_snapshots)
             
             # Enregistrement des tâches ultra-avancées
             await self._register_advanced_tasks()
@@ -170,6 +226,10 @@ class TradingAISystem:
         self.is_running = True
         logger.info("🚀 Démarrage opérations trading ultra-performantes")
         
+        # Cotations temps réel : WebSockets brokers diffusés aux consommateurs
+        if settings.MARKET_STREAM_ENABLED:
+            await self._start_market_stream()
+        
         # Démarrage des tâches principales en parallèle
         main_tasks = [
             # Orchestrateur IA (remplace tous les crons)
@@ -202,6 +262,21 @@ class TradingAISystem:
         finally:
             await self._graceful_shutdown()
     
+    async def _start_market_stream(self):
+        """📡 Flux temps réel : optimiseur et système prédictif abonnés (dernier tick par symbole)"""
+        from app.orchestrator.portfolio_optimizer import get_portfolio_optimizer
+        from app.orchestrator.predictive_system import get_predictive_system
+        
+        try:
+            self.market_stream = get_market_stream(self.ai_engine.universe)
+            await self.market_stream.start()
+            self.market_stream.attach("portfolio_optimizer", get_portfolio_optimizer().on_quotes, min_interval=1.0)
+            self.market_stream.attach("predictive_system", get_predictive_system().on_quotes, min_interval=1.0)
+            logger.info("📡 Flux temps réel actif", feeds=[feed.name for feed in self.market_stream.feeds])
+        except Exception as e:
+            logger.warning("⚠️ Flux temps réel indisponible, retour au polling", error=str(e))
+            self.market_stream = None
+    
     async def _register_advanced_tasks(self):
         """
         📋 ENREGISTREMENT DES TÂCHES ULTRA-AVANCÉES
@@ -302,11 +377,10 @@ class TradingAISystem:
         
         start_time = datetime.utcnow()
         
-        # Récupération des données de marché en temps réel
-        market_data = await self._fetch_comprehensive_market_data()
-        
-        # Analyse IA multi-modèles
-        ai_analysis = await self.ai_engine.analyze_market_multi_dimensional(market_data)
+        # Données de marché et analyse IA multi-modèles (instantané partagé)
+        snapshot = await self.market_snapshots.get()
+        market_data = snapshot.market_data
+        ai_analysis = snapshot.analysis
         
         # Mise à jour du régime de marché
         self.current_regime = ai_analysis["regime"]
@@ -544,9 +618,20 @@ class TradingAISystem:
         return result
     
     # MÉTHODES UTILITAIRES ET HELPERS
-    async def _fetch_comprehensive_market_data(self) -> Dict:
+    async def _fetch_comprehensive_market_data(self, max_staleness: Optional[float] = None) -> Dict:
+        """Données de marché de l'instantané partagé (fetch unique par fenêtre)"""
+        snapshot = await self.market_snapshots.get(max_staleness)
+        return snapshot.market_data
+    
+    async def _fetch_market_data_from_sources(self) -> Dict:
         """Récupération complète des données de marché"""
         
+        # Table de cotations du flux temps réel si elle est alimentée (cotations réelles uniquement)
+        if self.market_stream is not None:
+            snapshot = self.market_stream.table.snapshot()
+            if snapshot:
+                return snapshot
+        
         # TODO: Implémenter vraie récupération de données
         return {
             "VTI": {"price": 245.50, "volume": 1250000, "bid": 245.48, "ask": 245.52},
@@ -615,7 +700,13 @@ class TradingAISystem:
                 "ai_engine": "operational" if self.ai_engine else "offline",
                 "orchestrator": "operational" if self.orchestrator else "offline",
                 "auto_healer": "operational" if self.auto_healer else "offline"
-            }
+            },
+            "market_snapshot": self.market_snapshots.get_stats() if self.market_snapshots else {},
+            "llm_cache": self.ai_engine.get_llm_cache_stats() if self.ai_engine else {},
+            "indicators": get_indicator_engine().get_stats(),
+            "backtest": self.last_backtest.summary() if self.last_backtest else {},
+            "model_router": self.ai_engine.get_router_stats() if self.ai_engine else {},
+            "market_stream": self.market_stream.get_stats() if self.market_stream else {}
         }
     
     async def stop_system(self):
@@ -632,6 +723,12 @@ class TradingAISystem:
         if self.auto_healer:
             await self.auto_healer.stop_monitoring()
         
+        if self.market_stream:
+            await self.market_stream.stop()
+        
+        if self.ai_engine:
+            await self.ai_engine.close()
+        
         logger.info("✅ Système Trading AI arrêté avec succès")
     
     # Stubs pour méthodes complexes (à implémenter)
@@ -648,19 +745,89 @@ class TradingAISystem:
         pass
     
     async def _performance_monitoring_loop(self):
-        """Loop monitoring performance"""
+        """Loop monitoring performance : barres synchronisées rejouées dès leur arrivée dans le store"""
         while self.is_running:
+            try:
+                new_bars = await asyncio.to_thread(self._apply_synced_bars)
+                if new_bars.n_bars:
+                    logger.info("🕯️ Nouvelles barres rejouées", symbols=len(new_bars.symbols), bars=new_bars.n_bars)
+                    await self._validate_predictions(new_bars.symbols)
+            except Exception as e:
+                logger.warning("⚠️ Lecture des barres synchronisées impossible", error=str(e))
             await asyncio.sleep(60)  # Every minute
     
+    async def _validate_predictions(self, symbols: List[str]):
+        """Prédictions échues validées sur les clôtures réalisées du store"""
+        from app.orchestrator.predictive_system import get_predictive_system
+        
+        predictive = get_predictive_system()
+        timeframe = settings.INDICATOR_TIMEFRAME
+        bar = timeframe_duration(timeframe)
+        pending = predictive.pending_validations(datetime.utcnow(), bar)
+        if not pending:
+            return
+        
+        start = min(prediction.generated_at for prediction in pending.values()) - 2 * bar
+        arrays = await asyncio.to_thread(get_market_store().read_range, symbols, timeframe, start, datetime.utcnow())
+        # Store alimenté par CoinCap : cryptos cotées 24/7
+        results = await predictive.validate_with_bars(
+            arrays, default_class="crypto", periods_per_year=timedelta(days=365) / bar
+        )
+        if results:
+            logger.info("✅ Prédictions validées sur les barres réalisées", predictions=len(results))
+    
+    def _warm_up_indicators(self):
+        """Indicateurs recalculés sur les symboles synchronisés du store (thread)"""
+        store = get_market_store()
+        symbols = store.symbols(settings.INDICATOR_TIMEFRAME)
+        bars = get_indicator_engine().load_store(
+            symbols, settings.INDICATOR_TIMEFRAME, settings.INDICATOR_WARMUP_BARS, store=store
+        )
+        self._bars_seen = store.latest_timestamps(symbols, settings.INDICATOR_TIMEFRAME)
+        return symbols, bars
+    
+    def _apply_synced_bars(self):
+        """Barres écrites par la synchronisation depuis le dernier passage : indicateurs et covariance (thread)"""
+        from app.orchestrator.portfolio_optimizer import get_portfolio_optimizer
+        
+        store = get_market_store()
+        symbols = store.symbols(settings.INDICATOR_TIMEFRAME)
+        new_bars = store.read_since(symbols, settings.INDICATOR_TIMEFRAME, self._bars_seen, datetime.utcnow())
+        if new_bars.n_bars:
+            get_indicator_engine().advance(new_bars)
+            get_portfolio_optimizer().on_bars(new_bars)
+            for i, symbol in enumerate(new_bars.symbols):
+                present = np.flatnonzero(~np.isnan(new_bars.close[i]))
+                if present.size:
+                    self._bars_seen[symbol] = new_bars.timestamps[present[-1]].astype(datetime)
+        return new_bars
+    
     async def _continuous_optimization_loop(self):
         """Loop optimisation continue"""
         while self.is_running:
             await asyncio.sleep(300)  # Every 5 minutes
     
     async def _market_opportunity_scanner(self):
-        """Scanner opportunités marché"""
-        while self.is_running:
-            await asyncio.sleep(30)  # Every 30 seconds
+        """Scanner opportunités marché : tick par tick sur le flux temps réel, sinon toutes les 30 s"""
+        if self.market_stream is None:
+            while self.is_running:
+                await asyncio.sleep(30)  # Every 30 seconds
+            return
+        
+        # Mouvement depuis le dernier signal du symbole : instantané invalidé pour le prochain cycle IA
+        threshold = settings.MARKET_STREAM_MOVE_THRESHOLD
+        reference: Dict[str, float] = {}
+        async for tick in self.market_stream.subscribe("opportunity_scanner"):
+            if not self.is_running:
+                break
+            last = reference.setdefault(tick.symbol, tick.price)
+            if last and abs(tick.price / last - 1) >= threshold:
+                reference[tick.symbol] = tick.price
+                self.system_stats.signals_generated += 1
+                if self.market_snapshots:
+                    self.market_snapshots.invalidate()
+                logger.info("🎯 Mouvement de marché détecté", symbol=tick.symbol,
+                           move=f"{tick.price / last - 1:+.2%}", feed=tick.feed)
     
     async def _proactive_risk_management(self):
         """Gestion proactive des risques"""
@@ -698,13 +865,36 @@ class TradingAISystem:
         }
     
     async def _calculate_performance_metrics(self) -> Dict:
+        """Métriques réalisées : décisions de l'ensemble rejouées sur l'historique récent de l'univers"""
+        refresh = timedelta(seconds=settings.BACKTEST_REFRESH_SECONDS)
+        if self._last_backtest_at is None or datetime.utcnow() - self._last_backtest_at > refresh:
+            self._last_backtest_at = datetime.utcnow()
+            try:
+                self.last_backtest = await asyncio.to_thread(self._backtest_universe)
+            except Exception as e:
+                logger.warning("⚠️ Backtest des métriques de performance impossible", error=str(e))
+        
+        result = self.last_backtest
         return {
-            "total_return": 0.124,  # 12.4%
-            "sharpe_ratio": 1.45,
-            "max_drawdown": 0.08,  # 8%
-            "volatility": 0.18  # 18%
+            "total_return": result.total_return if result else 0.0,
+            "sharpe_ratio": result.sharpe_ratio if result else 0.0,
+            "max_drawdown": result.max_drawdown if result else 0.0,
+            "volatility": result.volatility if result else 0.0,
+            "turnover": result.turnover if result else 0.0,
+            "bars": result.bars if result else 0
         }
     
+    def _backtest_universe(self) -> BacktestResult:
+        """Backtest daily des symboles synchronisés sur BACKTEST_LOOKBACK_DAYS (thread)"""
+        end = datetime.utcnow()
+        # Symboles effectivement synchronisés dans le store (l'univers de signaux peut ne pas y être)
+        store = get_market_store()
+        symbols = store.symbols(settings.INDICATOR_TIMEFRAME)
+        arrays = store.read_range(
+            symbols, settings.INDICATOR_TIMEFRAME, end - timedelta(days=settings.BACKTEST_LOOKBACK_DAYS), end
+        )
+        return get_backtest_engine().run(arrays, BacktestConfig.from_settings(name="monitoring"))
+    
     async def _calculate_overall_system_health(self) -> float:
         return 0.95  # 95% health
 
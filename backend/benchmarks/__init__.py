@@ -0,0 +1,4 @@
+"""
+⏱️ BENCHMARKS - MESURES DE PERFORMANCE
+Scripts de benchmark à lancer depuis backend/ : python -m benchmarks.<module>
+"""
@@ -0,0 +1,117 @@
+"""
+⏱️ BENCHMARK - AI SCHEDULER
+===========================
+
+Retard de planification (démarrage réel - échéance prévue) sur des tâches
+périodiques dont le worker Celery est simulé (100 ms par exécution),
+temps compressé : 1 minute planifiée = 1 seconde réelle.
+- Avant : scrutation périodique (30 s -> 0.5 s) puis exécution en série
+- Après : file de priorité, réveil à l'échéance, exécution concurrente par priorité
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_ai_scheduler [--tasks 20] [--duration 10] [--poll 0.5]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.orchestrator.ai_scheduler import AIScheduler, ScheduledTask
+from app.orchestrator.decision_engine import Priority, TaskType
+from app.orchestrator.task_dispatcher import TaskOutcome
+from app.tasks.queues import queue_for_task
+
+TIME_SCALE = 1 / 60  # 1 minute planifiée = 1 seconde
+
+class SimulatedWorkerDispatcher:
+    """Remplace l'aller-retour Celery par un temps d'exécution fixe"""
+
+    def __init__(self, run_time: float):
+        self.run_time = run_time
+
+    async def dispatch(self, task_name, kwargs=None, priority=Priority.MEDIUM, timeout=None) -> TaskOutcome:
+        await asyncio.sleep(self.run_time)
+        return TaskOutcome(
+            task_id=task_name, task_name=task_name, queue=queue_for_task(task_name),
+            state="SUCCESS", run_time=self.run_time, total_time=self.run_time
+        )
+
+    def get_stats(self):
+        return {}
+
+def make_scheduler(n_tasks: int) -> AIScheduler:
+    """Planificateur avec n tâches réparties sur les priorités (1 à 3 min simulées)"""
+    scheduler = AIScheduler(dispatcher=SimulatedWorkerDispatcher(run_time=0.1))
+    priorities = list(Priority)
+    now = datetime.utcnow()
+    for i in range(n_tasks):
+        task = ScheduledTask(
+            id=f"bench_{i}",
+            task_type=TaskType.MARKET_ANALYSIS,
+            priority=priorities[i % len(priorities)],
+            next_execution=now + timedelta(seconds=0.05 * i),
+            frequency_minutes=(1 + i % 3) * TIME_SCALE,
+            celery_task_name=scheduler.task_registry[TaskType.MARKET_ANALYSIS],
+            parameters={}
+        )
+        scheduler.scheduled_tasks[task.id] = task
+        scheduler._schedule(task)
+    return scheduler
+
+async def run_polling(scheduler: AIScheduler, duration: float, poll_interval: float) -> np.ndarray:
+    """Ancienne boucle : scan complet toutes les poll_interval secondes, exécution en série"""
+    lags = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        now = datetime.utcnow()
+        ready = sorted(
+            (task for task in scheduler.scheduled_tasks.values() if task.next_execution <= now),
+            key=lambda t: t.priority.value
+        )
+        for task in ready:
+            lags.append((datetime.utcnow() - task.next_execution).total_seconds())
+            await scheduler._execute_task(task)
+        await asyncio.sleep(poll_interval)
+    return np.array(lags)
+
+async def run_event_driven(scheduler: AIScheduler, duration: float) -> np.ndarray:
+    """Nouvelle boucle de répartition d'AIScheduler"""
+    scheduler.running = True
+    dispatcher = asyncio.create_task(scheduler._dispatch_loop())
+    await asyncio.sleep(duration)
+    await scheduler.stop()
+    await dispatcher
+    return np.array(scheduler._recent_lags)
+
+def report(label: str, lags: np.ndarray):
+    p50, p95, p99 = np.percentile(lags * 1000, [50, 95, 99])
+    print(f"{label:<28} {lags.size:>7} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f} {lags.max() * 1000:>9.1f}")
+    return p95
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0, help="durée de chaque scénario (s)")
+    parser.add_argument("--poll", type=float, default=0.5, help="période de scrutation de l'ancienne boucle (s)")
+    args = parser.parse_args()
+
+    logging.getLogger("app.orchestrator.ai_scheduler").setLevel(logging.WARNING)
+
+    polling_lags = asyncio.run(run_polling(make_scheduler(args.tasks), args.duration, args.poll))
+    event_lags = asyncio.run(run_event_driven(make_scheduler(args.tasks), args.duration))
+
+    print(f"Retard de planification (ms), {args.tasks} tâches, {args.duration:.0f}s par scénario")
+    print(f"{'scénario':<28} {'départs':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    before = report("Scrutation + série (avant)", polling_lags)
+    after = report("Tas + concurrence (après)", event_lags)
+    print(f"p95 : {before / max(after, 1e-3):.1f}x plus faible, "
+          f"{event_lags.size / max(polling_lags.size, 1):.2f}x plus de départs")
+    return 0 if after < before else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+⏱️ BENCHMARK - BACKTEST DES DÉCISIONS
+====================================
+
+BacktestEngine sur des barres OHLCV synthétiques (marches aléatoires seedées) :
+
+1. Cohérence : trend_strength vectorisé vs moteur d'indicateurs en flux ;
+   mode daily (vectorisé) vs mode événementiel exécuté à la clôture, mêmes
+   courbes de valeur pour les politiques "signals" et "optimizer"
+2. Vitesse : daily vectorisé vs boucle d'événements sur --symbols × --bars
+3. Balayage : grille de paramètres en série puis dans le pool de processus
+   (résultats identiques), Sharpe / drawdown / turnover par configuration,
+   dont un run intraday (barres horaires, exécution à l'ouverture suivante)
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_backtest_engine [--symbols 200] [--bars 1260] [--workers 0]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+from app.orchestrator.backtest_engine import BacktestConfig, BacktestEngine, parameter_grid
+from app.orchestrator.indicator_engine import IndicatorEngine, trend_strength_history
+from benchmarks.bench_indicator_engine import synthetic_bars
+
+TOLERANCE = 1e-9
+
+def check_consistency(engine: BacktestEngine, seed: int) -> bool:
+    arrays = synthetic_bars(30, 400, seed)
+    streaming = IndicatorEngine()
+    streaming.recompute(arrays)
+    trend = trend_strength_history(arrays.high, arrays.low, arrays.close)
+    trend_gap = np.max(np.abs(streaming.snapshot(arrays.symbols).values["trend_strength"] - trend[:, -1]))
+
+    ok = trend_gap < TOLERANCE
+    print(f"trend_strength vectorisé vs flux : {trend_gap:.2e}")
+    for config in (BacktestConfig(rebalance_threshold=0.0), BacktestConfig(rebalance_threshold=0.05),
+                   BacktestConfig(policy="optimizer", rebalance_every=20, lookback=60)):
+        daily = engine.run(arrays, config)
+        events = engine.run(arrays, BacktestConfig(**{**config.__dict__, "mode": "intraday", "fill": "close"}))
+        gap = np.max(np.abs(daily.equity - events.equity))
+        ok &= gap < TOLERANCE and abs(daily.turnover - events.turnover) < 1e-6
+        print(f"daily vs événements ({config.policy}, seuil {config.rebalance_threshold:.2f}) : "
+              f"écart de valeur {gap:.2e}, Sharpe {daily.sharpe_ratio:.3f} / {events.sharpe_ratio:.3f}")
+    return ok
+
+def hourly(arrays, bars_per_day: int = 7):
+    """Mêmes barres réétiquetées en séances horaires (bars_per_day barres par jour)"""
+    n = arrays.close.shape[1]
+    day, slot = np.divmod(np.arange(n), bars_per_day)
+    arrays.timestamps = (np.datetime64("2024-01-01T14:00", "s") + day * np.timedelta64(86400, "s")
+                         + slot * np.timedelta64(3600, "s"))
+    arrays.timeframe = "1h"
+    return arrays
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--bars", type=int, default=1260)
+    parser.add_argument("--workers", type=int, default=0, help="0 = nombre de CPU")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)  # points fixes max_sharpe à μ ≈ 0 sur les fenêtres horaires
+    engine = BacktestEngine(max_workers=1)
+    consistent = check_consistency(engine, args.seed)
+
+    # Vitesse : un run daily vectorisé vs la boucle d'événements
+    arrays = synthetic_bars(args.symbols, args.bars, args.seed)
+    config = BacktestConfig()
+    daily = engine.run(arrays, config)
+    events = engine.run(arrays, BacktestConfig(mode="intraday", fill="close"))
+    speedup = events.elapsed_ms / daily.elapsed_ms
+    print(f"\n{args.symbols} symboles × {args.bars} barres : daily vectorisé {daily.elapsed_ms:.0f} ms, "
+          f"événements {events.elapsed_ms:.0f} ms ({speedup:.1f}x)")
+
+    # Balayage : série puis pool de processus
+    configs = parameter_grid(config, top_k=[3, 5, 10], rebalance_threshold=[0.0, 0.02, 0.05],
+                             rebalance_every=[1, 5])
+    configs.append(BacktestConfig(name="optimizer,every=20", policy="optimizer", rebalance_every=20))
+    configs.append(BacktestConfig(name="intraday,next_open", mode="intraday"))
+    sweep_arrays = hourly(synthetic_bars(args.symbols, args.bars, args.seed))
+
+    start = time.perf_counter()
+    serial = engine.sweep(sweep_arrays, configs)
+    serial_s = time.perf_counter() - start
+    pool = BacktestEngine(max_workers=args.workers)
+    start = time.perf_counter()
+    parallel = pool.sweep(sweep_arrays, configs)
+    parallel_s = time.perf_counter() - start
+    identical = all(np.array_equal(a.equity, b.equity) for a, b in zip(serial, parallel))
+    workers = min(pool._workers(), len(configs))
+
+    print(f"\n{'configuration':<52} {'Sharpe':>7} {'max DD':>7} {'turnover':>9} {'ordres':>7}")
+    for result in sorted(parallel, key=lambda r: r.sharpe_ratio, reverse=True):
+        print(f"{result.config.name:<52} {result.sharpe_ratio:>7.2f} {result.max_drawdown:>7.1%} "
+              f"{result.turnover:>8.1f}x {result.trades:>7}")
+    print(f"\n{len(configs)} configurations : série {serial_s:.1f}s, pool {workers} workers {parallel_s:.1f}s "
+          f"({serial_s / parallel_s:.1f}x, {os.cpu_count()} CPU), résultats identiques : {identical}")
+
+    parallel_ok = min(workers, os.cpu_count() or 1) < 2 or parallel_s < serial_s  # gain mesurable à 2+ CPU
+    return 0 if consistent and identical and speedup > 3 and parallel_ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+⏱️ BENCHMARK - FILES CELERY
+===========================
+
+Inonde les files Celery d'un mélange de tâches et mesure la latence de bout en
+bout (envoi -> résultat reçu par pub/sub) par domaine :
+- market_data : I/O 50 ms      - ai : I/O 200 ms
+- trading     : CPU ~50 ms     - monitoring : I/O 5 ms, priorité CRITICAL
+
+- Avant : file unique, un worker prefork -c 8 (ancien déploiement)
+- Après : files par domaine, un worker par profil (app.tasks.worker),
+  priorités broker, autoscaler prefork piloté par la profondeur de file
+
+Nécessite un broker Redis (REDIS_URL) ; les workers sont lancés en sous-processus.
+
+Usage (depuis backend/):
+    REDIS_URL=redis://localhost:6379/0 python -m benchmarks.bench_celery_queues [--tasks 200] [--legacy-concurrency 8]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+import redis
+
+from app.orchestrator.decision_engine import Priority
+from app.orchestrator.task_dispatcher import CeleryDispatcher
+from app.tasks.celery_app import celery_app
+from app.tasks.queues import QUEUE_PROFILES, desired_concurrency, queue_depths
+from app.tasks.worker import build_worker_argv
+
+LEGACY_QUEUE = "bench_legacy"
+BENCH_MODULE = "benchmarks.bench_celery_queues"
+
+@celery_app.task(name=f"{BENCH_MODULE}.io_task")
+def io_task(ms: float):
+    time.sleep(ms / 1000)
+    return ms
+
+@celery_app.task(name=f"{BENCH_MODULE}.cpu_task")
+def cpu_task(size: int):
+    matrix = np.random.default_rng(size).normal(size=(size, size))
+    return float(np.linalg.eigvalsh(matrix @ matrix.T)[-1])
+
+# domaine -> (tâche, argument, part du flot, priorité)
+WORKLOAD = {
+    "market_data": (io_task, 50, 1.0, Priority.HIGH),
+    "ai": (io_task, 200, 0.5, Priority.MEDIUM),
+    "trading": (cpu_task, 300, 0.25, Priority.HIGH),
+    "monitoring": (io_task, 5, 0.05, Priority.CRITICAL),
+}
+
+def start_workers(argvs):
+    env = {**os.environ, "PYTHONPATH": os.getcwd()}
+    workers = [subprocess.Popen(argv, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) for argv in argvs]
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if len(celery_app.control.ping(timeout=1.0) or []) >= len(argvs):
+            return workers
+    stop_workers(workers)
+    raise RuntimeError("workers Celery non démarrés (broker joignable ?)")
+
+def stop_workers(workers):
+    for worker in workers:
+        worker.terminate()
+    for worker in workers:
+        try:
+            worker.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+
+def build_flood(n_tasks: int):
+    """Envois entrelacés (domaine, tâche, argument, priorité)"""
+    flood = []
+    for domain, (task, arg, share, priority) in WORKLOAD.items():
+        flood += [(i / (n_tasks * share), domain, task, arg, priority) for i in range(max(int(n_tasks * share), 1))]
+    return [entry[1:] for entry in sorted(flood, key=lambda entry: entry[0])]
+
+async def run_flood(flood, legacy: bool, client: redis.Redis):
+    dispatcher = CeleryDispatcher(celery_app, timeout=300)
+    latencies = defaultdict(list)
+    max_depth = defaultdict(int)
+    done = asyncio.Event()
+
+    async def sample_depths():
+        queues = [LEGACY_QUEUE] if legacy else list(QUEUE_PROFILES)
+        while not done.is_set():
+            for queue, depth in (await asyncio.to_thread(queue_depths, client, queues)).items():
+                max_depth[queue] = max(max_depth[queue], depth)
+            await asyncio.sleep(0.2)
+
+    async def send(domain, task, arg, priority):
+        outcome = await dispatcher.dispatch(
+            task.name, {"ms" if task is io_task else "size": arg},
+            priority=Priority.MEDIUM if legacy else priority,
+            queue=LEGACY_QUEUE if legacy else domain
+        )
+        latencies[domain].append(outcome.total_time)
+
+    await dispatcher._ensure_listener()
+    sampler = asyncio.create_task(sample_depths())
+    start = time.perf_counter()
+    await asyncio.gather(*(send(*entry) for entry in flood))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await sampler
+    await dispatcher.close()
+    return latencies, max_depth, elapsed
+
+def report(label: str, latencies, elapsed: float):
+    print(f"\n{label} ({sum(len(v) for v in latencies.values())} tâches en {elapsed:.1f}s)")
+    print(f"{'file':<12} {'tâches':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    p95 = {}
+    for domain in WORKLOAD:
+        values = np.array(latencies[domain]) * 1000
+        p50, p95[domain], p99 = np.percentile(values, [50, 95, 99])
+        print(f"{domain:<12} {values.size:>7} {p50:>9.0f} {p95[domain]:>9.0f} {p99:>9.0f}")
+    return p95
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200, help="tâches market_data (les autres files au prorata)")
+    parser.add_argument("--legacy-concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    client = redis.Redis.from_url(celery_app.conf.broker_url)
+    flood = build_flood(args.tasks)
+    quiet = ["--loglevel", "warning", "-I", BENCH_MODULE]
+
+    legacy_argv = [
+        "celery", "-A", "app.tasks.celery_app", "worker", "-Q", LEGACY_QUEUE, "-n", "legacy@%h",
+        "-P", "prefork", "--concurrency", str(args.legacy_concurrency), *quiet
+    ]
+    workers = start_workers([legacy_argv])
+    try:
+        latencies, _, elapsed = asyncio.run(run_flood(flood, legacy=True, client=client))
+    finally:
+        stop_workers(workers)
+    before = report(f"Avant : file unique, prefork -c {args.legacy_concurrency}", latencies, elapsed)
+
+    workers = start_workers([build_worker_argv(profile, extra=quiet) for profile in QUEUE_PROFILES.values()])
+    try:
+        latencies, max_depth, elapsed = asyncio.run(run_flood(flood, legacy=False, client=client))
+    finally:
+        stop_workers(workers)
+    after = report("Après : files par domaine + priorités", latencies, elapsed)
+
+    print("\nProfondeur max et concurrence visée par la politique d'autoscaling :")
+    for name, profile in QUEUE_PROFILES.items():
+        target = desired_concurrency(profile, max_depth[name], 0)
+        print(f"  {name:<12} {profile.pool:<8} profondeur {max_depth[name]:>4} -> {target} (min {profile.concurrency})")
+
+    print(f"\nmonitoring p95 : {before['monitoring']:.0f}ms -> {after['monitoring']:.0f}ms")
+    return 0 if after["monitoring"] < before["monitoring"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+⏱️ BENCHMARK - COVARIANCE SERVICE
+=================================
+
+Coût d'une nouvelle barre sur une fenêtre glissante de 252 jours :
+- Référence : rechargement complet (log-rendements + moments sur la fenêtre)
+  puis estimation
+- Service : mise à jour de rang 1 des moments glissants puis estimation
+
+Vérifie aussi l'écart entre la covariance incrémentale et le recalcul
+(échantillon et Ledoit-Wolf).
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_covariance_service [--sizes 4 100 500] [--bars 200]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from app.orchestrator.covariance_service import CovarianceService
+
+WINDOW = 252
+MAX_ERROR = 1e-10
+MIN_SPEEDUP = 1.5
+
+def make_prices(n_assets: int, n_bars: int, seed: int = 42) -> np.ndarray:
+    """Prix (N × T) log-normaux seedés"""
+    rng = np.random.default_rng(seed)
+    return 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, (n_assets, n_bars)), axis=1))
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 100, 500])
+    parser.add_argument("--bars", type=int, default=200, help="nouvelles barres appliquées")
+    args = parser.parse_args()
+
+    worst_error = 0.0
+    min_speedup = float("inf")
+    print(f"{'assets':>6} {'estimateur':>12} {'recalcul':>11} {'incrémental':>12} {'gain':>7} {'écart max':>10}")
+    for n_assets in args.sizes:
+        prices = make_prices(n_assets, WINDOW + 1 + args.bars)
+        symbols = [f"SYM{i:04d}" for i in range(n_assets)]
+
+        for estimator in ("sample", "ledoit_wolf", "ewma"):
+            # Référence : rechargement complet de la fenêtre à chaque barre
+            start = time.perf_counter()
+            for t in range(WINDOW + 2, prices.shape[1] + 1):
+                reference_service = CovarianceService()
+                reference_service.load_prices(symbols, prices[:, t - WINDOW - 1:t], window=WINDOW)
+                reference = reference_service.estimate(symbols, WINDOW, estimator)
+            full_ms = (time.perf_counter() - start) * 1000 / max(args.bars - 1, 1)
+
+            service = CovarianceService()
+            service.load_prices(symbols, prices[:, :WINDOW + 1], window=WINDOW)
+
+            start = time.perf_counter()
+            for t in range(WINDOW + 1, prices.shape[1]):
+                service.update(symbols, prices[:, t])
+                estimate = service.estimate(symbols, WINDOW, estimator)
+            incremental_ms = (time.perf_counter() - start) * 1000 / max(args.bars - 1, 1)
+
+            # EWMA : récursion amorcée au chargement, non comparable au recalcul
+            error = 0.0
+            if estimator != "ewma":
+                error = float(np.max(np.abs(estimate.covariance - reference.covariance)))
+                worst_error = max(worst_error, error)
+
+            if n_assets == max(args.sizes):
+                min_speedup = min(min_speedup, full_ms / incremental_ms)
+
+            print(
+                f"{n_assets:>6} {estimator:>12} {full_ms:>9.3f}ms {incremental_ms:>10.3f}ms "
+                f"{full_ms / incremental_ms:>6.1f}x {error:>10.2e}"
+            )
+
+    print(f"Écart max : {worst_error:.2e} (objectif < {MAX_ERROR:.0e})")
+    print(f"Gain min à {max(args.sizes)} assets : {min_speedup:.1f}x (objectif > {MIN_SPEEDUP}x)")
+    return 0 if worst_error < MAX_ERROR and min_speedup > MIN_SPEEDUP else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+⏱️ BENCHMARK - POOL DE CONNEXIONS BASE DE DONNÉES
+=================================================
+
+200 requêtes concurrentes (connexion + requête courte) contre PostgreSQL,
+latence d'acquisition de connexion mesurée par requête :
+- Avant : engine synchrone en NullPool (une connexion physique par requête)
+- Après : engine synchrone poolé (configuration de database.connection)
+- Après : engine asynchrone asyncpg poolé, requêtes en tâches asyncio
+
+Chaque configuration fait un tour de chauffe puis --rounds tours mesurés.
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_db_pool [--url postgresql://...] [--concurrency 200] [--rounds 5] [--query-ms 5]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from database.connection import _pool_kwargs, async_database_url
+
+def summarize(label: str, timings: list, errors: int, elapsed_s: float, n_requests: int):
+    """Percentiles d'acquisition et de requête complète (ms)"""
+    acquire = np.array([t[0] for t in timings]) if timings else np.full(1, np.nan)
+    total = np.array([t[1] for t in timings]) if timings else np.full(1, np.nan)
+    a50, a95, a99 = np.percentile(acquire, [50, 95, 99])
+    t50, t95 = np.percentile(total, [50, 95])
+    print(
+        f"{label:<22} {a50:>8.2f} {a95:>8.2f} {a99:>8.2f} {t50:>9.2f} {t95:>9.2f} "
+        f"{n_requests / elapsed_s:>8.0f} {errors:>7}"
+    )
+    return a95, t95, errors
+
+def run_sync(engine, concurrency: int, rounds: int, query_ms: float):
+    query = text(f"SELECT pg_sleep({query_ms / 1000})")
+
+    def request():
+        start = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                acquired = (time.perf_counter() - start) * 1000
+                conn.execute(query)
+            return acquired, (time.perf_counter() - start) * 1000
+        except Exception:
+            return None
+
+    latencies, errors = [], 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda _: request(), range(concurrency)))  # chauffe
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for timing in executor.map(lambda _: request(), range(concurrency)):
+                if timing is None:
+                    errors += 1
+                else:
+                    latencies.append(timing)
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+async def run_async(engine, concurrency: int, rounds: int, query_ms: float):
+    query = text(f"SELECT pg_sleep({query_ms / 1000})")
+
+    async def request():
+        start = time.perf_counter()
+        try:
+            async with engine.connect() as conn:
+                acquired = (time.perf_counter() - start) * 1000
+                await conn.execute(query)
+            return acquired, (time.perf_counter() - start) * 1000
+        except Exception:
+            return None
+
+    await asyncio.gather(*(request() for _ in range(concurrency)))  # chauffe
+    latencies, errors = [], 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for timing in await asyncio.gather(*(request() for _ in range(concurrency))):
+            if timing is None:
+                errors += 1
+            else:
+                latencies.append(timing)
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return latencies, errors, elapsed
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--query-ms", type=float, default=5.0, help="durée de la requête simulée")
+    args = parser.parse_args()
+
+    n_requests = args.concurrency * args.rounds
+    print(f"Latences (ms), {args.concurrency} requêtes concurrentes × {args.rounds} tours")
+    print(
+        f"{'configuration':<22} {'acq p50':>8} {'acq p95':>8} {'acq p99':>8} "
+        f"{'req p50':>9} {'req p95':>9} {'req/s':>8} {'erreurs':>7}"
+    )
+
+    null_engine = create_engine(args.url, poolclass=NullPool)
+    latencies, errors, elapsed = run_sync(null_engine, args.concurrency, args.rounds, args.query_ms)
+    before_acquire, before_total, before_errors = summarize("NullPool (avant)", latencies, errors, elapsed, n_requests)
+    null_engine.dispose()
+
+    pooled_engine = create_engine(args.url, **_pool_kwargs(args.url))
+    latencies, errors, elapsed = run_sync(pooled_engine, args.concurrency, args.rounds, args.query_ms)
+    pooled_acquire, pooled_total, pooled_errors = summarize("QueuePool sync (après)", latencies, errors, elapsed, n_requests)
+    pooled_engine.dispose()
+
+    async_url = async_database_url(args.url)
+    async_engine = create_async_engine(async_url, **_pool_kwargs(async_url))
+    latencies, errors, elapsed = asyncio.run(run_async(async_engine, args.concurrency, args.rounds, args.query_ms))
+    async_acquire, async_total, async_errors = summarize("asyncpg pool (après)", latencies, errors, elapsed, n_requests)
+
+    # Asynchrone : au-delà de pool_size + max_overflow, l'attente du pool est de
+    # la mise en file (pas d'ouverture de connexion) ; on compare la requête complète
+    improved = pooled_errors == 0 and async_errors == 0 and (
+        before_errors > 0 or (pooled_acquire < before_acquire and async_total < before_total)
+    )
+    return 0 if improved else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+⏱️ BENCHMARK - ENSEMBLE IA HORS RÉSEAU
+======================================
+
+Charge de bout en bout d'AIEnsembleEngine sans service externe :
+LLMStubServer (serveur local compatible OpenAI) démarré dans le processus,
+fournisseurs HTTPChatProvider via le transport HTTP partagé, ModelRouter.
+
+- --concurrency cycles d'analyse simultanés (orchestrateurs, workers)
+- profils de latence / erreurs par modèle : défauts du stub ou --stub-config
+- temps compressé par --time-scale (échéances du routeur mises à l'échelle)
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_ensemble_offline [--cycles 60] [--concurrency 12] [--time-scale 0.05]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+
+import numpy as np
+import structlog
+
+from app.integrations.http_pool import close_http_transport, get_http_transport
+from benchmarks.llm_stub_server import LLMStubServer
+from core.ai_ensemble import AIEnsembleEngine
+
+BASE_MARKET = {
+    "VTI": {"price": 245.50, "volume": 1250000, "bid": 245.48, "ask": 245.52},
+    "QQQ": {"price": 384.75, "volume": 890000, "bid": 384.72, "ask": 384.78},
+    "SPY": {"price": 475.20, "volume": 2100000, "bid": 475.18, "ask": 475.22}
+}
+
+def market_data(cycle: int):
+    drift = 1 + 0.002 * cycle
+    return {asset: {field: value * drift for field, value in quote.items()} for asset, quote in BASE_MARKET.items()}
+
+async def run(args, stub_config):
+    server = LLMStubServer.from_config(stub_config, seed=args.seed, time_scale=args.time_scale)
+    base_url = await server.start(port=0)
+    engine = AIEnsembleEngine({
+        "providers": {name: {"kind": "http", "base_url": base_url} for name in ("openai", "groq")},
+        "router": {"cycle_deadline": 20.0 * args.time_scale, "analysis_timeout": 15.0 * args.time_scale},
+        "llm_cache": {"enabled": args.cache}
+    })
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    durations, partial, failures = [], 0, 0
+
+    async def cycle(index: int):
+        nonlocal partial, failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await engine.analyze_market_multi_dimensional(market_data(index))
+                partial += bool(result["routing"]["missing"])
+            except Exception:
+                failures += 1
+            durations.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(cycle(i) for i in range(args.cycles)))
+    elapsed = time.perf_counter() - start
+
+    pool = get_http_transport().get_pool_metrics()
+    router_stats = engine.get_router_stats()
+    await engine.close()
+    await close_http_transport()
+    await server.stop()
+    return np.array(durations), elapsed, partial, failures, server.get_stats(), router_stats, pool
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=12)
+    parser.add_argument("--time-scale", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--stub-config", default=None, help="profils de modèles du stub (JSON)")
+    parser.add_argument("--cache", action="store_true", help="active le cache LLM (mémoire)")
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+    stub_config = {}
+    if args.stub_config:
+        with open(args.stub_config) as f:
+            stub_config = json.load(f)
+
+    durations, elapsed, partial, failures, stub_stats, router_stats, pool = asyncio.run(run(args, stub_config))
+    scaled = durations / args.time_scale
+    p50, p95, p99 = np.percentile(scaled, [50, 95, 99])
+
+    print(f"{args.cycles} cycles, {args.concurrency} simultanés, {elapsed:.1f}s réelles "
+          f"({args.cycles / elapsed:.1f} cycles/s)")
+    print(f"durée de cycle (s simulées) : p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  max {scaled.max():.2f}")
+    print(f"cycles partiels : {partial}  échecs : {failures}")
+
+    print(f"\n{'modèle (stub)':<22} {'requêtes':>9} {'erreurs':>8} {'p50 s':>7} {'p99 s':>7}")
+    for model, stats in stub_stats.items():
+        print(f"{model:<22} {stats['requests']:>9} {stats['errors']:>8} "
+              f"{(stats['latency_p50'] or 0) / args.time_scale:>7.2f} {(stats['latency_p99'] or 0) / args.time_scale:>7.2f}")
+
+    print(f"\n{'modèle (routeur)':<22} {'timeouts':>9} {'hedges':>7} {'gagnés':>7} {'tokens':>8} {'coût $':>8}")
+    for model, stats in router_stats["models"].items():
+        if stats["tokens"] or stats["hedges_fired"] or stats["timeouts"]:
+            print(f"{model:<22} {stats['timeouts']:>9} {stats['hedges_fired']:>7} {stats['hedges_won']:>7} "
+                  f"{stats['tokens']:>8} {stats['cost_usd']:>8.3f}")
+
+    for host, metrics in pool.items():
+        print(f"\npool HTTP {host} : {metrics['requests_total']} requêtes, attente max {metrics['max_wait_ms']:.1f} ms")
+
+    within_deadline = scaled.max() <= 20.0 * 1.1
+    return 0 if failures == 0 and within_deadline else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+⏱️ BENCHMARK - INDICATEURS TECHNIQUES EN FLUX
+=============================================
+
+IndicatorEngine sur des barres OHLCV synthétiques (marches aléatoires seedées) :
+
+1. Exactitude : recalcul par lots vs référence pandas (ewm / rolling) sur
+   EMA, MACD, RSI et ATR de Wilder, Bollinger, VWAP ; flux barre par barre
+   identique au recalcul par lots ; relecture depuis le store OHLCV puis
+   barres synchronisées rejouées (SQLite en mémoire)
+2. Débit : mise à jour d'une barre pour --symbols symboles (objectif < 10 ms)
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_indicator_engine [--symbols 10000] [--warmup 60] [--iterations 200]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+from app.orchestrator.indicator_engine import FEATURES, IndicatorEngine
+from database.market_store import BarArrays, MarketDataStore
+
+TARGET_MS = 10.0
+
+def synthetic_bars(n_symbols: int, n_bars: int, seed: int) -> BarArrays:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_symbols, n_bars)), axis=1))
+    open_ = close * (1 + rng.normal(0, 0.005, close.shape))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, close.shape))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, close.shape))
+    volume = rng.uniform(1e4, 1e6, close.shape)
+    timestamps = np.datetime64("2024-01-01", "s") + np.arange(n_bars) * np.timedelta64(86400, "s")
+    return BarArrays([f"SYM{i:05d}" for i in range(n_symbols)], "1d", timestamps, open_, high, low, close, volume)
+
+def pandas_reference(arrays: BarArrays, row: int) -> dict:
+    """Indicateurs de la dernière barre, calculés par pandas"""
+    close, high, low = (pd.Series(getattr(arrays, name)[row]) for name in ("close", "high", "low"))
+    volume = pd.Series(arrays.volume[row])
+    ema_fast = close.ewm(span=12, adjust=False).mean()
+    ema_slow = close.ewm(span=26, adjust=False).mean()
+    macd = ema_fast - ema_slow
+    signal = macd.ewm(span=9, adjust=False).mean()
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    true_range = pd.concat([high - low, (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1).max(axis=1)
+    atr = true_range.ewm(alpha=1 / 14, adjust=False).mean()
+    mid = close.rolling(20).mean()
+    std = close.rolling(20).std(ddof=0)
+    typical = (high + low + close) / 3
+    return {
+        "ema_fast": ema_fast.iloc[-1], "ema_slow": ema_slow.iloc[-1], "macd": macd.iloc[-1],
+        "macd_signal": signal.iloc[-1], "rsi": 100 - 100 / (1 + gain.iloc[-1] / loss.iloc[-1]),
+        "atr": atr.iloc[-1], "bb_mid": mid.iloc[-1], "bb_upper": mid.iloc[-1] + 2 * std.iloc[-1],
+        "vwap": (typical * volume).sum() / volume.sum()
+    }
+
+def check_accuracy(seed: int) -> bool:
+    arrays = synthetic_bars(20, 300, seed)
+    batch = IndicatorEngine()
+    batch.recompute(arrays)
+    snapshot = batch.snapshot(arrays.symbols)
+
+    worst = 0.0
+    for row in range(len(arrays.symbols)):
+        for name, expected in pandas_reference(arrays, row).items():
+            worst = max(worst, abs(snapshot.values[name][row] - expected) / max(abs(expected), 1e-9))
+
+    streaming = IndicatorEngine(capacity=4)   # réallocations en cours de route
+    for t in range(arrays.close.shape[1]):
+        streaming.update(arrays.symbols, arrays.open[:, t], arrays.high[:, t], arrays.low[:, t],
+                         arrays.close[:, t], arrays.volume[:, t])
+    streamed = streaming.snapshot(arrays.symbols)
+    stream_gap = max(np.max(np.abs(streamed.values[name] - snapshot.values[name])) for name in FEATURES)
+
+    db_gap = check_market_store(arrays.symbols[:5], seed)
+    print(f"écart relatif max vs pandas : {worst:.2e}   flux vs lots : {stream_gap:.2e}   "
+          f"store OHLCV + barres synchronisées vs lots : {db_gap:.2e}")
+    return worst < 1e-6 and stream_gap < 1e-9 and db_gap < 1e-9
+
+def check_market_store(symbols, seed: int) -> float:
+    """Recalcul depuis le store OHLCV (SQLite) = recalcul depuis les tableaux ; barres synchronisées rejouées"""
+    arrays = synthetic_bars(len(symbols), 120, seed + 1)
+    store = MarketDataStore(create_engine("sqlite://"))
+    start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=130)
+    bars = [
+        (symbol, "1d", start + timedelta(days=t), arrays.open[i, t], arrays.high[i, t], arrays.low[i, t],
+         arrays.close[i, t], arrays.volume[i, t])
+        for i, symbol in enumerate(symbols) for t in range(arrays.close.shape[1])
+    ]
+    store.ingest(bar for bar in bars if bar[2] < start + timedelta(days=100))
+    from_store = IndicatorEngine()
+    from_store.load_store(list(symbols), "1d", store=store)
+    since = store.latest_timestamps(list(symbols), "1d")
+    store.ingest(bars)
+    from_store.advance(store.read_since(list(symbols), "1d", since, datetime.now(timezone.utc)))
+
+    arrays.symbols = list(symbols)
+    from_arrays = IndicatorEngine()
+    from_arrays.recompute(arrays)
+    a, b = from_store.snapshot(symbols), from_arrays.snapshot(symbols)
+    return max(np.max(np.abs(a.values[name] - b.values[name])) for name in FEATURES)
+
+def bench_update(n_symbols: int, warmup: int, iterations: int, seed: int):
+    arrays = synthetic_bars(n_symbols, warmup + iterations, seed)
+    engine = IndicatorEngine(capacity=n_symbols)
+    history = BarArrays(arrays.symbols, "1d", arrays.timestamps[:warmup], arrays.open[:, :warmup],
+                        arrays.high[:, :warmup], arrays.low[:, :warmup], arrays.close[:, :warmup],
+                        arrays.volume[:, :warmup])
+    start = time.perf_counter()
+    engine.recompute(history)
+    recompute_s = time.perf_counter() - start
+
+    idx = engine.indices(arrays.symbols)
+    timings = []
+    for t in range(warmup, warmup + iterations):
+        start = time.perf_counter()
+        engine.update(idx, arrays.open[:, t], arrays.high[:, t], arrays.low[:, t], arrays.close[:, t],
+                      arrays.volume[:, t])
+        timings.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    engine.update(arrays.symbols, arrays.open[:, -1], arrays.high[:, -1], arrays.low[:, -1],
+                  arrays.close[:, -1], arrays.volume[:, -1])
+    by_name_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    snapshot = engine.snapshot(arrays.symbols)
+    snapshot_ms = (time.perf_counter() - start) * 1000
+    return np.array(timings), recompute_s, by_name_ms, snapshot_ms, snapshot
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=10000)
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    accurate = check_accuracy(args.seed)
+
+    timings, recompute_s, by_name_ms, snapshot_ms, snapshot = bench_update(
+        args.symbols, args.warmup, args.iterations, args.seed)
+    p50, p99 = np.percentile(timings, [50, 99])
+    print(f"\n{args.symbols} symboles, historique {args.warmup} barres recalculé en {recompute_s * 1000:.0f} ms")
+    print(f"mise à jour 1 barre (indices résolus) : p50 {p50:.2f} ms  p99 {p99:.2f} ms  "
+          f"({args.symbols / p50 / 1000:.1f} M symboles/s)")
+    print(f"mise à jour 1 barre (noms de symboles) : {by_name_ms:.2f} ms")
+    print(f"lecture des indicateurs (snapshot) : {snapshot_ms:.2f} ms")
+    print(f"RSI médian {np.median(snapshot.values['rsi']):.1f}, tendance > 0 : "
+          f"{np.mean(snapshot.values['trend_strength'] > 0):.0%}")
+
+    return 0 if accurate and p50 < TARGET_MS else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
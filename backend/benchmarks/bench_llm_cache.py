@@ -0,0 +1,130 @@
+"""
+⏱️ BENCHMARK - CACHE LLM
+========================
+
+Cycles d'analyse d'AIEnsembleEngine (technique Groq + fondamentale GPT-4) avec
+des clients LLM simulés (latence fixe, usage en tokens) :
+- données de marché bruitées à chaque cycle (cours ±0.02 %, volumes ±2 %),
+  mouvement de 1 % tous les --move-every cycles
+- --callers demandeurs concurrents par cycle (orchestrateur, système, API...)
+
+- Avant : chaque demandeur appelle les deux modèles
+- Après : LLMCache (empreinte quantifiée, coalescence, LRU + Redis si --redis-url)
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_llm_cache [--cycles 20] [--callers 4] [--move-every 5] [--redis-url redis://localhost:6379/0]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from core.ai_ensemble import AIEnsembleEngine
+from core.llm_providers import SDKChatProvider
+
+LATENCY_S = {"llama3-70b-8192": 0.25, "gpt-4-turbo-preview": 0.60}
+TOKENS = {"llama3-70b-8192": 1400, "gpt-4-turbo-preview": 1900}
+
+BASE_MARKET = {
+    "VTI": {"price": 245.50, "volume": 1250000, "bid": 245.48, "ask": 245.52},
+    "QQQ": {"price": 384.75, "volume": 890000, "bid": 384.72, "ask": 384.78},
+    "SPY": {"price": 475.20, "volume": 2100000, "bid": 475.18, "ask": 475.22},
+    "IWM": {"price": 195.30, "volume": 560000, "bid": 195.28, "ask": 195.32},
+    "EFA": {"price": 78.45, "volume": 320000, "bid": 78.43, "ask": 78.47}
+}
+
+CONTENT = '{"trend_strength": 0.3, "macro_score": 0.1, "score": 72}'
+
+class SimulatedChatClient:
+    """Client chat.completions : latence et usage fixes par modèle"""
+
+    def __init__(self, scale: float):
+        self.scale = scale
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, **params):
+        self.calls += 1
+        await asyncio.sleep(LATENCY_S[model] * self.scale)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=CONTENT))],
+            usage=SimpleNamespace(total_tokens=TOKENS[model])
+        )
+
+def market_cycles(cycles: int, move_every: int, seed: int = 7):
+    """Données de marché par cycle : bruit de cotation + mouvement périodique"""
+    rng = np.random.default_rng(seed)
+    level = 1.0
+    for cycle in range(cycles):
+        if cycle and cycle % move_every == 0:
+            level *= 1.01
+        moves = {asset: level * (1 + rng.uniform(-2e-4, 2e-4)) for asset in BASE_MARKET}
+        yield {
+            asset: {
+                **{field: round(value * moves[asset], 2) for field, value in quote.items() if field != "volume"},
+                "volume": int(quote["volume"] * (1 + rng.uniform(-0.02, 0.02))),
+                "timestamp": time.time()
+            }
+            for asset, quote in BASE_MARKET.items()
+        }
+
+async def run(cycles, callers: int, cached: bool, redis_url, scale: float):
+    clients = {name: SimulatedChatClient(scale) for name in ("groq", "openai")}
+    engine = AIEnsembleEngine(
+        {"llm_cache": {"enabled": cached, "redis_url": redis_url}, "structured_output": {"stream": False}},
+        providers={name: SDKChatProvider(name, client) for name, client in clients.items()}
+    )
+    if engine.llm_cache is not None:
+        await engine.llm_cache.invalidate()
+
+    async def request(market_data):
+        await asyncio.gather(
+            engine._technical_analysis_groq(market_data),
+            engine._fundamental_analysis_gpt4(market_data)
+        )
+
+    start = time.perf_counter()
+    for market_data in cycles:
+        await asyncio.gather(*(request(market_data) for _ in range(callers)))
+    elapsed = time.perf_counter() - start
+
+    calls = sum(client.calls for client in clients.values())
+    stats = engine.get_llm_cache_stats()
+    await engine.close()
+    return elapsed, calls, stats
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--callers", type=int, default=4)
+    parser.add_argument("--move-every", type=int, default=5)
+    parser.add_argument("--redis-url", default=None, help="stockage partagé (sinon LRU mémoire seule)")
+    parser.add_argument("--scale", type=float, default=1.0, help="facteur appliqué aux latences simulées")
+    args = parser.parse_args()
+
+    direct_time, direct_calls, _ = asyncio.run(run(
+        list(market_cycles(args.cycles, args.move_every)), args.callers, False, None, args.scale))
+    cached_time, cached_calls, stats = asyncio.run(run(
+        list(market_cycles(args.cycles, args.move_every)), args.callers, True, args.redis_url, args.scale))
+
+    print(f"{args.cycles} cycles x {args.callers} demandeurs x 2 modèles")
+    print(f"{'scénario':<22} {'appels LLM':>10} {'temps s':>9}")
+    print(f"{'Sans cache (avant)':<22} {direct_calls:>10} {direct_time:>9.2f}")
+    print(f"{'LLMCache (après)':<22} {cached_calls:>10} {cached_time:>9.2f}")
+
+    print(f"\n{'modèle':<22} {'hit rate':>9} {'coalescés':>10} {'tokens éco.':>12} {'latence éco. s':>15}")
+    for model, model_stats in stats["models"].items():
+        print(f"{model:<22} {model_stats['hit_rate']:>9.1%} {model_stats['coalesced']:>10} "
+              f"{model_stats['tokens_saved']:>12} {model_stats['latency_saved']:>15.2f}")
+
+    levels = len({cycle // args.move_every for cycle in range(args.cycles)})
+    print(f"\nniveaux de marché distincts : {levels} (minimum {2 * levels} appels)")
+    # au-delà de la simple coalescence : des cycles entiers servis par le cache
+    return 0 if cached_calls < direct_calls / args.callers and cached_time < direct_time else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
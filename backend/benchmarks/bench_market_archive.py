@@ -0,0 +1,92 @@
+"""
+⏱️ BENCHMARK - MARKET ARCHIVE
+=============================
+
+Archive Parquet/Arrow sur des barres minute synthétiques (N symboles × Y ans) :
+- Écriture des partitions mensuelles Parquet (zstd)
+- Lecture froide : décodage Parquet + construction du cache Arrow IPC
+- Lecture chaude : cache memory-mappé, colonnes NumPy sans copie
+- Lecture d'un mois (partition unique, vues directes sur le fichier mappé)
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_market_archive [--symbols 3] [--years 2] [--root /tmp/market_archive_bench]
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from database.market_archive import MarketArchive
+
+MINUTES_PER_YEAR = 365 * 24 * 60
+START = datetime(2023, 1, 1, tzinfo=timezone.utc)
+MAX_WARM_READ_MS_PER_YEAR = 50.0
+
+def make_bars(n_minutes: int, seed: int):
+    """Barres minute log-normales seedées (epoch ms, o/h/l/c/v)"""
+    rng = np.random.default_rng(seed)
+    timestamps = int(START.timestamp() * 1000) + np.arange(n_minutes, dtype=np.int64) * 60_000
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 5e-4, n_minutes)))
+    spread = np.abs(rng.normal(0.0, 2e-4, n_minutes)) * close
+    return timestamps, close, close + spread, close - spread, close, rng.gamma(2.0, 50.0, n_minutes)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=3)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--root", default=None, help="répertoire de l'archive (temporaire par défaut)")
+    args = parser.parse_args()
+
+    root = args.root or tempfile.mkdtemp(prefix="market_archive_bench_")
+    archive = MarketArchive(root)
+    symbols = [f"SYM{i}" for i in range(args.symbols)]
+    n_minutes = args.years * MINUTES_PER_YEAR
+
+    try:
+        start = time.perf_counter()
+        for i, symbol in enumerate(symbols):
+            archive.write_bars(symbol, "1m", *make_bars(n_minutes, seed=i))
+        write_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for symbol in symbols:
+            cold = archive.read(symbol, "1m")
+        cold_ms = (time.perf_counter() - start) * 1000 / len(symbols)
+
+        warm_runs = []
+        for _ in range(5):
+            start = time.perf_counter()
+            for symbol in symbols:
+                warm = archive.read(symbol, "1m")
+            warm_runs.append((time.perf_counter() - start) * 1000 / len(symbols))
+        warm_ms = min(warm_runs)
+
+        month_start = datetime(2023, 6, 1, tzinfo=timezone.utc)
+        month_end = datetime(2023, 7, 1, tzinfo=timezone.utc)
+        start = time.perf_counter()
+        month = archive.read(symbols[0], "1m", month_start, month_end)
+        month_ms = (time.perf_counter() - start) * 1000
+
+        assert cold.n_bars == warm.n_bars == n_minutes
+        assert np.array_equal(cold.close, warm.close)
+
+        print(f"Archive : {len(symbols)} symboles × {n_minutes:,} barres minute ({args.years} an(s)) -> {root}")
+        print(f"Écriture Parquet      : {write_s:8.2f}s ({len(symbols) * n_minutes / write_s:,.0f} barres/s)")
+        print(f"Lecture froide        : {cold_ms:8.1f}ms / symbole (Parquet + cache Arrow)")
+        print(f"Lecture chaude (mmap) : {warm_ms:8.1f}ms / symbole")
+        print(f"Lecture d'un mois     : {month_ms:8.2f}ms ({month.n_bars:,} barres, vues sans copie: {month.close.base is not None})")
+
+        per_year = warm_ms / args.years
+        print(f"Lecture chaude : {per_year:.1f}ms par année de barres minute (objectif < {MAX_WARM_READ_MS_PER_YEAR:.0f}ms)")
+        return 0 if per_year < MAX_WARM_READ_MS_PER_YEAR else 1
+    finally:
+        if args.root is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+⏱️ BENCHMARK - MARKET SNAPSHOT
+==============================
+
+Demandes concurrentes de données de marché + analyse IA dans un cycle
+(contexte d'orchestration, tâches d'analyse, tâches aval) avec un fetch
+simulé de 150 ms et une analyse multi-modèles simulée de 600 ms :
+- Avant : chaque demandeur refait fetch + analyse
+- Après : MarketSnapshotProvider (single-flight + borne de fraîcheur)
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_market_snapshot [--requesters 8] [--cycles 3] [--scale 1.0]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from core.market_snapshot import MarketSnapshotProvider
+
+FETCH_S = 0.15
+ANALYSIS_S = 0.60
+
+class SimulatedMarket:
+    def __init__(self, scale: float):
+        self.scale = scale
+        self.fetches = 0
+        self.analyses = 0
+
+    async def fetch(self):
+        self.fetches += 1
+        await asyncio.sleep(FETCH_S * self.scale)
+        return {"VTI": {"price": 245.5}, "QQQ": {"price": 384.75}, "SPY": {"price": 475.2}}
+
+    async def analyze(self, market_data):
+        self.analyses += 1
+        await asyncio.sleep(ANALYSIS_S * self.scale)
+        return {"regime": "BULL", "assets": len(market_data)}
+
+async def run_direct(market: SimulatedMarket, requesters: int, cycles: int) -> float:
+    async def request():
+        return await market.analyze(await market.fetch())
+
+    start = time.perf_counter()
+    for _ in range(cycles):
+        await asyncio.gather(*(request() for _ in range(requesters)))
+    return time.perf_counter() - start
+
+async def run_snapshot(market: SimulatedMarket, requesters: int, cycles: int, max_staleness: float):
+    provider = MarketSnapshotProvider(market.fetch, market.analyze, bucket_seconds=30.0, max_staleness=max_staleness)
+    start = time.perf_counter()
+    versions = set()
+    for _ in range(cycles):
+        snapshots = await asyncio.gather(*(provider.get() for _ in range(requesters)))
+        versions.update(snapshot.version for snapshot in snapshots)
+    return time.perf_counter() - start, provider.get_stats(), versions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requesters", type=int, default=8, help="demandeurs concurrents par cycle")
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--scale", type=float, default=1.0, help="facteur appliqué aux durées simulées")
+    args = parser.parse_args()
+
+    direct = SimulatedMarket(args.scale)
+    direct_s = asyncio.run(run_direct(direct, args.requesters, args.cycles))
+
+    shared = SimulatedMarket(args.scale)
+    shared_s, stats, versions = asyncio.run(run_snapshot(shared, args.requesters, args.cycles, max_staleness=60.0))
+
+    fresh = SimulatedMarket(args.scale)
+    fresh_s, fresh_stats, _ = asyncio.run(run_snapshot(fresh, args.requesters, args.cycles, max_staleness=0.0))
+
+    print(f"{args.requesters} demandeurs concurrents × {args.cycles} cycles")
+    print(f"Direct (avant)                 : {direct_s:6.2f}s, {direct.fetches} fetchs, {direct.analyses} analyses")
+    print(f"Snapshot, fraîcheur 60s        : {shared_s:6.2f}s, {shared.fetches} fetch, {shared.analyses} analyse, "
+          f"versions {sorted(versions)}, {stats['coalesced']} regroupées, {stats['cache_hits']} en cache")
+    print(f"Snapshot, fraîcheur 0s (cycle) : {fresh_s:6.2f}s, {fresh.fetches} fetchs, {fresh.analyses} analyses, "
+          f"{fresh_stats['coalesced']} regroupées")
+
+    ok = shared.analyses == 1 and fresh.analyses == args.cycles and shared_s < direct_s
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
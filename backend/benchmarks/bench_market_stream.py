@@ -0,0 +1,174 @@
+"""
+⏱️ BENCHMARK - FLUX DE COTATIONS TEMPS RÉEL
+==========================================
+
+MarketStream contre le serveur de rejeu local (benchmarks/market_replay_server.py) :
+
+1. Ingestion : messages Binance pré-générés décodés, écrits dans la table et
+   diffusés à --subscribers abonnés tick par tick + 2 abonnés conflatés
+2. Temps réel : flux Binance et Alpaca par WebSocket pendant --seconds,
+   décalage mise à jour marché → consommation pour Alpaca (quotes horodatées),
+   réception → consommation pour Binance (@bookTicker sans heure d'événement,
+   décalage du flux publié comme indisponible) ; vs scan REST toutes les 30 s
+3. Coupures : le serveur ferme chaque connexion après --drop-after cotations ;
+   reconnexion, rattrapage REST, puis table identique au marché simulé ;
+   un symbole inconnu du broker n'entre jamais dans la table
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_market_stream [--messages 200000] [--subscribers 3] [--seconds 2]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+import numpy as np
+
+from app.integrations.http_pool import close_http_transport
+from app.integrations.market_stream import AlpacaFeed, BinanceFeed, MarketStream, StreamConfig
+from app.integrations.quote_service import QuoteConfig, QuoteService
+from app.integrations.trading_apis import AlpacaBroker, BinanceBroker, TradingMode, TradingOrchestrator
+from benchmarks.market_replay_server import MarketReplayServer
+
+POLL_INTERVAL_S = 30.0  # ancien _market_opportunity_scanner
+UNKNOWN_SYMBOL = "NOPEUSDT"  # abonné mais inconnu du serveur : aucune cotation réelle
+
+def quote_service(base_url: str) -> QuoteService:
+    """Cotations groupées (rattrapage) servies par le serveur de rejeu"""
+    orchestrator = TradingOrchestrator()
+    alpaca, binance = AlpacaBroker("key", "secret", TradingMode.PAPER), BinanceBroker("key", "secret", TradingMode.PAPER)
+    alpaca.data_url, binance.base_url = base_url, f"{base_url}/api"
+    orchestrator.brokers = {"alpaca": alpaca, "binance": binance}
+    return QuoteService(QuoteConfig(ttl_seconds=0.0), orchestrator)
+
+def make_stream(server: MarketReplayServer, base_url: str) -> MarketStream:
+    ws_url = base_url.replace("http://", "ws://")
+    feeds = [BinanceFeed(f"{ws_url}/stream", server.crypto_symbols + [UNKNOWN_SYMBOL]),
+             AlpacaFeed(f"{ws_url}/v2/iex", server.equity_symbols, "key", "secret")]
+    return MarketStream(StreamConfig(reconnect_initial=0.02, reconnect_max=0.2), feeds, quote_service(base_url))
+
+def bench_ingest(args) -> bool:
+    server = MarketReplayServer(seed=args.seed)
+    messages = []
+    for i in range(args.messages):
+        symbol = server.crypto_symbols[i % len(server.crypto_symbols)]
+        server.step(symbol)
+        messages.append(server.binance_message(symbol))
+
+    feed = BinanceFeed("ws://replay", server.crypto_symbols)
+    stream = MarketStream(StreamConfig(queue_size=args.messages), [feed], QuoteService(orchestrator=TradingOrchestrator()))
+    ticks = [stream.subscribe(f"scanner_{i}") for i in range(args.subscribers)]
+    conflated = [stream.bus.subscribe(f"consumer_{i}", conflate=True) for i in range(2)]
+
+    start = time.perf_counter()
+    for message in messages:
+        stream.ingest(feed, message)
+    elapsed = time.perf_counter() - start
+
+    stats = stream.feed_stats["binance"]
+    rate = stats.ticks / elapsed
+    delivered = all(s.pending() == args.messages for s in ticks) and all(
+        s.pending() == len(server.crypto_symbols) for s in conflated)
+    exact = all(
+        stream.table.get(symbol).bid == server.book[symbol][0] and stream.table.get(symbol).ask == server.book[symbol][1]
+        for symbol in server.crypto_symbols
+    )
+    print(f"1. ingestion : {stats.ticks} ticks en {elapsed * 1000:.0f} ms : {rate:,.0f} ticks/s, "
+          f"{args.subscribers} abonnés tick par tick + 2 conflatés, tout livré : {delivered}, table exacte : {exact}")
+    return rate >= args.min_rate and delivered and exact
+
+async def bench_live(args) -> bool:
+    server = MarketReplayServer(rate=args.rate, seed=args.seed)
+    base_url = await server.start()
+    stream = make_stream(server, base_url)
+    delays = {feed.name: [] for feed in stream.feeds}
+    batches = []
+
+    async def scanner():
+        async for tick in stream.subscribe("scanner"):
+            if not tick.backfill:
+                delays[tick.feed].append(time.time() - tick.timestamp)
+
+    try:
+        await stream.start()
+        stream.attach("optimizer", lambda batch: batches.append(len(batch)), min_interval=0.1)
+        task = asyncio.create_task(scanner())
+        await asyncio.sleep(args.seconds)
+        server.paused = True
+        await asyncio.sleep(0.2)
+        stats = stream.get_stats()
+        await stream.stop()
+        await task
+    finally:
+        await server.stop()
+
+    feeds = stats["feeds"]
+    consumed = sum(len(feed_delays) for feed_delays in delays.values())
+    print(f"2. temps réel : {server.stats['quotes']} cotations diffusées, {consumed} ticks consommés, "
+          f"{len(stream.table)} symboles en table, {len(batches)} lots conflatés "
+          f"(scan REST toutes les {POLL_INTERVAL_S:.0f} s : {POLL_INTERVAL_S / 2 * 1000:.0f} ms en moyenne)")
+    fast = True
+    for feed in stream.feeds:
+        delays_ms = np.array(delays[feed.name]) * 1000
+        p50, p99 = np.percentile(delays_ms, [50, 99]) if len(delays_ms) else (float("nan"), float("nan"))
+        fast &= p99 < POLL_INTERVAL_S * 1000 / 2
+        origin = "marché" if feed.event_time else "réception"
+        lag = feeds[feed.name]
+        lag_text = (f"décalage du flux moyen {lag['lag_ewma_ms']} ms / max {lag['lag_max_ms']} ms" if lag["lag_available"]
+                    else "décalage du flux indisponible (pas d'heure d'événement)")
+        print(f"   {feed.name}: {lag['messages']} messages, {lag['ticks']} ticks, "
+              f"{origin} → scanner p50 {p50:.1f} ms, p99 {p99:.1f} ms, {lag_text}")
+    received = sum(feed["ticks"] - feed["backfilled"] for feed in feeds.values())
+    binance_unmeasured = feeds["binance"]["lag_ewma_ms"] is None and feeds["binance"]["lag_max_ms"] is None
+    return received == server.stats["quotes"] and consumed == received and fast and binance_unmeasured
+
+async def bench_reconnect(args) -> bool:
+    server = MarketReplayServer(rate=args.rate, drop_after=args.drop_after, seed=args.seed)
+    base_url = await server.start()
+    stream = make_stream(server, base_url)
+    try:
+        await stream.start()
+        await asyncio.sleep(args.seconds)
+        server.paused = True
+        await asyncio.sleep(0.5)
+        stats = stream.get_stats()
+        mismatches = [
+            symbol for symbol, (bid, ask, *_) in server.book.items()
+            if (quote := stream.table.get(symbol)) is None or (quote.bid, quote.ask) != (bid, ask)
+        ]
+        unknown_kept = UNKNOWN_SYMBOL in stream.table.snapshot() or stream.table.get(UNKNOWN_SYMBOL) is not None
+        await stream.stop()
+    finally:
+        await server.stop()
+        await close_http_transport()
+
+    feeds = stats["feeds"]
+    print(f"3. coupures : serveur {server.stats['drops']} coupures, {server.stats['rest_requests']} appels REST")
+    for name, feed in feeds.items():
+        print(f"   {name}: {feed['reconnects']} reconnexions, trous {feed['gaps']} ({feed['gap_seconds']} s), "
+              f"{feed['backfilled']} cotations rattrapées, {feed['stale']} ticks périmés écartés")
+    print(f"   table vs marché simulé : {len(server.book) - len(mismatches)}/{len(server.book)} symboles identiques, "
+          f"{UNKNOWN_SYMBOL} sans cotation écarté : {not unknown_kept} ({feeds['binance']['unavailable']} fois)")
+    return not mismatches and not unknown_kept and all(feed["reconnects"] > 0 and feed["gaps"] > 0 for feed in feeds.values())
+
+async def run(args) -> bool:
+    live = await bench_live(args)
+    reconnect = await bench_reconnect(args)
+    return live and reconnect
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--subscribers", type=int, default=3)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--rate", type=float, default=2000.0, help="mises à jour marché par seconde")
+    parser.add_argument("--drop-after", type=int, default=300)
+    parser.add_argument("--min-rate", type=float, default=30_000.0, help="ticks/s minimum à l'ingestion")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    ingest = bench_ingest(args)
+    return 0 if asyncio.run(run(args)) and ingest else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
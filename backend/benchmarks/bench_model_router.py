@@ -0,0 +1,118 @@
+"""
+⏱️ BENCHMARK - ROUTAGE DES ANALYSES IA
+======================================
+
+Cycles d'analyse d'AIEnsembleEngine avec des clients LLM simulés :
+- GPT-4 : ~2 s (log-normale), 12 % d'appels bloqués 10 à 30 s
+- Groq  : ~0.4 s
+
+- Avant : asyncio.gather des 7 analyses, sans timeout (un appel bloqué bloque le cycle)
+- Après : ModelRouter (échéance 20 s, timeout 15 s, GPT-4 couvert par Groq au p90)
+
+Temps compressé par --scale (0.1 : 1 s simulée = 100 ms).
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_model_router [--cycles 40] [--scale 0.1]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from core.ai_ensemble import AIEnsembleEngine
+from core.llm_providers import SDKChatProvider
+from core.model_router import ModelRouter
+
+CONTENT = '{"trend_strength": 0.3, "macro_score": 0.1, "score": 72}'
+TOKENS = {"llama3-70b-8192": 1400, "gpt-4-turbo-preview": 1900}
+MARKET = {
+    "VTI": {"price": 245.50, "volume": 1250000, "bid": 245.48, "ask": 245.52},
+    "SPY": {"price": 475.20, "volume": 2100000, "bid": 475.18, "ask": 475.22}
+}
+
+class SimulatedChatClient:
+    """Client chat.completions avec latences tirées par modèle"""
+
+    def __init__(self, scale: float, rng: np.random.Generator):
+        self.scale = scale
+        self.rng = rng
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def latency(self, model: str) -> float:
+        if model == "gpt-4-turbo-preview":
+            if self.rng.random() < 0.12:
+                return self.rng.uniform(10, 30)
+            return self.rng.lognormal(np.log(2.0), 0.3)
+        return self.rng.lognormal(np.log(0.4), 0.2)
+
+    async def create(self, model, messages, **params):
+        await asyncio.sleep(self.latency(model) * self.scale)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=CONTENT))],
+            usage=SimpleNamespace(total_tokens=TOKENS[model])
+        )
+
+def make_engine(scale: float, seed: int) -> AIEnsembleEngine:
+    rng = np.random.default_rng(seed)
+    engine = AIEnsembleEngine(
+        {"llm_cache": {"enabled": False}, "structured_output": {"stream": False}},
+        providers={name: SDKChatProvider(name, SimulatedChatClient(scale, rng)) for name in ("groq", "openai")}
+    )
+    engine.router = ModelRouter(cycle_deadline=20.0 * scale, default_timeout=15.0 * scale)
+    return engine
+
+async def run_gather(engine: AIEnsembleEngine, cycles: int):
+    """Ancienne exécution : gather sans timeout"""
+    durations = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        await asyncio.gather(*(route.call() for route in engine._analysis_routes(MARKET)), return_exceptions=True)
+        durations.append(time.perf_counter() - start)
+    return np.array(durations), 1.0
+
+async def run_router(engine: AIEnsembleEngine, cycles: int):
+    durations, fundamental = [], 0
+    for _ in range(cycles):
+        start = time.perf_counter()
+        report = await engine.router.run_cycle(engine._analysis_routes(MARKET))
+        durations.append(time.perf_counter() - start)
+        fundamental += "gpt4_fundamental" in report.results
+    return np.array(durations), fundamental / cycles
+
+def report(label: str, durations: np.ndarray, scale: float, coverage: float):
+    p50, p95 = np.percentile(durations / scale, [50, 95])
+    print(f"{label:<26} {p50:>8.2f} {p95:>8.2f} {durations.max() / scale:>8.2f} {coverage:>10.0%}")
+    return p95
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=40)
+    parser.add_argument("--scale", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    gather_durations, gather_coverage = asyncio.run(run_gather(make_engine(args.scale, args.seed), args.cycles))
+    engine = make_engine(args.scale, args.seed)
+    router_durations, router_coverage = asyncio.run(run_router(engine, args.cycles))
+
+    print(f"Durée de cycle (s simulées), {args.cycles} cycles")
+    print(f"{'scénario':<26} {'p50':>8} {'p95':>8} {'max':>8} {'fondam.':>10}")
+    before = report("gather sans timeout", gather_durations, args.scale, gather_coverage)
+    after = report("ModelRouter (hedging)", router_durations, args.scale, router_coverage)
+
+    print(f"\n{'modèle':<22} {'appels':>7} {'timeouts':>9} {'hedges':>7} {'gagnés':>7} {'p90 s':>7} {'coût $':>8}")
+    for model, usage in engine.router.usage.items():
+        if usage.tokens or usage.hedges_fired:
+            p90 = (usage.quantile(0.9) or 0.0) / args.scale
+            print(f"{model:<22} {usage.calls:>7} {usage.timeouts:>9} {usage.hedges_fired:>7} "
+                  f"{usage.hedges_won:>7} {p90:>7.2f} {usage.cost:>8.3f}")
+
+    deadline_respected = router_durations.max() <= engine.router.cycle_deadline * 1.05
+    return 0 if after < before and deadline_respected else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
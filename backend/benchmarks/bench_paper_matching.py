@@ -0,0 +1,244 @@
+"""
+⏱️ BENCHMARK - APPARIEMENT DU PAPER TRADING
+==========================================
+
+PaperMatchingEngine en temps simulé :
+
+1. Exactitude : priorité prix-temps des limites, fills partiels sur la
+   liquidité cotée, plafonnement au prix limite, déclenchement des stops,
+   latence injectée, comptabilité des positions d'un broker paper
+2. Débit du moteur seul : flux d'ordres aléatoires (marché, limite, stop,
+   annulations) sur --symbols carnets entrecoupé de cotations
+   (objectif 100k ordres/s, meilleure de --repeat passes)
+3. Débit avec la comptabilité d'un broker paper : même flux, chaque fill
+   passe par on_fill → BaseBroker._apply_paper_fill → LedgerAccount.apply_fill
+   (débit mesuré et affiché, sans objectif : il dépend du registre)
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_paper_matching [--orders 300000] [--symbols 100] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Optional
+
+from app.integrations.paper_matching import MatchingConfig, PaperMatchingEngine
+from app.integrations.trading_apis import (
+    BaseBroker, MarketData, Order, OrderSide, OrderStatus, OrderType, TradingMode
+)
+
+TARGET_ORDERS_PER_SECOND = 100_000
+
+def make_order(order_id: str, symbol: str, side: OrderSide, quantity: float, order_type: OrderType = OrderType.MARKET,
+               price: float = None, stop_price: float = None) -> Order:
+    return Order(id=order_id, symbol=symbol, side=side, type=order_type, quantity=quantity, price=price,
+                 status=OrderStatus.PENDING, created_at=datetime.now(), stop_price=stop_price)
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class QuoteBroker(BaseBroker):
+    """Broker paper alimenté par une cotation fixée à la main"""
+
+    def __init__(self):
+        super().__init__("", "", TradingMode.PAPER)
+        self.quote = MarketData("TEST", 100.0, 99.95, 100.05, 0.0, datetime.now())
+
+    async def get_market_data(self, symbol: str) -> MarketData:
+        return self.quote
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+def check_matching() -> bool:
+    clock = SimulatedClock()
+    fills = []
+    engine = PaperMatchingEngine(MatchingConfig(slippage_bps=0.0, impact_bps=0.0, participation=1.0),
+                                 on_fill=fills.append, clock=clock)
+    ok = True
+
+    # Priorité prix-temps : 99.0 (t0), 99.5 (t1), 99.5 (t2) ; l'ask descend à 99.0 avec 250 de liquidité
+    engine.on_quote("A", 99.9, 100.1, volume=1000)
+    for order in (make_order("l1", "A", OrderSide.BUY, 100, OrderType.LIMIT, 99.0),
+                  make_order("l2", "A", OrderSide.BUY, 100, OrderType.LIMIT, 99.5),
+                  make_order("l3", "A", OrderSide.BUY, 100, OrderType.LIMIT, 99.5)):
+        engine.submit(order)
+    ok &= check("limites au repos hors du marché", not fills and engine.books["A"].best_bid() == 99.5)
+    engine.on_quote("A", 98.9, 99.0, volume=250)
+    ok &= check("priorité prix-temps (l2, l3 puis l1 partiel)",
+                [(f.order_id, f.quantity) for f in fills] == [("l2", 100), ("l3", 100), ("l1", 50)])
+    l1 = engine.orders["l1"]
+    ok &= check("fill partiel : reliquat au repos", l1.status is OrderStatus.PARTIALLY_FILLED and l1.filled_quantity == 50)
+    ok &= check("plafonnement au prix limite", all(f.price <= 99.5 for f in fills))
+    engine.on_quote("A", 98.9, 99.0, volume=1000)
+    ok &= check("reliquat exécuté à la cotation suivante", l1.status is OrderStatus.FILLED and l1.filled_quantity == 100)
+
+    # Slippage et impact : achat au marché consommant toute la liquidité
+    engine = PaperMatchingEngine(MatchingConfig(slippage_bps=2.0, impact_bps=10.0, participation=1.0), clock=clock)
+    engine.on_quote("B", 99.95, 100.05, volume=100)
+    market = make_order("m1", "B", OrderSide.BUY, 100)
+    engine.submit(market)
+    ok &= check(f"slippage + impact sur l'ask ({market.filled_price:.4f})",
+                abs(market.filled_price - 100.05 * (1 + 12 / 10_000)) < 1e-9)
+    engine.on_quote("B", 0.0, 0.0, price=50.0)
+    sell = make_order("m2", "B", OrderSide.SELL, 10)
+    engine.submit(sell)
+    ok &= check("spread synthétique sans bid/ask", sell.filled_price < 50.0 and engine.books["B"].bid < 50.0)
+
+    # Stops : stop de vente déclenché sous 95, stop-limit d'achat au repos après déclenchement
+    engine = PaperMatchingEngine(MatchingConfig(slippage_bps=0.0, impact_bps=0.0), clock=clock)
+    engine.on_quote("C", 99.9, 100.1)
+    stop = make_order("s1", "C", OrderSide.SELL, 10, OrderType.STOP, stop_price=95.0)
+    stop_limit = make_order("s2", "C", OrderSide.BUY, 10, OrderType.STOP_LIMIT, price=104.0, stop_price=103.0)
+    engine.submit(stop)
+    engine.submit(stop_limit)
+    engine.on_quote("C", 96.0, 96.2)
+    ok &= check("stop en attente au-dessus du seuil", stop.status is OrderStatus.PENDING)
+    engine.on_quote("C", 94.8, 95.0)
+    ok &= check("stop déclenché et exécuté au bid", stop.status is OrderStatus.FILLED and stop.filled_price == 94.8)
+    engine.on_quote("C", 104.8, 105.0)
+    ok &= check("stop-limit déclenché, au repos au-dessus de la limite",
+                stop_limit.status is OrderStatus.PENDING and engine.books["C"].best_bid() == 104.0)
+    engine.on_quote("C", 103.8, 103.9)
+    ok &= check("stop-limit exécuté sous la limite", stop_limit.status is OrderStatus.FILLED)
+
+    # Latence : rien avant l'arrivée au carnet, puis exécution sur la cotation alors en vigueur
+    engine = PaperMatchingEngine(MatchingConfig(slippage_bps=0.0, impact_bps=0.0, latency_ms=50.0), clock=clock)
+    engine.on_quote("D", 99.9, 100.0)
+    delayed = make_order("d1", "D", OrderSide.BUY, 1)
+    delay = engine.submit(delayed)
+    clock.now += 0.02
+    engine.on_quote("D", 100.9, 101.0)
+    pending = delayed.status is OrderStatus.PENDING
+    clock.now += 0.04
+    engine.on_quote("D", 101.9, 102.0)
+    ok &= check(f"latence {delay * 1000:.0f} ms : exécution sur la cotation en vigueur à l'arrivée",
+                pending and delayed.filled_price == 101.0)
+    cancelled = make_order("d2", "D", OrderSide.BUY, 1)
+    engine.submit(cancelled)
+    ok &= check("annulation en vol", engine.cancel("d2") and engine.advance(clock.now + 1) == 0
+                and cancelled.filled_quantity == 0)
+    return ok
+
+async def check_broker() -> bool:
+    broker = QuoteBroker()
+    broker.paper_engine.config = MatchingConfig(slippage_bps=0.0, impact_bps=0.0)
+    ok = True
+    await broker.place_order("TEST", OrderSide.BUY, 10)
+    await broker.place_order("TEST", OrderSide.BUY, 10, OrderType.LIMIT, price=99.0)
+    position = broker.paper_positions["TEST"]
+    ok &= check("achat au marché à l'ask, limite au repos",
+                position.quantity == 10 and position.avg_price == 100.05 and len(broker.paper_engine.open_orders()) == 1)
+
+    broker.quote = MarketData("TEST", 110.0, 109.95, 110.05, 0.0, datetime.now())
+    await broker.place_order("TEST", OrderSide.SELL, 15)
+    position = broker.paper_positions["TEST"]
+    ok &= check(f"retournement court : P&L réalisé {broker.paper_realized_pnl:.2f}",
+                position.quantity == -5 and position.avg_price == 109.95
+                and abs(broker.paper_realized_pnl - 10 * (109.95 - 100.05)) < 1e-9)
+    cash = 10_000.0 - 10 * 100.05 + 15 * 109.95
+    ok &= check("cash = ventes - achats", abs(broker.paper_balance - cash) < 1e-9)
+
+    broker.quote = MarketData("TEST", 98.0, 97.95, 98.05, 0.0, datetime.now())
+    await broker.place_order("TEST", OrderSide.BUY, 1)  # la limite à 99 s'exécute d'abord sur cette cotation
+    position = broker.paper_positions["TEST"]
+    ok &= check("limite exécutée sur une cotation ultérieure, retour à l'achat",
+                position.quantity == 6 and position.avg_price == 98.05 and not broker.paper_engine.open_orders())
+    broker.reset_paper()
+    ok &= check("reset", broker.paper_balance == 10_000.0 and not broker.paper_orders
+                and broker.paper_engine.get_stats()["submitted"] == 0)
+    return ok
+
+def throughput(n_orders: int, n_symbols: int, seed: int, broker: Optional[BaseBroker] = None) -> float:
+    rng = random.Random(seed)
+    on_fill = broker._apply_paper_fill if broker is not None else None
+    engine = PaperMatchingEngine(MatchingConfig(participation=0.05, latency_ms=1.0, latency_jitter_ms=2.0),
+                                 on_fill=on_fill, seed=seed)
+    symbols = [f"SYM{i:03d}" for i in range(n_symbols)]
+    mids = {symbol: 100.0 for symbol in symbols}
+    for symbol in symbols:
+        engine.on_quote(symbol, 99.99, 100.01, volume=10_000, now=0.0)
+
+    # Flux pré-généré : le chronomètre ne mesure que le moteur (et le registre du broker s'il est branché)
+    types = (OrderType.MARKET, OrderType.LIMIT, OrderType.LIMIT, OrderType.LIMIT, OrderType.STOP)
+    orders = []
+    for i in range(n_orders):
+        symbol = symbols[rng.randrange(n_symbols)]
+        side = OrderSide.BUY if rng.random() < 0.5 else OrderSide.SELL
+        order_type = types[rng.randrange(len(types))]
+        offset = rng.uniform(-0.5, 0.5)
+        price = stop_price = None
+        if order_type is OrderType.LIMIT:
+            price = 100.0 + (offset if side is OrderSide.BUY else -offset)
+        elif order_type is OrderType.STOP:
+            stop_price = 100.0 + (abs(offset) if side is OrderSide.BUY else -abs(offset))
+        orders.append(make_order(str(i), symbol, side, float(rng.randint(1, 100)), order_type, price, stop_price))
+
+    # Une cotation toutes les 4 soumissions, une annulation toutes les 10
+    events = []
+    for i, order in enumerate(orders):
+        quote = cancel = None
+        if i % 4 == 0:
+            mid = mids[order.symbol] = mids[order.symbol] * (1 + rng.gauss(0, 0.001))
+            quote = (order.symbol, mid - 0.01, mid + 0.01)
+        if i % 10 == 0 and i:
+            cancel = orders[i - rng.randrange(1, min(i, 1000) + 1)].id
+        events.append((i * 1e-5, order, quote, cancel))
+
+    start = time.perf_counter()
+    for now, order, quote, cancel in events:
+        engine.submit(order, now)
+        if quote is not None:
+            engine.on_quote(*quote, volume=10_000, now=now)
+        if cancel is not None:
+            engine.cancel(cancel)
+    engine.advance(len(orders) * 1e-5 + 1)
+    elapsed = time.perf_counter() - start
+
+    stats = engine.get_stats()
+    rate = n_orders / elapsed
+    print(f"  {n_orders} ordres sur {n_symbols} carnets en {elapsed * 1000:.0f} ms : {rate:,.0f} ordres/s")
+    if broker is not None:
+        account = broker.ledger_account
+        print(f"  registre : {account.fills} exécutions, {len(account.positions)} positions, "
+              f"P&L réalisé {account.realized_pnl:,.2f}")
+    return rate, stats
+
+def best_throughput(label: str, args, with_broker: bool) -> float:
+    """Meilleure de --repeat passes : sur une machine partagée ou mono-CPU, la médiane varie de ±20 %"""
+    print(f"\n{label}")
+    best = 0.0
+    for _ in range(args.repeat):
+        rate, stats = throughput(args.orders, args.symbols, args.seed, QuoteBroker() if with_broker else None)
+        best = max(best, rate)
+    print(f"  fills {stats['fills']}, exécutés {stats['filled_orders']}, stops déclenchés {stats['triggered_stops']}, "
+          f"annulés {stats['cancelled']}, encore ouverts {stats['open_orders']}")
+    print(f"  meilleure passe : {best:,.0f} ordres/s")
+    return best
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=300_000)
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    correct = check_matching()
+    correct &= asyncio.run(check_broker())
+    engine_rate = best_throughput(f"Moteur seul (objectif {TARGET_ORDERS_PER_SECOND:,} ordres/s)", args, False)
+    broker_rate = best_throughput("Moteur + comptabilité du broker paper (registre des positions)", args, True)
+    print(f"\ncoût de la comptabilité : {engine_rate / broker_rate:.2f}x le temps du moteur seul")
+    return 0 if correct and engine_rate >= TARGET_ORDERS_PER_SECOND else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+⏱️ BENCHMARK - OPTIMISATION DE PORTEFEUILLE (FRONTIÈRE EN CACHE)
+===============================================================
+
+PortfolioOptimizer.optimize_portfolio sur l'historique mémoïsé :
+
+1. Deux appels successifs : le premier résout la frontière, le second la
+   relit du cache (mêmes estimations tant que l'historique n'est pas rafraîchi) ;
+   métriques attendues en forme fermée (pas de Monte Carlo) : 2e appel
+   sous MAX_WARM_OPTIMIZE_MS
+2. Toutes les paires stratégie × niveau de risque : une résolution par
+   niveau de risque, toutes les stratégies lues sur sa frontière
+3. Après refresh_market_data : nouvelles estimations, nouvelle résolution
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_portfolio_optimizer [--seed 42]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from app.orchestrator.portfolio_optimizer import AllocationStrategy, PortfolioOptimizer, RiskLevel
+
+MAX_WARM_OPTIMIZE_MS = 20.0
+
+async def timed_optimize(optimizer: PortfolioOptimizer, strategy=None, risk_level=None):
+    start = time.perf_counter()
+    result = await optimizer.optimize_portfolio(strategy, risk_level)
+    return result, (time.perf_counter() - start) * 1000
+
+async def run(args) -> bool:
+    optimizer = PortfolioOptimizer(seed=args.seed)
+    solver = optimizer.frontier_solver
+
+    # 1. Deux appels identiques
+    first, cold_ms = await timed_optimize(optimizer)
+    misses = solver.cache_misses
+    second, warm_ms = await timed_optimize(optimizer)
+    second_hit = solver.cache_misses == misses and solver.cache_hits >= 1
+    same_weights = first.optimal_weights == second.optimal_weights
+    print(f"1. optimize_portfolio : 1er appel {cold_ms:.1f} ms, 2e appel {warm_ms:.1f} ms "
+          f"(objectif < {MAX_WARM_OPTIMIZE_MS:.0f} ms, cache hit : {second_hit}, mêmes poids : {same_weights})")
+
+    # 2. Toutes les paires stratégie × niveau de risque
+    hits, misses = solver.cache_hits, solver.cache_misses
+    start = time.perf_counter()
+    pairs = [(strategy, risk_level) for risk_level in RiskLevel for strategy in AllocationStrategy]
+    for strategy, risk_level in pairs:
+        await optimizer.optimize_portfolio(strategy, risk_level)
+    pairs_ms = (time.perf_counter() - start) * 1000
+    new_misses = solver.cache_misses - misses
+    new_hits = solver.cache_hits - hits
+    # Le niveau par défaut (MEDIUM) est déjà en cache depuis l'étape 1
+    expected_misses = len(RiskLevel) - 1
+    print(f"2. {len(pairs)} paires stratégie × risque en {pairs_ms:.0f} ms : "
+          f"{new_misses} résolutions (attendu {expected_misses}), {new_hits} lectures en cache")
+
+    # 3. Rafraîchissement de l'historique
+    misses = solver.cache_misses
+    optimizer.refresh_market_data()
+    await optimizer.optimize_portfolio()
+    refreshed = solver.cache_misses == misses + 1
+    print(f"3. après refresh_market_data : nouvelle résolution : {refreshed}")
+
+    fast = warm_ms < MAX_WARM_OPTIMIZE_MS
+    return fast and second_hit and same_weights and new_misses == expected_misses and refreshed
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    return 0 if asyncio.run(run(args)) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+⏱️ BENCHMARK - REGISTRE DES POSITIONS
+====================================
+
+PositionLedger sur un flux aléatoire d'exécutions et de ticks (deux comptes,
+--symbols symboles actions / ETF / crypto, positions courtes comprises) :
+
+1. Exactitude : agrégats incrémentaux (cash, valeur, P&L réalisé et latent,
+   expositions par classe d'actifs) vs recalcul complet depuis les positions
+2. Débit : événements (exécutions + ticks) par seconde
+3. Lecture : valeur du portfolio et expositions en O(1), comparées à la somme
+   sur toutes les positions que faisait get_account
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_position_ledger [--symbols 5000] [--events 500000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import defaultdict
+
+from app.integrations.position_ledger import LedgerAccount, PositionLedger
+from app.integrations.trading_apis import TradingMode
+
+TOLERANCE = 1e-6
+
+def full_recompute(account: LedgerAccount):
+    """Référence : agrégats recalculés depuis les positions et le dernier prix"""
+    gross, net = defaultdict(float), defaultdict(float)
+    market_value = unrealized = 0.0
+    for symbol, position in account.positions.items():
+        price = account.prices[symbol]
+        value = position.quantity * price
+        market_value += value
+        unrealized += (price - position.avg_price) * position.quantity
+        gross[account.asset_classes[symbol]] += abs(value)
+        net[account.asset_classes[symbol]] += value
+    return market_value, unrealized, gross, net
+
+def replay_cash(account: LedgerAccount, initial_cash: float) -> float:
+    return initial_cash - sum(event.quantity * event.price for event in account.journal)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=500_000)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    symbols = [f"S{i:05d}" for i in range(args.symbols)]
+    symbols[:30] = ["VTI", "QQQ", "SPY", "BND", "VNQ", "GLD"] + [f"C{i}USDT" for i in range(24)]
+    prices = {symbol: rng.uniform(10, 500) for symbol in symbols}
+
+    ledger = PositionLedger()
+    initial_cash = 1_000_000.0
+    for name in ("alpaca", "binance"):
+        ledger.attach(name, LedgerAccount(name, TradingMode.PAPER, cash=initial_cash, journal_size=args.events))
+    accounts = list(ledger.accounts.values())
+
+    # Flux pré-généré : 30% d'exécutions, 70% de ticks
+    events = []
+    for _ in range(args.events):
+        symbol = symbols[rng.randrange(len(symbols))]
+        prices[symbol] *= 1 + rng.gauss(0, 0.002)
+        if rng.random() < 0.3:
+            events.append((accounts[rng.randrange(2)], symbol, rng.choice((-1, 1)) * rng.randint(1, 50), prices[symbol]))
+        else:
+            events.append((None, symbol, 0, prices[symbol]))
+
+    start = time.perf_counter()
+    for account, symbol, quantity, price in events:
+        if account is None:
+            ledger.on_price(symbol, price)
+        else:
+            account.mark(symbol, price)
+            account.apply_fill(symbol, quantity, price)
+    elapsed = time.perf_counter() - start
+    stats = ledger.get_stats()
+    print(f"{args.events} événements ({stats['fills']} exécutions, {stats['ticks']} réévaluations) "
+          f"en {elapsed * 1000:.0f} ms : {args.events / elapsed:,.0f} événements/s, {stats['positions']} positions")
+
+    # Exactitude
+    worst = 0.0
+    for account in accounts:
+        market_value, unrealized, gross, net = full_recompute(account)
+        gaps = [abs(account.market_value - market_value), abs(account.unrealized_pnl - unrealized),
+                abs(account.cash - replay_cash(account, initial_cash))]
+        gaps += [abs(account.gross_exposure[c] - gross[c]) for c in gross]
+        gaps += [abs(account.net_exposure[c] - net[c]) for c in net]
+        scale = max(1.0, abs(market_value), account.cash)
+        worst = max(worst, max(gaps) / scale)
+    print(f"écart relatif max incrémental vs recalcul : {worst:.2e}")
+    exposure = ledger.exposure_by_asset_class()
+    print("exposition : " + ", ".join(f"{c} {e['gross']:,.0f} brut / {e['weight']:+.1%} net" for c, e in exposure.items()))
+
+    # Lecture : O(1) vs somme sur les positions
+    reads = 2000
+    start = time.perf_counter()
+    for _ in range(reads):
+        ledger.total_value()
+        ledger.exposure_by_asset_class()
+    ledger_us = (time.perf_counter() - start) / reads * 1e6
+    start = time.perf_counter()
+    for _ in range(reads // 20):
+        sum(account.cash + sum(p.market_value for p in account.positions.values()) for account in accounts)
+    scan_us = (time.perf_counter() - start) / (reads // 20) * 1e6
+    print(f"valeur + expositions : registre {ledger_us:.1f} µs, somme sur les positions {scan_us:.1f} µs "
+          f"({scan_us / ledger_us:.0f}x)")
+
+    return 0 if worst < TOLERANCE and ledger_us < scan_us else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+⏱️ BENCHMARK - COTATIONS GROUPÉES
+================================
+
+Cotations de --symbols symboles (actions + crypto) contre un serveur local
+qui imite les endpoints Alpaca et Binance avec --latency-ms par requête :
+
+- Avant : boucle séquentielle de /market-data/batch, un appel
+  get_market_data par symbole
+- Après : QuoteService, un appel multi-symboles par broker (Alpaca
+  /v2/stocks/quotes/latest?symbols=, Binance /v3/ticker/bookTicker) en
+  parallèle, puis relecture depuis le cache à TTL court
+- Demandeurs concurrents sur des symboles communs : chaque symbole n'est
+  récupéré qu'une fois (single-flight)
+- Symbole inconnu du broker : erreur, ni cache ni prix simulé propagé
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_quote_service [--symbols 50] [--latency-ms 40] [--requesters 8]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import sys
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+from aiohttp import web
+
+from app.integrations.http_pool import close_http_transport
+from app.integrations.quote_service import QuoteConfig, QuoteService
+from app.integrations.trading_apis import AlpacaBroker, BinanceBroker, TradingMode, TradingOrchestrator
+
+class BrokerStub:
+    """Endpoints de cotations Alpaca / Binance avec une latence fixe par requête"""
+
+    def __init__(self, latency_s: float, crypto_symbols: int = 400):
+        self.latency_s = latency_s
+        self.crypto_symbols = [f"C{i:03d}USDT" for i in range(crypto_symbols)] + ["BTCUSDT", "ETHUSDT"]
+        self.requests: Counter = Counter()
+        self._runner: Optional[web.AppRunner] = None
+
+    @staticmethod
+    def book(symbol: str):
+        """Bid / ask / quantités déterministes par symbole"""
+        seed = int(hashlib.sha256(symbol.encode()).hexdigest()[:8], 16)
+        bid = round(10 + seed % 50_000 / 100, 2)
+        return bid, round(bid + 0.01 * (1 + seed % 5), 2), float(1 + seed % 300), float(1 + seed % 700)
+
+    def alpaca_quote(self, symbol: str) -> Dict:
+        bid, ask, bid_size, ask_size = self.book(symbol)
+        return {"bp": bid, "ap": ask, "bs": bid_size, "as": ask_size, "t": "2024-06-03T14:30:00.123456789Z"}
+
+    async def _delay(self, route: str):
+        self.requests[route] += 1
+        await asyncio.sleep(self.latency_s)
+
+    async def alpaca_single(self, request: web.Request) -> web.Response:
+        await self._delay("alpaca_single")
+        return web.json_response({"quote": self.alpaca_quote(request.match_info["symbol"])})
+
+    async def alpaca_batch(self, request: web.Request) -> web.Response:
+        await self._delay("alpaca_batch")
+        symbols = request.query.get("symbols", "").split(",")
+        return web.json_response({"quotes": {symbol: self.alpaca_quote(symbol) for symbol in symbols if symbol}})
+
+    async def binance_24hr(self, request: web.Request) -> web.Response:
+        await self._delay("binance_24hr")
+        bid, ask, bid_qty, ask_qty = self.book(request.query["symbol"])
+        return web.json_response({"lastPrice": str((bid + ask) / 2), "bidPrice": str(bid), "askPrice": str(ask),
+                                  "volume": str(bid_qty + ask_qty)})
+
+    async def binance_book(self, request: web.Request) -> web.Response:
+        await self._delay("binance_book")
+        tickers = []
+        for symbol in self.crypto_symbols:
+            bid, ask, bid_qty, ask_qty = self.book(symbol)
+            tickers.append({"symbol": symbol, "bidPrice": str(bid), "bidQty": str(bid_qty),
+                            "askPrice": str(ask), "askQty": str(ask_qty)})
+        return web.json_response(tickers)
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/v2/stocks/quotes/latest", self.alpaca_batch)
+        app.router.add_get("/v2/stocks/{symbol}/quotes/latest", self.alpaca_single)
+        app.router.add_get("/api/v3/ticker/24hr", self.binance_24hr)
+        app.router.add_get("/api/v3/ticker/bookTicker", self.binance_book)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+        return f"http://127.0.0.1:{self._runner.addresses[0][1]}"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+async def legacy_batch(orchestrator: TradingOrchestrator, symbols):
+    """Ancienne boucle de /market-data/batch : un appel par symbole, en séquence"""
+    results = {}
+    for symbol in symbols:
+        broker_name = "binance" if any(crypto in symbol.upper() for crypto in ["BTC", "ETH", "USDT"]) else "alpaca"
+        broker = orchestrator.brokers[broker_name]
+        async with broker:
+            results[symbol] = await broker.get_market_data(symbol)
+    return results
+
+async def run(args) -> bool:
+    stub = BrokerStub(args.latency_ms / 1000)
+    base_url = await stub.start()
+
+    orchestrator = TradingOrchestrator()
+    alpaca, binance = AlpacaBroker("key", "secret", TradingMode.PAPER), BinanceBroker("key", "secret", TradingMode.PAPER)
+    alpaca.data_url, binance.base_url = base_url, f"{base_url}/api"
+    orchestrator.brokers = {"alpaca": alpaca, "binance": binance}
+
+    n_crypto = max(1, args.symbols * 3 // 10)
+    symbols = [f"C{i:03d}USDT" for i in range(n_crypto)] + [f"STK{i:03d}" for i in range(args.symbols - n_crypto)]
+    try:
+        start = time.perf_counter()
+        legacy = await legacy_batch(orchestrator, symbols)
+        legacy_ms = (time.perf_counter() - start) * 1000
+        legacy_calls = sum(stub.requests.values())
+
+        stub.requests.clear()
+        service = QuoteService(QuoteConfig(ttl_seconds=5.0, broker_concurrency=4, batch_size=args.batch_size),
+                               orchestrator)
+        start = time.perf_counter()
+        batched = await service.get_quotes(symbols)
+        cold_ms = (time.perf_counter() - start) * 1000
+        cold_calls = sum(stub.requests.values())
+        start = time.perf_counter()
+        warm = await service.get_quotes(symbols)
+        warm_ms = (time.perf_counter() - start) * 1000
+
+        identical = all(
+            result.error is None and (result.quote.bid, result.quote.ask) == (legacy[s].bid, legacy[s].ask)
+            for s, result in batched.items()
+        )
+        routed = all(result.broker == ("binance" if s.endswith("USDT") else "alpaca") for s, result in batched.items())
+        cached = all(result.cached for result in warm.values())
+
+        # Demandeurs concurrents, fenêtres de symboles qui se chevauchent
+        service.invalidate()
+        stub.requests.clear()
+        window = max(1, args.symbols // 2)
+        windows = [(symbols * 2)[i * args.symbols // args.requesters:][:window] for i in range(args.requesters)]
+        fetched_before = service.stats["fetched"]
+        start = time.perf_counter()
+        await asyncio.gather(*(service.get_quotes(w) for w in windows))
+        concurrent_ms = (time.perf_counter() - start) * 1000
+        concurrent_calls = sum(stub.requests.values())
+        unique = len({symbol for w in windows for symbol in w})
+        fetched_once = service.stats["fetched"] - fetched_before == unique
+
+        # Symbole sans cotation : erreur, pas de repli simulé mis en cache
+        unknown = (await service.get_quotes(["NOPEUSDT"]))["NOPEUSDT"]
+        rejected = unknown.error is not None and unknown.quote is None and "NOPEUSDT" not in service._cache
+    finally:
+        await stub.stop()
+        await close_http_transport()
+
+    expected_calls = -(-(args.symbols - n_crypto) // args.batch_size) + 1
+    print(f"{args.symbols} symboles ({n_crypto} crypto), latence serveur {args.latency_ms:.0f} ms/requête")
+    print(f"  avant : boucle séquentielle     {legacy_ms:7.0f} ms, {legacy_calls} requêtes")
+    print(f"  après : lots par broker (froid) {cold_ms:7.0f} ms, {cold_calls} requêtes "
+          f"({legacy_ms / cold_ms:.0f}x), cotations identiques : {identical}, routage : {routed}")
+    print(f"          cache (chaud)           {warm_ms:7.2f} ms, toutes en cache : {cached}")
+    print(f"  {args.requesters} demandeurs concurrents      {concurrent_ms:7.0f} ms, {concurrent_calls} requêtes "
+          f"(vs {args.requesters * expected_calls} sans partage), chaque symbole récupéré une fois : {fetched_once}")
+    print(f"  symbole inconnu : {unknown.error!r}, rejeté sans cache : {rejected}")
+    print(f"  stats : {service.get_stats()}")
+
+    return (identical and routed and cached and cold_calls == expected_calls
+            and cold_ms * 5 < legacy_ms and fetched_once and rejected)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--requesters", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+    return 0 if asyncio.run(run(args)) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
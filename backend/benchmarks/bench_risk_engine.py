@@ -0,0 +1,110 @@
+"""
+⏱️ BENCHMARK - RISK ENGINE
+==========================
+
+Débit du moteur Monte Carlo (4 assets, horizon 252 jours) en exécution
+locale par chunks puis via le pool de processus, avec la mémoire de pointe
+d'un run local (bornée par la taille de chunk, pas par le nombre de
+scénarios) et le respect du budget de temps. Univers de 500 assets :
+la mémoire de pointe reste sous le budget par chunk, et un budget trop
+petit pour un seul scénario est refusé.
+
+L'exécution locale est mesurée sur un échantillon puis extrapolée.
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_risk_engine [--scenarios 1000000] [--workers 0] [--serial-sample 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.orchestrator.risk_engine import MonteCarloRiskEngine, RiskEngineConfig
+
+WEIGHTS = np.array([0.10, 0.30, 0.20, 0.40])
+EXPECTED_RETURNS = np.array([0.15, 0.12, 0.02, 0.08])
+VOLATILITIES = np.array([0.80, 0.45, 0.15, 0.18])
+CORRELATION = np.array([
+    [1.0, 0.6, 0.1, 0.3],
+    [0.6, 1.0, 0.1, 0.4],
+    [0.1, 0.1, 1.0, 0.2],
+    [0.3, 0.4, 0.2, 1.0]
+])
+
+def run(engine: MonteCarloRiskEngine, n_scenarios: int, **kwargs):
+    return engine.simulate(WEIGHTS, EXPECTED_RETURNS, VOLATILITIES, CORRELATION, n_scenarios, seed=42, **kwargs)
+
+def bench_large_universe(n_assets: int = 500, n_scenarios: int = 200) -> bool:
+    """Mémoire de pointe bornée par chunk_memory_mb même quand un chunk ne tient que quelques scénarios"""
+    engine = MonteCarloRiskEngine(RiskEngineConfig(process_threshold=sys.maxsize))
+    weights = np.full(n_assets, 1.0 / n_assets)
+    args = (weights, np.full(n_assets, 0.08), np.full(n_assets, 0.20), np.eye(n_assets))
+
+    tracemalloc.start()
+    result = engine.simulate(*args, n_scenarios, seed=42)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    budget_bytes = engine.config.chunk_memory_mb * 1024 * 1024
+    # Marge pour la covariance / Cholesky (n_assets²) et les résultats
+    bounded = peak_bytes <= budget_bytes + 4 * 8 * n_assets ** 2 + 1024 * 1024
+
+    tiny = MonteCarloRiskEngine(RiskEngineConfig(chunk_memory_mb=1))
+    try:
+        tiny.simulate(*args, n_scenarios, seed=42)
+        refused = False
+    except ValueError:
+        refused = True
+
+    chunk = engine.chunk_size(result.horizon_days, n_assets)
+    print(f"Univers {n_assets} : chunks de {chunk} scénarios, pic mémoire {peak_bytes / 1e6:.0f} Mo "
+          f"(budget {engine.config.chunk_memory_mb} Mo), budget de 1 Mo refusé : {refused}")
+    return bounded and refused and result.n_scenarios == n_scenarios
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=0, help="0 = nombre de CPU")
+    parser.add_argument("--serial-sample", type=int, default=100_000)
+    args = parser.parse_args()
+
+    serial = MonteCarloRiskEngine(RiskEngineConfig(max_scenarios=args.scenarios, process_threshold=sys.maxsize))
+    pooled = MonteCarloRiskEngine(RiskEngineConfig(
+        max_scenarios=args.scenarios, process_threshold=1, max_workers=args.workers or os.cpu_count() or 1
+    ))
+
+    # Même seed : mêmes résultats en local et en multi-processus
+    reference = run(serial, 20_000)
+    assert np.isclose(reference.var_95, run(pooled, 20_000).var_95), "résultats local / pool divergents"
+
+    tracemalloc.start()
+    sample = min(args.serial_sample, args.scenarios)
+    serial_sample = run(serial, sample)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    serial_s = serial_sample.elapsed_ms / 1000 * args.scenarios / sample
+
+    pooled_result = run(pooled, args.scenarios)
+    pooled_s = pooled_result.elapsed_ms / 1000
+
+    budget_s = 0.5
+    budgeted = run(serial, args.scenarios, time_budget_s=budget_s)
+    pooled.shutdown()
+
+    chunk = serial.chunk_size(serial_sample.horizon_days, WEIGHTS.shape[0])
+    print(f"Scénarios     : {args.scenarios} × {WEIGHTS.shape[0]} assets × {serial_sample.horizon_days} jours (chunks de {chunk})")
+    print(f"Local         : {serial_s:8.2f} s (extrapolé depuis {sample} scénarios), pic mémoire {peak_bytes / 1e6:.0f} Mo")
+    print(f"Pool {pooled_result.workers:2d} proc. : {pooled_s:8.2f} s ({args.scenarios / pooled_s:,.0f} scénarios/s)")
+    print(f"Budget {budget_s:.1f} s  : {budgeted.n_scenarios} scénarios en {budgeted.elapsed_ms / 1000:.2f} s")
+    print(f"VaR 95%       : {pooled_result.var_95:.4f}  CVaR 95% : {pooled_result.cvar_95:.4f}  "
+          f"MDD moyen : {pooled_result.max_drawdown:.4f}  Sortino : {pooled_result.sortino_ratio:.3f}")
+
+    large_ok = bench_large_universe()
+
+    return 0 if (budgeted.truncated or budgeted.n_scenarios == args.scenarios) and large_ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
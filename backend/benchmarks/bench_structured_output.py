@@ -0,0 +1,120 @@
+"""
+⏱️ BENCHMARK - SORTIES JSON STRUCTURÉES EN FLUX
+===============================================
+
+Analyses technique (Groq) et fondamentale (GPT-4) d'AIEnsembleEngine contre
+LLMStubServer démarré dans le processus (fournisseurs HTTP) :
+
+- Avant : complétion entière, JSON analysé à la fin
+- Après : flux SSE analysé au fil des tokens, analyse rendue dès que les champs
+  requis (trend_strength / macro_score, score) sont validés ; la fin du flux
+  alimente le cache en arrière-plan
+
+Mesures : temps jusqu'à la décision (s simulées), champs requis extraits,
+signaux de régime non nuls, réutilisation du cache après la fin des flux.
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_structured_output [--markets 30] [--time-scale 0.05]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+
+import numpy as np
+import structlog
+
+from app.integrations.http_pool import close_http_transport
+from benchmarks.llm_stub_server import LLMStubServer
+from core.ai_ensemble import AIEnsembleEngine
+
+BASE_MARKET = {
+    "VTI": {"price": 245.50, "volume": 1250000, "bid": 245.48, "ask": 245.52},
+    "QQQ": {"price": 384.75, "volume": 890000, "bid": 384.72, "ask": 384.78},
+    "SPY": {"price": 475.20, "volume": 2100000, "bid": 475.18, "ask": 475.22}
+}
+
+def market_data(index: int):
+    drift = 1 + 0.01 * index   # un niveau de marché distinct par index (pas de hit de cache)
+    return {asset: {field: value * drift for field, value in quote.items()} for asset, quote in BASE_MARKET.items()}
+
+async def run(args, stream: bool):
+    server = LLMStubServer(seed=args.seed, time_scale=args.time_scale)
+    base_url = await server.start(port=0)
+    engine = AIEnsembleEngine({
+        "providers": {name: {"kind": "http", "base_url": base_url} for name in ("openai", "groq")},
+        "llm_cache": {"enabled": True},
+        "structured_output": {"stream": stream}
+    })
+    # pas d'erreurs injectées : on mesure le format, pas la fiabilité
+    for profile in server.profiles.values():
+        profile.error_rate = 0.0
+
+    durations, extracted, regimes = [], 0, 0
+
+    async def analyze(index: int):
+        nonlocal extracted, regimes
+        data = market_data(index)
+        start = time.perf_counter()
+        results = await asyncio.gather(engine._technical_analysis_groq(data),
+                                       engine._fundamental_analysis_gpt4(data))
+        durations.append(time.perf_counter() - start)
+        analysis = await engine._consolidate_analyses(list(results))
+        extracted += sum(
+            all(field in analysis.get(dimension, {}) for field in fields)
+            for dimension, fields in (("technical", ("trend_strength", "score")),
+                                      ("fundamental", ("macro_score", "score")))
+        )
+        regime = await engine._detect_market_regime(analysis)
+        regimes += regime.risk_on_off != 0
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def bounded(index: int):
+        async with semaphore:
+            await analyze(index)
+
+    await asyncio.gather(*(bounded(i) for i in range(args.markets)))
+
+    # fin des flux en arrière-plan, puis relecture : tout doit venir du cache
+    await asyncio.gather(*engine._background_tasks, return_exceptions=True)
+    requests_before = sum(stats["requests"] for stats in server.get_stats().values())
+    replay = await asyncio.gather(*(engine._technical_analysis_groq(market_data(i)) for i in range(args.markets)))
+    cache_hits = sum(result.get("cache") == "memory" for result in replay)
+    replay_requests = sum(stats["requests"] for stats in server.get_stats().values()) - requests_before
+
+    await engine.close()
+    await close_http_transport()
+    await server.stop()
+    return np.array(durations) / args.time_scale, extracted, regimes, cache_hits, replay_requests
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--markets", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--time-scale", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+
+    print(f"{args.markets} niveaux de marché, analyses technique + fondamentale")
+    print(f"{'scénario':<28} {'p50 s':>7} {'p95 s':>7} {'champs':>8} {'régime':>7} {'cache':>7}")
+    p95s = {}
+    for label, stream in (("complétion puis parse", False), ("flux + champs requis", True)):
+        durations, extracted, regimes, hits, replay_requests = asyncio.run(run(args, stream))
+        p50, p95 = np.percentile(durations, [50, 95])
+        p95s[stream] = p95
+        print(f"{label:<28} {p50:>7.2f} {p95:>7.2f} {extracted:>4}/{2 * args.markets:<3} "
+              f"{regimes:>3}/{args.markets:<3} {hits:>3}/{args.markets:<3}")
+        if extracted < 2 * args.markets or hits < args.markets or replay_requests:
+            return 1
+
+    print(f"\ntemps jusqu'à la décision p95 : {p95s[False]:.2f}s -> {p95s[True]:.2f}s "
+          f"({p95s[False] / p95s[True]:.1f}x)")
+    return 0 if p95s[True] < p95s[False] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+🧪 LLM STUB SERVER - SERVEUR LLM LOCAL COMPATIBLE OPENAI
+========================================================
+
+Remplace OpenAI / Groq hors réseau (CI, machines de benchmark) :
+- POST /v1/chat/completions et /openai/v1/chat/completions (chemin du SDK Groq),
+  réponses JSON ou flux SSE (stream=true)
+- Par modèle : latence de premier token log-normale + queue de distribution,
+  débit en tokens/s, taux d'erreur (500 / 429), réponses JSON prédéfinies
+- Déterministe : tirages d'un générateur initialisé par --seed et par modèle,
+  réponse choisie par empreinte du prompt
+- GET /v1/models, GET /stats (requêtes, erreurs, latences par modèle)
+
+Configuration JSON optionnelle (--config) :
+    {"seed": 7, "models": {"gpt-4-turbo-preview": {"latency_ms": 1800, "tail_probability": 0.1,
+                                                   "tail_latency_ms": [8000, 20000], "error_rate": 0.02}}}
+
+Usage (depuis backend/):
+    python -m benchmarks.llm_stub_server [--port 8900] [--config stub.json] [--seed 7] [--time-scale 1.0]
+    LLM_PROVIDER=http LLM_HTTP_BASE_URL=http://localhost:8900/v1 ...
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+DEFAULT_RESPONSES = [
+    {"trend_strength": 0.42, "macro_score": 0.18, "momentum": 0.35, "valuation_score": 0.05, "score": 68,
+     "signals": {"VTI": "BUY", "QQQ": "HOLD", "SPY": "BUY"},
+     "rationale": "Momentum haussier confirmé sur les trois indices, volumes au-dessus de la moyenne "
+                  "20 jours et cassure de la résistance hebdomadaire. Les indicateurs avancés restent "
+                  "en expansion, la politique monétaire est accommodante en relatif et les valorisations "
+                  "forward restent proches de leur moyenne décennale ; risque principal : resserrement "
+                  "des spreads de crédit et rotation sectorielle hors technologie."},
+    {"trend_strength": -0.15, "macro_score": -0.05, "momentum": -0.22, "valuation_score": -0.3, "score": 47,
+     "signals": {"VTI": "HOLD", "QQQ": "SELL", "SPY": "HOLD"},
+     "rationale": "Divergence RSI baissière sur QQQ, volumes en repli sur les hausses et échec sous la "
+                  "résistance. Politique monétaire restrictive, courbe des taux toujours inversée et "
+                  "multiples tech au-dessus de leur moyenne historique ; positionnement défensif "
+                  "jusqu'à confirmation d'un plancher sur les indicateurs de largeur de marché."},
+]
+
+@dataclass
+class StubModelProfile:
+    """Comportement simulé d'un modèle"""
+    latency_ms: float = 800.0                 # médiane du premier token
+    latency_sigma: float = 0.3                # écart-type log-normal
+    tail_probability: float = 0.0             # part d'appels en queue de distribution
+    tail_latency_ms: Tuple[float, float] = (5000.0, 15000.0)
+    tokens_per_second: float = 100.0          # débit de génération
+    completion_tokens: int = 600
+    error_rate: float = 0.0
+    rate_limit_share: float = 0.5             # part des erreurs renvoyées en 429
+    responses: List[Dict[str, Any]] = field(default_factory=lambda: list(DEFAULT_RESPONSES))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StubModelProfile":
+        known = {f.name for f in fields(cls)}
+        profile = cls(**{key: value for key, value in data.items() if key in known})
+        profile.tail_latency_ms = tuple(profile.tail_latency_ms)
+        return profile
+
+DEFAULT_PROFILES = {
+    "gpt-4-turbo-preview": StubModelProfile(latency_ms=1200, tail_probability=0.08,
+                                            tail_latency_ms=(8000, 25000), tokens_per_second=60,
+                                            completion_tokens=450, error_rate=0.01),
+    "llama3-70b-8192": StubModelProfile(latency_ms=250, latency_sigma=0.2, tokens_per_second=800,
+                                        completion_tokens=450, error_rate=0.005),
+    "*": StubModelProfile(),
+}
+
+@dataclass
+class _ModelStats:
+    requests: int = 0
+    streamed: int = 0
+    errors: int = 0
+    completion_tokens: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+class LLMStubServer:
+    """
+    🧪 Serveur LLM local
+
+    server = LLMStubServer(seed=7)
+    base_url = await server.start(port=0)   # http://127.0.0.1:<port>/v1
+    ...
+    await server.stop()
+    """
+
+    def __init__(self, profiles: Optional[Dict[str, StubModelProfile]] = None,
+                 seed: int = 7, time_scale: float = 1.0):
+        self.profiles = {**DEFAULT_PROFILES, **(profiles or {})}
+        self.seed = seed
+        self.time_scale = time_scale
+        self._rngs: Dict[str, random.Random] = {}
+        self._stats: Dict[str, _ModelStats] = defaultdict(_ModelStats)
+        self._runner: Optional[web.AppRunner] = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], seed: Optional[int] = None,
+                    time_scale: float = 1.0) -> "LLMStubServer":
+        profiles = {}
+        for model, data in config.get("models", {}).items():
+            base = asdict(DEFAULT_PROFILES.get(model, DEFAULT_PROFILES["*"]))
+            profiles[model] = StubModelProfile.from_dict({**base, **data})
+        return cls(profiles, seed=config.get("seed", 7) if seed is None else seed, time_scale=time_scale)
+
+    def profile(self, model: str) -> StubModelProfile:
+        return self.profiles.get(model, self.profiles["*"])
+
+    def _rng(self, model: str) -> random.Random:
+        if model not in self._rngs:
+            digest = hashlib.sha256(f"{self.seed}:{model}".encode()).digest()
+            self._rngs[model] = random.Random(int.from_bytes(digest[:8], "big"))
+        return self._rngs[model]
+
+    def _sample(self, model: str, max_tokens: Optional[int]) -> Tuple[float, int, Optional[int]]:
+        """(premier token s, tokens générés, statut d'erreur éventuel)"""
+        profile, rng = self.profile(model), self._rng(model)
+        if rng.random() < profile.tail_probability:
+            first_token = rng.uniform(*profile.tail_latency_ms) / 1000
+        else:
+            first_token = rng.lognormvariate(math.log(profile.latency_ms / 1000), profile.latency_sigma)
+        tokens = min(profile.completion_tokens, max_tokens or profile.completion_tokens)
+        error = None
+        if rng.random() < profile.error_rate:
+            error = 429 if rng.random() < profile.rate_limit_share else 500
+        return first_token * self.time_scale, tokens, error
+
+    def _content(self, model: str, messages: List[Dict[str, str]]) -> str:
+        responses = self.profile(model).responses or DEFAULT_RESPONSES
+        prompt = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+        index = int(hashlib.sha256(prompt.encode()).hexdigest(), 16) % len(responses)
+        return json.dumps(responses[index], ensure_ascii=False)
+
+    @staticmethod
+    def _prompt_tokens(messages: List[Dict[str, str]]) -> int:
+        return sum(len(str(message.get("content", ""))) for message in messages) // 4
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        start = time.perf_counter()
+        payload = await request.json()
+        model = payload.get("model", "*")
+        messages = payload.get("messages", [])
+        stats = self._stats[model]
+        stats.requests += 1
+
+        first_token, tokens, error = self._sample(model, payload.get("max_tokens"))
+        generation = tokens / self.profile(model).tokens_per_second * self.time_scale
+
+        if error is not None:
+            await asyncio.sleep(first_token)
+            stats.errors += 1
+            kind = "rate_limit_exceeded" if error == 429 else "server_error"
+            return web.json_response({"error": {"message": f"stub {kind}", "type": kind, "code": error}},
+                                     status=error)
+
+        content = self._content(model, messages)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        if payload.get("stream"):
+            response = await self._stream(request, model, completion_id, content, first_token, generation)
+            stats.streamed += 1
+        else:
+            await asyncio.sleep(first_token + generation)
+            prompt_tokens = self._prompt_tokens(messages)
+            response = web.json_response({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": tokens,
+                          "total_tokens": prompt_tokens + tokens}
+            })
+
+        stats.completion_tokens += tokens
+        stats.latencies.append(time.perf_counter() - start)
+        return response
+
+    async def _stream(self, request: web.Request, model: str, completion_id: str, content: str,
+                      first_token: float, generation: float) -> web.StreamResponse:
+        """Flux SSE : premier fragment après la latence initiale, puis au débit du modèle"""
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+
+        chunk_size = 8
+        pieces = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)] or [""]
+        interval = generation / len(pieces)
+
+        async def send(delta: Dict[str, Any], finish_reason: Optional[str] = None):
+            chunk = {
+                "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }
+            await response.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode())
+
+        try:
+            await asyncio.sleep(first_token)
+            await send({"role": "assistant", "content": ""})
+            for piece in pieces:
+                await asyncio.sleep(interval)
+                await send({"content": piece})
+            await send({}, finish_reason="stop")
+            await response.write(b"data: [DONE]\n\n")
+            await response.write_eof()
+        except ConnectionResetError:
+            # client parti en cours de flux (requête couverte perdante, champs requis déjà reçus)
+            pass
+        return response
+
+    async def list_models(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "object": "list",
+            "data": [{"id": model, "object": "model", "owned_by": "stub"} for model in self.profiles if model != "*"]
+        })
+
+    async def stats_handler(self, request: web.Request) -> web.Response:
+        return web.json_response(self.get_stats())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """📊 Requêtes, erreurs et latences servies par modèle"""
+        def quantile(latencies: List[float], q: float) -> Optional[float]:
+            return round(latencies[min(int(q * len(latencies)), len(latencies) - 1)], 4) if latencies else None
+
+        stats = {}
+        for model, model_stats in self._stats.items():
+            latencies = sorted(model_stats.latencies)
+            stats[model] = {
+                "requests": model_stats.requests,
+                "streamed": model_stats.streamed,
+                "errors": model_stats.errors,
+                "completion_tokens": model_stats.completion_tokens,
+                "latency_p50": quantile(latencies, 0.5),
+                "latency_p99": quantile(latencies, 0.99)
+            }
+        return stats
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        for prefix in ("/v1", "/openai/v1"):
+            app.router.add_post(f"{prefix}/chat/completions", self.chat_completions)
+            app.router.add_get(f"{prefix}/models", self.list_models)
+        app.router.add_get("/stats", self.stats_handler)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8900) -> str:
+        """Démarre le serveur dans la boucle courante ; renvoie l'URL de base OpenAI"""
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        bound_port = self._runner.addresses[0][1]
+        return f"http://{host}:{bound_port}/v1"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--config", default=None, help="profils de modèles (JSON)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--time-scale", type=float, default=1.0, help="facteur appliqué à toutes les latences")
+    args = parser.parse_args()
+
+    config = {}
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+    server = LLMStubServer.from_config(config, seed=args.seed, time_scale=args.time_scale)
+    print(f"🧪 LLM stub sur http://{args.host}:{args.port}/v1 (modèles : {', '.join(server.profiles)})")
+    web.run_app(server.build_app(), host=args.host, port=args.port, access_log=None, print=None)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
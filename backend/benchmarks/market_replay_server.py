@@ -0,0 +1,246 @@
+"""
+🧪 MARKET REPLAY SERVER - FLUX DE COTATIONS LOCAL BINANCE / ALPACA
+=================================================================
+
+Remplace les WebSockets de marché hors réseau (CI, machines de benchmark) :
+- Marché simulé partagé : marche aléatoire seedée du bid/ask de chaque
+  symbole, --rate mises à jour par seconde (réparties en lots)
+- WS /stream?streams=<symbole>@bookTicker/... au format des flux combinés
+  Binance (champs u, s, b, B, a, A du flux réel : pas d'heure d'événement)
+- WS /v2/iex au format Alpaca : auth, subscribe quotes, tableaux de quotes
+- REST de rattrapage : GET /api/v3/ticker/bookTicker (Binance) et
+  GET /v2/stocks/quotes/latest?symbols= (Alpaca), état courant du marché
+- Coupures : connexion fermée par le serveur après --drop-after cotations
+  (les mises à jour continuent pendant la coupure)
+- GET /stats : mises à jour, messages et cotations envoyés, connexions, coupures
+
+Usage (depuis backend/):
+    python -m benchmarks.market_replay_server [--port 8901] [--rate 2000] [--drop-after 0]
+    MARKET_STREAM_BINANCE_URL=ws://localhost:8901/stream MARKET_STREAM_ALPACA_URL=ws://localhost:8901/v2/iex ...
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from aiohttp import WSMsgType, web
+
+CRYPTO_SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"] + [f"C{i:03d}USDT" for i in range(37)]
+EQUITY_SYMBOLS = ["VTI", "QQQ", "SPY", "IWM", "EFA"] + [f"STK{i:03d}" for i in range(35)]
+
+class _Connection:
+    """Client WebSocket abonné : symboles suivis et messages en attente"""
+
+    def __init__(self, kind: str, symbols: Set[str]):
+        self.kind = kind
+        self.symbols = symbols
+        self.pending: List[str] = []
+        self.ready = asyncio.Event()
+        self.sent = 0  # cotations envoyées
+
+class MarketReplayServer:
+    """🧪 Marché simulé diffusé aux formats WebSocket / REST Binance et Alpaca"""
+
+    def __init__(self, crypto_symbols: Optional[List[str]] = None, equity_symbols: Optional[List[str]] = None,
+                 rate: float = 2000.0, batch: int = 20, drop_after: int = 0, seed: int = 7):
+        self.crypto_symbols = list(crypto_symbols or CRYPTO_SYMBOLS)
+        self.equity_symbols = list(equity_symbols or EQUITY_SYMBOLS)
+        self.rate = rate
+        self.batch = batch
+        self.drop_after = drop_after
+        self.rng = random.Random(seed)
+        # symbole -> (bid, ask, taille bid, taille ask, horodatage epoch s)
+        self.book: Dict[str, Tuple[float, float, float, float, float]] = {}
+        now = time.time()
+        for symbol in self.crypto_symbols + self.equity_symbols:
+            mid = self.rng.uniform(20, 500)
+            self.book[symbol] = (round(mid - 0.01, 2), round(mid + 0.01, 2), 100.0, 100.0, now)
+        self.connections: List[_Connection] = []
+        self.stats = {"updates": 0, "messages": 0, "quotes": 0, "connections": 0, "drops": 0, "rest_requests": 0}
+        self.paused = False
+        self.closing = False
+        self._runner: Optional[web.AppRunner] = None
+        self._producer: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Marché simulé
+    # ------------------------------------------------------------------
+
+    def step(self, symbol: str):
+        """Une mise à jour du bid/ask du symbole, diffusée aux abonnés"""
+        bid, ask, _, _, _ = self.book[symbol]
+        mid = max(1.0, (bid + ask) / 2 * (1 + self.rng.gauss(0, 0.002)))
+        half_spread = max(0.01, round(mid * self.rng.uniform(0.0001, 0.0005), 2))
+        self.book[symbol] = (round(mid - half_spread, 2), round(mid + half_spread, 2),
+                             float(self.rng.randint(1, 500)), float(self.rng.randint(1, 500)), time.time())
+        self.stats["updates"] += 1
+        for connection in self.connections:
+            if symbol in connection.symbols:
+                connection.pending.append(symbol)
+                connection.ready.set()
+
+    async def _produce(self):
+        symbols = self.crypto_symbols + self.equity_symbols
+        interval = self.batch / self.rate
+        while True:
+            if not self.paused:
+                for _ in range(self.batch):
+                    self.step(symbols[self.rng.randrange(len(symbols))])
+            await asyncio.sleep(interval)
+
+    def binance_message(self, symbol: str) -> str:
+        bid, ask, bid_qty, ask_qty, _ = self.book[symbol]
+        return json.dumps({"stream": f"{symbol.lower()}@bookTicker", "data": {
+            "u": self.stats["updates"], "s": symbol,
+            "b": str(bid), "B": str(bid_qty), "a": str(ask), "A": str(ask_qty)
+        }})
+
+    def alpaca_quote(self, symbol: str) -> Dict:
+        bid, ask, bid_size, ask_size, timestamp = self.book[symbol]
+        iso = datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="microseconds").replace("+00:00", "Z")
+        return {"T": "q", "S": symbol, "bp": bid, "bs": bid_size, "ap": ask, "as": ask_size, "t": iso}
+
+    # ------------------------------------------------------------------
+    # WebSockets
+    # ------------------------------------------------------------------
+
+    async def _serve(self, ws: web.WebSocketResponse, connection: _Connection):
+        """Envoi des mises à jour en attente jusqu'à la coupure programmée"""
+        self.connections.append(connection)
+        self.stats["connections"] += 1
+        try:
+            while not ws.closed:
+                await connection.ready.wait()
+                connection.ready.clear()
+                if self.closing:
+                    await ws.close()
+                    return
+                symbols, connection.pending = connection.pending, []
+                if connection.kind == "binance":
+                    messages = [self.binance_message(symbol) for symbol in symbols]
+                else:
+                    messages = [json.dumps([self.alpaca_quote(symbol) for symbol in symbols])]
+                for message in messages:
+                    await ws.send_str(message)
+                    self.stats["messages"] += 1
+                    quotes = 1 if connection.kind == "binance" else len(symbols)
+                    connection.sent += quotes
+                    self.stats["quotes"] += quotes
+                    if self.drop_after and connection.sent >= self.drop_after:
+                        self.stats["drops"] += 1
+                        await ws.close()
+                        return
+        except ConnectionResetError:
+            pass
+        finally:
+            self.connections.remove(connection)
+
+    async def binance_stream(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        streams = request.query.get("streams", "").split("/")
+        symbols = {stream.split("@")[0].upper() for stream in streams if stream}
+        await self._serve(ws, _Connection("binance", symbols & set(self.crypto_symbols)))
+        return ws
+
+    async def alpaca_stream(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_str(json.dumps([{"T": "success", "msg": "connected"}]))
+        symbols: Set[str] = set()
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                break
+            payload = json.loads(message.data)
+            if payload.get("action") == "auth":
+                await ws.send_str(json.dumps([{"T": "success", "msg": "authenticated"}]))
+            elif payload.get("action") == "subscribe":
+                symbols = set(payload.get("quotes", [])) & set(self.equity_symbols)
+                await ws.send_str(json.dumps([{"T": "subscription", "quotes": sorted(symbols)}]))
+                break
+        if symbols:
+            await self._serve(ws, _Connection("alpaca", symbols))
+        return ws
+
+    # ------------------------------------------------------------------
+    # REST (rattrapage)
+    # ------------------------------------------------------------------
+
+    async def binance_book(self, request: web.Request) -> web.Response:
+        self.stats["rest_requests"] += 1
+        tickers = []
+        for symbol in self.crypto_symbols:
+            bid, ask, bid_qty, ask_qty, _ = self.book[symbol]
+            tickers.append({"symbol": symbol, "bidPrice": str(bid), "bidQty": str(bid_qty),
+                            "askPrice": str(ask), "askQty": str(ask_qty)})
+        return web.json_response(tickers)
+
+    async def alpaca_latest(self, request: web.Request) -> web.Response:
+        self.stats["rest_requests"] += 1
+        symbols = [s for s in request.query.get("symbols", "").split(",") if s in self.book]
+        return web.json_response({"quotes": {symbol: self.alpaca_quote(symbol) for symbol in symbols}})
+
+    async def stats_handler(self, request: web.Request) -> web.Response:
+        return web.json_response({**self.stats, "open_connections": len(self.connections)})
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/stream", self.binance_stream)
+        app.router.add_get("/v2/iex", self.alpaca_stream)
+        app.router.add_get("/api/v3/ticker/bookTicker", self.binance_book)
+        app.router.add_get("/v2/stocks/quotes/latest", self.alpaca_latest)
+        app.router.add_get("/stats", self.stats_handler)
+        app.on_startup.append(self._on_startup)
+        app.on_shutdown.append(self._on_shutdown)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+    async def _on_startup(self, app: web.Application):
+        self._producer = asyncio.create_task(self._produce())
+
+    async def _on_shutdown(self, app: web.Application):
+        """Réveiller les connexions en attente pour qu'elles se ferment (sinon délai d'arrêt aiohttp)"""
+        self.closing = True
+        for connection in self.connections:
+            connection.ready.set()
+
+    async def _on_cleanup(self, app: web.Application):
+        if self._producer is not None:
+            self._producer.cancel()
+            await asyncio.gather(self._producer, return_exceptions=True)
+            self._producer = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8901) -> str:
+        """Démarre le serveur dans la boucle courante ; renvoie l'URL de base"""
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        return f"http://{host}:{self._runner.addresses[0][1]}"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--rate", type=float, default=2000.0, help="mises à jour par seconde")
+    parser.add_argument("--drop-after", type=int, default=0, help="cotations avant coupure (0 = jamais)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    server = MarketReplayServer(rate=args.rate, drop_after=args.drop_after, seed=args.seed)
+    print(f"🧪 Rejeu de marché sur ws://{args.host}:{args.port}/stream (Binance) et /v2/iex (Alpaca), "
+          f"{len(server.book)} symboles")
+    web.run_app(server.build_app(), host=args.host, port=args.port, access_log=None, print=None)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
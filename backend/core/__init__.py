@@ -6,6 +6,13 @@ Module principal contenant les composants révolutionnaires du système trading
 from .ai_ensemble import AIEnsembleEngine, AIDecision, MarketRegime
 from .ai_orchestrator import AIOrchestrator, Task, TaskPriority
 from .auto_healer import AutoHealer, HealthLevel
+from .task_graph import TaskGraph, GraphRun, CycleError
+from .market_snapshot import MarketSnapshot, MarketSnapshotProvider
+from .llm_cache import LLMCache, CachedResponse, market_fingerprint
+from .model_router import ModelRouter, AnalysisRoute, CycleReport
+from .llm_providers import LLMProvider, SDKChatProvider, HTTPChatProvider, Completion, build_provider
+from .signal_engine import VectorSignalEngine, SignalBatch
+from .structured_output import OutputSchema, FieldSpec, SchemaError, StructuredStream, StructuredResult, IncrementalJSONParser
 
 __all__ = [
     "AIEnsembleEngine",
@@ -15,5 +22,29 @@ __all__ = [
     "Task",
     "TaskPriority",
     "AutoHealer",
-    "HealthLevel"
+    "HealthLevel",
+    "TaskGraph",
+    "GraphRun",
+    "CycleError",
+    "MarketSnapshot",
+    "MarketSnapshotProvider",
+    "LLMCache",
+    "CachedResponse",
+    "market_fingerprint",
+    "ModelRouter",
+    "AnalysisRoute",
+    "CycleReport",
+    "LLMProvider",
+    "SDKChatProvider",
+    "HTTPChatProvider",
+    "Completion",
+    "build_provider",
+    "OutputSchema",
+    "FieldSpec",
+    "SchemaError",
+    "StructuredStream",
+    "StructuredResult",
+    "IncrementalJSONParser",
+    "VectorSignalEngine",
+    "SignalBatch"
 ] 
\ No newline at end of file
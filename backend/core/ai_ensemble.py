@@ -4,18 +4,110 @@ Système multi-modèles avec auto-optimisation et apprentissage continu
 """
 
 import asyncio
+import json
+import time
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import structlog
-from openai import AsyncOpenAI
-from groq import AsyncGroq
+import redis.asyncio as redis
+
+from app.orchestrator.indicator_engine import IndicatorEngine, get_indicator_engine
+
+from .llm_cache import CachedResponse, LLMCache, market_fingerprint
+from .llm_providers import LLMProvider, build_provider
+from .model_router import AnalysisRoute, CycleReport, ModelRouter
+from .signal_engine import VectorSignalEngine
+from .structured_output import (
+    FUNDAMENTAL_SCHEMA, TECHNICAL_SCHEMA, OutputSchema, StructuredResult, StructuredStream
+)
 
 logger = structlog.get_logger()
 
+# Prompts (gabarits versionnés dans la clé du cache LLM)
+TECHNICAL_ANALYSIS_PROMPT = """
+        🔍 ANALYSE TECHNIQUE ULTRA-PRÉCISE
+        
+        Données de marché : {market_data}
+        
+        Effectue une analyse technique de niveau institutionnel :
+        
+        1. PATTERNS CHARTISTES :
+           - Triangles, flags, head & shoulders
+           - Support/résistance dynamiques
+           - Breakouts et faux breakouts
+        
+        2. INDICATEURS AVANCÉS :
+           - RSI divergences
+           - MACD histogramme
+           - Bollinger Bands squeeze
+           - Volume profile analysis
+        
+        3. TIMEFRAME ANALYSIS :
+           - Confluence multi-timeframes
+           - Fibonacci retracements/extensions
+           - Ichimoku cloud analysis
+        
+        4. MOMENTUM & FLOW :
+           - Institutional volume patterns
+           - Dark pool activity
+           - Options flow implications
+        
+        Réponds en JSON avec scores numériques précis (0-100) et signaux clairs.
+        """
+
+FUNDAMENTAL_ANALYSIS_PROMPT = """
+        📈 ANALYSE FONDAMENTALE INSTITUTIONNELLE
+        
+        Contexte marché : {market_data}
+        
+        Effectue une analyse fondamentale de hedge fund :
+        
+        1. MACRO ÉCONOMIQUE :
+           - Politique monétaire Fed/BCE/BOJ
+           - Indicateurs économiques leading
+           - Géopolitique et risques systémiques
+           - Cycles économiques et sectoriels
+        
+        2. VALORISATIONS :
+           - P/E forward vs historique
+           - EV/EBITDA sectoriels
+           - Book value et cash flow
+           - Comparative analysis peers
+        
+        3. CATALYSEURS :
+           - Earnings season impacts
+           - Événements corporate
+           - Regulatory changes
+           - Technology disruptions
+        
+        4. SENTIMENT & POSITIONING :
+           - Institutional flows
+           - Hedge fund positioning
+           - Retail vs smart money
+           - Options positioning (GEX/DEX)
+        
+        Format : JSON avec scores quantifiés et rationale détaillé.
+        """
+
+# Univers par défaut (ETF principaux)
+DEFAULT_UNIVERSE = ["VTI", "QQQ", "IWM", "VTIAX", "BND", "VNQ", "GLD", "VXX"]
+
+# Source de consolidation -> dimension lue par la détection de régime et les décisions
+ANALYSIS_DIMENSIONS = {
+    "groq_technical": "technical",
+    "gpt4_fundamental": "fundamental",
+    "sentiment_ensemble": "sentiment"
+}
+
+# Analyses locales utilisées quand la dimension manque (LLM en échec, échéance)
+FALLBACK_DIMENSIONS = {
+    "technical_indicators": "technical"
+}
+
 @dataclass
 class AIDecision:
     """Décision IA avec métadonnées complètes"""
@@ -54,10 +146,28 @@ class AIEnsembleEngine:
     - Auto-optimisation continue des poids
     """
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], providers: Optional[Dict[str, LLMProvider]] = None,
+                 indicators: Optional[IndicatorEngine] = None):
         self.config = config
-        self.openai_client = AsyncOpenAI(api_key=config.get("openai_api_key"))
-        self.groq_client = AsyncGroq(api_key=config.get("groq_api_key"))
+        
+        # Fournisseurs LLM (SDK OpenAI / Groq, ou endpoint HTTP compatible OpenAI)
+        provider_config = config.get("providers", {})
+        self.providers: Dict[str, LLMProvider] = providers or {
+            name: build_provider(name, {"api_key": config.get(f"{name}_api_key"), **provider_config.get(name, {})})
+            for name in ("openai", "groq")
+        }
+        
+        # Cache sémantique des réponses LLM (front LRU + Redis partagé)
+        cache_config = config.get("llm_cache", {})
+        self.cache_step_bps = cache_config.get("quantization_bps", 50.0)
+        self.llm_cache: Optional[LLMCache] = None
+        if cache_config.get("enabled", True):
+            redis_url = cache_config.get("redis_url")
+            self.llm_cache = LLMCache(
+                redis_client=redis.from_url(redis_url) if redis_url else None,
+                max_entries=cache_config.get("max_entries", 512),
+                ttls=cache_config.get("ttls")
+            )
         
         # Poids dynamiques des modèles (auto-optimisés)
         self.model_weights = {
@@ -68,6 +178,33 @@ class AIEnsembleEngine:
             "macro_ai": 0.10
         }
         
+        # Routage sous budget : échéance de cycle, timeouts, requêtes couvertes
+        router_config = config.get("router", {})
+        self.router = ModelRouter(
+            cycle_deadline=router_config.get("cycle_deadline", 20.0),
+            default_timeout=router_config.get("analysis_timeout", 15.0),
+            hedge_quantile=router_config.get("hedge_quantile", 0.9),
+            pricing=router_config.get("pricing"),
+            cost_budget=router_config.get("cost_budget", 0.0)
+        )
+        self.latency_weight = router_config.get("latency_weight", 0.05)
+        
+        # Sorties JSON structurées : flux de tokens analysé au fil de l'eau
+        structured_config = config.get("structured_output", {})
+        self.stream_outputs = structured_config.get("stream", True)
+        self._background_tasks: Set[asyncio.Task] = set()
+        
+        # Indicateurs techniques locaux (RSI, MACD, ATR, Bollinger, VWAP) mis à jour par barre
+        self.indicators = indicators or get_indicator_engine()
+        
+        # Signaux vectorisés sur l'univers (sizing Kelly, stops ATR, top-K)
+        signal_config = config.get("signals", {})
+        self.universe: List[str] = list(signal_config.get("universe") or DEFAULT_UNIVERSE)
+        self.signal_engine = VectorSignalEngine(
+            threshold=signal_config.get("threshold", 0.3),
+            top_k=signal_config.get("top_k", 5)
+        )
+        
         # Performance tracking pour auto-optimisation
         self.model_performance = {model: [] for model in self.model_weights.keys()}
         self.decision_history: List[AIDecision] = []
@@ -97,21 +234,11 @@ class AIEnsembleEngine:
         
         logger.info("🧠 Démarrage analyse multi-dimensionnelle", assets=list(market_data.keys()))
         
-        # Exécution parallèle de toutes les analyses
-        tasks = [
-            self._technical_analysis_groq(market_data),
-            self._fundamental_analysis_gpt4(market_data),
-            self._sentiment_analysis_ensemble(market_data),
-            self._macro_analysis_ai(market_data),
-            self._cross_asset_analysis(market_data),
-            self._volatility_regime_analysis(market_data),
-            self._liquidity_analysis(market_data)
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Exécution parallèle sous échéance (consensus partiel si dépassement)
+        routing = await self.router.run_cycle(self._analysis_routes(market_data))
         
         # Consolidation intelligente des résultats
-        consolidated_analysis = await self._consolidate_analyses(results)
+        consolidated_analysis = await self._consolidate_analyses(list(routing.results.values()))
         
         # Détection du régime de marché
         market_regime = await self._detect_market_regime(consolidated_analysis)
@@ -130,58 +257,88 @@ class AIEnsembleEngine:
             "regime": market_regime,
             "decisions": optimal_decisions,
             "analysis": consolidated_analysis,
-            "confidence_score": self._calculate_ensemble_confidence(optimal_decisions),
+            "confidence_score": self._calculate_ensemble_confidence(optimal_decisions) * self._routing_coverage(routing),
+            "routing": routing.summary(),
             "timestamp": datetime.utcnow().isoformat()
         }
     
+    def _analysis_routes(self, market_data: Dict[str, Any]) -> List[AnalysisRoute]:
+        """Analyses du cycle ; GPT-4 couvert par Groq au-delà de son p90"""
+        features = self.indicators.features(list(market_data))
+        technical_data = self._with_indicators(market_data, features)
+        return [
+            AnalysisRoute("groq_technical", lambda: self._technical_analysis_groq(technical_data),
+                          model="llama3-70b-8192", weight_key="groq_technical"),
+            AnalysisRoute("technical_indicators", lambda: self._indicator_analysis(features)),
+            AnalysisRoute("gpt4_fundamental", lambda: self._fundamental_analysis_gpt4(market_data),
+                          model="gpt-4-turbo-preview", weight_key="gpt4_fundamental",
+                          hedge=lambda: self._fundamental_analysis_groq(market_data),
+                          hedge_model="llama3-70b-8192"),
+            AnalysisRoute("sentiment_ensemble", lambda: self._sentiment_analysis_ensemble(market_data),
+                          weight_key="sentiment_ai"),
+            AnalysisRoute("macro_ai", lambda: self._macro_analysis_ai(market_data), weight_key="macro_ai"),
+            AnalysisRoute("cross_asset", lambda: self._cross_asset_analysis(market_data)),
+            AnalysisRoute("volatility", lambda: self._volatility_regime_analysis(market_data)),
+            AnalysisRoute("liquidity", lambda: self._liquidity_analysis(market_data))
+        ]
+    
+    @staticmethod
+    def _with_indicators(market_data: Dict[str, Any], features: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+        """Données de marché enrichies des indicateurs locaux (prompt et empreinte du cache)"""
+        if not features:
+            return market_data
+        return {
+            asset: {**quote, "indicators": features[asset]} if asset in features and isinstance(quote, dict) else quote
+            for asset, quote in market_data.items()
+        }
+    
+    async def _indicator_analysis(self, features: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+        """Analyse technique locale : moyenne des indicateurs de l'univers (sans LLM)"""
+        if not features:
+            return {"source": "technical_indicators", "assets": {}, "confidence": 0.0}
+        
+        trend = float(np.mean([f["trend_strength"] for f in features.values()]))
+        return {
+            "source": "technical_indicators",
+            "trend_strength": trend,
+            "score": 50.0 * (1.0 + trend),
+            "rsi": float(np.mean([f["rsi"] for f in features.values()])),
+            "assets": features,
+            "confidence": 0.7
+        }
+    
+    def _routing_coverage(self, routing: CycleReport) -> float:
+        """Part des poids de modèles couverte par les analyses reçues"""
+        weighted = {
+            "groq_technical": "groq_technical",
+            "gpt4_fundamental": "gpt4_fundamental",
+            "sentiment_ensemble": "sentiment_ai",
+            "macro_ai": "macro_ai"
+        }
+        total = sum(self.model_weights[key] for key in weighted.values())
+        covered = sum(self.model_weights[key] for name, key in weighted.items() if name in routing.results)
+        return covered / total if total else 1.0
+    
     async def _technical_analysis_groq(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
         """Groq excelle en analyse technique et pattern recognition"""
         
-        prompt = f"""
-        🔍 ANALYSE TECHNIQUE ULTRA-PRÉCISE
-        
-        Données de marché : {market_data}
-        
-        Effectue une analyse technique de niveau institutionnel :
-        
-        1. PATTERNS CHARTISTES :
-           - Triangles, flags, head & shoulders
-           - Support/résistance dynamiques
-           - Breakouts et faux breakouts
-        
-        2. INDICATEURS AVANCÉS :
-           - RSI divergences
-           - MACD histogramme
-           - Bollinger Bands squeeze
-           - Volume profile analysis
-        
-        3. TIMEFRAME ANALYSIS :
-           - Confluence multi-timeframes
-           - Fibonacci retracements/extensions
-           - Ichimoku cloud analysis
-        
-        4. MOMENTUM & FLOW :
-           - Institutional volume patterns
-           - Dark pool activity
-           - Options flow implications
-        
-        Réponds en JSON avec scores numériques précis (0-100) et signaux clairs.
-        """
-        
         try:
-            response = await self.groq_client.chat.completions.create(
-                model="llama3-70b-8192",
-                messages=[{"role": "user", "content": prompt}],
+            response = await self._structured_completion(
+                self.providers["groq"], "llama3-70b-8192", "technical",
+                TECHNICAL_ANALYSIS_PROMPT, TECHNICAL_SCHEMA, market_data,
                 max_tokens=2000,
                 temperature=0.2
             )
             
-            # Parse et structure la réponse
             return {
                 "source": "groq_technical",
-                "analysis": response.choices[0].message.content,
+                "analysis": response.data,
                 "timestamp": datetime.utcnow().isoformat(),
-                "confidence": 0.85
+                "confidence": 0.85,
+                "model": response.model,
+                "tokens": response.tokens,
+                "cache": response.source,
+                "complete": response.complete
             }
             
         except Exception as e:
@@ -191,59 +348,142 @@ class AIEnsembleEngine:
     async def _fundamental_analysis_gpt4(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
         """GPT-4 excelle en analyse fondamentale et contextuelle"""
         
-        prompt = f"""
-        📈 ANALYSE FONDAMENTALE INSTITUTIONNELLE
-        
-        Contexte marché : {market_data}
-        
-        Effectue une analyse fondamentale de hedge fund :
-        
-        1. MACRO ÉCONOMIQUE :
-           - Politique monétaire Fed/BCE/BOJ
-           - Indicateurs économiques leading
-           - Géopolitique et risques systémiques
-           - Cycles économiques et sectoriels
-        
-        2. VALORISATIONS :
-           - P/E forward vs historique
-           - EV/EBITDA sectoriels
-           - Book value et cash flow
-           - Comparative analysis peers
-        
-        3. CATALYSEURS :
-           - Earnings season impacts
-           - Événements corporate
-           - Regulatory changes
-           - Technology disruptions
-        
-        4. SENTIMENT & POSITIONING :
-           - Institutional flows
-           - Hedge fund positioning
-           - Retail vs smart money
-           - Options positioning (GEX/DEX)
-        
-        Format : JSON avec scores quantifiés et rationale détaillé.
-        """
-        
         try:
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[{"role": "user", "content": prompt}],
+            response = await self._structured_completion(
+                self.providers["openai"], "gpt-4-turbo-preview", "fundamental",
+                FUNDAMENTAL_ANALYSIS_PROMPT, FUNDAMENTAL_SCHEMA, market_data,
                 max_tokens=2000,
                 temperature=0.3
             )
             
             return {
                 "source": "gpt4_fundamental",
-                "analysis": response.choices[0].message.content,
+                "analysis": response.data,
                 "timestamp": datetime.utcnow().isoformat(),
-                "confidence": 0.88
+                "confidence": 0.88,
+                "model": response.model,
+                "tokens": response.tokens,
+                "cache": response.source,
+                "complete": response.complete
             }
             
         except Exception as e:
             logger.error("Erreur analyse fondamentale GPT-4", error=str(e))
             return {"source": "gpt4_fundamental", "error": str(e), "confidence": 0.0}
     
+    async def _fundamental_analysis_groq(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Requête couverte : analyse fondamentale par Groq quand GPT-4 est lent"""
+        
+        try:
+            response = await self._structured_completion(
+                self.providers["groq"], "llama3-70b-8192", "fundamental",
+                FUNDAMENTAL_ANALYSIS_PROMPT, FUNDAMENTAL_SCHEMA, market_data,
+                max_tokens=2000,
+                temperature=0.3
+            )
+            
+            return {
+                "source": "gpt4_fundamental",
+                "analysis": response.data,
+                "timestamp": datetime.utcnow().isoformat(),
+                "confidence": 0.80,
+                "model": response.model,
+                "tokens": response.tokens,
+                "cache": response.source,
+                "complete": response.complete
+            }
+            
+        except Exception as e:
+            logger.error("Erreur analyse fondamentale Groq", error=str(e))
+            return {"source": "gpt4_fundamental", "error": str(e), "confidence": 0.0}
+    
+    async def _structured_completion(self, provider: LLMProvider, model: str, analysis_type: str,
+                                     prompt_template: str, schema: OutputSchema,
+                                     market_data: Dict[str, Any], **params) -> StructuredResult:
+        """
+        Sortie JSON validée par le schéma, via le cache LLM
+
+        En flux, rend la main dès que les champs requis sont reçus : la fin de la
+        génération (rationale...) et la mise en cache continuent en arrière-plan.
+        """
+        prompt = prompt_template.format(market_data=market_data) + "\n" + schema.prompt_hint()
+        messages = [{"role": "user", "content": prompt}]
+        params = {**params, "response_format": {"type": "json_object"}}
+        stream = StructuredStream(schema)
+        
+        async def call():
+            if self.stream_outputs:
+                data = await stream.consume(provider.stream(model, messages, **params))
+                tokens = (len(prompt) + stream.chars) // 4    # usage absent des flux : estimation
+            else:
+                completion = await provider.complete(model, messages, **params)
+                stream.feed(completion.content)
+                stream.close()
+                data, tokens = stream.result(), completion.total_tokens
+            # le cache conserve la sortie validée, pas le texte brut
+            return json.dumps(data, ensure_ascii=False), tokens
+        
+        if self.llm_cache is None:
+            async def uncached():
+                start = time.perf_counter()
+                content, tokens = await call()
+                now = time.time()
+                return CachedResponse(content=content, model=model, tokens=tokens,
+                                      latency=time.perf_counter() - start, created_at=now, expires_at=now)
+            completion_task = asyncio.create_task(uncached())
+        else:
+            fingerprint = market_fingerprint(market_data, self.cache_step_bps)
+            key = self.llm_cache.key(model, analysis_type, fingerprint, prompt_template + schema.prompt_hint(), params)
+            completion_task = asyncio.create_task(self.llm_cache.get_or_call(model, analysis_type, key, call))
+        
+        ready_task = asyncio.create_task(stream.ready())
+        try:
+            await asyncio.wait({completion_task, ready_task}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            completion_task.cancel()
+            ready_task.cancel()
+            raise
+        
+        if completion_task.done() or not ready_task.result():
+            ready_task.cancel()
+            response = await completion_task
+            return StructuredResult(
+                data=json.loads(response.content), model=response.model,
+                tokens=response.tokens if response.source == "llm" else 0,
+                source=response.source, complete=True
+            )
+        
+        # champs requis reçus : la fin du flux alimente le cache en arrière-plan
+        self._background_tasks.add(completion_task)
+        completion_task.add_done_callback(self._on_background_done)
+        return StructuredResult(
+            data=dict(stream.data), model=model,
+            tokens=(len(prompt) + stream.chars) // 4,
+            source="stream", complete=False
+        )
+    
+    def _on_background_done(self, task: asyncio.Task):
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("⚠️ Fin de flux LLM en échec", error=str(task.exception()))
+    
+    async def close(self):
+        """Fermeture des fournisseurs LLM et du cache"""
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        for provider in self.providers.values():
+            await provider.close()
+        if self.llm_cache:
+            await self.llm_cache.close()
+    
+    def get_router_stats(self) -> Dict[str, Any]:
+        """📊 Latences, tokens/s et coût par modèle"""
+        return self.router.get_stats()
+    
+    def get_llm_cache_stats(self) -> Dict[str, Any]:
+        """📊 Statistiques du cache LLM par modèle"""
+        return self.llm_cache.get_stats() if self.llm_cache else {}
+    
     async def _sentiment_analysis_ensemble(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyse de sentiment multi-sources ultra-avancée"""
         
@@ -338,91 +578,45 @@ class AIEnsembleEngine:
     async def _generate_optimal_decisions(
         self, 
         analysis: Dict[str, Any], 
-        regime: MarketRegime
+        regime: MarketRegime,
+        universe: Optional[List[str]] = None
     ) -> List[AIDecision]:
         """
         ⚡ GÉNÉRATION DE DÉCISIONS OPTIMALES
         
         Combine tous les signaux pour générer des décisions de trading optimales
-        avec sizing, stops, et timing précis
+        avec sizing, stops, et timing précis (top-K de l'univers par confiance)
         """
         
-        decisions = []
-        
-        # Assets à analyser (ETF principaux)
-        assets = ["VTI", "QQQ", "IWM", "VTIAX", "BND", "VNQ", "GLD", "VXX"]
-        
-        for asset in assets:
-            # Calcul du signal composite pour chaque asset
-            signal_strength = self._calculate_asset_signal(asset, analysis, regime)
-            
-            if abs(signal_strength) > 0.3:  # Seuil de signal significatif
-                
-                action = "BUY" if signal_strength > 0 else "SELL"
-                confidence = min(0.95, abs(signal_strength))
-                
-                # Position sizing dynamique basé sur Kelly Criterion modifié
-                position_size = self._calculate_optimal_position_size(
-                    signal_strength, confidence, regime.volatility_level
-                )
-                
-                # Risk management avancé
-                stop_loss, take_profit = self._calculate_risk_levels(
-                    asset, signal_strength, regime.volatility_level
-                )
-                
-                decision = AIDecision(
-                    action=action,
-                    asset=asset,
-                    confidence=confidence,
-                    reasoning=self._generate_reasoning(asset, signal_strength, analysis),
-                    model_scores={
-                        "technical": analysis.get("technical", {}).get("score", 0),
-                        "fundamental": analysis.get("fundamental", {}).get("score", 0),
-                        "sentiment": analysis.get("sentiment", {}).get("overall_sentiment", 0)
-                    },
-                    risk_assessment=regime.volatility_level,
-                    expected_return=signal_strength * 0.15,  # 15% max expected
-                    time_horizon=self._determine_time_horizon(signal_strength, regime),
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
-                    position_size=position_size
-                )
-                
-                decisions.append(decision)
-        
-        # Tri par conviction décroissante
-        decisions.sort(key=lambda x: x.confidence, reverse=True)
-        
-        return decisions[:5]  # Top 5 opportunities
-    
-    def _calculate_optimal_position_size(
-        self, 
-        signal_strength: float, 
-        confidence: float, 
-        volatility: float
-    ) -> float:
-        """Kelly Criterion modifié pour sizing optimal"""
-        
-        # Kelly fraction = (bp - q) / b
-        # où b = odds, p = prob success, q = prob loss
-        
-        win_prob = (confidence + 1) / 2  # Convert to 0-1 probability
-        loss_prob = 1 - win_prob
-        
-        # Expected return ratio
-        win_loss_ratio = abs(signal_strength) * 2  # 2:1 reward ratio
+        # Une passe NumPy sur tout l'univers ; AIDecision construites pour le top-K seulement
+        assets = list(universe) if universe is not None else self.universe
+        signals = self._calculate_asset_signals(assets, analysis, regime)
+        batch = self.signal_engine.score(assets, signals, regime.volatility_level)
         
-        # Kelly fraction
-        kelly_fraction = (win_prob * win_loss_ratio - loss_prob) / win_loss_ratio
-        
-        # Volatility adjustment (reduce size in high vol)
-        vol_adjustment = 1 / (1 + volatility)
-        
-        # Conservative Kelly (25% of full Kelly)
-        optimal_size = max(0.01, min(0.20, kelly_fraction * 0.25 * vol_adjustment))
+        model_scores = {
+            "technical": analysis.get("technical", {}).get("score", 0),
+            "fundamental": analysis.get("fundamental", {}).get("score", 0),
+            "sentiment": analysis.get("sentiment", {}).get("overall_sentiment", 0)
+        }
         
-        return optimal_size
+        decisions = []
+        for i in self.signal_engine.top_k(batch):
+            signal_strength = float(batch.signal[i])
+            decisions.append(AIDecision(
+                action="BUY" if signal_strength > 0 else "SELL",
+                asset=batch.assets[i],
+                confidence=float(batch.confidence[i]),
+                reasoning=self._generate_reasoning(batch.assets[i], signal_strength, analysis),
+                model_scores=dict(model_scores),
+                risk_assessment=regime.volatility_level,
+                expected_return=float(batch.expected_return[i]),
+                time_horizon=str(batch.time_horizon[i]),
+                stop_loss=float(batch.stop_loss[i]),
+                take_profit=float(batch.take_profit[i]),
+                position_size=float(batch.position_size[i])
+            ))
+        
+        return decisions
     
     async def _optimize_model_weights(self, decisions: List[AIDecision]):
         """Auto-optimisation des poids de modèles basée sur performance"""
@@ -439,7 +633,8 @@ class AIEnsembleEngine:
             # Simulation de calcul de performance
             # TODO: Implémenter tracking réel des performances
             performance = np.random.normal(0.02, 0.05)  # 2% return moyen
-            model_performances[model] = performance
+            # Latence et fiabilité comptent aussi (p90 / timeout, taux d'échec)
+            model_performances[model] = performance - self.latency_weight * self.router.latency_penalty(model)
         
         # Ajustement graduel des poids vers les meilleurs modèles
         best_model = max(model_performances, key=model_performances.get)
@@ -463,10 +658,10 @@ class AIEnsembleEngine:
                    performances=model_performances)
     
     # Méthodes utilitaires additionnelles...
-    def _calculate_asset_signal(self, asset: str, analysis: Dict, regime: MarketRegime) -> float:
-        """Calcul du signal composite pour un asset"""
+    def _calculate_asset_signals(self, assets: List[str], analysis: Dict, regime: MarketRegime) -> np.ndarray:
+        """Signaux composites de l'univers (un par asset, [-1, 1] typique)"""
         # Simplified signal calculation
-        return np.random.normal(0, 0.5)  # TODO: Implémenter vraie logique
+        return np.random.normal(0, 0.5, len(assets))  # TODO: Implémenter vraie logique
     
     def _generate_reasoning(self, asset: str, signal: float, analysis: Dict) -> List[str]:
         """Génère le raisonnement pour une décision"""
@@ -478,25 +673,6 @@ class AIEnsembleEngine:
         ]
         return reasons
     
-    def _determine_time_horizon(self, signal: float, regime: MarketRegime) -> str:
-        """Détermine l'horizon de temps optimal"""
-        if abs(signal) > 0.7:
-            return "short_term"  # 1-5 jours
-        elif abs(signal) > 0.4:
-            return "medium_term"  # 1-4 semaines  
-        else:
-            return "long_term"  # 1-3 mois
-    
-    def _calculate_risk_levels(self, asset: str, signal: float, volatility: float) -> tuple:
-        """Calcule stop-loss et take-profit optimaux"""
-        # ATR-based stops
-        atr_multiplier = 1.5 + volatility  # Adaptive to volatility
-        
-        stop_loss = atr_multiplier * 0.02  # 2% base + volatility adj
-        take_profit = stop_loss * 2.5  # 1:2.5 risk/reward
-        
-        return stop_loss, take_profit
-    
     def _calculate_ensemble_confidence(self, decisions: List[AIDecision]) -> float:
         """Calcule la confiance globale de l'ensemble"""
         if not decisions:
@@ -526,4 +702,13 @@ class AIEnsembleEngine:
         for result in results:
             if isinstance(result, dict) and "source" in result:
                 consolidated[result["source"]] = result
+                # champs structurés exposés par dimension (technical.trend_strength, ...)
+                dimension = ANALYSIS_DIMENSIONS.get(result["source"])
+                if dimension:
+                    fields = result["analysis"] if isinstance(result.get("analysis"), dict) else result
+                    consolidated[dimension] = {**fields, "confidence": result.get("confidence", 0.0)}
+        for source, dimension in FALLBACK_DIMENSIONS.items():
+            fallback = consolidated.get(source)
+            if dimension not in consolidated and fallback and fallback.get("confidence"):
+                consolidated[dimension] = fallback
         return consolidated 
\ No newline at end of file
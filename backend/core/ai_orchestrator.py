@@ -13,6 +13,8 @@ import structlog
 from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from .ai_ensemble import AIEnsembleEngine, MarketRegime
+from .market_snapshot import MarketSnapshotProvider
+from .task_graph import CycleError, GraphRun, TaskGraph
 
 logger = structlog.get_logger()
 
@@ -64,6 +66,11 @@ class ExecutionContext:
     volatility_level: float
     risk_budget: float
     timestamp: datetime = field(default_factory=datetime.utcnow)
+    
+    # Données partagées du cycle (évite de refaire fetch + analyse dans les tâches)
+    market_data: Dict[str, Any] = field(default_factory=dict)
+    market_analysis: Optional[Dict[str, Any]] = None
+    snapshot_version: int = 0
 
 class AIOrchestrator:
     """
@@ -77,12 +84,21 @@ class AIOrchestrator:
     - Prédiction proactive des besoins
     """
     
-    def __init__(self, ai_engine: AIEnsembleEngine):
+    def __init__(self, ai_engine: AIEnsembleEngine, market_snapshots: Optional[MarketSnapshotProvider] = None):
         self.ai_engine = ai_engine
+        
+        # Instantané de marché partagé (un fetch + une analyse IA par fenêtre)
+        self.market_snapshots = market_snapshots or MarketSnapshotProvider(
+            self._fetch_market_data, ai_engine.analyze_market_multi_dimensional
+        )
         self.tasks: Dict[str, Task] = {}
         self.execution_queue: List[str] = []
         self.running_tasks: Dict[str, asyncio.Task] = {}
         
+        # Exécution DAG : dernières sorties par tâche et bilan du dernier cycle
+        self.task_outputs: Dict[str, Any] = {}
+        self.last_cycle_report: Optional[Dict[str, Any]] = None
+        
         # State management
         self.is_running = False
         self.current_context: Optional[ExecutionContext] = None
@@ -155,11 +171,10 @@ class AIOrchestrator:
         les décisions d'exécution
         """
         
-        # Données de marché en temps réel
-        market_data = await self._fetch_market_data()
-        
-        # Analyse IA du régime de marché
-        ai_analysis = await self.ai_engine.analyze_market_multi_dimensional(market_data)
+        # Données de marché et analyse IA du régime (instantané partagé)
+        snapshot = await self.market_snapshots.get()
+        market_data = snapshot.market_data
+        ai_analysis = snapshot.analysis
         market_regime = ai_analysis["regime"]
         
         # Santé du système
@@ -181,7 +196,10 @@ class AIOrchestrator:
             active_tasks=list(self.running_tasks.keys()),
             market_hours=self._is_market_hours(),
             volatility_level=volatility_level,
-            risk_budget=risk_budget
+            risk_budget=risk_budget,
+            market_data=market_data,
+            market_analysis=ai_analysis,
+            snapshot_version=snapshot.version
         )
         
         logger.info("🔍 Contexte analysé", 
@@ -199,45 +217,13 @@ class AIOrchestrator:
         basé sur le contexte complet
         """
         
-        plan_decisions = []
-        
-        for task_id, task in self.tasks.items():
-            # Skip si tâche déjà en cours
-            if task_id in self.running_tasks:
-                continue
-            
-            # Analyse de pertinence IA
-            relevance_score = await self._calculate_task_relevance(task, context)
-            
-            if relevance_score < 0.3:  # Seuil de pertinence
-                continue
-            
-            # Calcul du timing optimal
-            optimal_timing = await self._calculate_optimal_timing(task, context)
-            
-            # Évaluation des risques
-            risk_assessment = await self._assess_task_risks(task, context)
-            
-            # Calcul de priorité dynamique
-            dynamic_priority = await self._calculate_dynamic_priority(
-                task, context, relevance_score, risk_assessment
-            )
-            
-            decision = {
-                "task_id": task_id,
-                "relevance_score": relevance_score,
-                "optimal_timing": optimal_timing,
-                "risk_assessment": risk_assessment,
-                "dynamic_priority": dynamic_priority,
-                "execution_context": {
-                    "market_regime": context.market_regime.regime_type,
-                    "volatility": context.volatility_level,
-                    "resource_load": sum(context.resource_availability.values()) / len(context.resource_availability)
-                },
-                "ai_reasoning": await self._generate_execution_reasoning(task, context, relevance_score)
-            }
-            
-            plan_decisions.append(decision)
+        # Évaluation concurrente de toutes les tâches éligibles
+        evaluations = await asyncio.gather(*(
+            self._evaluate_task(task, context)
+            for task_id, task in self.tasks.items()
+            if task_id not in self.running_tasks  # Skip si tâche déjà en cours
+        ))
+        plan_decisions = [decision for decision in evaluations if decision is not None]
         
         # Tri par priorité dynamique
         plan_decisions.sort(key=lambda x: x["dynamic_priority"], reverse=True)
@@ -248,6 +234,41 @@ class AIOrchestrator:
         
         return plan_decisions
     
+    async def _evaluate_task(self, task: Task, context: ExecutionContext) -> Optional[Dict[str, Any]]:
+        """Décision de planification d'une tâche (scores indépendants en parallèle)"""
+        
+        # Analyse de pertinence IA
+        relevance_score = await self._calculate_task_relevance(task, context)
+        
+        if relevance_score < 0.3:  # Seuil de pertinence
+            return None
+        
+        # Timing optimal, évaluation des risques et raisonnement sont indépendants
+        optimal_timing, risk_assessment, ai_reasoning = await asyncio.gather(
+            self._calculate_optimal_timing(task, context),
+            self._assess_task_risks(task, context),
+            self._generate_execution_reasoning(task, context, relevance_score)
+        )
+        
+        # Calcul de priorité dynamique
+        dynamic_priority = await self._calculate_dynamic_priority(
+            task, context, relevance_score, risk_assessment
+        )
+        
+        return {
+            "task_id": task.id,
+            "relevance_score": relevance_score,
+            "optimal_timing": optimal_timing,
+            "risk_assessment": risk_assessment,
+            "dynamic_priority": dynamic_priority,
+            "execution_context": {
+                "market_regime": context.market_regime.regime_type,
+                "volatility": context.volatility_level,
+                "resource_load": sum(context.resource_availability.values()) / len(context.resource_availability)
+            },
+            "ai_reasoning": ai_reasoning
+        }
+    
     async def _calculate_task_relevance(self, task: Task, context: ExecutionContext) -> float:
         """
         🎯 CALCUL DE PERTINENCE ULTRA-INTELLIGENT
@@ -319,15 +340,17 @@ class AIOrchestrator:
         """
         ⚡ EXÉCUTION INTELLIGENTE DU PLAN
         
-        Exécute les tâches de manière optimale avec monitoring en temps réel
+        Construit le DAG des tâches retenues (dépendances déclarées) et
+        l'exécute en arrière-plan : branches indépendantes en parallèle,
+        sorties amont transmises aux tâches aval
         """
         
-        executed_tasks = 0
         max_concurrent = self._calculate_max_concurrent_tasks(context)
+        graph = TaskGraph()
         
         for decision in plan:
             # Limite de concurrence intelligente
-            if len(self.running_tasks) >= max_concurrent:
+            if len(self.running_tasks) + len(graph) >= max_concurrent:
                 break
             
             task_id = decision["task_id"]
@@ -337,24 +360,57 @@ class AIOrchestrator:
             if not await self._final_execution_check(task, decision, context):
                 continue
             
-            # Lancement de la tâche
-            execution_task = asyncio.create_task(
-                self._execute_single_task_with_monitoring(task, decision, context)
+            graph.add(
+                task_id,
+                lambda upstream, task=task, decision=decision: self._execute_single_task_with_monitoring(
+                    task, {**decision, "upstream": upstream}, context
+                ),
+                dependencies=task.dependencies
             )
-            
-            self.running_tasks[task_id] = execution_task
-            executed_tasks += 1
-            
-            logger.info("⚡ Tâche lancée", 
-                       task_id=task_id,
-                       priority=decision["dynamic_priority"],
-                       reasoning=decision["ai_reasoning"][:100])
+        
+        if not len(graph):
+            return
+        
+        try:
+            levels = graph.topological_levels()
+        except CycleError as e:
+            logger.error("🚨 Plan rejeté", error=str(e))
+            return
+        
+        # Les tâches du graphe sont "en cours" jusqu'à la fin de leur nœud
+        graph_task = asyncio.create_task(self._run_task_graph(graph, max_concurrent))
+        for level in levels:
+            for task_id in level:
+                self.running_tasks[task_id] = graph_task
         
         logger.info("📊 Plan exécuté", 
-                   executed=executed_tasks,
+                   executed=len(graph),
                    total_planned=len(plan),
+                   levels=levels,
                    running=len(self.running_tasks))
     
+    async def _run_task_graph(self, graph: TaskGraph, max_concurrent: int) -> GraphRun:
+        """Exécute le DAG du cycle et publie son chemin critique"""
+        
+        graph_run = await graph.run(max_concurrency=max_concurrent, external_outputs=self.task_outputs)
+        
+        # Les tâches aval des cycles suivants réutilisent ces sorties
+        self.task_outputs.update(graph_run.outputs())
+        for task_id in graph_run.results:
+            if self.running_tasks.get(task_id) is asyncio.current_task():
+                del self.running_tasks[task_id]
+        
+        self.last_cycle_report = graph_run.summary()
+        logger.info("🧭 Chemin critique du cycle",
+                   path=" → ".join(graph_run.critical_path),
+                   duration=f"{graph_run.critical_path_duration:.2f}s",
+                   wall_time=f"{graph_run.wall_time:.2f}s")
+        return graph_run
+    
+    def get_cycle_report(self) -> Optional[Dict[str, Any]]:
+        """📊 Bilan DAG du dernier cycle (chemin critique, statuts, durées)"""
+        return self.last_cycle_report
+    
     async def _execute_single_task_with_monitoring(
         self, 
         task: Task, 
@@ -394,9 +450,12 @@ class AIOrchestrator:
                        execution_time=f"{execution_time:.2f}s",
                        result_summary=str(result)[:100])
             
+            return result
+            
         except Exception as e:
-            # Gestion intelligente des erreurs
+            # Gestion intelligente des erreurs (puis échec du nœud : tâches aval sautées)
             await self._handle_task_error(task, e, context)
+            raise
             
         finally:
             # Nettoyage
@@ -462,9 +521,10 @@ class AIOrchestrator:
     
     # TÂCHES SPÉCIALISÉES
     async def _task_market_analysis(self, context: ExecutionContext, decision: Dict) -> Dict:
-        """Tâche d'analyse de marché ultra-avancée"""
-        market_data = await self._fetch_market_data()
-        analysis = await self.ai_engine.analyze_market_multi_dimensional(market_data)
+        """Tâche d'analyse de marché ultra-avancée (réutilise l'analyse du cycle)"""
+        analysis = context.market_analysis
+        if analysis is None:
+            analysis = (await self.market_snapshots.get()).analysis
         
         return {
             "analysis": analysis,
@@ -474,12 +534,14 @@ class AIOrchestrator:
         }
     
     async def _task_portfolio_rebalancing(self, context: ExecutionContext, decision: Dict) -> Dict:
-        """Tâche de rebalancing intelligent"""
+        """Tâche de rebalancing intelligent (analyse transmise par market_analysis)"""
+        market_analysis = decision.get("upstream", {}).get("market_analysis", {})
         # TODO: Implémenter logique de rebalancing réelle
         return {
             "rebalancing_performed": True,
             "adjustments_made": 3,
-            "cost_basis": 0.15
+            "cost_basis": 0.15,
+            "market_regime": market_analysis.get("market_regime")
         }
     
     async def _task_system_health_check(self, context: ExecutionContext, decision: Dict) -> Dict:
@@ -0,0 +1,272 @@
+"""
+🗃️ LLM CACHE - CACHE SÉMANTIQUE DES RÉPONSES LLM
+Réutilise une analyse tant que les données de marché n'ont pas significativement changé
+
+- Empreinte canonique des données de marché : clés triées, horodatages ignorés,
+  nombres quantifiés sur une grille relative (bps) -> un bruit de cotation ne
+  change pas la clé
+- TTL par type d'analyse (technique courte, fondamentale longue)
+- Front LRU en mémoire, stockage partagé Redis (dégradation en mémoire seule)
+- Coalescence : les prompts identiques concurrents partagent un seul appel
+- Statistiques par modèle : taux de hit, tokens et latence économisés
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+import redis.asyncio as redis
+import structlog
+
+logger = structlog.get_logger()
+
+# Champs volatils exclus de l'empreinte
+IGNORED_KEYS = frozenset({"timestamp", "fetched_at", "updated_at", "last_update", "time"})
+
+# Pas de quantification par champ, en points de base (les volumes fluctuent
+# sans changer l'analyse)
+DEFAULT_STEP_BPS = 50.0
+DEFAULT_FIELD_STEPS_BPS = {"volume": 2500.0}
+
+DEFAULT_TTLS = {
+    "technical": 300,
+    "fundamental": 1800,
+}
+DEFAULT_TTL = 300
+
+LLMCall = Callable[[], Awaitable[Tuple[str, int]]]  # -> (contenu, tokens consommés)
+
+def quantize(value: Any, step_bps: float = DEFAULT_STEP_BPS) -> Any:
+    """Ramène un nombre sur une grille logarithmique (pas relatif en bps ; bool et None inchangés)"""
+    if isinstance(value, bool) or value is None or not isinstance(value, (int, float)):
+        return value
+    if value == 0 or step_bps <= 0 or not math.isfinite(value):
+        return value
+    ratio = math.log1p(step_bps / 10_000)
+    bucket = round(math.log(abs(value)) / ratio)
+    return math.copysign(float(f"{math.exp(bucket * ratio):.6g}"), value)
+
+def canonicalize(data: Any, step_bps: float = DEFAULT_STEP_BPS,
+                 field_steps_bps: Optional[Dict[str, float]] = None,
+                 ignored_keys: Iterable[str] = IGNORED_KEYS) -> Any:
+    """Forme canonique JSON-sérialisable : clés triées, nombres quantifiés"""
+    field_steps = DEFAULT_FIELD_STEPS_BPS if field_steps_bps is None else field_steps_bps
+    ignored = ignored_keys if isinstance(ignored_keys, frozenset) else frozenset(ignored_keys)
+    if isinstance(data, dict):
+        return {
+            str(key): canonicalize(value, field_steps.get(str(key), step_bps), field_steps, ignored)
+            for key, value in sorted(data.items(), key=lambda item: str(item[0]))
+            if str(key) not in ignored
+        }
+    if isinstance(data, (list, tuple)):
+        return [canonicalize(value, step_bps, field_steps, ignored) for value in data]
+    if isinstance(data, (datetime, date)):
+        return data.isoformat()
+    if hasattr(data, "item") and not isinstance(data, (str, bytes)):  # scalaires numpy
+        return quantize(data.item(), step_bps)
+    if isinstance(data, (str, bool, int, float)) or data is None:
+        return quantize(data, step_bps)
+    return str(data)
+
+def market_fingerprint(market_data: Dict[str, Any], step_bps: float = DEFAULT_STEP_BPS,
+                       field_steps_bps: Optional[Dict[str, float]] = None) -> str:
+    """Empreinte stable des données de marché quantifiées"""
+    canonical = json.dumps(canonicalize(market_data, step_bps, field_steps_bps),
+                           sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Réponse LLM mise en cache"""
+    content: str
+    model: str
+    tokens: int
+    latency: float          # durée de l'appel d'origine (s)
+    created_at: float
+    expires_at: float
+    source: str = "llm"     # llm | memory | redis | coalesced
+
+@dataclass
+class ModelCacheStats:
+    """Compteurs du cache pour un modèle"""
+    requests: int = 0
+    memory_hits: int = 0
+    redis_hits: int = 0
+    coalesced: int = 0
+    misses: int = 0
+    errors: int = 0
+    tokens_used: int = 0
+    tokens_saved: int = 0
+    latency_saved: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        served = self.memory_hits + self.redis_hits + self.coalesced
+        return served / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4), "latency_saved": round(self.latency_saved, 3)}
+
+class LLMCache:
+    """
+    🗃️ Cache des réponses LLM
+
+    response = await cache.get_or_call(
+        model, "technical", cache.key(model, "technical", fingerprint, prompt_template, params), call
+    )
+    """
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None, max_entries: int = 512,
+                 ttls: Optional[Dict[str, int]] = None, namespace: str = "llm_cache"):
+        self.redis_client = redis_client
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.namespace = namespace
+
+        self._memory: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats: Dict[str, ModelCacheStats] = {}
+
+    def key(self, model: str, analysis_type: str, fingerprint: str,
+            prompt_template: str = "", params: Optional[Dict[str, Any]] = None) -> str:
+        """Clé : modèle, type d'analyse, version du prompt et des paramètres, empreinte marché"""
+        prompt_version = hashlib.sha256(
+            (prompt_template + json.dumps(params or {}, sort_keys=True)).encode()
+        ).hexdigest()[:12]
+        return f"{self.namespace}:{model}:{analysis_type}:{prompt_version}:{fingerprint}"
+
+    def ttl_for(self, analysis_type: str) -> int:
+        return self.ttls.get(analysis_type, DEFAULT_TTL)
+
+    def _model_stats(self, model: str) -> ModelCacheStats:
+        return self._stats.setdefault(model, ModelCacheStats())
+
+    async def get_or_call(self, model: str, analysis_type: str, key: str, call: LLMCall,
+                          ttl: Optional[int] = None) -> CachedResponse:
+        """Réponse en cache (mémoire, Redis, appel en cours) ou nouvel appel LLM"""
+        stats = self._model_stats(model)
+        stats.requests += 1
+
+        cached = self._memory_get(key)
+        if cached is not None:
+            stats.memory_hits += 1
+            self._record_saving(stats, cached)
+            return replace(cached, source="memory")
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            stats.coalesced += 1
+            response = await asyncio.shield(inflight)
+            self._record_saving(stats, response)
+            return replace(response, source="coalesced")
+
+        inflight = asyncio.create_task(self._load_or_call(model, key, call, ttl or self.ttl_for(analysis_type)))
+        self._inflight[key] = inflight
+        # shield : l'annulation d'un demandeur n'annule pas l'appel partagé
+        return await asyncio.shield(inflight)
+
+    async def _load_or_call(self, model: str, key: str, call: LLMCall, ttl: int) -> CachedResponse:
+        stats = self._model_stats(model)
+        try:
+            stored = await self._redis_get(key)
+            if stored is not None:
+                stats.redis_hits += 1
+                self._record_saving(stats, stored)
+                self._memory_set(key, stored)
+                return replace(stored, source="redis")
+
+            stats.misses += 1
+            start = time.perf_counter()
+            content, tokens = await call()
+            now = time.time()
+            response = CachedResponse(
+                content=content, model=model, tokens=int(tokens or 0),
+                latency=time.perf_counter() - start, created_at=now, expires_at=now + ttl
+            )
+            stats.tokens_used += response.tokens
+            self._memory_set(key, response)
+            await self._redis_set(key, response, ttl)
+            return response
+        except Exception as e:
+            stats.errors += 1
+            logger.error("❌ Erreur appel LLM (cache)", model=model, error=str(e))
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    @staticmethod
+    def _record_saving(stats: ModelCacheStats, response: CachedResponse):
+        stats.tokens_saved += response.tokens
+        stats.latency_saved += response.latency
+
+    def _memory_get(self, key: str) -> Optional[CachedResponse]:
+        cached = self._memory.get(key)
+        if cached is None:
+            return None
+        if cached.expires_at <= time.time():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return cached
+
+    def _memory_set(self, key: str, response: CachedResponse):
+        self._memory[key] = replace(response, source="llm")
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def _redis_get(self, key: str) -> Optional[CachedResponse]:
+        if self.redis_client is None:
+            return None
+        try:
+            raw = await self.redis_client.get(key)
+        except redis.RedisError as e:
+            logger.warning("⚠️ Cache LLM Redis indisponible", error=str(e))
+            return None
+        if raw is None:
+            return None
+        response = CachedResponse(**json.loads(raw))
+        return response if response.expires_at > time.time() else None
+
+    async def _redis_set(self, key: str, response: CachedResponse, ttl: int):
+        if self.redis_client is None:
+            return
+        try:
+            await self.redis_client.set(key, json.dumps(asdict(response)), ex=max(int(ttl), 1))
+        except redis.RedisError as e:
+            logger.warning("⚠️ Cache LLM Redis indisponible", error=str(e))
+
+    async def invalidate(self, analysis_type: Optional[str] = None):
+        """Vide le cache (tout ou un type d'analyse)"""
+        pattern = f"{self.namespace}:*:{analysis_type}:*" if analysis_type else f"{self.namespace}:*"
+        for key in [key for key in self._memory if analysis_type is None or f":{analysis_type}:" in key]:
+            del self._memory[key]
+        if self.redis_client is not None:
+            try:
+                async for key in self.redis_client.scan_iter(match=pattern):
+                    await self.redis_client.delete(key)
+            except redis.RedisError as e:
+                logger.warning("⚠️ Cache LLM Redis indisponible", error=str(e))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """📊 Taux de hit, tokens et latence économisés par modèle"""
+        totals = ModelCacheStats()
+        for stats in self._stats.values():
+            for name, value in asdict(stats).items():
+                setattr(totals, name, getattr(totals, name) + value)
+        return {
+            "models": {model: stats.to_dict() for model, stats in self._stats.items()},
+            "total": totals.to_dict(),
+            "memory_entries": len(self._memory),
+            "inflight": len(self._inflight)
+        }
+
+    async def close(self):
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
@@ -0,0 +1,155 @@
+"""
+🔌 LLM PROVIDERS - INTERFACE FOURNISSEURS LLM
+Découple AIEnsembleEngine des SDK OpenAI / Groq
+
+- SDKChatProvider : tout client exposant chat.completions.create (AsyncOpenAI, AsyncGroq)
+- HTTPChatProvider : endpoint HTTP compatible OpenAI (/chat/completions) via le
+  transport HTTP partagé, sans SDK (serveur LLM local, stub de benchmark)
+- stream : fragments de contenu au fil de la génération (stream=true, SSE)
+- build_provider : construction depuis la configuration
+"""
+
+import json
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import aiohttp
+import structlog
+
+from app.integrations.http_pool import get_http_transport
+
+logger = structlog.get_logger()
+
+Messages = List[Dict[str, str]]
+
+class LLMProviderError(RuntimeError):
+    """Erreur renvoyée par un fournisseur LLM"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+@dataclass(frozen=True)
+class Completion:
+    """Réponse d'un fournisseur LLM"""
+    content: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+class LLMProvider(ABC):
+    """Fournisseur de chat completions"""
+
+    name: str = "llm"
+
+    @abstractmethod
+    async def complete(self, model: str, messages: Messages, **params) -> Completion:
+        """Chat completion (paramètres OpenAI : max_tokens, temperature...)"""
+
+    async def stream(self, model: str, messages: Messages, **params) -> AsyncIterator[str]:
+        """Fragments de contenu au fil de la génération (défaut : réponse complète en un fragment)"""
+        completion = await self.complete(model, messages, **params)
+        yield completion.content
+
+    async def close(self):
+        pass
+
+class SDKChatProvider(LLMProvider):
+    """Client SDK compatible OpenAI (chat.completions.create)"""
+
+    def __init__(self, name: str, client: Any):
+        self.name = name
+        self.client = client
+
+    async def complete(self, model: str, messages: Messages, **params) -> Completion:
+        response = await self.client.chat.completions.create(model=model, messages=messages, **params)
+        usage = getattr(response, "usage", None)
+        return Completion(
+            content=response.choices[0].message.content,
+            model=getattr(response, "model", None) or model,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or getattr(usage, "total_tokens", 0) or 0
+        )
+
+    async def stream(self, model: str, messages: Messages, **params) -> AsyncIterator[str]:
+        response = await self.client.chat.completions.create(model=model, messages=messages, stream=True, **params)
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def close(self):
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            await close()
+
+class HTTPChatProvider(LLMProvider):
+    """Endpoint HTTP compatible OpenAI, via le pool HTTP partagé"""
+
+    def __init__(self, name: str, base_url: str, api_key: str = "", timeout: float = 120.0):
+        self.name = name
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.headers = {"Authorization": f"Bearer {api_key or 'local'}"}
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async def complete(self, model: str, messages: Messages, **params) -> Completion:
+        payload = {"model": model, "messages": messages, **params}
+        async with get_http_transport().post(self.url, json=payload, headers=self.headers,
+                                             timeout=self.timeout) as response:
+            if response.status >= 400:
+                raise LLMProviderError(f"{self.name} HTTP {response.status}: {await response.text()}",
+                                       status=response.status)
+            data = await response.json()
+
+        usage = data.get("usage") or {}
+        return Completion(
+            content=data["choices"][0]["message"]["content"],
+            model=data.get("model", model),
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0)
+        )
+
+    async def stream(self, model: str, messages: Messages, **params) -> AsyncIterator[str]:
+        payload = {"model": model, "messages": messages, **params, "stream": True}
+        async with get_http_transport().post(self.url, json=payload, headers=self.headers,
+                                             timeout=self.timeout) as response:
+            if response.status >= 400:
+                raise LLMProviderError(f"{self.name} HTTP {response.status}: {await response.text()}",
+                                       status=response.status)
+            # Server-Sent Events : une ligne "data: {...}" par fragment, "data: [DONE]" en fin de flux
+            async for line in response.content:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
+
+def build_provider(name: str, config: Dict[str, Any]) -> LLMProvider:
+    """
+    Fournisseur depuis la configuration :
+    {"kind": "openai" | "groq" | "http", "api_key": ..., "base_url": ...}
+    """
+    kind = config.get("kind", name)
+    api_key = config.get("api_key")
+    base_url = config.get("base_url") or None
+
+    if kind == "http":
+        if not base_url:
+            raise ValueError(f"base_url requis pour le fournisseur HTTP {name}")
+        return HTTPChatProvider(name, base_url, api_key or "", timeout=config.get("timeout", 120.0))
+    if kind == "openai":
+        from openai import AsyncOpenAI
+        return SDKChatProvider(name, AsyncOpenAI(api_key=api_key, base_url=base_url))
+    if kind == "groq":
+        from groq import AsyncGroq
+        return SDKChatProvider(name, AsyncGroq(api_key=api_key, base_url=base_url))
+    raise ValueError(f"Fournisseur LLM inconnu: {kind}")
@@ -0,0 +1,127 @@
+"""
+📸 MARKET SNAPSHOT - INSTANTANÉ DE MARCHÉ PARTAGÉ (SINGLE-FLIGHT)
+Un seul fetch + une seule analyse IA par fenêtre de temps, partagés par
+l'orchestrateur et ses tâches
+
+- Instantané versionné (données de marché + analyse multi-dimensionnelle)
+- Single-flight : les demandes concurrentes d'une même fenêtre attendent
+  le calcul en cours au lieu d'en lancer un autre
+- Borne de fraîcheur configurable : un instantané assez récent est réutilisé
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+MarketFetcher = Callable[[], Awaitable[Dict[str, Any]]]
+MarketAnalyzer = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """Instantané immuable des données de marché et de leur analyse"""
+    version: int
+    bucket: int                      # fenêtre de temps (epoch // bucket_seconds)
+    market_data: Dict[str, Any]
+    analysis: Optional[Dict[str, Any]]
+    fetched_at: float = field(default_factory=time.time)
+    compute_time: float = 0.0
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+class MarketSnapshotProvider:
+    """
+    📸 Fournisseur d'instantanés de marché
+
+    get() renvoie l'instantané en cache s'il a moins de max_staleness secondes,
+    rejoint le calcul en cours de la fenêtre courante, ou en lance un seul.
+    """
+
+    def __init__(self, fetcher: MarketFetcher, analyzer: Optional[MarketAnalyzer] = None,
+                 bucket_seconds: float = 30.0, max_staleness: float = 60.0):
+        self.fetcher = fetcher
+        self.analyzer = analyzer
+        self.bucket_seconds = bucket_seconds
+        self.max_staleness = max_staleness
+
+        self._snapshot: Optional[MarketSnapshot] = None
+        self._inflight: Dict[int, asyncio.Task] = {}
+        self._version = 0
+        self.stats = {"requests": 0, "cache_hits": 0, "coalesced": 0, "fetches": 0, "errors": 0}
+
+    def _bucket(self, now: Optional[float] = None) -> int:
+        return int((now or time.time()) // self.bucket_seconds)
+
+    @property
+    def current(self) -> Optional[MarketSnapshot]:
+        """Dernier instantané calculé (sans contrôle de fraîcheur)"""
+        return self._snapshot
+
+    async def get(self, max_staleness: Optional[float] = None) -> MarketSnapshot:
+        """Instantané assez frais, partagé entre demandeurs concurrents"""
+        self.stats["requests"] += 1
+        staleness = self.max_staleness if max_staleness is None else max_staleness
+
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.age <= staleness:
+            self.stats["cache_hits"] += 1
+            return snapshot
+
+        bucket = self._bucket()
+        inflight = self._inflight.get(bucket)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+        else:
+            inflight = asyncio.create_task(self._compute(bucket))
+            self._inflight[bucket] = inflight
+
+        # shield : l'annulation d'un demandeur n'annule pas le calcul partagé
+        return await asyncio.shield(inflight)
+
+    async def _compute(self, bucket: int) -> MarketSnapshot:
+        start = time.perf_counter()
+        try:
+            self.stats["fetches"] += 1
+            market_data = await self.fetcher()
+            fetched_at = time.time()
+            analysis = await self.analyzer(market_data) if self.analyzer is not None else None
+
+            self._version += 1
+            snapshot = MarketSnapshot(
+                version=self._version,
+                bucket=bucket,
+                market_data=market_data,
+                analysis=analysis,
+                fetched_at=fetched_at,
+                compute_time=time.perf_counter() - start
+            )
+            self._snapshot = snapshot
+            logger.info("📸 Instantané de marché", version=snapshot.version,
+                        assets=len(market_data), compute_time=f"{snapshot.compute_time:.2f}s")
+            return snapshot
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error("❌ Erreur instantané de marché", error=str(e))
+            raise
+        finally:
+            self._inflight.pop(bucket, None)
+
+    def invalidate(self):
+        """Force un nouveau calcul à la prochaine demande"""
+        self._snapshot = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """📊 Demandes, réutilisations et calculs effectifs"""
+        snapshot = self._snapshot
+        return {
+            **self.stats,
+            "version": snapshot.version if snapshot else 0,
+            "age_seconds": round(snapshot.age, 2) if snapshot else None,
+            "inflight": len(self._inflight)
+        }
@@ -0,0 +1,308 @@
+"""
+⏳ MODEL ROUTER - BUDGET TEMPS / TOKENS DES ANALYSES IA
+Routage adaptatif des analyses de l'ensemble sous échéance de cycle
+
+- Échéance par cycle + timeout par analyse : un appel lent ne bloque plus le cycle
+- Requêtes couvertes (hedging) : si le modèle principal dépasse son p90 de
+  latence (ou échoue), le modèle de secours est lancé et la première réponse
+  valide l'emporte
+- Dégradation gracieuse : à l'échéance, consensus partiel sur les analyses reçues
+- Budget de coût par cycle : au-delà, routage direct vers le modèle de secours
+- Suivi par modèle : latences (p50/p90), tokens/s, coût, timeouts, hedges gagnés
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+AnalysisCall = Callable[[], Awaitable[Dict[str, Any]]]
+
+# Prix indicatifs (USD / 1k tokens, entrée et sortie confondues)
+DEFAULT_PRICING = {
+    "gpt-4-turbo-preview": 0.02,
+    "llama3-70b-8192": 0.0007,
+}
+
+class AnalysisError(RuntimeError):
+    """Une analyse a renvoyé une erreur"""
+
+@dataclass
+class AnalysisRoute:
+    """Analyse routée : appel principal et modèle de secours éventuel"""
+    name: str                              # source de consolidation
+    call: AnalysisCall
+    model: Optional[str] = None            # None : analyse locale (pas de tokens)
+    timeout: Optional[float] = None
+    hedge: Optional[AnalysisCall] = None
+    hedge_model: Optional[str] = None
+    weight_key: Optional[str] = None       # clé de model_weights
+
+@dataclass
+class ModelUsage:
+    """Statistiques d'un modèle (ou d'une analyse locale)"""
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    cancelled: int = 0
+    hedges_fired: int = 0
+    hedges_won: int = 0
+    tokens: int = 0
+    cost: float = 0.0
+    llm_time: float = 0.0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+    def quantile(self, q: float) -> Optional[float]:
+        return float(np.quantile(self.latencies, q)) if self.latencies else None
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.llm_time if self.llm_time > 0 else 0.0
+
+    @property
+    def failure_rate(self) -> float:
+        return (self.errors + self.timeouts) / self.calls if self.calls else 0.0
+
+    @property
+    def avg_cost(self) -> float:
+        successes = self.calls - self.errors - self.timeouts - self.cancelled
+        return self.cost / successes if successes > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        p50, p90 = self.quantile(0.5), self.quantile(0.9)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "hedges_fired": self.hedges_fired,
+            "hedges_won": self.hedges_won,
+            "tokens": self.tokens,
+            "tokens_per_second": round(self.tokens_per_second, 1),
+            "cost_usd": round(self.cost, 5),
+            "latency_p50": round(p50, 3) if p50 is not None else None,
+            "latency_p90": round(p90, 3) if p90 is not None else None
+        }
+
+@dataclass
+class CycleReport:
+    """Bilan d'un cycle d'analyses"""
+    results: Dict[str, Dict[str, Any]]
+    missing: Dict[str, str]                # route -> raison (timeout, deadline, erreur, budget)
+    served_by: Dict[str, str]              # route -> modèle ayant répondu
+    hedged: List[str]
+    elapsed: float
+    deadline: float
+    cost: float = 0.0
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.missing)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "completed": sorted(self.results),
+            "missing": self.missing,
+            "served_by": self.served_by,
+            "hedged": self.hedged,
+            "elapsed": round(self.elapsed, 3),
+            "deadline": self.deadline,
+            "cost_usd": round(self.cost, 5)
+        }
+
+class ModelRouter:
+    """
+    ⏳ Routeur des analyses IA sous budget
+
+    report = await router.run_cycle([
+        AnalysisRoute("gpt4_fundamental", gpt4_call, model="gpt-4-turbo-preview",
+                      hedge=groq_call, hedge_model="llama3-70b-8192"),
+        AnalysisRoute("liquidity", liquidity_call),
+    ])
+    """
+
+    def __init__(self, cycle_deadline: float = 20.0, default_timeout: float = 15.0,
+                 hedge_quantile: float = 0.9, min_samples: int = 5,
+                 initial_hedge_delay: Optional[float] = None,
+                 pricing: Optional[Dict[str, float]] = None, cost_budget: float = 0.0):
+        self.cycle_deadline = cycle_deadline
+        self.default_timeout = default_timeout
+        self.hedge_quantile = hedge_quantile
+        self.min_samples = min_samples
+        self.initial_hedge_delay = initial_hedge_delay if initial_hedge_delay is not None else default_timeout / 2
+        self.pricing = {**DEFAULT_PRICING, **(pricing or {})}
+        self.cost_budget = cost_budget    # USD par cycle, 0 = illimité
+
+        self.usage: Dict[str, ModelUsage] = {}
+        self._weight_models: Dict[str, str] = {}
+        self.cycles = 0
+        self.partial_cycles = 0
+        self.last_report: Optional[CycleReport] = None
+
+    def _usage(self, key: str) -> ModelUsage:
+        return self.usage.setdefault(key, ModelUsage())
+
+    def hedge_delay(self, model: str) -> float:
+        """Délai avant requête couverte : p90 observé du modèle principal, plafonné"""
+        usage = self._usage(model)
+        if len(usage.latencies) < self.min_samples:
+            return self.initial_hedge_delay
+        return min(usage.quantile(self.hedge_quantile), self.initial_hedge_delay)
+
+    def latency_penalty(self, weight_key: str) -> float:
+        """Pénalité [0, 1] : p90 rapporté au timeout et taux d'échec"""
+        usage = self.usage.get(self._weight_models.get(weight_key, weight_key))
+        if usage is None or not usage.calls:
+            return 0.0
+        p90 = usage.quantile(0.9) or 0.0
+        return min(1.0, 0.5 * min(1.0, p90 / self.default_timeout) + 0.5 * usage.failure_rate)
+
+    async def run_cycle(self, routes: List[AnalysisRoute], deadline: Optional[float] = None) -> CycleReport:
+        """Lance toutes les analyses ; à l'échéance, renvoie celles qui ont abouti"""
+        deadline = deadline or self.cycle_deadline
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline_at = start + deadline
+
+        report = CycleReport(results={}, missing={}, served_by={}, hedged=[], elapsed=0.0, deadline=deadline)
+        tasks: Dict[asyncio.Task, AnalysisRoute] = {}
+        planned_cost = 0.0
+
+        for route in routes:
+            if route.weight_key:
+                self._weight_models[route.weight_key] = route.model or route.name
+            route, over_budget = self._apply_budget(route, planned_cost)
+            if over_budget:
+                report.missing[route.name] = "budget"
+                continue
+            if route.model:
+                planned_cost += self._usage(route.model).avg_cost
+            tasks[asyncio.create_task(self._run_route(route, deadline_at, report))] = route
+
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=max(deadline_at - loop.time(), 0))
+            for task in pending:
+                task.cancel()
+                report.missing[tasks[task].name] = "deadline"
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            for task in done:
+                route = tasks[task]
+                if task.exception() is not None:
+                    report.missing[route.name] = str(task.exception()) or type(task.exception()).__name__
+                else:
+                    result, model = task.result()
+                    report.results[route.name] = result
+                    report.served_by[route.name] = model
+
+        report.elapsed = loop.time() - start
+        self.cycles += 1
+        if report.partial:
+            self.partial_cycles += 1
+            logger.warning("⏳ Cycle IA partiel", missing=report.missing, elapsed=f"{report.elapsed:.2f}s")
+        self.last_report = report
+        return report
+
+    def _apply_budget(self, route: AnalysisRoute, planned_cost: float) -> Tuple[AnalysisRoute, bool]:
+        """Au-delà du budget : modèle de secours s'il est moins cher, sinon analyse sautée"""
+        if not self.cost_budget or not route.model:
+            return route, False
+        if planned_cost + self._usage(route.model).avg_cost <= self.cost_budget:
+            return route, False
+        if route.hedge is not None and route.hedge_model:
+            if planned_cost + self._usage(route.hedge_model).avg_cost <= self.cost_budget:
+                return AnalysisRoute(route.name, route.hedge, model=route.hedge_model,
+                                     timeout=route.timeout, weight_key=route.weight_key), False
+        return route, True
+
+    async def _run_route(self, route: AnalysisRoute, deadline_at: float,
+                         report: CycleReport) -> Tuple[Dict[str, Any], str]:
+        loop = asyncio.get_running_loop()
+        timeout = min(route.timeout or self.default_timeout, deadline_at - loop.time())
+        primary_model = route.model or route.name
+        primary = asyncio.create_task(self._attempt(primary_model, route.call, timeout, report))
+        if route.hedge is None or not route.hedge_model:
+            return await primary, primary_model
+
+        attempts = {primary: primary_model}
+        try:
+            await asyncio.wait({primary}, timeout=min(self.hedge_delay(primary_model), timeout))
+            if primary.done() and primary.exception() is None:
+                return primary.result(), primary_model
+
+            # principal lent ou en échec : requête couverte
+            hedge = asyncio.create_task(
+                self._attempt(route.hedge_model, route.hedge, deadline_at - loop.time(), report)
+            )
+            attempts[hedge] = route.hedge_model
+            self._usage(route.hedge_model).hedges_fired += 1
+            report.hedged.append(route.name)
+
+            pending, error = set(attempts), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._usage(route.hedge_model).hedges_won += 1
+                        return task.result(), attempts[task]
+                    error = task.exception()
+            raise error
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*attempts, return_exceptions=True)
+
+    async def _attempt(self, model: str, call: AnalysisCall, timeout: float,
+                       report: CycleReport) -> Dict[str, Any]:
+        usage = self._usage(model)
+        usage.calls += 1
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(call(), timeout=max(timeout, 0.001))
+        except asyncio.TimeoutError:
+            usage.timeouts += 1
+            usage.latencies.append(time.perf_counter() - start)  # borne inférieure
+            raise AnalysisError(f"timeout {model}")
+        except asyncio.CancelledError:
+            # annulation décidée par le routeur (hedge gagnant, échéance) : pas un échantillon
+            usage.cancelled += 1
+            raise
+        except Exception:
+            usage.errors += 1
+            raise
+
+        if isinstance(result, dict) and result.get("error"):
+            usage.errors += 1
+            raise AnalysisError(result["error"])
+
+        elapsed = time.perf_counter() - start
+        # les réponses servies par le cache LLM ne mesurent pas le modèle
+        # (flux : latence jusqu'aux champs requis, tokens estimés)
+        if not isinstance(result, dict) or result.get("cache", "llm") in ("llm", "stream"):
+            usage.latencies.append(elapsed)
+            tokens = int(result.get("tokens", 0)) if isinstance(result, dict) else 0
+            if tokens:
+                cost = tokens / 1000 * self.pricing.get(model, 0.0)
+                usage.tokens += tokens
+                usage.llm_time += elapsed
+                usage.cost += cost
+                report.cost += cost
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """📊 Latences, débit, coût et couverture par modèle"""
+        return {
+            "cycles": self.cycles,
+            "partial_cycles": self.partial_cycles,
+            "cycle_deadline": self.cycle_deadline,
+            "models": {model: usage.to_dict() for model, usage in self.usage.items()},
+            "last_cycle": self.last_report.summary() if self.last_report else None
+        }
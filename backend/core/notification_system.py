@@ -8,7 +8,6 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.image import MIMEImage
-import aiohttp
 import structlog
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, field
@@ -22,6 +21,8 @@ import seaborn as sns
 import io
 from PIL import Image, ImageDraw, ImageFont
 
+from app.integrations.http_pool import HTTPTransport, get_http_transport
+
 logger = structlog.get_logger()
 
 class NotificationLevel(Enum):
@@ -104,7 +105,7 @@ class NotificationSystem:
     
     def __init__(self, config: NotificationConfig):
         self.config = config
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[HTTPTransport] = None
         
         # Rate limiting
         self.notification_history: List[datetime] = []
@@ -129,13 +130,13 @@ class NotificationSystem:
     
     async def __aenter__(self):
         """Context manager entry"""
-        self.session = aiohttp.ClientSession()
+        # Transport HTTP partagé, fermé par le lifespan de l'application
+        self.session = get_http_transport()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit"""
-        if self.session:
-            await self.session.close()
+        self.session = None
     
     async def send_notification(self, message: NotificationMessage) -> Dict[str, bool]:
         """
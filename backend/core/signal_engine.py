@@ -0,0 +1,108 @@
+"""
+📐 SIGNAL ENGINE - SIGNAUX VECTORISÉS SUR L'UNIVERS
+Sizing Kelly, stops ATR et sélection top-K en une passe NumPy
+
+- Une ligne par symbole : signal, confiance, taille, stop, objectif, horizon
+- Kelly modifié (fraction de Kelly, ajustement volatilité) et stops ATR adaptatifs
+- Top-K par argpartition (O(n)) : seuls les gagnants deviennent des AIDecision
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+HORIZONS = np.array(["long_term", "medium_term", "short_term"])  # 1-3 mois, 1-4 semaines, 1-5 jours
+
+@dataclass
+class SignalBatch:
+    """Signaux d'un univers, alignés sur assets"""
+    assets: np.ndarray
+    signal: np.ndarray
+    confidence: np.ndarray
+    position_size: np.ndarray
+    stop_loss: np.ndarray
+    take_profit: np.ndarray
+    expected_return: np.ndarray
+    time_horizon: np.ndarray
+    actionable: np.ndarray         # |signal| au-dessus du seuil
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+class VectorSignalEngine:
+    """
+    📐 Moteur de signaux vectorisé
+
+    batch = engine.score(assets, signals, volatility=regime.volatility_level)
+    for i in engine.top_k(batch):
+        ...   # batch.assets[i], batch.position_size[i], ...
+    """
+
+    def __init__(self, threshold: float = 0.3, top_k: int = 5, max_confidence: float = 0.95,
+                 kelly_fraction: float = 0.25, min_position: float = 0.01, max_position: float = 0.20,
+                 reward_ratio: float = 2.0, risk_reward: float = 2.5, base_atr: float = 0.02,
+                 max_expected_return: float = 0.15):
+        self.threshold = threshold                  # seuil de signal significatif
+        self.top_k_size = top_k
+        self.max_confidence = max_confidence
+        self.kelly_fraction = kelly_fraction        # Kelly conservateur (25 % du Kelly complet)
+        self.min_position = min_position
+        self.max_position = max_position
+        self.reward_ratio = reward_ratio            # ratio gain/perte par unité de signal
+        self.risk_reward = risk_reward              # take-profit = stop × 2.5
+        self.base_atr = base_atr                    # ATR relatif par défaut (2 %)
+        self.max_expected_return = max_expected_return
+
+    def score(self, assets: Sequence[str], signals: np.ndarray, volatility: float,
+              atr: Optional[Union[float, np.ndarray]] = None) -> SignalBatch:
+        """Sizing, stops et horizon pour tout l'univers"""
+        signal = np.asarray(signals, dtype=np.float64)
+        strength = np.abs(signal)
+        confidence = np.minimum(self.max_confidence, strength)
+
+        # Kelly : f = (p·b - q) / b, p = (confiance + 1) / 2, b = |signal| × ratio
+        win_prob = (confidence + 1) / 2
+        win_loss_ratio = strength * self.reward_ratio
+        with np.errstate(divide="ignore", invalid="ignore"):
+            kelly = (win_prob * win_loss_ratio - (1 - win_prob)) / win_loss_ratio
+        kelly = np.nan_to_num(kelly, nan=0.0, neginf=0.0, posinf=0.0)
+        vol_adjustment = 1 / (1 + volatility)
+        position_size = np.clip(kelly * self.kelly_fraction * vol_adjustment, self.min_position, self.max_position)
+
+        # Stops ATR adaptatifs à la volatilité du régime
+        atr = self.base_atr if atr is None else np.asarray(atr, dtype=np.float64)
+        stop_loss = np.broadcast_to((1.5 + volatility) * atr, signal.shape).astype(np.float64)
+        take_profit = stop_loss * self.risk_reward
+
+        horizon = HORIZONS[(strength > 0.4).astype(np.int8) + (strength > 0.7)]
+
+        return SignalBatch(
+            assets=np.asarray(assets, dtype=object),
+            signal=signal,
+            confidence=confidence,
+            position_size=position_size,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            expected_return=signal * self.max_expected_return,
+            time_horizon=horizon,
+            actionable=strength > self.threshold
+        )
+
+    def top_k(self, batch: SignalBatch, k: Optional[int] = None) -> np.ndarray:
+        """Indices des k signaux actionnables de plus forte confiance, par confiance décroissante"""
+        k = self.top_k_size if k is None else k
+        candidates = np.flatnonzero(batch.actionable)
+        if k <= 0 or candidates.size == 0:
+            return candidates[:0]
+        confidence = batch.confidence[candidates]
+        if candidates.size > k:
+            # k-ième confiance par argpartition ; à égalité au seuil, les premiers de l'univers
+            threshold = confidence[np.argpartition(-confidence, k - 1)[k - 1]]
+            above = confidence > threshold
+            tied = np.flatnonzero(confidence == threshold)[:k - int(above.sum())]
+            keep = np.concatenate([np.flatnonzero(above), tied])
+            candidates, confidence = candidates[keep], confidence[keep]
+        # tri stable : à confiance égale, l'ordre de l'univers est conservé
+        order = np.lexsort((candidates, -confidence))
+        return candidates[order]
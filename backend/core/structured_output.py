@@ -0,0 +1,295 @@
+"""
+🧩 STRUCTURED OUTPUT - SORTIES JSON STRUCTURÉES DES MODÈLES
+Analyse incrémentale et validation des réponses JSON des LLM
+
+- Schémas compacts (type, bornes, champs requis) et consigne de format pour le prompt
+- Parseur incrémental : chaque champ de premier niveau est extrait dès que sa
+  valeur est complète dans le flux de tokens
+- StructuredStream : les consommateurs attendent un champ ou l'ensemble des
+  champs requis, sans attendre la fin de la complétion
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+class SchemaError(ValueError):
+    """Sortie du modèle non conforme au schéma"""
+
+SIGNAL_VALUES = ("BUY", "SELL", "HOLD")
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """Champ d'un schéma de sortie"""
+    kind: str                          # number | string | signals
+    required: bool = False
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    description: str = ""
+
+    def validate(self, value: Any) -> Any:
+        """Valeur normalisée (nombres bornés) ; SchemaError si invalide"""
+        if self.kind == "number":
+            if isinstance(value, bool):
+                raise SchemaError("booléen au lieu d'un nombre")
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                raise SchemaError(f"nombre attendu: {value!r}")
+            if self.minimum is not None:
+                number = max(self.minimum, number)
+            if self.maximum is not None:
+                number = min(self.maximum, number)
+            return number
+        if self.kind == "string":
+            if not isinstance(value, str):
+                raise SchemaError(f"texte attendu: {value!r}")
+            return value
+        if self.kind == "signals":
+            if not isinstance(value, dict):
+                raise SchemaError(f"objet attendu: {value!r}")
+            return {
+                str(asset): str(signal).upper() for asset, signal in value.items()
+                if str(signal).upper() in SIGNAL_VALUES
+            }
+        raise SchemaError(f"type de champ inconnu: {self.kind}")
+
+    def hint(self) -> str:
+        if self.kind == "number":
+            text = f"nombre [{self.minimum:g}, {self.maximum:g}]" if self.minimum is not None else "nombre"
+        elif self.kind == "signals":
+            text = '{"<actif>": "BUY" | "SELL" | "HOLD"}'
+        else:
+            text = "texte"
+        if self.description:
+            text += f" ({self.description})"
+        return text + (" requis" if self.required else "")
+
+@dataclass(frozen=True)
+class OutputSchema:
+    """Schéma compact d'une sortie JSON (ordre des champs = ordre demandé au modèle)"""
+    name: str
+    fields: Dict[str, FieldSpec]
+
+    @property
+    def required(self) -> Tuple[str, ...]:
+        return tuple(name for name, spec in self.fields.items() if spec.required)
+
+    def prompt_hint(self) -> str:
+        """Consigne de format ajoutée au prompt (champs numériques d'abord)"""
+        lines = ",\n".join(f'  "{name}": {spec.hint()}' for name, spec in self.fields.items())
+        return ("Réponds uniquement par un objet JSON valide, clés dans cet ordre :\n"
+                "{\n" + lines + "\n}")
+
+    def validate(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """Champs connus normalisés et liste des erreurs (champs requis manquants inclus)"""
+        clean, errors = {}, []
+        for name, spec in self.fields.items():
+            if name not in data:
+                if spec.required:
+                    errors.append(f"{name}: manquant")
+                continue
+            try:
+                clean[name] = spec.validate(data[name])
+            except SchemaError as e:
+                errors.append(f"{name}: {e}")
+        return clean, errors
+
+TECHNICAL_SCHEMA = OutputSchema("technical", {
+    "trend_strength": FieldSpec("number", True, -1.0, 1.0, "-1 baissier, 1 haussier"),
+    "momentum": FieldSpec("number", False, -1.0, 1.0),
+    "score": FieldSpec("number", True, 0.0, 100.0),
+    "signals": FieldSpec("signals"),
+    "rationale": FieldSpec("string"),
+})
+
+FUNDAMENTAL_SCHEMA = OutputSchema("fundamental", {
+    "macro_score": FieldSpec("number", True, -1.0, 1.0, "-1 défavorable, 1 favorable"),
+    "valuation_score": FieldSpec("number", False, -1.0, 1.0),
+    "score": FieldSpec("number", True, 0.0, 100.0),
+    "signals": FieldSpec("signals"),
+    "rationale": FieldSpec("string"),
+})
+
+class IncrementalJSONParser:
+    """
+    Extrait les champs de premier niveau d'un objet JSON au fil des fragments
+
+    Le texte avant la première accolade (balises ```json, préambule) est ignoré.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.values: Dict[str, Any] = {}
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self._state = "key"          # key | colon | value | scalar | comma
+        self._key: Optional[str] = None
+        self._token_start = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Ajoute un fragment ; renvoie les champs complétés par ce fragment"""
+        completed: List[Tuple[str, Any]] = []
+        self.text += chunk
+        text, i = self.text, self._pos
+
+        while i < len(text) and not self.done:
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._state == "key":
+                        self._key = json.loads(text[self._token_start:i + 1])
+                        self._state = "colon"
+                    elif self._depth == 1 and self._state == "value":
+                        self._emit(completed, text[self._token_start:i + 1])
+            elif not self._started:
+                if c == "{":
+                    self._started, self._depth = True, 1
+            elif c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._state in ("key", "value"):
+                    self._token_start = i
+            elif c in "{[":
+                if self._depth == 1 and self._state == "value":
+                    self._token_start = i
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._state == "value":
+                    self._emit(completed, text[self._token_start:i + 1])
+                elif self._depth == 0:
+                    if self._state == "scalar":
+                        self._emit(completed, text[self._token_start:i])
+                    self.done = True
+            elif self._depth == 1:
+                if c == ":" and self._state == "colon":
+                    self._state = "value"
+                elif c == ",":
+                    if self._state == "scalar":
+                        self._emit(completed, text[self._token_start:i])
+                    self._state = "key"
+                elif not c.isspace() and self._state == "value":
+                    self._token_start, self._state = i, "scalar"
+            i += 1
+
+        self._pos = i
+        return completed
+
+    def _emit(self, completed: List[Tuple[str, Any]], raw: str):
+        self._state = "comma"
+        try:
+            value = json.loads(raw.strip())
+        except json.JSONDecodeError:
+            return
+        if self._key is not None:
+            self.values[self._key] = value
+            completed.append((self._key, value))
+
+@dataclass
+class StructuredResult:
+    """Sortie structurée d'une analyse LLM"""
+    data: Dict[str, Any]
+    model: str
+    tokens: int
+    source: str              # llm | memory | redis | coalesced | stream
+    complete: bool = True    # False : rendue dès les champs requis, flux encore en cours
+
+def parse_structured(content: str, schema: OutputSchema) -> Dict[str, Any]:
+    """Réponse complète -> champs validés ; SchemaError si un champ requis manque"""
+    parser = IncrementalJSONParser()
+    parser.feed(content)
+    data, errors = schema.validate(parser.values)
+    missing = [name for name in schema.required if name not in data]
+    if missing:
+        raise SchemaError(f"{schema.name}: champs requis invalides ou absents ({'; '.join(errors)})")
+    return data
+
+class StructuredStream:
+    """
+    🧩 Sortie structurée en cours de réception
+
+    stream = StructuredStream(TECHNICAL_SCHEMA)
+    asyncio.create_task(stream.consume(provider.stream(...)))
+    trend = await stream.field("trend_strength")    # dès que la valeur est complète
+    if await stream.ready():                         # tous les champs requis reçus
+        ...
+    """
+
+    def __init__(self, schema: OutputSchema):
+        self.schema = schema
+        self.parser = IncrementalJSONParser()
+        self.data: Dict[str, Any] = {}
+        self.errors: List[str] = []
+        self.chars = 0
+        self.closed = False
+        self._events: Dict[str, asyncio.Event] = {}
+        self._ready = asyncio.Event()
+
+    def _event(self, name: str) -> asyncio.Event:
+        return self._events.setdefault(name, asyncio.Event())
+
+    @property
+    def is_ready(self) -> bool:
+        return all(name in self.data for name in self.schema.required)
+
+    def feed(self, chunk: str) -> List[str]:
+        """Fragment reçu ; renvoie les champs validés qu'il complète"""
+        self.chars += len(chunk)
+        fields = []
+        for name, value in self.parser.feed(chunk):
+            spec = self.schema.fields.get(name)
+            if spec is None:
+                continue
+            try:
+                self.data[name] = spec.validate(value)
+            except SchemaError as e:
+                self.errors.append(f"{name}: {e}")
+                continue
+            fields.append(name)
+            self._event(name).set()
+        if self.is_ready:
+            self._ready.set()
+        return fields
+
+    def close(self):
+        """Fin du flux : réveille tous les consommateurs en attente"""
+        self.closed = True
+        self._ready.set()
+        for event in self._events.values():
+            event.set()
+
+    async def consume(self, chunks: AsyncIterator[str]) -> Dict[str, Any]:
+        """Lit tout le flux ; renvoie la sortie validée (SchemaError si incomplète)"""
+        try:
+            async for chunk in chunks:
+                self.feed(chunk)
+        finally:
+            self.close()
+        return self.result()
+
+    async def field(self, name: str) -> Optional[Any]:
+        """Valeur d'un champ dès sa réception (None si absent en fin de flux)"""
+        if name not in self.data and not self.closed:
+            await self._event(name).wait()
+        return self.data.get(name)
+
+    async def ready(self) -> bool:
+        """Attend les champs requis ; False si le flux se termine sans eux"""
+        await self._ready.wait()
+        return self.is_ready
+
+    def result(self) -> Dict[str, Any]:
+        if not self.is_ready:
+            missing = [name for name in self.schema.required if name not in self.data]
+            raise SchemaError(f"{self.schema.name}: champs requis absents {missing} {self.errors}")
+        return dict(self.data)
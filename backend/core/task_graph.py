@@ -0,0 +1,199 @@
+"""
+🕸️ TASK GRAPH - EXÉCUTEUR DAG DES TÂCHES D'ORCHESTRATION
+Ordonnancement topologique et exécution concurrente des branches indépendantes
+
+- Un nœud démarre dès que toutes ses dépendances ont réussi
+- Les sorties amont sont transmises aux nœuds aval (pas de recalcul)
+- Dépendances hors graphe résolues depuis des sorties externes (cycle précédent)
+- Chemin critique (plus longue chaîne de durées) calculé à chaque exécution
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+NodeFunction = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+class CycleError(ValueError):
+    """Le graphe de dépendances contient un cycle"""
+
+@dataclass
+class NodeResult:
+    """Résultat d'un nœud du graphe"""
+    node_id: str
+    status: str  # success | failed | skipped
+    result: Any = None
+    error: Optional[str] = None
+    started_at: float = 0.0   # secondes depuis le début de l'exécution
+    finished_at: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        return self.finished_at - self.started_at
+
+@dataclass
+class GraphRun:
+    """Bilan d'une exécution du graphe"""
+    results: Dict[str, NodeResult]
+    levels: List[List[str]]
+    critical_path: List[str]
+    critical_path_duration: float
+    wall_time: float
+    started_at: float = field(default_factory=time.time)
+
+    def outputs(self) -> Dict[str, Any]:
+        """Sorties des nœuds réussis"""
+        return {node_id: r.result for node_id, r in self.results.items() if r.status == "success"}
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "wall_time": round(self.wall_time, 4),
+            "critical_path": self.critical_path,
+            "critical_path_duration": round(self.critical_path_duration, 4),
+            "levels": self.levels,
+            "statuses": {node_id: r.status for node_id, r in self.results.items()},
+            "durations": {node_id: round(r.duration, 4) for node_id, r in self.results.items()}
+        }
+
+class TaskGraph:
+    """
+    🕸️ Graphe de tâches asynchrones
+
+    graph.add("market_analysis", fetch_and_analyze)
+    graph.add("portfolio_rebalancing", rebalance, dependencies=["market_analysis"])
+    run = await graph.run()
+    """
+
+    def __init__(self):
+        self._functions: Dict[str, NodeFunction] = {}
+        self._dependencies: Dict[str, List[str]] = {}
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._functions
+
+    def __len__(self) -> int:
+        return len(self._functions)
+
+    def add(self, node_id: str, function: NodeFunction, dependencies: Iterable[str] = ()):
+        """Ajoute un nœud ; function reçoit {dépendance: sortie}"""
+        self._functions[node_id] = function
+        self._dependencies[node_id] = list(dependencies)
+
+    def internal_dependencies(self, node_id: str) -> List[str]:
+        return [dep for dep in self._dependencies[node_id] if dep in self._functions]
+
+    def topological_levels(self) -> List[List[str]]:
+        """Niveaux de Kahn : chaque niveau ne dépend que des précédents"""
+        indegree = {node_id: len(self.internal_dependencies(node_id)) for node_id in self._functions}
+        children: Dict[str, List[str]] = {node_id: [] for node_id in self._functions}
+        for node_id in self._functions:
+            for dep in self.internal_dependencies(node_id):
+                children[dep].append(node_id)
+
+        levels, current = [], [node_id for node_id, degree in indegree.items() if degree == 0]
+        visited = 0
+        while current:
+            levels.append(current)
+            visited += len(current)
+            following = []
+            for node_id in current:
+                for child in children[node_id]:
+                    indegree[child] -= 1
+                    if indegree[child] == 0:
+                        following.append(child)
+            current = following
+
+        if visited != len(self._functions):
+            blocked = sorted(node_id for node_id, degree in indegree.items() if degree > 0)
+            raise CycleError(f"Cycle de dépendances entre: {', '.join(blocked)}")
+        return levels
+
+    async def run(self, max_concurrency: Optional[int] = None,
+                  external_outputs: Optional[Dict[str, Any]] = None) -> GraphRun:
+        """Exécute le graphe ; un échec (ou une dépendance indisponible) saute les nœuds aval"""
+        levels = self.topological_levels()
+        external_outputs = external_outputs or {}
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        origin = time.perf_counter()
+
+        results: Dict[str, NodeResult] = {}
+        done: Dict[str, asyncio.Event] = {node_id: asyncio.Event() for node_id in self._functions}
+
+        async def run_node(node_id: str):
+            try:
+                upstream: Dict[str, Any] = {}
+                for dep in self._dependencies[node_id]:
+                    if dep in done:
+                        await done[dep].wait()
+                        if results[dep].status != "success":
+                            results[node_id] = self._skipped(node_id, origin, f"dépendance {dep} en échec")
+                            return
+                        upstream[dep] = results[dep].result
+                    elif dep in external_outputs:
+                        upstream[dep] = external_outputs[dep]
+                    else:
+                        results[node_id] = self._skipped(node_id, origin, f"dépendance {dep} indisponible")
+                        return
+
+                if semaphore is not None:
+                    async with semaphore:
+                        results[node_id] = await self._execute(node_id, upstream, origin)
+                else:
+                    results[node_id] = await self._execute(node_id, upstream, origin)
+            finally:
+                done[node_id].set()
+
+        await asyncio.gather(*(run_node(node_id) for level in levels for node_id in level))
+
+        critical_path, critical_duration = self._critical_path(levels, results)
+        return GraphRun(
+            results=results,
+            levels=levels,
+            critical_path=critical_path,
+            critical_path_duration=critical_duration,
+            wall_time=time.perf_counter() - origin
+        )
+
+    async def _execute(self, node_id: str, upstream: Dict[str, Any], origin: float) -> NodeResult:
+        started = time.perf_counter() - origin
+        try:
+            result = await self._functions[node_id](upstream)
+            return NodeResult(node_id, "success", result=result,
+                              started_at=started, finished_at=time.perf_counter() - origin)
+        except Exception as e:
+            logger.error("❌ Nœud du graphe en échec", node=node_id, error=str(e))
+            return NodeResult(node_id, "failed", error=str(e),
+                              started_at=started, finished_at=time.perf_counter() - origin)
+
+    @staticmethod
+    def _skipped(node_id: str, origin: float, reason: str) -> NodeResult:
+        now = time.perf_counter() - origin
+        return NodeResult(node_id, "skipped", error=reason, started_at=now, finished_at=now)
+
+    def _critical_path(self, levels: List[List[str]], results: Dict[str, NodeResult]):
+        """Plus longue chaîne de dépendances pondérée par les durées"""
+        longest: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for level in levels:
+            for node_id in level:
+                best_dep, best = None, 0.0
+                for dep in self.internal_dependencies(node_id):
+                    if longest[dep] > best:
+                        best_dep, best = dep, longest[dep]
+                longest[node_id] = best + results[node_id].duration
+                previous[node_id] = best_dep
+
+        if not longest:
+            return [], 0.0
+        node_id = max(longest, key=longest.get)
+        duration = longest[node_id]
+        path = []
+        while node_id is not None:
+            path.append(node_id)
+            node_id = previous[node_id]
+        return path[::-1], duration
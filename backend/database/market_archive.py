@@ -0,0 +1,343 @@
+"""
+🗄️ MARKET ARCHIVE - ARCHIVE COLONNAIRE DE L'HISTORIQUE DE MARCHÉ
+Parquet partitionné par symbole / mois, lecture Arrow memory-mappée
+
+Arborescence:
+    {root}/{timeframe}/symbol={SYMBOL}/date={YYYY-MM}.parquet   (archive durable)
+    {root}/.arrow/{timeframe}/symbol={SYMBOL}/date={YYYY-MM}.arrow  (cache IPC)
+
+- Écriture : fusion avec la partition existante (dédoublonnage par timestamp,
+  dernière valeur gagnante), remplacement atomique du fichier
+- Lecture : chaque partition Parquet est convertie une fois en fichier Arrow
+  IPC non compressé, ensuite memory-mappé ; les colonnes sont exposées en
+  NumPy sans copie (une seule concaténation si la plage couvre plusieurs mois)
+- Alimentation : chandelles CoinCap (`get_asset_history`) et barres broker
+  (`get_historical_data` Binance / Alpaca, tâche `sync_market_data`)
+
+Usage:
+    archive = get_market_archive()
+    archive.write_candles("BTC", "1m", candles)
+    series = archive.read("BTC", "1m", start, end)
+    series.close  # np.ndarray
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.config import settings
+from database.market_store import BarArrays
+
+logger = logging.getLogger(__name__)
+
+PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+ARCHIVE_SCHEMA = pa.schema(
+    [pa.field("timestamp", pa.int64())]  # epoch millisecondes UTC
+    + [pa.field(name, pa.float64()) for name in PRICE_FIELDS]
+)
+
+@dataclass
+class ArchiveSeries:
+    """Série d'un symbole (tableaux NumPy, vues sur le cache memory-mappé si possible)"""
+    symbol: str
+    timeframe: str
+    timestamps: np.ndarray  # int64 epoch ms
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @property
+    def n_bars(self) -> int:
+        return self.timestamps.shape[0]
+
+def _to_epoch_ms(value) -> int:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    return int(value)
+
+def _epoch_ms_array(timestamps) -> np.ndarray:
+    """Epoch ms vectorisé pour les tableaux NumPy (entiers ou datetime64), sinon par élément"""
+    if isinstance(timestamps, np.ndarray):
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            return timestamps.astype("datetime64[ms]").astype(np.int64)
+        if np.issubdtype(timestamps.dtype, np.integer):
+            return timestamps.astype(np.int64, copy=False)
+    return np.fromiter((_to_epoch_ms(t) for t in timestamps), dtype=np.int64)
+
+def _month_key(epoch_ms: np.ndarray) -> np.ndarray:
+    """Mois de partition par barre (datetime64[M], str() donne YYYY-MM)"""
+    return epoch_ms.astype("datetime64[ms]").astype("datetime64[M]")
+
+class MarketArchive:
+    """
+    🗄️ ARCHIVE PARQUET / ARROW
+
+    Les lectures ne touchent ni PostgreSQL ni le réseau ; un processus
+    d'écriture par symbole à la fois (pas de verrou inter-processus).
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.MARKET_ARCHIVE_PATH)
+        self.cache_root = self.root / ".arrow"
+
+        self.rows_written = 0
+        self.partitions_read = 0
+        self.cache_builds = 0
+
+    # ------------------------------------------------------------------
+    # Chemins
+    # ------------------------------------------------------------------
+
+    def _partition_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / timeframe / f"symbol={symbol}"
+
+    def _partition_path(self, symbol: str, timeframe: str, month: str) -> Path:
+        return self._partition_dir(symbol, timeframe) / f"date={month}.parquet"
+
+    def _cache_path(self, symbol: str, timeframe: str, month: str) -> Path:
+        return self.cache_root / timeframe / f"symbol={symbol}" / f"date={month}.arrow"
+
+    def partitions(self, symbol: str, timeframe: str) -> List[str]:
+        """Mois archivés (YYYY-MM), triés"""
+        directory = self._partition_dir(symbol, timeframe)
+        if not directory.exists():
+            return []
+        return sorted(path.stem[len("date="):] for path in directory.glob("date=*.parquet"))
+
+    def symbols(self, timeframe: str) -> List[str]:
+        """Symboles archivés pour un timeframe"""
+        directory = self.root / timeframe
+        if not directory.exists():
+            return []
+        return sorted(path.name[len("symbol="):] for path in directory.glob("symbol=*") if path.is_dir())
+
+    def latest_timestamp(self, symbol: str, timeframe: str) -> Optional[datetime]:
+        """Dernière barre archivée (UTC), lue dans la partition la plus récente"""
+        months = self.partitions(symbol, timeframe)
+        if not months:
+            return None
+        timestamps = self._load_partition(symbol, timeframe, months[-1]).column("timestamp")
+        if not len(timestamps):
+            return None
+        return datetime.fromtimestamp(timestamps[-1].as_py() / 1000, timezone.utc)
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def write_bars(self,
+                   symbol: str,
+                   timeframe: str,
+                   timestamps: Sequence,
+                   open: Sequence[float],
+                   high: Sequence[float],
+                   low: Sequence[float],
+                   close: Sequence[float],
+                   volume: Optional[Sequence[float]] = None) -> int:
+        """
+        💾 Archiver des barres (fusion idempotente avec les partitions existantes)
+
+        Args:
+            timestamps: datetimes (naïfs = UTC), datetime64 ou epoch millisecondes
+
+        Returns:
+            Nombre de barres écrites
+        """
+        epoch_ms = _epoch_ms_array(timestamps)
+        if epoch_ms.size == 0:
+            return 0
+
+        columns = {
+            "timestamp": epoch_ms,
+            "open": np.asarray(open, dtype=float),
+            "high": np.asarray(high, dtype=float),
+            "low": np.asarray(low, dtype=float),
+            "close": np.asarray(close, dtype=float),
+            "volume": np.zeros(epoch_ms.size) if volume is None else np.asarray(volume, dtype=float)
+        }
+
+        # Regroupement par mois via un tri stable (ordre d'arrivée conservé par mois)
+        months = _month_key(epoch_ms)
+        order = np.argsort(months, kind="stable")
+        sorted_months = months[order]
+        boundaries = np.flatnonzero(sorted_months[1:] != sorted_months[:-1]) + 1
+        for rows in np.split(order, boundaries):
+            batch = pa.table({name: values[rows] for name, values in columns.items()}, schema=ARCHIVE_SCHEMA)
+            self._merge_partition(symbol, timeframe, str(months[rows[0]]), batch)
+
+        self.rows_written += int(epoch_ms.size)
+        return int(epoch_ms.size)
+
+    def write_candles(self, symbol: str, timeframe: str, candles: Sequence) -> int:
+        """💾 Archiver des chandelles (CoinCapCandle ou équivalent)"""
+        return self.write_bars(
+            symbol, timeframe,
+            [c.timestamp for c in candles],
+            [c.open for c in candles], [c.high for c in candles],
+            [c.low for c in candles], [c.close for c in candles],
+            [c.volume for c in candles]
+        )
+
+    def write_records(self, symbol: str, timeframe: str, records: Sequence[Dict]) -> int:
+        """💾 Archiver des barres broker (dicts timestamp/open/high/low/close/volume)"""
+        return self.write_bars(
+            symbol, timeframe,
+            [r["timestamp"] for r in records],
+            *([r.get(field, 0.0) for r in records] for field in PRICE_FIELDS)
+        )
+
+    def _merge_partition(self, symbol: str, timeframe: str, month: str, batch: pa.Table):
+        path = self._partition_path(symbol, timeframe, month)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Ordre inverse d'arrivée (nouvelles barres d'abord, dernière du lot en tête) :
+        # la première occurrence d'un timestamp après tri stable est la plus récente
+        batch = batch.take(pa.array(np.arange(batch.num_rows - 1, -1, -1)))
+        if path.exists():
+            batch = pa.concat_tables([batch, pq.read_table(path, schema=ARCHIVE_SCHEMA)])
+
+        batch = batch.sort_by("timestamp")
+        timestamps = batch.column("timestamp").to_numpy()
+        if timestamps.size > 1:
+            keep = np.ones(timestamps.size, dtype=bool)
+            keep[1:] = timestamps[1:] != timestamps[:-1]
+            batch = batch.filter(pa.array(keep))
+
+        temporary = path.with_suffix(".parquet.tmp")
+        pq.write_table(batch, temporary, compression="zstd")
+        os.replace(temporary, path)
+
+        cache = self._cache_path(symbol, timeframe, month)
+        if cache.exists():
+            cache.unlink()
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def _load_partition(self, symbol: str, timeframe: str, month: str) -> pa.Table:
+        """Table Arrow memory-mappée (cache IPC reconstruit si la partition est plus récente)"""
+        source = self._partition_path(symbol, timeframe, month)
+        cache = self._cache_path(symbol, timeframe, month)
+
+        if not cache.exists() or cache.stat().st_mtime < source.stat().st_mtime:
+            table = pq.read_table(source, schema=ARCHIVE_SCHEMA).combine_chunks()
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            temporary = cache.with_suffix(".arrow.tmp")
+            with pa.OSFile(str(temporary), "wb") as sink:
+                with pa.ipc.new_file(sink, ARCHIVE_SCHEMA) as writer:
+                    writer.write_table(table)
+            os.replace(temporary, cache)
+            self.cache_builds += 1
+
+        self.partitions_read += 1
+        return pa.ipc.open_file(pa.memory_map(str(cache), "r")).read_all()
+
+    def read(self,
+             symbol: str,
+             timeframe: str,
+             start: Optional[datetime] = None,
+             end: Optional[datetime] = None) -> ArchiveSeries:
+        """
+        📤 Lire [start, end) d'un symbole
+
+        Une seule partition : vues NumPy directement sur le fichier mappé.
+        """
+        start_ms = _to_epoch_ms(start) if start is not None else None
+        end_ms = _to_epoch_ms(end) if end is not None else None
+        first_month = str(_month_key(np.array([start_ms]))[0]) if start_ms is not None else None
+        last_month = str(_month_key(np.array([end_ms - 1]))[0]) if end_ms is not None else None
+
+        tables = [
+            self._load_partition(symbol, timeframe, month)
+            for month in self.partitions(symbol, timeframe)
+            if (first_month is None or month >= first_month) and (last_month is None or month <= last_month)
+        ]
+
+        if not tables:
+            empty = np.empty(0)
+            return ArchiveSeries(symbol, timeframe, np.empty(0, dtype=np.int64),
+                                 empty, empty.copy(), empty.copy(), empty.copy(), empty.copy())
+
+        def column(name: str) -> np.ndarray:
+            chunks = [t.column(name).chunk(0).to_numpy(zero_copy_only=True) for t in tables if t.num_rows]
+            if not chunks:
+                return np.empty(0, dtype=np.int64 if name == "timestamp" else float)
+            return chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+
+        timestamps = column("timestamp")
+        lo = 0 if start_ms is None else int(np.searchsorted(timestamps, start_ms, side="left"))
+        hi = timestamps.size if end_ms is None else int(np.searchsorted(timestamps, end_ms, side="left"))
+
+        return ArchiveSeries(
+            symbol, timeframe, timestamps[lo:hi],
+            *(column(name)[lo:hi] for name in PRICE_FIELDS)
+        )
+
+    def read_universe(self,
+                      symbols: Sequence[str],
+                      timeframe: str,
+                      start: Optional[datetime] = None,
+                      end: Optional[datetime] = None) -> BarArrays:
+        """📤 Plusieurs symboles alignés sur l'union des timestamps (NaN si absent)"""
+        symbols = list(symbols)
+        series = [self.read(symbol, timeframe, start, end) for symbol in symbols]
+
+        all_timestamps = np.unique(np.concatenate([s.timestamps for s in series])) if series else np.empty(0, dtype=np.int64)
+        fields = {name: np.full((len(symbols), all_timestamps.size), np.nan) for name in PRICE_FIELDS}
+        for i, s in enumerate(series):
+            positions = np.searchsorted(all_timestamps, s.timestamps)
+            for name in PRICE_FIELDS:
+                fields[name][i, positions] = getattr(s, name)
+
+        return BarArrays(
+            symbols, timeframe,
+            (all_timestamps // 1000).astype("datetime64[s]"),
+            *(fields[name] for name in PRICE_FIELDS)
+        )
+
+    async def archive_broker_history(self,
+                                     broker,
+                                     symbol: str,
+                                     timeframe: str,
+                                     start: datetime,
+                                     end: datetime) -> int:
+        """📥 Archiver l'historique d'un broker (`get_historical_data`)"""
+        try:
+            records = await broker.get_historical_data(symbol, timeframe, start, end)
+            return self.write_records(symbol, timeframe, records)
+        except NotImplementedError:
+            logger.warning(f"⚠️ Historique non disponible pour {type(broker).__name__}")
+            return 0
+        except Exception as e:
+            logger.error(f"❌ Erreur archivage historique broker {symbol}: {e}")
+            return 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """📊 Statistiques de l'archive"""
+        return {
+            "rows_written": self.rows_written,
+            "partitions_read": self.partitions_read,
+            "cache_builds": self.cache_builds
+        }
+
+# Instance globale
+_market_archive: Optional[MarketArchive] = None
+
+def get_market_archive() -> MarketArchive:
+    """🗄️ Obtenir l'archive de marché partagée"""
+    global _market_archive
+    if _market_archive is None:
+        _market_archive = MarketArchive()
+    return _market_archive
@@ -0,0 +1,392 @@
+"""
+🕯️ MARKET DATA STORE - SÉRIES TEMPORELLES OHLCV
+Ingestion en masse et lecture par plage en NumPy
+
+- Partitions mensuelles créées à la demande (PostgreSQL, RANGE sur timestamp)
+- Upserts idempotents sur (symbol, timeframe, timestamp)
+- Ingestion par COPY vers une table de staging (psycopg2) ou par lots
+  executemany, jamais d'ajout ORM ligne par ligne
+- Lecture d'une plage pour des centaines de symboles en une requête,
+  renvoyée en matrices (symboles × timestamps)
+
+Usage:
+    store = get_market_store()
+    store.ingest(bars)  # itérable de (symbol, timeframe, timestamp, o, h, l, c, v)
+    arrays = store.read_range(["BTC", "ETH"], "1d", start, end)
+    arrays.close  # np.ndarray (2 × T), NaN pour les barres manquantes
+"""
+
+import csv
+import io
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Integer, cast, func, select, text
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from models.market import OHLCVBar
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ("symbol", "timeframe", "timestamp", "open", "high", "low", "close", "volume")
+PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+BarRow = Tuple[str, str, datetime, float, float, float, float, float]
+
+# Intervalles CoinCap → timeframes du store
+COINCAP_TIMEFRAMES = {
+    "m1": "1m", "m5": "5m", "m15": "15m", "m30": "30m",
+    "h1": "1h", "h2": "2h", "h6": "6h", "h12": "12h", "d1": "1d"
+}
+
+@dataclass
+class MarketStoreConfig:
+    """Configuration de l'ingestion"""
+    batch_size: int = 5000
+    copy_threshold: int = 1000  # au-delà : COPY (PostgreSQL + psycopg2)
+
+    @classmethod
+    def from_settings(cls) -> "MarketStoreConfig":
+        return cls(
+            batch_size=settings.MARKET_STORE_BATCH_SIZE,
+            copy_threshold=settings.MARKET_STORE_COPY_THRESHOLD
+        )
+
+@dataclass
+class BarArrays:
+    """Plage de barres alignée : matrices (symboles × timestamps)"""
+    symbols: List[str]
+    timeframe: str
+    timestamps: np.ndarray  # datetime64[s] UTC
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @property
+    def n_bars(self) -> int:
+        return self.timestamps.shape[0]
+
+    def aligned_close(self) -> np.ndarray:
+        """
+        Clôtures propagées vers l'avant (barres manquantes), tronquées au
+        premier timestamp où tous les symboles ont un prix
+        """
+        close = self.close
+        if close.size == 0:
+            return close
+        valid = ~np.isnan(close)
+        last_valid = np.where(valid, np.arange(close.shape[1]), 0)
+        np.maximum.accumulate(last_valid, axis=1, out=last_valid)
+        filled = close[np.arange(close.shape[0])[:, None], last_valid]
+
+        started = np.maximum.accumulate(valid, axis=1).all(axis=0)
+        if not started.any():
+            return filled[:, :0]
+        return filled[:, int(np.argmax(started)):]
+
+def _as_utc(timestamp: datetime) -> datetime:
+    """Timestamps naïfs interprétés en UTC"""
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
+
+def _month_start(timestamp: datetime) -> datetime:
+    return datetime(timestamp.year, timestamp.month, 1, tzinfo=timezone.utc)
+
+def _next_month(month: datetime) -> datetime:
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+class MarketDataStore:
+    """
+    🕯️ STORE OHLCV
+
+    Une transaction par appel d'ingestion ; les lots rejoués (resync,
+    chevauchements) remplacent les barres existantes sans doublon.
+    """
+
+    def __init__(self, engine: Optional[Engine] = None, config: Optional[MarketStoreConfig] = None):
+        if engine is None:
+            from database.connection import engine
+        self.engine = engine
+        self.config = config or MarketStoreConfig.from_settings()
+        self.table = OHLCVBar.__table__
+        self.is_postgres = engine.dialect.name == "postgresql"
+
+        self._partitions: set = set()
+        self._schema_ready = False
+
+        self.rows_ingested = 0
+        self.copy_batches = 0
+        self.executemany_batches = 0
+
+    # ------------------------------------------------------------------
+    # Schéma et partitions
+    # ------------------------------------------------------------------
+
+    def create_schema(self):
+        """Créer la table parente (partitionnée sous PostgreSQL)"""
+        self.table.create(self.engine, checkfirst=True)
+        self._schema_ready = True
+
+    @staticmethod
+    def partition_name(month: datetime) -> str:
+        return f"ohlcv_bars_{month.year:04d}_{month.month:02d}"
+
+    def ensure_partitions(self, start: datetime, end: datetime):
+        """Créer les partitions mensuelles couvrant [start, end] (no-op hors PostgreSQL)"""
+        if not self.is_postgres:
+            return
+
+        month = _month_start(_as_utc(start))
+        last = _month_start(_as_utc(end))
+        statements = []
+        while month <= last:
+            name = self.partition_name(month)
+            if name not in self._partitions:
+                statements.append((name, (
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {self.table.name} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+                )))
+            month = _next_month(month)
+
+        if not statements:
+            return
+
+        # Transaction dédiée : le cache n'enregistre que des partitions commitées
+        with self.engine.begin() as conn:
+            for _, ddl in statements:
+                conn.execute(text(ddl))
+
+        self._partitions.update(name for name, _ in statements)
+        logger.debug(f"🗂️ {len(statements)} partition(s) OHLCV créée(s)")
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize(bars: Iterable[BarRow]) -> List[BarRow]:
+        """Timestamps UTC et dédoublonnage intra-lot (dernière barre gagnante)"""
+        unique: Dict[Tuple[str, str, datetime], BarRow] = {}
+        for symbol, timeframe, timestamp, o, h, l, c, v in bars:
+            timestamp = _as_utc(timestamp)
+            unique[(symbol, timeframe, timestamp)] = (
+                symbol, timeframe, timestamp, float(o), float(h), float(l), float(c), float(v or 0.0)
+            )
+        return list(unique.values())
+
+    def ingest(self, bars: Iterable[BarRow]) -> int:
+        """
+        📥 Upsert en masse de barres OHLCV
+
+        Args:
+            bars: tuples (symbol, timeframe, timestamp, open, high, low, close, volume)
+
+        Returns:
+            Nombre de barres écrites
+        """
+        rows = self._normalize(bars)
+        if not rows:
+            return 0
+
+        if not self._schema_ready:
+            self.create_schema()
+
+        timestamps = [row[2] for row in rows]
+        use_copy = self.is_postgres and len(rows) >= self.config.copy_threshold
+
+        self.ensure_partitions(min(timestamps), max(timestamps))
+        with self.engine.begin() as conn:
+            for start in range(0, len(rows), self.config.batch_size):
+                batch = rows[start:start + self.config.batch_size]
+                if use_copy and self._copy_batch(conn, batch):
+                    self.copy_batches += 1
+                else:
+                    self._executemany_batch(conn, batch)
+                    self.executemany_batches += 1
+
+        self.rows_ingested += len(rows)
+        return len(rows)
+
+    def ingest_candles(self, symbol: str, timeframe: str, candles: Sequence) -> int:
+        """📥 Ingérer des chandelles (objets avec timestamp/open/high/low/close/volume)"""
+        return self.ingest(
+            (symbol, timeframe, c.timestamp, c.open, c.high, c.low, c.close, c.volume)
+            for c in candles
+        )
+
+    def _upsert_statement(self):
+        if self.is_postgres:
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(self.table)
+        return stmt.on_conflict_do_update(
+            index_elements=["symbol", "timeframe", "timestamp"],
+            set_={field: stmt.excluded[field] for field in PRICE_FIELDS}
+        )
+
+    def _executemany_batch(self, conn, batch: List[BarRow]):
+        """Lot executemany (insertmanyvalues SQLAlchemy : un INSERT multi-lignes)"""
+        conn.execute(self._upsert_statement(), [dict(zip(BAR_COLUMNS, row)) for row in batch])
+
+    def _copy_batch(self, conn, batch: List[BarRow]) -> bool:
+        """COPY vers une table de staging temporaire puis upsert ensembliste"""
+        dbapi_connection = conn.connection.dbapi_connection
+        cursor = dbapi_connection.cursor()
+        if not hasattr(cursor, "copy_expert"):
+            cursor.close()
+            return False  # driver sans COPY : repli executemany
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for symbol, timeframe, timestamp, o, h, l, c, v in batch:
+            writer.writerow((symbol, timeframe, timestamp.isoformat(), repr(o), repr(h), repr(l), repr(c), repr(v)))
+        buffer.seek(0)
+
+        columns = ", ".join(BAR_COLUMNS)
+        updates = ", ".join(f"{field} = EXCLUDED.{field}" for field in PRICE_FIELDS)
+        try:
+            cursor.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS ohlcv_staging "
+                f"(LIKE {self.table.name} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+            )
+            cursor.copy_expert(f"COPY ohlcv_staging ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+            cursor.execute(
+                f"INSERT INTO {self.table.name} ({columns}) SELECT {columns} FROM ohlcv_staging "
+                f"ON CONFLICT (symbol, timeframe, timestamp) DO UPDATE SET {updates}"
+            )
+            cursor.execute("TRUNCATE ohlcv_staging")
+        finally:
+            cursor.close()
+        return True
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def read_range(self,
+                   symbols: Sequence[str],
+                   timeframe: str,
+                   start: datetime,
+                   end: datetime) -> BarArrays:
+        """
+        📤 Lire [start, end) pour un ensemble de symboles en une requête
+
+        Les séries sont alignées sur l'union des timestamps ; les barres
+        manquantes valent NaN.
+        """
+        symbols = list(symbols)
+        table = self.table
+        query = (
+            select(table.c.symbol, self._epoch(table.c.timestamp), table.c.open, table.c.high,
+                   table.c.low, table.c.close, table.c.volume)
+            .where(table.c.timeframe == timeframe)
+            .where(table.c.symbol.in_(symbols))
+            .where(table.c.timestamp >= _as_utc(start))
+            .where(table.c.timestamp < _as_utc(end))
+            .order_by(table.c.symbol, table.c.timestamp)
+        )
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(query).fetchall()
+
+        return self._to_arrays(symbols, timeframe, rows)
+
+    def read_since(self,
+                   symbols: Sequence[str],
+                   timeframe: str,
+                   since: Dict[str, datetime],
+                   end: datetime) -> BarArrays:
+        """
+        📤 Barres strictement postérieures à since[symbole] (historique complet si absent)
+
+        Une requête depuis le plus ancien repère ; les barres déjà vues valent
+        NaN et les timestamps sans nouvelle barre sont retirés.
+        """
+        symbols = list(symbols)
+        marks = [since.get(symbol) for symbol in symbols]
+        if marks and all(mark is not None for mark in marks):
+            start = min(_as_utc(mark) for mark in marks)
+        else:
+            start = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        arrays = self.read_range(symbols, timeframe, start, end)
+
+        seen = np.array([int(_as_utc(mark).timestamp()) if mark is not None else np.iinfo(np.int64).min
+                         for mark in marks], dtype=np.int64)
+        stale = arrays.timestamps.astype(np.int64)[None, :] <= seen[:, None]
+        fields = [np.where(stale, np.nan, getattr(arrays, name)) for name in PRICE_FIELDS]
+        keep = ~np.isnan(fields[3]).all(axis=0)
+        return BarArrays(symbols, timeframe, arrays.timestamps[keep], *(field[:, keep] for field in fields))
+
+    def _epoch(self, column):
+        """Timestamp en secondes epoch côté SQL (évite la conversion Python par ligne)"""
+        if self.is_postgres:
+            return func.extract("epoch", column)
+        return cast(func.strftime("%s", column), Integer)
+
+    @staticmethod
+    def _to_arrays(symbols: List[str], timeframe: str, rows) -> BarArrays:
+        n_symbols = len(symbols)
+        if not rows:
+            empty = np.empty((n_symbols, 0))
+            return BarArrays(symbols, timeframe, np.empty(0, dtype="datetime64[s]"),
+                             empty, empty.copy(), empty.copy(), empty.copy(), empty.copy())
+
+        columns = list(zip(*rows))
+        index = {symbol: i for i, symbol in enumerate(symbols)}
+        symbol_idx = np.fromiter((index[s] for s in columns[0]), dtype=np.int64, count=len(rows))
+        epochs = np.asarray(columns[1], dtype=float).astype(np.int64)
+
+        unique_epochs, time_idx = np.unique(epochs, return_inverse=True)
+        fields = []
+        for values in columns[2:]:
+            matrix = np.full((n_symbols, unique_epochs.shape[0]), np.nan)
+            matrix[symbol_idx, time_idx] = np.asarray(values, dtype=float)
+            fields.append(matrix)
+
+        return BarArrays(symbols, timeframe, unique_epochs.astype("datetime64[s]"), *fields)
+
+    def latest_timestamps(self, symbols: Sequence[str], timeframe: str) -> Dict[str, datetime]:
+        """Dernière barre stockée par symbole (reprise incrémentale des syncs)"""
+        table = self.table
+        query = (
+            select(table.c.symbol, func.max(table.c.timestamp))
+            .where(table.c.timeframe == timeframe)
+            .where(table.c.symbol.in_(list(symbols)))
+            .group_by(table.c.symbol)
+        )
+        with self.engine.connect() as conn:
+            return {symbol: _as_utc(ts) for symbol, ts in conn.execute(query) if ts is not None}
+
+    def symbols(self, timeframe: str) -> List[str]:
+        """Symboles stockés pour un timeframe (univers synchronisé)"""
+        table = self.table
+        query = select(table.c.symbol).where(table.c.timeframe == timeframe).distinct().order_by(table.c.symbol)
+        with self.engine.connect() as conn:
+            return [symbol for (symbol,) in conn.execute(query)]
+
+    def get_stats(self) -> Dict[str, int]:
+        """📊 Statistiques d'ingestion"""
+        return {
+            "rows_ingested": self.rows_ingested,
+            "copy_batches": self.copy_batches,
+            "executemany_batches": self.executemany_batches,
+            "partitions": len(self._partitions)
+        }
+
+# Instance globale
+_market_store: Optional[MarketDataStore] = None
+
+def get_market_store() -> MarketDataStore:
+    """🕯️ Obtenir le store OHLCV partagé"""
+    global _market_store
+    if _market_store is None:
+        _market_store = MarketDataStore()
+    return _market_store
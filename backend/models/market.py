@@ -3,7 +3,7 @@
 Stockage des données de marché et analyses
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, Index, PrimaryKeyConstraint
 from sqlalchemy.sql import func
 
 import sys
@@ -15,6 +15,9 @@ class MarketData(Base):
     📊 Modèle pour les données de marché
     """
     __tablename__ = "market_data"
+    __table_args__ = (
+        Index("ix_market_data_symbol_timeframe_timestamp", "symbol", "timeframe", "timestamp"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     symbol = Column(String(20), nullable=False, index=True)
@@ -44,6 +47,35 @@ class MarketData(Base):
     def __repr__(self):
         return f"<MarketData(symbol={self.symbol}, close={self.close_price}, time={self.timestamp})>"
 
+class OHLCVBar(Base):
+    """
+    🕯️ Barres OHLCV (série temporelle, ingestion en masse)
+    
+    Table partitionnée par mois sur timestamp (PostgreSQL) ; la clé primaire
+    (symbol, timeframe, timestamp) sert d'index composite et de cible des upserts.
+    """
+    __tablename__ = "ohlcv_bars"
+    __table_args__ = (
+        PrimaryKeyConstraint("symbol", "timeframe", "timestamp", name="pk_ohlcv_bars"),
+        {"postgresql_partition_by": "RANGE (timestamp)"}
+    )
+    
+    symbol = Column(String(20), nullable=False)
+    timeframe = Column(String(10), nullable=False)  # 1m, 5m, 1h, 1d, etc.
+    timestamp = Column(DateTime(timezone=True), nullable=False)
+    
+    # Prix OHLCV
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Float, nullable=False, default=0.0)
+    
+    ingested_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<OHLCVBar(symbol={self.symbol}, timeframe={self.timeframe}, close={self.close}, time={self.timestamp})>"
+
 class TradingSignal(Base):
     """
     🎯 Modèle pour les signaux de trading